@@ -8,6 +8,7 @@
 #
 # Nome do grupo no Canvas: RA4_1
 
+import argparse
 import sys
 import os
 import traceback
@@ -22,6 +23,13 @@ import json
 # ============================================================================
 
 from src.RA1.functions.python.io_utils import lerArquivo, salvar_tokens
+from src.RA1.functions.python.artefatos import (
+    FORMATOS_ARTEFATO, ErroArtefato, caminho_artefato, carregar_artefato, definir_copias_secundarias,
+    definir_formato_artefato
+)
+from src.RA1.functions.python.relatorios import (
+    MODO_DESLIGADO, MODO_SEGUNDO_PLANO, agendar_relatorio, aguardar_relatorios, definir_modo_relatorios
+)
 from src.RA1.functions.python.rpn_calc import parseExpressao
 from src.RA1.functions.python.tokens import Tipo_de_Token
 
@@ -33,6 +41,7 @@ from src.RA2.functions.python.lerTokens import lerTokens, validarTokens, reconhe
 from src.RA2.functions.python.construirGramatica import imprimir_gramatica_completa
 from src.RA2.functions.python.construirTabelaLL1 import construirTabelaLL1
 from src.RA2.functions.python.parsear import parsear_todas_linhas
+from src.RA2.functions.python.gerarParser import carregarParserGerado
 from src.RA3.functions.python.analisador_semantico import analisarSemanticaDaJsonRA2
 from src.RA3.functions.python.gerador_arvore_atribuida import executar_geracao_arvore_atribuida
 from src.RA4.functions.python.gerador_tac import gerarTAC
@@ -239,8 +248,9 @@ def executar_ra2_parsing(tabela_ll1):
 
     print(f"Analisando {len(tokens_por_linha)} linha(s) de tokens")
 
-    # Aplica parsear para cada linha
-    derivacoes = parsear_todas_linhas(tabela_ll1, tokens_por_linha)
+    # Aplica o parser gerado a partir da gramática (cache de build, regenerado
+    # se GRAMATICA_RPN mudar) para cada linha
+    derivacoes = parsear_todas_linhas(tabela_ll1, tokens_por_linha, carregarParserGerado())
 
     return derivacoes, tokens_por_linha
 
@@ -286,60 +296,44 @@ def executar_ra3_analise_semantica():
 
     try:
         # Carregar AST de RA2
-        with open(str(OUT_ARVORE_JSON), 'r', encoding='utf-8') as f:
-            arvore_ra2 = json.load(f)
+        arvore_ra2 = carregar_artefato(OUT_ARVORE_JSON)
 
         # Executar análise semântica completa (3 fases: tipos, memória, controle)
-        # Esta função orquestradora executa todas as fases de validação sequencialmente
+        # Linhas com erro não interrompem a análise: o resultado traz a árvore
+        # anotada parcial e todos os erros encontrados
         resultado_semantico = analisarSemanticaDaJsonRA2(arvore_ra2)
+        erros = resultado_semantico['erros']
 
-        # Processa resultados baseado no tipo de retorno
-        if isinstance(resultado_semantico, list):
-            # Análise retornou erros (lista de strings de erro)
+        if erros:
             print("    Erro(s) semântico(s) encontrado(s):")
-            for erro in resultado_semantico:
+            for erro in erros:
                 print(f"    {erro}")
+        else:
+            print("    [OK] Análise semântica concluída com sucesso sem nenhum erro")
 
-            print("\n--- GERAÇÃO DA ÁRVORE ATRIBUÍDA ---")
-            print("  Falha na análise semântica - gerando árvore com dados parciais...")
-
-            # Cria estrutura de resultado para geração de árvore parcial
-            resultado_semantico_dict = {
-                'arvore_anotada': arvore_ra2,
-                'tabela_simbolos': None,
-                'erros': resultado_semantico
-            }
-            resultado_arvore = executar_geracao_arvore_atribuida(resultado_semantico_dict)
+        print("\n--- GERAÇÃO DA ÁRVORE ATRIBUÍDA ---")
+        resultado_arvore = executar_geracao_arvore_atribuida(resultado_semantico)
 
-            if resultado_arvore['sucesso']:
+        if resultado_arvore['sucesso']:
+            if erros:
                 print("  [OK] Árvore atribuída gerada com dados parciais")
                 print(f"  [OK] Relatórios de erro salvos em: {BASE_DIR / 'outputs' / 'RA3' / 'relatorios'}")
             else:
-                print(f"  [ERROR] Falha na geração da árvore: {resultado_arvore.get('erro', 'Erro desconhecido')}")
-
-        else:
-            # Análise bem-sucedida (retornou dict com 'arvore_anotada' e 'tabela_simbolos')
-            print("    [OK] Análise semântica concluída com sucesso sem nenhum erro")
-
-            print("\n--- GERAÇÃO DA ÁRVORE ATRIBUÍDA ---")
-            resultado_arvore = executar_geracao_arvore_atribuida(resultado_semantico)
-
-            if resultado_arvore['sucesso']:
                 print("    [OK] Árvore atribuída gerada e salva com sucesso")
                 print(f"    [OK] Relatórios gerados em: {BASE_DIR / 'outputs' / 'RA3' / 'relatorios'}")
                 print("      - arvore_atribuida.md")
                 print("      - julgamento_tipos.md")
                 print("      - erros_sematicos.md")
                 print("      - tabela_simbolos.md")
-            else:
-                print(f"    [ERROR] Falha na geração da árvore atribuída: {resultado_arvore.get('erro', 'Erro desconhecido')}")
+        else:
+            print(f"    [ERROR] Falha na geração da árvore atribuída: {resultado_arvore.get('erro', 'Erro desconhecido')}")
 
     except FileNotFoundError:
-        print(f"  [ERROR] ERRO: Arquivo de árvore sintática não encontrado: {OUT_ARVORE_JSON}")
+        print(f"  [ERROR] ERRO: Arquivo de árvore sintática não encontrado: {caminho_artefato(OUT_ARVORE_JSON)}")
         print("  Certifique-se de que a análise sintática (RA2) foi executada corretamente.")
-    except json.JSONDecodeError as e:
-        print(f"  [ERROR] ERRO: Arquivo JSON inválido: {e}")
-        print(f"  Arquivo: {OUT_ARVORE_JSON}")
+    except (json.JSONDecodeError, ErroArtefato) as e:
+        print(f"  [ERROR] ERRO: Arquivo de árvore sintática inválido: {e}")
+        print(f"  Arquivo: {caminho_artefato(OUT_ARVORE_JSON)}")
     except Exception as e:
         print(f"  [ERROR] ERRO na análise semântica: {e}")
         traceback.print_exc()
@@ -361,12 +355,12 @@ def executar_ra4_geracao_tac():
         ast_path = BASE_DIR / "outputs" / "RA3" / "arvore_atribuida.json"
         output_dir = BASE_DIR / "outputs" / "RA4"
 
-        result = gerarTAC(ast_path, output_dir, save_output=True, source_file=str(ast_path))
+        result = gerarTAC(ast_path, output_dir, save_output=True, source_file=str(caminho_artefato(ast_path)))
 
         if result["success"]:
             print(f"    [OK] {result['statistics']['total_instructions']} instruções TAC geradas")
             print(f"    [OK] Arquivos salvos em: {output_dir.relative_to(BASE_DIR)}")
-            print("      - tac_instructions.json")
+            print(f"      - {result['output_files']['json'].name}")
             print("      - tac_output.md")
         else:
             print(f"    [ERROR] {result['error']}")
@@ -423,7 +417,7 @@ def executar_ra4_otimizacao_tac(arquivo_entrada):
             'jump_elim': stats.get('jump_elimination', 0),
             'iterations': stats.get('iterations', 0)
         }
-        optimizer._gerar_relatorio_otimizacoes_md(arquivo_entrada, stats_compat)
+        agendar_relatorio(optimizer._gerar_relatorio_otimizacoes_md, arquivo_entrada, stats_compat)
 
         print(f"    [OK] TAC otimizado com sucesso")
         print(f"    [OK] Instruções originais: {stats_compat['initial_instructions']}")
@@ -434,7 +428,7 @@ def executar_ra4_otimizacao_tac(arquivo_entrada):
         else:
             print(f"    [OK] Redução: N/A (nenhuma instrução para otimizar)")
         print(f"    [OK] Arquivos salvos em: {output_dir.relative_to(BASE_DIR)}")
-        print("      - tac_otimizado.json")
+        print(f"      - {caminho_artefato('tac_otimizado.json').name}")
         print("      - tac_otimizado.md")
         print("      - relatorios/otimizacao_tac.md")
 
@@ -541,17 +535,16 @@ def executar_ra4_geracao_assembly(arquivo_entrada):
         output_dir = BASE_DIR / "outputs" / "RA4"
 
         # Carregar TAC otimizado
-        with open(str(tac_otimizado_path), 'r', encoding='utf-8') as f:
-            tac_data = json.load(f)
-            # Extract just the instructions from the metadata wrapper
-            if "instructions" in tac_data:
-                tac_otimizado = tac_data
-            else:
-                # Wrap in expected format if needed
-                tac_otimizado = {"instructions": tac_data}
+        tac_data = carregar_artefato(tac_otimizado_path)
+        # Extract just the instructions from the metadata wrapper
+        if "instructions" in tac_data:
+            tac_otimizado = tac_data
+        else:
+            # Wrap in expected format if needed
+            tac_otimizado = {"instructions": tac_data}
 
         # Instanciar gerador de Assembly
-        gerador = GeradorAssembly()
+        gerador = GeradorAssembly(usar_intervalos=True)
 
         # Gerar Assembly
         assembly_code = gerador.gerarAssembly(tac_otimizado)
@@ -594,17 +587,39 @@ def main():
     11. Compila Assembly e faz upload (RA4)
     
 
+    Opções:
+        --artifact-format {json,bin}: formato dos artefatos entre fases
+            (arvore_sintatica, arvore_atribuida, tac_instructions, tac_otimizado)
+        --no-secondary-copies: não replica artefatos e relatórios do RA3 nos
+            locais secundários (ex.: relatorios/ na raiz do projeto)
+        --no-reports: não gera os relatórios em Markdown (por padrão eles são
+            gerados em segundo plano e aguardados ao final da execução)
+
     Levanta:
         SystemExit: Se houver erro crítico em qualquer fase
     """
     if len(sys.argv) < 2:
         print("ERRO -> Especificar arquivo de teste como argumento")
-        print("Uso: python3 compilar.py <arquivo>")
+        print("Uso: python3 compilar.py <arquivo> [--artifact-format {json,bin}] [--no-secondary-copies] [--no-reports]")
         print("Exemplo: python3 compilar.py teste1_valido.txt")
         sys.exit(1)
 
+    parser = argparse.ArgumentParser(description="Compilador RPN (RA1-RA4)")
+    parser.add_argument("arquivo", help="arquivo de entrada com as expressões")
+    parser.add_argument("--artifact-format", choices=FORMATOS_ARTEFATO, default="json",
+                        help="formato dos artefatos entre fases (padrão: json)")
+    parser.add_argument("--no-secondary-copies", action="store_true",
+                        help="não replica artefatos e relatórios em locais secundários")
+    parser.add_argument("--no-reports", action="store_true",
+                        help="não gera os relatórios em Markdown")
+    argumentos = parser.parse_args()
+
+    definir_formato_artefato(argumentos.artifact_format)
+    definir_copias_secundarias(not argumentos.no_secondary_copies)
+    definir_modo_relatorios(MODO_DESLIGADO if argumentos.no_reports else MODO_SEGUNDO_PLANO)
+
     # Validar e carregar arquivo de entrada
-    arquivo_entrada = sys.argv[1]
+    arquivo_entrada = argumentos.arquivo
 
     # Verifica se arquivo existe
     if not os.path.exists(arquivo_entrada):
@@ -654,6 +669,10 @@ def main():
     # Fase 10: Compilação de Assembly e Upload para Arduino (RA4)
     executar_ra4_compilacao_upload(arquivo_entrada)
 
+    # Relatórios em Markdown agendados em segundo plano pelas fases
+    for erro in aguardar_relatorios():
+        print(f"  [ERROR] Falha na geração de relatório: {erro}")
+
 
 
 if __name__ == "__main__":
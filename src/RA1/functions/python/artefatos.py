@@ -0,0 +1,862 @@
+#!/usr/bin/env python3
+
+# Integrantes do grupo (ordem alfabética):
+# Breno Rossi Duarte - breno-rossi
+# Francisco Bley Ruthes - fbleyruthes
+# Rafael Olivare Piveta - RafaPiveta
+# Stefan Benjamim Seixas Lourenco Rodrigues - waifuisalie
+#
+# Nome do grupo no Canvas: RA4_1
+
+"""
+Artefatos entre fases do compilador
+
+Centraliza a escrita e a leitura dos artefatos trocados entre as fases
+(arvore_sintatica, arvore_atribuida, tac_instructions e tac_otimizado).
+Dois formatos são suportados:
+
+- json: formato legível (padrão), idêntico ao gerado anteriormente.
+- bin:  formato binário compacto com tabela de strings internadas, de modo
+        que rótulos repetidos ('tipo_vertice', 'subtipo', 'LINHA', ...) são
+        gravados uma única vez e referenciados por índice.
+
+Layout do formato binário:
+    MAGIA (4 bytes) | VERSÃO (1 byte) | offset da tabela de strings (<Q)
+    valor raiz codificado
+    tabela de strings: quantidade (varint) + [tamanho (varint) + utf-8]*
+
+As listas diretamente abaixo da raiz ('linhas', 'arvore_atribuida',
+'instructions') são gravadas de forma indexada: cada elemento é codificado
+de forma independente e um índice de offsets por elemento fica logo após
+eles. Com abrir_artefato o arquivo é mapeado em memória (mmap) e cada LINHA
+ou instrução TAC só é decodificada quando acessada.
+
+A escrita (escrever_artefato/salvar_artefato) também é incremental nessas
+listas: cada elemento é serializado e gravado antes do próximo, e a lista
+pode ser um iterador (gerador) que produz as linhas sob demanda. Valores da
+raiz que são funções são chamados quando chega a vez deles, depois das listas
+anteriores (ex: estatísticas calculadas durante a geração das linhas). Assim o
+pico de memória da escrita fica limitado ao maior elemento.
+
+O JSON é escrito com pilha explícita (percorrer) e, quando o json.loads
+esbarra no limite de recursão, lido da mesma forma: expressões com milhares
+de níveis de aninhamento passam entre as fases.
+"""
+
+import json
+import mmap
+import os
+import re
+import shutil
+import struct
+from collections.abc import Iterable, Mapping, Sequence
+from json.decoder import scanstring
+from json.encoder import encode_basestring
+from json.scanner import NUMBER_RE
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Set, Tuple, Union
+
+from src.RA1.functions.python.percurso import percorrer
+
+
+#########################
+# CONSTANTES
+#########################
+
+FORMATO_JSON = 'json'
+FORMATO_BIN = 'bin'
+FORMATOS_ARTEFATO = (FORMATO_JSON, FORMATO_BIN)
+EXTENSOES_ARTEFATO = {FORMATO_JSON: '.json', FORMATO_BIN: '.bin'}
+
+MAGIA_BINARIO = b'RAB\x00'
+VERSAO_BINARIO = 2
+
+_CABECALHO = struct.Struct('<4sBQ')
+_FLOAT = struct.Struct('<d')
+_OFFSET = struct.Struct('<Q')
+
+# Tags de tipo (1 byte) do formato binário
+TAG_NULO = 0x00
+TAG_FALSO = 0x01
+TAG_VERDADEIRO = 0x02
+TAG_INTEIRO = 0x03
+TAG_REAL = 0x04
+TAG_STRING = 0x05
+TAG_LISTA = 0x06
+TAG_DICT = 0x07
+TAG_LISTA_INDEXADA = 0x08
+
+_formato_atual = FORMATO_JSON
+_copias_secundarias = True
+
+
+class ErroArtefato(ValueError):
+    """Artefato binário corrompido ou em versão não suportada."""
+    pass
+
+
+#########################
+# CONFIGURAÇÃO DO FORMATO
+#########################
+
+def definir_formato_artefato(formato: str) -> None:
+    """Define o formato usado por salvar_artefato quando nenhum é informado."""
+    global _formato_atual
+    if formato not in FORMATOS_ARTEFATO:
+        raise ValueError(f"Formato de artefato desconhecido: '{formato}'. Use um de {FORMATOS_ARTEFATO}")
+    _formato_atual = formato
+
+
+def obter_formato_artefato() -> str:
+    """Retorna o formato de artefato atualmente configurado."""
+    return _formato_atual
+
+
+def definir_copias_secundarias(ativas: bool) -> None:
+    """Liga/desliga as cópias em locais secundários feitas por replicar_arquivo."""
+    global _copias_secundarias
+    _copias_secundarias = bool(ativas)
+
+
+def obter_copias_secundarias() -> bool:
+    """Retorna se as cópias em locais secundários estão ativas."""
+    return _copias_secundarias
+
+
+def caminho_artefato(caminho: Union[str, Path], formato: Optional[str] = None) -> Path:
+    """Troca a extensão de 'caminho' pela extensão do formato (padrão: o configurado)."""
+    formato = formato or _formato_atual
+    return Path(caminho).with_suffix(EXTENSOES_ARTEFATO[formato])
+
+
+#########################
+# CODIFICAÇÃO BINÁRIA
+#########################
+
+def _escrever_varint(saida: bytearray, valor: int) -> None:
+    while valor > 0x7F:
+        saida.append((valor & 0x7F) | 0x80)
+        valor >>= 7
+    saida.append(valor)
+
+
+def _ler_varint(dados, pos: int) -> Tuple[int, int]:
+    resultado = 0
+    deslocamento = 0
+    while True:
+        byte = dados[pos]
+        pos += 1
+        resultado |= (byte & 0x7F) << deslocamento
+        if byte < 0x80:
+            return resultado, pos
+        deslocamento += 7
+
+
+def _chave_json(chave: Any) -> str:
+    """Converte chaves não-string como o json.dump faria (1 -> '1', True -> 'true')."""
+    return chave if isinstance(chave, str) else json.dumps(chave)
+
+
+def _valor_da_raiz(valor: Any) -> Any:
+    """Valor de uma chave da raiz: funções são chamadas na vez da chave."""
+    return valor() if callable(valor) else valor
+
+
+def _eh_lista_da_raiz(valor: Any) -> bool:
+    """Listas, tuplas e iteradores da raiz são gravados elemento a elemento."""
+    return isinstance(valor, Iterable) and not isinstance(valor, (str, bytes, Mapping))
+
+
+class _CodificadorBinario:
+    """
+    Codifica valores JSON-compatíveis internando todas as strings.
+
+    Com 'arquivo' (aberto em 'wb', posicionável) o que já foi codificado é
+    gravado depois de cada elemento das listas da raiz; os offsets que só são
+    conhecidos depois (índice da lista, tabela de strings) são preenchidos
+    voltando ao ponto do arquivo.
+    """
+
+    def __init__(self, arquivo: Optional[IO] = None):
+        self.saida = bytearray()
+        self.strings: Dict[str, int] = {}
+        self.arquivo = arquivo
+        self.inicio = arquivo.tell() if arquivo is not None else 0
+        self.descarregados = 0
+        # Coleções em codificação (detecta referências circulares)
+        self._abertos: Set[int] = set()
+
+    def posicao(self) -> int:
+        """Posição atual em relação ao início do artefato (cabeçalho incluído)."""
+        return _CABECALHO.size + self.descarregados + len(self.saida)
+
+    def descarregar(self) -> None:
+        """Grava no arquivo o que já foi codificado (sem arquivo, não faz nada)."""
+        if self.arquivo is not None and self.saida:
+            self.arquivo.write(self.saida)
+            self.descarregados += len(self.saida)
+            self.saida = bytearray()
+
+    def _gravar_offset(self, posicao: int, valor: int) -> None:
+        relativa = posicao - _CABECALHO.size - self.descarregados
+        if relativa >= 0:
+            _OFFSET.pack_into(self.saida, relativa, valor)
+            return
+        fim = self.arquivo.tell()
+        self.arquivo.seek(self.inicio + posicao)
+        self.arquivo.write(_OFFSET.pack(valor))
+        self.arquivo.seek(fim)
+
+    def _indice_string(self, texto: str) -> int:
+        indice = self.strings.get(texto)
+        if indice is None:
+            indice = len(self.strings)
+            self.strings[texto] = indice
+        return indice
+
+    def codificar(self, valor: Any) -> None:
+        """Codifica 'valor' com pilha explícita (percorrer), sem limite de aninhamento."""
+        if not self._codificar_escalar(valor):
+            percorrer(valor, self._passos_colecao)
+
+    def _codificar_escalar(self, valor: Any) -> bool:
+        """Codifica um valor sem itens; retorna False (sem gravar nada) para listas e dicts."""
+        saida = self.saida
+        if valor is None:
+            saida.append(TAG_NULO)
+        elif valor is True:
+            saida.append(TAG_VERDADEIRO)
+        elif valor is False:
+            saida.append(TAG_FALSO)
+        elif isinstance(valor, str):
+            saida.append(TAG_STRING)
+            _escrever_varint(saida, self._indice_string(valor))
+        elif isinstance(valor, int):
+            saida.append(TAG_INTEIRO)
+            # zigzag: inteiros negativos também viram varint curto
+            _escrever_varint(saida, (valor << 1) if valor >= 0 else ((-valor << 1) - 1))
+        elif isinstance(valor, float):
+            saida.append(TAG_REAL)
+            saida += _FLOAT.pack(valor)
+        elif isinstance(valor, (dict, list, tuple)):
+            return False
+        else:
+            raise TypeError(f"Objeto do tipo {type(valor).__name__} não é serializável em artefato")
+        return True
+
+    def _passos_colecao(self, valor: Any):
+        """Gerador de codificar para percorrer: pede a codificação dos itens que são coleções."""
+        if id(valor) in self._abertos:
+            raise ValueError("Referência circular não é serializável em artefato")
+        self._abertos.add(id(valor))
+        saida = self.saida
+        if isinstance(valor, dict):
+            saida.append(TAG_DICT)
+            _escrever_varint(saida, len(valor))
+            for chave, item in valor.items():
+                _escrever_varint(saida, self._indice_string(_chave_json(chave)))
+                if not self._codificar_escalar(item):
+                    yield item
+        else:
+            saida.append(TAG_LISTA)
+            _escrever_varint(saida, len(valor))
+            for item in valor:
+                if not self._codificar_escalar(item):
+                    yield item
+        self._abertos.discard(id(valor))
+
+    def codificar_lista_indexada(self, lista: Iterable) -> None:
+        """
+        Codifica uma lista com índice de offsets:
+        TAG | offset do índice (<Q) | elementos... | quantidade (varint) + offsets (<Q)*
+        """
+        self.saida.append(TAG_LISTA_INDEXADA)
+        posicao_ponteiro = self.posicao()
+        self.saida += bytes(_OFFSET.size)
+
+        offsets = []
+        for item in lista:
+            offsets.append(self.posicao())
+            self.codificar(item)
+            self.descarregar()
+
+        self._gravar_offset(posicao_ponteiro, self.posicao())
+        _escrever_varint(self.saida, len(offsets))
+        self.saida += struct.pack(f'<{len(offsets)}Q', *offsets)
+
+    def codificar_raiz(self, dados: Any) -> None:
+        """Codifica a raiz; listas de primeiro nível recebem índice por elemento."""
+        if not isinstance(dados, dict):
+            self.codificar(dados)
+            return
+        self.saida.append(TAG_DICT)
+        _escrever_varint(self.saida, len(dados))
+        for chave, item in dados.items():
+            _escrever_varint(self.saida, self._indice_string(_chave_json(chave)))
+            item = _valor_da_raiz(item)
+            if _eh_lista_da_raiz(item):
+                self.codificar_lista_indexada(item)
+            else:
+                self.codificar(item)
+
+    def tabela_strings(self) -> bytes:
+        tabela = bytearray()
+        _escrever_varint(tabela, len(self.strings))
+        for texto in self.strings:
+            codificado = texto.encode('utf-8')
+            _escrever_varint(tabela, len(codificado))
+            tabela += codificado
+        return bytes(tabela)
+
+
+def _gravar_binario(dados: Any, arquivo: IO) -> None:
+    """Serializa 'dados' no formato binário direto em 'arquivo', por partes."""
+    codificador = _CodificadorBinario(arquivo)
+    arquivo.write(bytes(_CABECALHO.size))
+    codificador.codificar_raiz(dados)
+    offset_tabela = codificador.posicao()
+    codificador.descarregar()
+    arquivo.write(codificador.tabela_strings())
+    fim = arquivo.tell()
+    arquivo.seek(codificador.inicio)
+    arquivo.write(_CABECALHO.pack(MAGIA_BINARIO, VERSAO_BINARIO, offset_tabela))
+    arquivo.seek(fim)
+
+
+def _gerar_json(tarefa: Tuple[Any, int], partes: List[str], abertos: Set[int]):
+    """
+    Visitante de _texto_json para percorrer: escreve escalares direto em
+    'partes' e devolve um gerador para listas e dicionários não vazios.
+    """
+    valor, nivel = tarefa
+    if isinstance(valor, str):
+        partes.append(encode_basestring(valor))
+    elif valor is None:
+        partes.append('null')
+    elif valor is True:
+        partes.append('true')
+    elif valor is False:
+        partes.append('false')
+    elif isinstance(valor, (int, float)):
+        partes.append(json.dumps(valor))
+    elif isinstance(valor, (dict, list, tuple)):
+        if not valor:
+            partes.append('{}' if isinstance(valor, dict) else '[]')
+            return None
+        if id(valor) in abertos:
+            raise ValueError("Circular reference detected")
+        return _passos_json(valor, nivel, partes, abertos)
+    else:
+        raise TypeError(f"Object of type {type(valor).__name__} is not JSON serializable")
+    return None
+
+
+def _passos_json(valor: Any, nivel: int, partes: List[str], abertos: Set[int]):
+    """Gerador de _gerar_json: pede o texto de cada item da lista ou do dicionário."""
+    abertos.add(id(valor))
+    recuo = '\n' + '  ' * (nivel + 1)
+    if isinstance(valor, dict):
+        separador = '{' + recuo
+        for chave, item in valor.items():
+            partes.append(separador + encode_basestring(_chave_json(chave)) + ': ')
+            separador = ',' + recuo
+            yield item, nivel + 1
+        partes.append('\n' + '  ' * nivel + '}')
+    else:
+        separador = '[' + recuo
+        for item in valor:
+            partes.append(separador)
+            separador = ',' + recuo
+            yield item, nivel + 1
+        partes.append('\n' + '  ' * nivel + ']')
+    abertos.discard(id(valor))
+
+
+def _texto_json(valor: Any, nivel: int = 0) -> str:
+    """
+    Mesmo texto de json.dumps(valor, indent=2, ensure_ascii=False), com as
+    linhas após a primeira recuadas 'nivel' vezes. Usa pilha explícita
+    (percorrer): valores com milhares de níveis de aninhamento não esbarram
+    no limite de recursão como no json.dumps.
+    """
+    partes: List[str] = []
+    abertos: Set[int] = set()
+    percorrer((valor, nivel), lambda tarefa: _gerar_json(tarefa, partes, abertos))
+    return ''.join(partes)
+
+
+def _gravar_json(dados: Any, arquivo: IO) -> None:
+    """
+    Mesmo texto de json.dump(dados, indent=2, ensure_ascii=False), com as
+    listas da raiz serializadas e gravadas um elemento por vez.
+    """
+    if not isinstance(dados, dict) or not dados:
+        arquivo.write(_texto_json(dados))
+        return
+
+    separador = '{\n  '
+    for chave, item in dados.items():
+        arquivo.write(separador + encode_basestring(_chave_json(chave)) + ': ')
+        separador = ',\n  '
+        item = _valor_da_raiz(item)
+        if not _eh_lista_da_raiz(item):
+            arquivo.write(_texto_json(item, 1))
+            continue
+        abertura = '[\n    '
+        for elemento in item:
+            arquivo.write(abertura + _texto_json(elemento, 2))
+            abertura = ',\n    '
+        arquivo.write('[]' if abertura == '[\n    ' else '\n  ]')
+    arquivo.write('\n}')
+
+
+# Espaços entre os símbolos do JSON (os mesmos aceitos pelo json.loads)
+_ESPACOS_JSON = re.compile(r'[ \t\n\r]*')
+_LITERAIS_JSON = {'null': None, 'true': True, 'false': False,
+                  'NaN': float('nan'), 'Infinity': float('inf'), '-Infinity': float('-inf')}
+
+
+def _ler_json_iterativo(texto: str) -> Any:
+    """
+    Decodifica 'texto' como o json.loads, mas com pilha explícita: usado
+    por _ler_json quando o aninhamento passa do limite de recursão do
+    decodificador da biblioteca padrão.
+
+    Raises:
+        json.JSONDecodeError: Se o texto não for um JSON válido.
+    """
+    def espacos(pos: int) -> int:
+        return _ESPACOS_JSON.match(texto, pos).end()
+
+    def ler_chave(pos: int) -> Tuple[str, int]:
+        if texto[pos:pos + 1] != '"':
+            raise json.JSONDecodeError("Expecting property name enclosed in double quotes", texto, pos)
+        chave, pos = scanstring(texto, pos + 1)
+        pos = espacos(pos)
+        if texto[pos:pos + 1] != ':':
+            raise json.JSONDecodeError("Expecting ':' delimiter", texto, pos)
+        return chave, espacos(pos + 1)
+
+    # Listas e dicionários abertos, com a chave pendente de cada dicionário
+    abertos: List[Any] = []
+    chaves: List[Optional[str]] = []
+    pos = espacos(0)
+    while True:
+        simbolo = texto[pos:pos + 1]
+        if simbolo in ('{', '['):
+            novo: Any = {} if simbolo == '{' else []
+            pos = espacos(pos + 1)
+            if texto[pos:pos + 1] == ('}' if simbolo == '{' else ']'):
+                valor, pos = novo, pos + 1
+            else:
+                abertos.append(novo)
+                chave = None
+                if simbolo == '{':
+                    chave, pos = ler_chave(pos)
+                chaves.append(chave)
+                continue
+        elif simbolo == '"':
+            valor, pos = scanstring(texto, pos + 1)
+        else:
+            numero = NUMBER_RE.match(texto, pos)
+            literal = next((nome for nome in _LITERAIS_JSON if texto.startswith(nome, pos)), None)
+            if numero is not None:
+                inteiro, fracao, expoente = numero.groups()
+                valor = float(inteiro + (fracao or '') + (expoente or '')) if fracao or expoente else int(inteiro)
+                pos = numero.end()
+            elif literal is not None:
+                valor, pos = _LITERAIS_JSON[literal], pos + len(literal)
+            else:
+                raise json.JSONDecodeError("Expecting value", texto, pos)
+
+        # Encaixa o valor lido e fecha as listas/dicionários que terminam aqui
+        while True:
+            if not abertos:
+                pos = espacos(pos)
+                if pos != len(texto):
+                    raise json.JSONDecodeError("Extra data", texto, pos)
+                return valor
+            topo = abertos[-1]
+            if isinstance(topo, dict):
+                topo[chaves[-1]] = valor
+            else:
+                topo.append(valor)
+            pos = espacos(pos)
+            simbolo = texto[pos:pos + 1]
+            if simbolo == ',':
+                pos = espacos(pos + 1)
+                if isinstance(topo, dict):
+                    chaves[-1], pos = ler_chave(pos)
+                break
+            if simbolo != ('}' if isinstance(topo, dict) else ']'):
+                raise json.JSONDecodeError("Expecting ',' delimiter", texto, pos)
+            valor, pos = abertos.pop(), pos + 1
+            chaves.pop()
+
+
+def _ler_json(texto: str) -> Any:
+    """json.loads, com _ler_json_iterativo para aninhamentos muito profundos."""
+    try:
+        return json.loads(texto)
+    except RecursionError:
+        return _ler_json_iterativo(texto)
+
+
+def serializar_binario(dados: Any) -> bytes:
+    """Serializa 'dados' (estrutura JSON-compatível) no formato binário."""
+    codificador = _CodificadorBinario()
+    codificador.codificar_raiz(dados)
+    offset_tabela = _CABECALHO.size + len(codificador.saida)
+    return (_CABECALHO.pack(MAGIA_BINARIO, VERSAO_BINARIO, offset_tabela)
+            + bytes(codificador.saida)
+            + codificador.tabela_strings())
+
+
+def _ler_tabela_strings(dados, pos: int) -> List[str]:
+    quantidade, pos = _ler_varint(dados, pos)
+    strings = []
+    for _ in range(quantidade):
+        tamanho, pos = _ler_varint(dados, pos)
+        strings.append(bytes(dados[pos:pos + tamanho]).decode('utf-8'))
+        pos += tamanho
+    return strings
+
+
+def _ler_indice(dados, pos: int) -> Tuple[Tuple[int, ...], int]:
+    """Lê o índice de uma lista indexada. Retorna (offsets, posição após o índice)."""
+    (posicao_indice,) = _OFFSET.unpack_from(dados, pos)
+    quantidade, posicao_offsets = _ler_varint(dados, posicao_indice)
+    offsets = struct.unpack_from(f'<{quantidade}Q', dados, posicao_offsets)
+    return offsets, posicao_offsets + quantidade * _OFFSET.size
+
+
+def _decodificar(dados, pos: int, strings: List[str]) -> Tuple[Any, int]:
+    """
+    Decodifica o valor que começa em 'pos'. Retorna (valor, posição após ele).
+
+    Listas e dicts em construção ficam em uma pilha explícita, então valores
+    com milhares de níveis de aninhamento não esbarram no limite de recursão.
+    """
+    # Cada entrada: [coleção, itens restantes, chave pendente (dicts), fim (listas indexadas)]
+    pilha: List[List[Any]] = []
+    while True:
+        tag = dados[pos]
+        pos += 1
+        if tag == TAG_STRING:
+            indice, pos = _ler_varint(dados, pos)
+            valor = strings[indice]
+        elif tag == TAG_INTEIRO:
+            bruto, pos = _ler_varint(dados, pos)
+            valor = (bruto >> 1) if not bruto & 1 else -((bruto + 1) >> 1)
+        elif tag in (TAG_DICT, TAG_LISTA, TAG_LISTA_INDEXADA):
+            fim = None
+            if tag == TAG_LISTA_INDEXADA:
+                offsets, fim = _ler_indice(dados, pos)
+                quantidade, pos = len(offsets), pos + _OFFSET.size
+            else:
+                quantidade, pos = _ler_varint(dados, pos)
+            valor = {} if tag == TAG_DICT else []
+            if quantidade:
+                chave = None
+                if tag == TAG_DICT:
+                    indice, pos = _ler_varint(dados, pos)
+                    chave = strings[indice]
+                pilha.append([valor, quantidade, chave, fim])
+                continue
+            if fim is not None:
+                pos = fim
+        elif tag == TAG_REAL:
+            valor = _FLOAT.unpack_from(dados, pos)[0]
+            pos += _FLOAT.size
+        elif tag == TAG_NULO:
+            valor = None
+        elif tag == TAG_VERDADEIRO:
+            valor = True
+        elif tag == TAG_FALSO:
+            valor = False
+        else:
+            raise ErroArtefato(f"Tag desconhecida 0x{tag:02x} na posição {pos - 1}")
+
+        # Encaixa o valor na coleção do topo e fecha as que ficaram completas
+        while pilha:
+            topo = pilha[-1]
+            colecao = topo[0]
+            if isinstance(colecao, dict):
+                colecao[topo[2]] = valor
+            else:
+                colecao.append(valor)
+            topo[1] -= 1
+            if topo[1]:
+                if isinstance(colecao, dict):
+                    indice, pos = _ler_varint(dados, pos)
+                    topo[2] = strings[indice]
+                break
+            pilha.pop()
+            valor = colecao
+            if topo[3] is not None:
+                pos = topo[3]
+        if not pilha:
+            return valor, pos
+
+
+def _ler_cabecalho(dados) -> List[str]:
+    """Valida o cabeçalho e retorna a tabela de strings."""
+    if len(dados) < _CABECALHO.size:
+        raise ErroArtefato("Artefato binário truncado")
+    magia, versao, offset_tabela = _CABECALHO.unpack_from(dados, 0)
+    if magia != MAGIA_BINARIO:
+        raise ErroArtefato("Arquivo não é um artefato binário do compilador")
+    if versao != VERSAO_BINARIO:
+        raise ErroArtefato(f"Versão de artefato binário não suportada: {versao}")
+    try:
+        return _ler_tabela_strings(dados, offset_tabela)
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise ErroArtefato(f"Artefato binário corrompido: {e}")
+
+
+def desserializar_binario(dados: bytes) -> Any:
+    """Reconstrói a estrutura a partir de bytes gerados por serializar_binario."""
+    strings = _ler_cabecalho(dados)
+    try:
+        valor, _ = _decodificar(dados, _CABECALHO.size, strings)
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise ErroArtefato(f"Artefato binário corrompido: {e}")
+    return valor
+
+
+#########################
+# ACESSO PREGUIÇOSO (MMAP)
+#########################
+
+class ListaIndexada(Sequence):
+    """
+    Lista de um artefato binário decodificada sob demanda.
+
+    Cada acesso decodifica apenas o elemento pedido a partir do seu offset;
+    fatias decodificam só o trecho solicitado.
+    """
+
+    def __init__(self, dados, offsets: Tuple[int, ...], strings: List[str]):
+        self._dados = dados
+        self._offsets = offsets
+        self._strings = strings
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self._decodificar_em(offset) for offset in self._offsets[indice]]
+        return self._decodificar_em(self._offsets[indice])
+
+    def _decodificar_em(self, offset: int) -> Any:
+        try:
+            return _decodificar(self._dados, offset, self._strings)[0]
+        except (IndexError, struct.error, UnicodeDecodeError) as e:
+            raise ErroArtefato(f"Artefato binário corrompido: {e}")
+
+
+class ArtefatoIndexado(Mapping):
+    """
+    Artefato aberto para leitura sob demanda.
+
+    Binários são mapeados em memória: apenas o cabeçalho, a tabela de strings
+    e os valores pequenos da raiz são decodificados na abertura; listas de
+    primeiro nível viram ListaIndexada. Artefatos JSON são carregados por
+    inteiro e expostos pela mesma interface.
+
+    Uso:
+        with abrir_artefato('outputs/RA4/tac_otimizado.json') as tac:
+            print(len(tac['instructions']), tac['instructions'][10:20])
+    """
+
+    def __init__(self, caminho: Union[str, Path]):
+        self.caminho = resolver_artefato(caminho)
+        self._arquivo = None
+        self._mapa = None
+
+        with open(self.caminho, 'rb') as f:
+            eh_binario = f.read(len(MAGIA_BINARIO)) == MAGIA_BINARIO
+
+        if not eh_binario:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                self._raiz = _ler_json(f.read())
+            return
+
+        self._arquivo = open(self.caminho, 'rb')
+        self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._raiz = self._decodificar_raiz(self._mapa)
+        except (IndexError, struct.error, UnicodeDecodeError) as e:
+            self.fechar()
+            raise ErroArtefato(f"Artefato binário corrompido: {e}")
+        except ErroArtefato:
+            self.fechar()
+            raise
+
+    @staticmethod
+    def _decodificar_raiz(dados) -> Any:
+        strings = _ler_cabecalho(dados)
+        pos = _CABECALHO.size
+        if dados[pos] != TAG_DICT:
+            return _decodificar(dados, pos, strings)[0]
+
+        quantidade, pos = _ler_varint(dados, pos + 1)
+        raiz = {}
+        for _ in range(quantidade):
+            indice, pos = _ler_varint(dados, pos)
+            if dados[pos] == TAG_LISTA_INDEXADA:
+                offsets, pos = _ler_indice(dados, pos + 1)
+                raiz[strings[indice]] = ListaIndexada(dados, offsets, strings)
+            else:
+                raiz[strings[indice]], pos = _decodificar(dados, pos, strings)
+        return raiz
+
+    def __getitem__(self, chave):
+        return self._raiz[chave]
+
+    def __iter__(self):
+        return iter(self._raiz)
+
+    def __len__(self) -> int:
+        return len(self._raiz)
+
+    def fechar(self) -> None:
+        """Libera o mapeamento; listas indexadas deixam de ser acessíveis."""
+        if self._mapa is not None:
+            self._mapa.close()
+            self._mapa = None
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+
+    def __enter__(self) -> 'ArtefatoIndexado':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+
+def abrir_artefato(caminho: Union[str, Path]) -> ArtefatoIndexado:
+    """Abre um artefato para acesso sob demanda (ver ArtefatoIndexado)."""
+    return ArtefatoIndexado(caminho)
+
+
+#########################
+# LEITURA E ESCRITA
+#########################
+
+def modo_escrita_artefato(formato: Optional[str] = None) -> str:
+    """Modo de abertura (open) adequado ao formato: texto para json, binário para bin."""
+    return 'wb' if (formato or _formato_atual) == FORMATO_BIN else 'w'
+
+
+def escrever_artefato(dados: Any, arquivo: IO, formato: Optional[str] = None) -> None:
+    """
+    Escreve 'dados' em um arquivo já aberto com modo_escrita_artefato(formato).
+
+    As listas da raiz de 'dados' são gravadas um elemento por vez e podem ser
+    iteradores; valores da raiz que são funções são chamados na vez deles.
+    """
+    if (formato or _formato_atual) == FORMATO_BIN:
+        _gravar_binario(dados, arquivo)
+    else:
+        _gravar_json(dados, arquivo)
+
+
+def salvar_artefato(dados: Any, caminho: Union[str, Path], formato: Optional[str] = None) -> Path:
+    """
+    Salva um artefato no formato escolhido (padrão: o configurado).
+
+    A extensão de 'caminho' é ajustada ao formato, então os chamadores podem
+    continuar passando o nome .json de sempre.
+
+    O artefato é escrito em um arquivo temporário no mesmo diretório e só
+    então renomeado para o destino (os.replace): uma falha no meio da
+    escrita não deixa um artefato truncado no lugar do anterior.
+
+    Returns:
+        Caminho efetivamente escrito.
+    """
+    formato = formato or _formato_atual
+    destino = caminho_artefato(caminho, formato)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+
+    modo = modo_escrita_artefato(formato)
+    temporario = destino.with_name(f'.{destino.name}.{os.getpid()}.tmp')
+    try:
+        with open(temporario, modo, encoding='utf-8' if modo == 'w' else None) as f:
+            escrever_artefato(dados, f, formato)
+        os.replace(temporario, destino)
+    except BaseException:
+        temporario.unlink(missing_ok=True)
+        raise
+    return destino
+
+
+def resolver_artefato(caminho: Union[str, Path]) -> Path:
+    """
+    Localiza o arquivo de um artefato: primeiro na extensão do formato
+    configurado e depois no caminho informado.
+
+    Raises:
+        FileNotFoundError: Se nenhum dos dois existir.
+    """
+    preferido = caminho_artefato(caminho)
+    if preferido.exists():
+        return preferido
+    caminho = Path(caminho)
+    if caminho.exists():
+        return caminho
+    raise FileNotFoundError(f"Artefato não encontrado: {preferido}")
+
+
+def carregar_artefato(caminho: Union[str, Path]) -> Any:
+    """
+    Carrega um artefato em qualquer dos formatos (detectado pelo conteúdo).
+
+    Raises:
+        FileNotFoundError: Se o artefato não existir.
+        json.JSONDecodeError: Se o JSON for inválido.
+        ErroArtefato: Se o binário for inválido.
+    """
+    origem = resolver_artefato(caminho)
+    with open(origem, 'rb') as f:
+        conteudo = f.read()
+    if conteudo[:len(MAGIA_BINARIO)] == MAGIA_BINARIO:
+        return desserializar_binario(conteudo)
+    return _ler_json(conteudo.decode('utf-8'))
+
+
+#########################
+# CÓPIAS SECUNDÁRIAS
+#########################
+
+def replicar_arquivo(origem: Union[str, Path], destino: Union[str, Path]) -> Optional[Path]:
+    """
+    Disponibiliza um arquivo já escrito em um segundo local sem gerá-lo de
+    novo: cria um hard link e, se o sistema de arquivos não permitir, copia
+    o conteúdo.
+
+    Não faz nada se as cópias secundárias estiverem desligadas
+    (definir_copias_secundarias(False)) ou se 'destino' for o próprio
+    'origem'.
+
+    Returns:
+        Caminho do destino, ou None se nada foi feito.
+    """
+    if not _copias_secundarias:
+        return None
+    origem, destino = Path(origem), Path(destino)
+    if destino.resolve() == origem.resolve():
+        return None
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    if destino.exists() or destino.is_symlink():
+        if destino.exists() and os.path.samefile(origem, destino):
+            return destino
+        destino.unlink()
+    try:
+        os.link(origem, destino)
+    except OSError:
+        shutil.copyfile(origem, destino)
+    return destino
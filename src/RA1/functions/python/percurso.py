@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+# Integrantes do grupo (ordem alfabética):
+# Breno Rossi Duarte - breno-rossi
+# Francisco Bley Ruthes - fbleyruthes
+# Rafael Olivare Piveta - RafaPiveta
+# Stefan Benjamim Seixas Lourenco Rodrigues - waifuisalie
+#
+# Nome do grupo no Canvas: RA4_1
+
+"""
+Percurso de árvores sem recursão do Python
+
+As árvores das fases (NoArvore do RA2, árvore atribuída do RA3, nós tipados
+do RA4) podem ter milhares de níveis em expressões geradas. Os percursos
+usam percorrer(), que mantém uma pilha explícita de geradores em vez de
+empilhar chamadas recursivas, então a profundidade não esbarra no limite de
+recursão.
+
+O visitante recebe uma tarefa (normalmente um nó) e devolve o resultado
+dela, ou um gerador que pede o resultado de cada filho com
+
+    resultado_filho = yield tarefa_filho
+
+e termina com 'return resultado'. Os filhos são processados por completo,
+na ordem em que são pedidos, antes de o gerador continuar - a mesma ordem
+da versão recursiva. Exceções de um filho são relançadas no gerador do pai
+(no ponto do yield), como aconteceria na chamada recursiva.
+
+Exemplo:
+    >>> def somar(no):
+    ...     total = no['valor']
+    ...     for filho in no['filhos']:
+    ...         total += yield filho
+    ...     return total
+    >>> folha = {'valor': 1, 'filhos': []}
+    >>> percorrer({'valor': 2, 'filhos': [folha, folha]}, somar)
+    4
+"""
+
+from types import GeneratorType
+from typing import Any, Callable
+
+
+def percorrer(raiz: Any, visitar: Callable[[Any], Any]) -> Any:
+    """
+    Executa 'visitar' na raiz e em todas as tarefas pedidas pelos geradores.
+
+    Args:
+        raiz: Tarefa inicial (normalmente o nó raiz)
+        visitar: Função que devolve o resultado da tarefa ou um gerador que
+            pede os filhos (ver o docstring do módulo)
+
+    Returns:
+        Resultado da raiz.
+    """
+    resultado = visitar(raiz)
+    if not isinstance(resultado, GeneratorType):
+        return resultado
+
+    pilha = [resultado]
+    enviar = None
+    erro = None
+    while pilha:
+        gerador = pilha[-1]
+        try:
+            if erro is None:
+                tarefa = gerador.send(enviar)
+            else:
+                erro, lancar = None, erro
+                tarefa = gerador.throw(lancar)
+        except StopIteration as fim:
+            pilha.pop()
+            enviar = fim.value
+            continue
+        except BaseException as excecao:
+            pilha.pop()
+            if not pilha:
+                raise
+            erro = excecao
+            continue
+
+        try:
+            resultado = visitar(tarefa)
+        except BaseException as excecao:
+            erro = excecao
+            continue
+        if isinstance(resultado, GeneratorType):
+            pilha.append(resultado)
+            enviar = None
+        else:
+            enviar = resultado
+    return enviar
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+# Integrantes do grupo (ordem alfabética):
+# Breno Rossi Duarte - breno-rossi
+# Francisco Bley Ruthes - fbleyruthes
+# Rafael Olivare Piveta - RafaPiveta
+# Stefan Benjamim Seixas Lourenco Rodrigues - waifuisalie
+#
+# Nome do grupo no Canvas: RA4_1
+
+"""
+Geração de relatórios fora do caminho crítico
+
+Os relatórios em Markdown (RA3: arvore_atribuida, julgamento_tipos,
+erros_sematicos, tabela_simbolos; RA4: tac_output, tac_otimizado,
+otimizacao_tac) não são lidos por nenhuma fase seguinte. As fases entregam
+cada relatório a agendar_relatorio, que conforme o modo configurado:
+
+- sincrono:     executa na hora (padrão; comportamento anterior);
+- segundo_plano: enfileira em uma thread de fundo e segue adiante;
+- desligado:    descarta o relatório.
+
+A thread de fundo é única, então relatórios que escrevem o mesmo arquivo
+terminam na ordem em que foram agendados. aguardar_relatorios espera os
+pendentes (chamado ao final da execução e antes de criar processos com fork).
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, List, Optional
+
+
+#########################
+# CONSTANTES
+#########################
+
+MODO_SINCRONO = 'sincrono'
+MODO_SEGUNDO_PLANO = 'segundo_plano'
+MODO_DESLIGADO = 'desligado'
+MODOS_RELATORIO = (MODO_SINCRONO, MODO_SEGUNDO_PLANO, MODO_DESLIGADO)
+
+_modo_atual = MODO_SINCRONO
+_executor: Optional[ThreadPoolExecutor] = None
+_pendentes: List[Future] = []
+_trava = threading.Lock()
+
+
+#########################
+# CONFIGURAÇÃO DO MODO
+#########################
+
+def definir_modo_relatorios(modo: str) -> None:
+    """Define como agendar_relatorio trata os relatórios seguintes."""
+    global _modo_atual
+    if modo not in MODOS_RELATORIO:
+        raise ValueError(f"Modo de relatórios desconhecido: '{modo}'. Use um de {MODOS_RELATORIO}")
+    _modo_atual = modo
+
+
+def obter_modo_relatorios() -> str:
+    """Retorna o modo de relatórios atualmente configurado."""
+    return _modo_atual
+
+
+def relatorios_ativos() -> bool:
+    """Indica se os relatórios serão gerados (modo diferente de desligado)."""
+    return _modo_atual != MODO_DESLIGADO
+
+
+#########################
+# AGENDAMENTO
+#########################
+
+def agendar_relatorio(funcao: Callable[..., Any], *args: Any, **kwargs: Any) -> Optional[Future]:
+    """
+    Gera um relatório conforme o modo configurado.
+
+    Os argumentos não devem ser alterados pelo chamador depois do
+    agendamento: no modo segundo_plano o relatório é gerado mais tarde.
+
+    Returns:
+        Future do relatório no modo segundo_plano; None nos demais (no modo
+        sincrono exceções de 'funcao' se propagam normalmente).
+    """
+    global _executor
+    if _modo_atual == MODO_DESLIGADO:
+        return None
+    if _modo_atual == MODO_SINCRONO:
+        funcao(*args, **kwargs)
+        return None
+
+    with _trava:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='relatorios')
+        futuro = _executor.submit(funcao, *args, **kwargs)
+        _pendentes.append(futuro)
+    return futuro
+
+
+def aguardar_relatorios(coletar: bool = True) -> List[BaseException]:
+    """
+    Espera todos os relatórios agendados em segundo plano terminarem.
+
+    Args:
+        coletar: False para só esperar (ex: antes de um fork, que não pode
+            acontecer com a thread de fundo no meio de um relatório); os
+            relatórios continuam pendentes e suas exceções saem na próxima
+            chamada com coletar=True
+
+    Returns:
+        Exceções levantadas pelos relatórios (vazia se todos foram gerados;
+        sempre vazia com coletar=False).
+    """
+    with _trava:
+        pendentes = list(_pendentes)
+        if coletar:
+            _pendentes.clear()
+
+    if not coletar:
+        wait(pendentes)
+        return []
+
+    erros = []
+    for futuro in pendentes:
+        erro = futuro.exception()
+        if erro is not None:
+            erros.append(erro)
+    return erros
@@ -12,6 +12,8 @@ from .calcularFirst import calcularFirst
 from .calcularFollow import calcularFollow
 from .construirTabelaLL1 import construirTabelaLL1, ConflictError
 from .construirGramatica import imprimir_gramatica_completa
+from .analisadorGramatica import analisarGramatica
+from .construirAST import construirAST
 
 __all__ = [
     'calcularFirst',
@@ -19,5 +21,7 @@ __all__ = [
     'construirTabelaLL1',
     'construirGramatica',
     'imprimir_gramatica_completa',
+    'analisarGramatica',
+    'construirAST',
     'ConflictError'
 ]
\ No newline at end of file
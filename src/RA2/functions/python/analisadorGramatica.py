@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+
+# Integrantes do grupo (ordem alfabética):
+# Nome Completo 1 - Breno Rossi Duarte
+# Nome Completo 2 - Francisco Bley Ruthes
+# Nome Completo 3 - Rafael Olivare Piveta
+# Nome Completo 4 - Stefan Benjamim Seixas Lourenço Rodrigues
+#
+# Nome do grupo no Canvas: RA2_1
+
+from collections import deque
+
+from .configuracaoGramatica import GRAMATICA_RPN, SIMBOLO_INICIAL
+
+
+def _first_da_sequencia(sequencia, FIRST, nao_terminais):
+    # Mesmo contrato de calcular_first_da_sequencia ('epsilon' se tudo for anulável)
+    first_seq = set()
+    for simbolo in sequencia:
+        if simbolo not in nao_terminais:
+            first_seq.add(simbolo)
+            return first_seq
+        first_seq.update(FIRST[simbolo] - {'epsilon'})
+        if 'epsilon' not in FIRST[simbolo]:
+            return first_seq
+    first_seq.add('epsilon')
+    return first_seq
+
+
+def calcular_first_worklist(gramatica):
+    nao_terminais = set(gramatica.keys())
+
+    # Grafo de dependências: se X aparece em uma produção de A, mudanças em
+    # FIRST(X) podem mudar FIRST(A). Só esses A voltam para a fila.
+    dependentes = {nt: set() for nt in nao_terminais}
+    for cabeca, producoes in gramatica.items():
+        for producao in producoes:
+            for simbolo in producao:
+                if simbolo in nao_terminais:
+                    dependentes[simbolo].add(cabeca)
+
+    FIRST = {nt: set() for nt in nao_terminais}
+    pendentes = deque(gramatica.keys())
+    na_fila = set(pendentes)
+
+    while pendentes:
+        nt = pendentes.popleft()
+        na_fila.discard(nt)
+
+        novo = set()
+        for producao in gramatica[nt]:
+            novo |= _first_da_sequencia(producao, FIRST, nao_terminais)
+
+        if novo != FIRST[nt]:
+            FIRST[nt] = novo
+            for dependente in dependentes[nt]:
+                if dependente not in na_fila:
+                    na_fila.add(dependente)
+                    pendentes.append(dependente)
+
+    return FIRST
+
+
+def calcular_follow_worklist(gramatica, simbolo_inicial, FIRST):
+    nao_terminais = set(gramatica.keys())
+    FOLLOW = {nt: set() for nt in nao_terminais}
+    FOLLOW[simbolo_inicial].add('$')
+
+    # Parte estática (FIRST(beta)) é aplicada uma única vez; a parte dinâmica
+    # vira arestas A -> B significando FOLLOW(A) ⊆ FOLLOW(B)
+    arestas = {nt: set() for nt in nao_terminais}
+    for cabeca, producoes in gramatica.items():
+        for producao in producoes:
+            for i, simbolo in enumerate(producao):
+                if simbolo not in nao_terminais:
+                    continue
+                beta = producao[i + 1:]
+                first_beta = _first_da_sequencia(beta, FIRST, nao_terminais) if beta else {'epsilon'}
+                FOLLOW[simbolo].update(first_beta - {'epsilon'})
+                if 'epsilon' in first_beta and cabeca != simbolo:
+                    arestas[cabeca].add(simbolo)
+
+    pendentes = deque(nt for nt in gramatica if FOLLOW[nt])
+    na_fila = set(pendentes)
+
+    while pendentes:
+        origem = pendentes.popleft()
+        na_fila.discard(origem)
+        for destino in arestas[origem]:
+            if not FOLLOW[origem] <= FOLLOW[destino]:
+                FOLLOW[destino] |= FOLLOW[origem]
+                if destino not in na_fila:
+                    na_fila.add(destino)
+                    pendentes.append(destino)
+
+    return FOLLOW
+
+
+def _registrar_entrada(tabela, conflitos, tipo, nt_head, terminal, producao):
+    existente = tabela[nt_head][terminal]
+    if existente is None:
+        tabela[nt_head][terminal] = producao
+        return
+    conflitos.append({
+        'tipo': tipo,
+        'nao_terminal': nt_head,
+        'terminal': terminal,
+        'producao_existente': existente,
+        'nova_producao': producao,
+        'mensagem': (
+            f"Conflito {tipo} em [{nt_head}, {terminal}]! "
+            f"Produção existente: {existente}, "
+            f"Nova produção: {producao}"
+        )
+    })
+
+
+def analisarGramatica(gramatica=None, simbolo_inicial=None):
+    """
+    Analisa a gramática em uma única passada: FIRST, FOLLOW, FIRST de cada
+    produção, tabela LL(1) e relatório completo de conflitos.
+
+    FIRST e FOLLOW são calculados por worklist sobre o grafo de dependências
+    entre não-terminais, então apenas os não-terminais afetados por uma
+    mudança são reprocessados.
+
+    Args:
+        gramatica: Gramática teórica (padrão: GRAMATICA_RPN)
+        simbolo_inicial: Símbolo inicial (padrão: SIMBOLO_INICIAL)
+
+    Returns:
+        dict com as chaves 'first', 'follow', 'first_producoes' (lista de
+        (nt, producao, first) na ordem da gramática), 'terminais', 'tabela'
+        e 'conflitos'. Em caso de conflito a tabela mantém a primeira
+        produção registrada e todos os conflitos são listados, cada um com
+        'tipo' (FIRST/FIRST ou FIRST/FOLLOW), 'nao_terminal', 'terminal',
+        'producao_existente', 'nova_producao' e 'mensagem'.
+    """
+    gramatica = GRAMATICA_RPN if gramatica is None else gramatica
+    simbolo_inicial = SIMBOLO_INICIAL if simbolo_inicial is None else simbolo_inicial
+    nao_terminais = set(gramatica.keys())
+
+    todos_simbolos = set(nao_terminais)
+    for producoes in gramatica.values():
+        for producao in producoes:
+            todos_simbolos.update(producao)
+    terminais = sorted(list(todos_simbolos - nao_terminais - {'epsilon'})) + ['$']
+
+    FIRST = calcular_first_worklist(gramatica)
+    FOLLOW = calcular_follow_worklist(gramatica, simbolo_inicial, FIRST)
+
+    first_producoes = [
+        (nt_head, producao, _first_da_sequencia(producao, FIRST, nao_terminais))
+        for nt_head, producoes in gramatica.items()
+        for producao in producoes
+    ]
+
+    tabela = {nt: {t: None for t in terminais} for nt in nao_terminais}
+    conflitos = []
+    for nt_head, producao, first_producao in first_producoes:
+        for terminal in first_producao - {'epsilon'}:
+            _registrar_entrada(tabela, conflitos, 'FIRST/FIRST', nt_head, terminal, producao)
+
+        if 'epsilon' in first_producao:
+            for terminal in FOLLOW[nt_head]:
+                _registrar_entrada(tabela, conflitos, 'FIRST/FOLLOW', nt_head, terminal, producao)
+
+    return {
+        'first': FIRST,
+        'follow': FOLLOW,
+        'first_producoes': first_producoes,
+        'terminais': terminais,
+        'tabela': tabela,
+        'conflitos': conflitos
+    }
@@ -9,51 +9,12 @@
 # Nome do grupo no Canvas: RA2_1
 
 from .configuracaoGramatica import GRAMATICA_RPN, mapear_gramatica_para_tokens_reais
+from .analisadorGramatica import calcular_first_worklist
 
 def calcularFirst():
-    # Usa gramática teórica diretamente
-    gramatica = GRAMATICA_RPN
-    
-    # Identifica não-terminais
-    nao_terminais = set(gramatica.keys())
-    
-    # Inicialização
-    FIRST = {nt: set() for nt in nao_terminais}
-    
-    # Adiciona ε ao FIRST de todos os não-terminais que são NULLABLE
-    # (Integrado no loop principal conforme referência)
-    
-    mudou = True
-    while mudou:
-        mudou = False
-        for nt_head, producoes in gramatica.items():
-            for producao in producoes:
-                # Produção vazia
-                if producao == ['epsilon']:
-                    if 'epsilon' not in FIRST[nt_head]:
-                        FIRST[nt_head].add('epsilon')
-                        mudou = True
-                    continue
-                
-                for simbolo in producao:
-                    # Se o símbolo é um terminal
-                    if simbolo not in nao_terminais:
-                        if simbolo not in FIRST[nt_head]:
-                            FIRST[nt_head].add(simbolo)
-                            mudou = True
-                        break  # interrompe a análise aqui
-                    
-                    # Se o símbolo é um não-terminal
-                    else:
-                        tamanho_anterior = len(FIRST[nt_head])
-                        FIRST[nt_head].update(FIRST[simbolo] - {'epsilon'})
-                        if len(FIRST[nt_head]) > tamanho_anterior:
-                            mudou = True
-
-                        if 'epsilon' not in FIRST[simbolo]:
-                            break  # interrompe a análise aqui
-    
-    return FIRST
+    # Usa gramática teórica diretamente; o cálculo por worklist só reprocessa
+    # os não-terminais cujas dependências mudaram (ver analisadorGramatica)
+    return calcular_first_worklist(GRAMATICA_RPN)
 
 
 def calcular_first_da_sequencia(sequencia, FIRST, nao_terminais):
@@ -10,54 +10,14 @@
 
 from .configuracaoGramatica import GRAMATICA_RPN, SIMBOLO_INICIAL, mapear_gramatica_para_tokens_reais
 from .calcularFirst import calcularFirst, calcular_first_da_sequencia
+from .analisadorGramatica import calcular_follow_worklist
 
 def calcularFollow():
     # Usa gramática teórica diretamente
     gramatica = GRAMATICA_RPN
-    simbolo_inicial = SIMBOLO_INICIAL
-    nao_terminais = set(gramatica.keys())
-    
+
     # Calcula FIRST primeiro (necessário para FOLLOW)
     FIRST = calcularFirst()
-    
-    # Inicialização
-    FOLLOW = {nt: set() for nt in nao_terminais}
-    
-    # Regra 1: Adiciona $ ao FOLLOW do símbolo inicial
-    FOLLOW[simbolo_inicial].add('$')
-    
-    mudou = True
-    while mudou:
-        mudou = False
-        # Itera sobre cada produção da gramática
-        for nt_head, producoes in gramatica.items():
-            for producao in producoes:
-                # Itera sobre cada símbolo da produção
-                for i, simbolo in enumerate(producao):
-                    if simbolo in nao_terminais:
-                        beta = producao[i+1:]  # resto da produção após o símbolo
-                        
-                        # Regra 2.a: Adicionar FIRST(beta) a FOLLOW(simbolo)
-                        if beta:
-                            first_beta = calcular_first_da_sequencia(beta, FIRST, nao_terminais)
-                            
-                            tamanho_anterior = len(FOLLOW[simbolo])
-                            FOLLOW[simbolo].update(first_beta - {'epsilon'})
-                            if len(FOLLOW[simbolo]) > tamanho_anterior:
-                                mudou = True
 
-                            # Regra 2.b: Se beta é NULLABLE, adicionar FOLLOW(head) a FOLLOW(simbolo)
-                            if 'epsilon' in first_beta:
-                                tamanho_anterior = len(FOLLOW[simbolo])
-                                FOLLOW[simbolo].update(FOLLOW[nt_head])
-                                if len(FOLLOW[simbolo]) > tamanho_anterior:
-                                    mudou = True
-                        
-                        # Regra 2.b (caso beta seja vazio): Adicionar FOLLOW(head) a FOLLOW(simbolo)
-                        else:
-                            tamanho_anterior = len(FOLLOW[simbolo])
-                            FOLLOW[simbolo].update(FOLLOW[nt_head])
-                            if len(FOLLOW[simbolo]) > tamanho_anterior:
-                                mudou = True
-    
-    return FOLLOW
+    # Propagação por worklist sobre as arestas FOLLOW(A) ⊆ FOLLOW(B)
+    return calcular_follow_worklist(gramatica, SIMBOLO_INICIAL, FIRST)
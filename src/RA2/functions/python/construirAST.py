@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+# Integrantes do grupo (ordem alfabética):
+# Nome Completo 1 - Breno Rossi Duarte
+# Nome Completo 2 - Francisco Bley Ruthes
+# Nome Completo 3 - Rafael Olivare Piveta
+# Nome Completo 4 - Stefan Benjamim Seixas Lourenço Rodrigues
+#
+# Nome do grupo no Canvas: RA2_1
+
+"""
+AST da linha, montada uma única vez pelo RA2
+
+A árvore sintática concreta (PROGRAM/LINHA/SEQUENCIA/SEQUENCIA_PRIME/...)
+só interessa ao parser. O RA3 consome apenas operandos e operador de cada
+linha, no formato:
+
+    {'elementos': [...], 'operador': '+'}
+
+Cada elemento é um operando {'subtipo': 'numero_inteiro' | 'numero_real' |
+'variavel' (com sufixo '_res' quando seguido de RES), 'valor': token} ou uma
+subexpressão {'subtipo': 'LINHA', 'elementos': [...], 'operador': ...}.
+Linhas sem operador têm operador ''.
+
+Literais numéricos são convertidos uma única vez, aqui: o operando também
+guarda 'numero' (int ou float) e 'tipo' ('int' ou 'real'), e as fases
+seguintes não voltam a converter o texto do token.
+"""
+
+from .configuracaoGramatica import MAPEAMENTO_TOKENS
+
+# Folha da árvore concreta -> operador da AST
+OPERADORES_AST = {
+    MAPEAMENTO_TOKENS[teorico]: operador
+    for teorico, operador in {
+        'soma': '+', 'subtracao': '-', 'multiplicacao': '*', 'divisao_inteira': '/',
+        'divisao_real': '|', 'resto': '%', 'potencia': '^',
+        'menor': '<', 'maior': '>', 'igual': '==', 'menor_igual': '<=',
+        'maior_igual': '>=', 'diferente': '!=',
+        'and': '&&', 'or': '||', 'not': '!',
+        'ifelse': 'IFELSE', 'while': 'WHILE', 'for': 'FOR',
+    }.items()
+}
+
+# Folha da árvore concreta -> subtipo do operando
+SUBTIPOS_OPERANDO = {
+    MAPEAMENTO_TOKENS['numero_inteiro']: 'numero_inteiro',
+    MAPEAMENTO_TOKENS['numero_real']: 'numero_real',
+    MAPEAMENTO_TOKENS['variavel']: 'variavel',
+}
+
+
+# Literais numéricos (o tipo usa os nomes de TYPE_INT/TYPE_REAL do RA3)
+SUBTIPOS_LITERAIS = ('numero_inteiro', 'numero_real')
+
+
+def _converter_literal(operando):
+    """
+    (tipo, numero) do texto de um literal numérico (com ou sem _res). Texto
+    de inteiro que não é int vira float; texto inválido dá numero None
+    (tipo real).
+    """
+    texto = operando.get('valor')
+    numero = None
+    if texto is not None:
+        if operando.get('subtipo', '').startswith('numero_inteiro'):
+            try:
+                numero = int(texto)
+            except (TypeError, ValueError):
+                pass
+        if numero is None:
+            try:
+                numero = float(texto)
+            except (TypeError, ValueError):
+                pass
+    return ('int' if isinstance(numero, int) else 'real'), numero
+
+
+def anotar_literal(operando):
+    """Grava em 'operando' o valor nativo em 'numero' e o tipo em 'tipo'."""
+    operando['tipo'], operando['numero'] = _converter_literal(operando)
+    return operando
+
+
+def valor_literal(operando):
+    """
+    (tipo, numero) de um literal numérico. Operandos que não passaram por
+    anotar_literal (montados à mão) são convertidos sem alterar o nó.
+    """
+    if 'numero' in operando:
+        return operando['tipo'], operando['numero']
+    return _converter_literal(operando)
+
+
+def _folhas(arvore):
+    # Percurso em pré-ordem iterativo: as folhas saem na ordem dos tokens.
+    # Aceita NoArvore ou o dict exportado por no_para_dict
+    pendentes = [arvore]
+    while pendentes:
+        no = pendentes.pop()
+        if isinstance(no, dict):
+            label, filhos = no.get('label'), no.get('filhos', [])
+        else:
+            label, filhos = no.label, no.filhos
+        if filhos:
+            pendentes.extend(reversed(filhos))
+        else:
+            yield label
+
+
+def construirAST(arvore, tokens):
+    """
+    Monta a AST de uma linha a partir da árvore sintática (NoArvore ou dict
+    do JSON) e dos tokens da linha (strings, na ordem em que foram lidos).
+
+    Cada folha da árvore, exceto epsilon, corresponde a um token; os valores
+    dos operandos vêm dos tokens e as categorias, das folhas.
+
+    Returns:
+        dict {'elementos', 'operador'} ou None se a árvore não tiver linha.
+    """
+    abertas = []
+    resultado = None
+    posicao = 0
+
+    for label in _folhas(arvore):
+        if label == 'epsilon':
+            continue
+        token = tokens[posicao] if posicao < len(tokens) else None
+        posicao += 1
+
+        if label == MAPEAMENTO_TOKENS['abre_parenteses']:
+            abertas.append({'elementos': [], 'operador': ''})
+        elif label == MAPEAMENTO_TOKENS['fecha_parenteses']:
+            seq = abertas.pop()
+            if abertas:
+                abertas[-1]['elementos'].append({'subtipo': 'LINHA', **seq})
+            elif resultado is None:
+                resultado = seq
+        elif label in SUBTIPOS_OPERANDO:
+            operando = {'subtipo': SUBTIPOS_OPERANDO[label], 'valor': token}
+            if operando['subtipo'] in SUBTIPOS_LITERAIS:
+                anotar_literal(operando)
+            abertas[-1]['elementos'].append(operando)
+        elif label == MAPEAMENTO_TOKENS['res']:
+            operando = abertas[-1]['elementos'][-1]
+            operando['subtipo'] += '_res'
+        elif label in OPERADORES_AST:
+            abertas[-1]['operador'] = OPERADORES_AST[label]
+
+    return resultado
@@ -12,6 +12,7 @@ from .configuracaoGramatica import GRAMATICA_RPN, SIMBOLO_INICIAL, mapear_tokens
 from .calcularFirst import calcularFirst
 from .calcularFollow import calcularFollow
 from .construirTabelaLL1 import construirTabelaLL1, ConflictError
+from .analisadorGramatica import analisarGramatica
 
 def imprimir_gramatica_completa():
     # Função simplificada que faz tudo inline para exibição
@@ -28,24 +29,22 @@ def imprimir_gramatica_completa():
                 if simbolo not in nao_terminais and simbolo != 'epsilon':
                     terminais.add(simbolo)
     
-    # Calcular conjuntos
-    conjuntos_first_reais = calcularFirst()
-    conjuntos_follow_reais = calcularFollow()
+    # Calcular conjuntos (uma única análise da gramática)
+    analise = analisarGramatica(gramatica_teorica, simbolo_inicial)
+    conjuntos_first_reais = analise['first']
+    conjuntos_follow_reais = analise['follow']
     
     conjuntos_first = {nt: mapear_tokens_reais_para_teoricos(conjunto) 
                       for nt, conjunto in conjuntos_first_reais.items()}
     conjuntos_follow = {nt: mapear_tokens_reais_para_teoricos(conjunto) 
                        for nt, conjunto in conjuntos_follow_reais.items()}
     
-    # Tabela LL1
+    # Tabela LL1 (com relatório de todos os conflitos, não só o primeiro)
     tabela_ll1_teorica = None
-    conflitos = []
+    conflitos = [conflito['mensagem'] for conflito in analise['conflitos']]
 
-    try:
-        tabela_ll1_reais = construirTabelaLL1()
-        tabela_ll1_teorica = mapear_tokens_reais_para_teoricos(tabela_ll1_reais)
-    except ConflictError as e:
-        conflitos = [str(e)]
+    if not conflitos:
+        tabela_ll1_teorica = mapear_tokens_reais_para_teoricos(analise['tabela'])
     
     # Produções para exibição
     producoes_lista = []
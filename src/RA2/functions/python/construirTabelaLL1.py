@@ -11,54 +11,18 @@
 from .configuracaoGramatica import GRAMATICA_RPN, mapear_gramatica_para_tokens_reais
 from .calcularFirst import calcularFirst, calcular_first_da_sequencia
 from .calcularFollow import calcularFollow
+from .analisadorGramatica import analisarGramatica
 
 class ConflictError(Exception):
     pass
 
 def construirTabelaLL1():
-    # Usa gramática teórica diretamente
-    gramatica = GRAMATICA_RPN
-    nao_terminais = set(gramatica.keys())
-    
-    # Identifica todos os terminais
-    todos_simbolos = set(nao_terminais)
-    for producoes in gramatica.values():
-        for producao in producoes:
-            todos_simbolos.update(producao)
-    terminais = sorted(list(todos_simbolos - nao_terminais - {'epsilon'})) + ['$']
-    
-    # Calcula conjuntos FIRST e FOLLOW
-    FIRST = calcularFirst()
-    FOLLOW = calcularFollow()
-    
-    # Inicializa tabela
-    tabela = {nt: {t: None for t in terminais} for nt in nao_terminais}
-    
-    # Preenche a tabela conforme algoritmo da referência
-    for nt_head, producoes in gramatica.items():
-        for producao in producoes:
-            first_producao = calcular_first_da_sequencia(producao, FIRST, nao_terminais)
-            
-            # Regra 1: FIRST
-            for terminal in first_producao - {'epsilon'}:
-                if tabela[nt_head][terminal] is not None:
-                    raise ConflictError(
-                        f"Conflito FIRST/FIRST em [{nt_head}, {terminal}]! "
-                        f"Produção existente: {tabela[nt_head][terminal]}, "
-                        f"Nova produção: {producao}"
-                    )
-                tabela[nt_head][terminal] = producao
+    # FIRST, FOLLOW e FIRST de cada produção são calculados uma única vez
+    analise = analisarGramatica(GRAMATICA_RPN)
 
-            # Regra 2: FOLLOW (se a produção pode derivar epsilon)
-            if 'epsilon' in first_producao:
-                for terminal in FOLLOW[nt_head]:
-                    if tabela[nt_head][terminal] is not None:
-                        raise ConflictError(
-                            f"Conflito FIRST/FOLLOW em [{nt_head}, {terminal}]! "
-                            f"Produção existente: {tabela[nt_head][terminal]}, "
-                            f"Nova produção: {producao}"
-                        )
-                    tabela[nt_head][terminal] = producao
-
-    return tabela
+    # O parser precisa de uma tabela sem ambiguidades: o primeiro conflito
+    # interrompe a construção (o relatório completo fica em analisarGramatica)
+    if analise['conflitos']:
+        raise ConflictError(analise['conflitos'][0]['mensagem'])
 
+    return analise['tabela']
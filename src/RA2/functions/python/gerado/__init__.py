@@ -0,0 +1 @@
+# Cache de build: módulos gerados por gerarParser.py
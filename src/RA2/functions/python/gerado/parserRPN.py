@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+
+# ARQUIVO GERADO AUTOMATICAMENTE por src/RA2/functions/python/gerarParser.py
+# Não edite manualmente: altere configuracaoGramatica.GRAMATICA_RPN e regenere com
+#     python -m src.RA2.functions.python.gerarParser
+
+HASH_GRAMATICA = '1dcbe80df9eb06a10b164d237c77c29f77f07bcb4b5e236e13b823905a755bc5'
+SIMBOLO_INICIAL = 'PROGRAM'
+
+# Tipo_de_Token -> símbolo da gramática
+_SIMBOLOS = {
+    'ABRE_PARENTESES': 'abre_parenteses',
+    'AND': 'and',
+    'DIFERENTE': 'diferente',
+    'DIV_INT': 'divisao_inteira',
+    'DIV_REAL': 'divisao_real',
+    'FECHA_PARENTESES': 'fecha_parenteses',
+    'FOR': 'for',
+    'IFELSE': 'ifelse',
+    'IGUAL': 'igual',
+    'MAIOR': 'maior',
+    'MAIOR_IGUAL': 'maior_igual',
+    'MENOR': 'menor',
+    'MENOR_IGUAL': 'menor_igual',
+    'MULT': 'multiplicacao',
+    'NOT': 'not',
+    'NUMERO_INTEIRO': 'numero_inteiro',
+    'NUMERO_REAL': 'numero_real',
+    'OR': 'or',
+    'POT': 'potencia',
+    'RES': 'res',
+    'RESTO': 'resto',
+    'SOMA': 'soma',
+    'SUBTRACAO': 'subtracao',
+    'VARIAVEL': 'variavel',
+    'WHILE': 'while',
+}
+
+# (não-terminal, lookahead) -> (derivação, símbolos a empilhar)
+_ACOES = {
+    ('ARITH_OP', 'divisao_inteira'): ('ARITH_OP → divisao_inteira', ('divisao_inteira',)),
+    ('ARITH_OP', 'divisao_real'): ('ARITH_OP → divisao_real', ('divisao_real',)),
+    ('ARITH_OP', 'multiplicacao'): ('ARITH_OP → multiplicacao', ('multiplicacao',)),
+    ('ARITH_OP', 'potencia'): ('ARITH_OP → potencia', ('potencia',)),
+    ('ARITH_OP', 'resto'): ('ARITH_OP → resto', ('resto',)),
+    ('ARITH_OP', 'soma'): ('ARITH_OP → soma', ('soma',)),
+    ('ARITH_OP', 'subtracao'): ('ARITH_OP → subtracao', ('subtracao',)),
+    ('COMP_OP', 'diferente'): ('COMP_OP → diferente', ('diferente',)),
+    ('COMP_OP', 'igual'): ('COMP_OP → igual', ('igual',)),
+    ('COMP_OP', 'maior'): ('COMP_OP → maior', ('maior',)),
+    ('COMP_OP', 'maior_igual'): ('COMP_OP → maior_igual', ('maior_igual',)),
+    ('COMP_OP', 'menor'): ('COMP_OP → menor', ('menor',)),
+    ('COMP_OP', 'menor_igual'): ('COMP_OP → menor_igual', ('menor_igual',)),
+    ('CONTROL_OP', 'for'): ('CONTROL_OP → for', ('for',)),
+    ('CONTROL_OP', 'ifelse'): ('CONTROL_OP → ifelse', ('ifelse',)),
+    ('CONTROL_OP', 'while'): ('CONTROL_OP → while', ('while',)),
+    ('LINHA', 'abre_parenteses'): ('LINHA → abre_parenteses SEQUENCIA fecha_parenteses', ('fecha_parenteses', 'SEQUENCIA', 'abre_parenteses')),
+    ('LOGIC_OP', 'and'): ('LOGIC_OP → and', ('and',)),
+    ('LOGIC_OP', 'not'): ('LOGIC_OP → not', ('not',)),
+    ('LOGIC_OP', 'or'): ('LOGIC_OP → or', ('or',)),
+    ('OPERADOR_FINAL', 'and'): ('OPERADOR_FINAL → LOGIC_OP', ('LOGIC_OP',)),
+    ('OPERADOR_FINAL', 'diferente'): ('OPERADOR_FINAL → COMP_OP', ('COMP_OP',)),
+    ('OPERADOR_FINAL', 'divisao_inteira'): ('OPERADOR_FINAL → ARITH_OP', ('ARITH_OP',)),
+    ('OPERADOR_FINAL', 'divisao_real'): ('OPERADOR_FINAL → ARITH_OP', ('ARITH_OP',)),
+    ('OPERADOR_FINAL', 'for'): ('OPERADOR_FINAL → CONTROL_OP', ('CONTROL_OP',)),
+    ('OPERADOR_FINAL', 'ifelse'): ('OPERADOR_FINAL → CONTROL_OP', ('CONTROL_OP',)),
+    ('OPERADOR_FINAL', 'igual'): ('OPERADOR_FINAL → COMP_OP', ('COMP_OP',)),
+    ('OPERADOR_FINAL', 'maior'): ('OPERADOR_FINAL → COMP_OP', ('COMP_OP',)),
+    ('OPERADOR_FINAL', 'maior_igual'): ('OPERADOR_FINAL → COMP_OP', ('COMP_OP',)),
+    ('OPERADOR_FINAL', 'menor'): ('OPERADOR_FINAL → COMP_OP', ('COMP_OP',)),
+    ('OPERADOR_FINAL', 'menor_igual'): ('OPERADOR_FINAL → COMP_OP', ('COMP_OP',)),
+    ('OPERADOR_FINAL', 'multiplicacao'): ('OPERADOR_FINAL → ARITH_OP', ('ARITH_OP',)),
+    ('OPERADOR_FINAL', 'not'): ('OPERADOR_FINAL → LOGIC_OP', ('LOGIC_OP',)),
+    ('OPERADOR_FINAL', 'or'): ('OPERADOR_FINAL → LOGIC_OP', ('LOGIC_OP',)),
+    ('OPERADOR_FINAL', 'potencia'): ('OPERADOR_FINAL → ARITH_OP', ('ARITH_OP',)),
+    ('OPERADOR_FINAL', 'resto'): ('OPERADOR_FINAL → ARITH_OP', ('ARITH_OP',)),
+    ('OPERADOR_FINAL', 'soma'): ('OPERADOR_FINAL → ARITH_OP', ('ARITH_OP',)),
+    ('OPERADOR_FINAL', 'subtracao'): ('OPERADOR_FINAL → ARITH_OP', ('ARITH_OP',)),
+    ('OPERADOR_FINAL', 'while'): ('OPERADOR_FINAL → CONTROL_OP', ('CONTROL_OP',)),
+    ('OPERANDO', 'abre_parenteses'): ('OPERANDO → LINHA', ('LINHA',)),
+    ('OPERANDO', 'numero_inteiro'): ('OPERANDO → numero_inteiro OPERANDO_OPCIONAL', ('OPERANDO_OPCIONAL', 'numero_inteiro')),
+    ('OPERANDO', 'numero_real'): ('OPERANDO → numero_real OPERANDO_OPCIONAL', ('OPERANDO_OPCIONAL', 'numero_real')),
+    ('OPERANDO', 'variavel'): ('OPERANDO → variavel OPERANDO_OPCIONAL', ('OPERANDO_OPCIONAL', 'variavel')),
+    ('OPERANDO_OPCIONAL', 'abre_parenteses'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'and'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'diferente'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'divisao_inteira'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'divisao_real'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'fecha_parenteses'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'for'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'ifelse'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'igual'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'maior'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'maior_igual'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'menor'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'menor_igual'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'multiplicacao'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'not'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'numero_inteiro'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'numero_real'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'or'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'potencia'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'res'): ('OPERANDO_OPCIONAL → res', ('res',)),
+    ('OPERANDO_OPCIONAL', 'resto'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'soma'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'subtracao'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'variavel'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('OPERANDO_OPCIONAL', 'while'): ('OPERANDO_OPCIONAL → epsilon', ()),
+    ('PROGRAM', 'abre_parenteses'): ('PROGRAM → LINHA PROGRAM_PRIME', ('PROGRAM_PRIME', 'LINHA')),
+    ('PROGRAM_PRIME', '$'): ('PROGRAM_PRIME → epsilon', ()),
+    ('PROGRAM_PRIME', 'abre_parenteses'): ('PROGRAM_PRIME → LINHA PROGRAM_PRIME', ('PROGRAM_PRIME', 'LINHA')),
+    ('SEQUENCIA', 'abre_parenteses'): ('SEQUENCIA → OPERANDO SEQUENCIA_PRIME', ('SEQUENCIA_PRIME', 'OPERANDO')),
+    ('SEQUENCIA', 'numero_inteiro'): ('SEQUENCIA → OPERANDO SEQUENCIA_PRIME', ('SEQUENCIA_PRIME', 'OPERANDO')),
+    ('SEQUENCIA', 'numero_real'): ('SEQUENCIA → OPERANDO SEQUENCIA_PRIME', ('SEQUENCIA_PRIME', 'OPERANDO')),
+    ('SEQUENCIA', 'variavel'): ('SEQUENCIA → OPERANDO SEQUENCIA_PRIME', ('SEQUENCIA_PRIME', 'OPERANDO')),
+    ('SEQUENCIA_PRIME', 'abre_parenteses'): ('SEQUENCIA_PRIME → OPERANDO SEQUENCIA_PRIME', ('SEQUENCIA_PRIME', 'OPERANDO')),
+    ('SEQUENCIA_PRIME', 'and'): ('SEQUENCIA_PRIME → OPERADOR_FINAL', ('OPERADOR_FINAL',)),
+    ('SEQUENCIA_PRIME', 'diferente'): ('SEQUENCIA_PRIME → OPERADOR_FINAL', ('OPERADOR_FINAL',)),
+    ('SEQUENCIA_PRIME', 'divisao_inteira'): ('SEQUENCIA_PRIME → OPERADOR_FINAL', ('OPERADOR_FINAL',)),
+    ('SEQUENCIA_PRIME', 'divisao_real'): ('SEQUENCIA_PRIME → OPERADOR_FINAL', ('OPERADOR_FINAL',)),
+    ('SEQUENCIA_PRIME', 'fecha_parenteses'): ('SEQUENCIA_PRIME → epsilon', ()),
+    ('SEQUENCIA_PRIME', 'for'): ('SEQUENCIA_PRIME → OPERADOR_FINAL', ('OPERADOR_FINAL',)),
+    ('SEQUENCIA_PRIME', 'ifelse'): ('SEQUENCIA_PRIME → OPERADOR_FINAL', ('OPERADOR_FINAL',)),
+    ('SEQUENCIA_PRIME', 'igual'): ('SEQUENCIA_PRIME → OPERADOR_FINAL', ('OPERADOR_FINAL',)),
+    ('SEQUENCIA_PRIME', 'maior'): ('SEQUENCIA_PRIME → OPERADOR_FINAL', ('OPERADOR_FINAL',)),
+    ('SEQUENCIA_PRIME', 'maior_igual'): ('SEQUENCIA_PRIME → OPERADOR_FINAL', ('OPERADOR_FINAL',)),
+    ('SEQUENCIA_PRIME', 'menor'): ('SEQUENCIA_PRIME → OPERADOR_FINAL', ('OPERADOR_FINAL',)),
+    ('SEQUENCIA_PRIME', 'menor_igual'): ('SEQUENCIA_PRIME → OPERADOR_FINAL', ('OPERADOR_FINAL',)),
+    ('SEQUENCIA_PRIME', 'multiplicacao'): ('SEQUENCIA_PRIME → OPERADOR_FINAL', ('OPERADOR_FINAL',)),
+    ('SEQUENCIA_PRIME', 'not'): ('SEQUENCIA_PRIME → OPERADOR_FINAL', ('OPERADOR_FINAL',)),
+    ('SEQUENCIA_PRIME', 'numero_inteiro'): ('SEQUENCIA_PRIME → OPERANDO SEQUENCIA_PRIME', ('SEQUENCIA_PRIME', 'OPERANDO')),
+    ('SEQUENCIA_PRIME', 'numero_real'): ('SEQUENCIA_PRIME → OPERANDO SEQUENCIA_PRIME', ('SEQUENCIA_PRIME', 'OPERANDO')),
+    ('SEQUENCIA_PRIME', 'or'): ('SEQUENCIA_PRIME → OPERADOR_FINAL', ('OPERADOR_FINAL',)),
+    ('SEQUENCIA_PRIME', 'potencia'): ('SEQUENCIA_PRIME → OPERADOR_FINAL', ('OPERADOR_FINAL',)),
+    ('SEQUENCIA_PRIME', 'resto'): ('SEQUENCIA_PRIME → OPERADOR_FINAL', ('OPERADOR_FINAL',)),
+    ('SEQUENCIA_PRIME', 'soma'): ('SEQUENCIA_PRIME → OPERADOR_FINAL', ('OPERADOR_FINAL',)),
+    ('SEQUENCIA_PRIME', 'subtracao'): ('SEQUENCIA_PRIME → OPERADOR_FINAL', ('OPERADOR_FINAL',)),
+    ('SEQUENCIA_PRIME', 'variavel'): ('SEQUENCIA_PRIME → OPERANDO SEQUENCIA_PRIME', ('SEQUENCIA_PRIME', 'OPERANDO')),
+    ('SEQUENCIA_PRIME', 'while'): ('SEQUENCIA_PRIME → OPERADOR_FINAL', ('OPERADOR_FINAL',)),
+}
+
+
+def parsear(tokens_linha):
+    if not tokens_linha:
+        return []
+
+    try:
+        entrada = [_SIMBOLOS.get(token.tipo) or str(token.valor).lower() for token in tokens_linha]
+        entrada.append('$')
+        fim = len(entrada)
+
+        pilha = ['$', SIMBOLO_INICIAL]
+        indice = 0
+        derivacao = []
+        acoes = _ACOES
+
+        while len(pilha) > 1:
+            topo = pilha.pop()
+            simbolo_entrada = entrada[indice] if indice < fim else '$'
+
+            if topo == simbolo_entrada:
+                indice += 1
+                continue
+
+            acao = acoes.get((topo, simbolo_entrada))
+            if acao is None:
+                return []
+
+            derivacao.append(acao[0])
+            pilha.extend(acao[1])
+
+        return derivacao if indice == fim - 1 else []
+
+    except Exception:
+        return []
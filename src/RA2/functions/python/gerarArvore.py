@@ -8,9 +8,12 @@
 #
 # Nome do grupo no Canvas: RA2_1
 
+import io
 import os
-import json
+from src.RA1.functions.python.artefatos import salvar_artefato
+from src.RA1.functions.python.percurso import percorrer
 from .configuracaoGramatica import MAPEAMENTO_TOKENS
+from .construirAST import construirAST
 
 class NoArvore:
     def __init__(self, label):
@@ -20,107 +23,209 @@ class NoArvore:
     def adicionar_filho(self, filho):
         self.filhos.append(filho)
 
-    def desenhar_ascii(self, prefixo='', eh_ultimo=True):
-        conector = '└── ' if eh_ultimo else '├── '
-        resultado = prefixo + conector + self.label + '\n'
-        prefixo_prox = prefixo + ('    ' if eh_ultimo else '│   ')
-        for i, filho in enumerate(self.filhos):
-            ultimo = i == len(self.filhos) - 1
-            resultado += filho.desenhar_ascii(prefixo_prox, ultimo)
+    def desenhar_ascii(self, prefixo='', eh_ultimo=True, saida=None, max_profundidade=None, max_filhos=None):
+        """
+        Desenha a subárvore em ASCII, uma linha por nó.
+
+        As linhas são escritas em 'saida' (qualquer objeto com write, ex: um
+        arquivo aberto); sem 'saida', o desenho é montado em um StringIO e
+        retornado. Com max_profundidade (a raiz tem profundidade 0) e
+        max_filhos, os nós além dos limites são resumidos em uma linha
+        '... (N omitido(s))', mantendo o desenho limitado para árvores
+        enormes.
+        """
+        buffer = io.StringIO() if saida is None else None
+        escrever = (buffer or saida).write
+
+        def desenhar(tarefa):
+            no, prefixo, eh_ultimo, profundidade = tarefa
+            conector = '└── ' if eh_ultimo else '├── '
+            escrever(prefixo + conector + no.label + '\n')
+            prefixo_prox = prefixo + ('    ' if eh_ultimo else '│   ')
+
+            filhos = no.filhos
+            if max_profundidade is not None and profundidade >= max_profundidade:
+                filhos = []
+            elif max_filhos is not None:
+                filhos = filhos[:max_filhos]
+            omitidos = len(no.filhos) - len(filhos)
+
+            for i, filho in enumerate(filhos):
+                ultimo = i == len(filhos) - 1 and not omitidos
+                yield (filho, prefixo_prox, ultimo, profundidade + 1)
+            if omitidos:
+                escrever(f"{prefixo_prox}└── ... ({omitidos} omitido(s))\n")
+
+        percorrer((self, prefixo, eh_ultimo, 0), desenhar)
+        return buffer.getvalue() if buffer is not None else None
+
+class TabelaNos:
+    """
+    Tabela de hash-consing de NoArvore.
+
+    Subárvores estruturalmente iguais (mesmo label e mesmos filhos) passam a
+    ser o mesmo objeto, inclusive entre linhas diferentes do programa. Como a
+    chave usa a identidade dos filhos já internados, internar um nó custa
+    O(número de filhos). Nós internados são compartilhados e não devem ser
+    alterados depois de criados.
+    """
+
+    def __init__(self):
+        self._nos = {}
+
+    def internar(self, label, filhos=()):
+        chave = (label, tuple(id(filho) for filho in filhos))
+        no = self._nos.get(chave)
+        if no is None:
+            no = NoArvore(label)
+            no.filhos = list(filhos)
+            self._nos[chave] = no
+        return no
+
+    def __len__(self):
+        return len(self._nos)
+
+
+def no_para_dict(no: NoArvore, memo=None) -> dict:
+    """
+    Converte NoArvore para dicionário (formato JSON), sem recursão.
+
+    Com 'memo' (dict id(nó) -> dict), subárvores compartilhadas geram um único
+    dicionário, reaproveitado em todas as ocorrências.
+    """
+    def converter(no):
+        if memo is not None:
+            resultado = memo.get(id(no))
+            if resultado is not None:
+                return resultado
+        filhos = []
+        for filho in no.filhos:
+            filhos.append((yield filho))
+        resultado = {"label": no.label, "filhos": filhos}
+        if memo is not None:
+            memo[id(no)] = resultado
         return resultado
 
-def no_para_dict(no: NoArvore) -> dict:
-    """Converte NoArvore para dicionário (formato JSON) recursivamente"""
-    return {
-        "label": no.label,
-        "filhos": [no_para_dict(filho) for filho in no.filhos]
-    }
+    return percorrer(no, converter)
 
-def gerarArvore(derivacao):
+def gerarArvore(derivacao, tabela_nos=None):
+    """
+    Monta a árvore sintática a partir da derivação de uma linha.
+
+    Se 'tabela_nos' (TabelaNos) for informada, os nós são internados nela e
+    subárvores repetidas são compartilhadas com as linhas já construídas.
+    """
     producoes = [linha.split('→') for linha in derivacao]
     producoes = [(lhs.strip(), rhs.strip().split()) for lhs, rhs in producoes]
 
     index = [0]  # índice mutável
 
+    if tabela_nos is None:
+        def criar_no(label, filhos=()):
+            no = NoArvore(label)
+            for filho in filhos:
+                no.adicionar_filho(filho)
+            return no
+    else:
+        criar_no = tabela_nos.internar
+
     def construir_no(simbolo_esperado):
         if index[0] >= len(producoes):
             # Terminal
             valor_real = MAPEAMENTO_TOKENS.get(simbolo_esperado, simbolo_esperado)
-            return NoArvore(valor_real)
+            return criar_no(valor_real)
 
         lhs, rhs = producoes[index[0]]
         if lhs != simbolo_esperado:
             # Terminal
             valor_real = MAPEAMENTO_TOKENS.get(simbolo_esperado, simbolo_esperado)
-            return NoArvore(valor_real)
+            return criar_no(valor_real)
 
         index[0] += 1
-        no = NoArvore(lhs)
+        return _construir_producao(lhs, rhs)
+
+    def _construir_producao(lhs, rhs):
+        # Filhos primeiro: o nó só é criado (e internado) já completo
+        filhos = []
         for simbolo in rhs:
             if simbolo != 'ε':
-                filho = construir_no(simbolo)
-                no.adicionar_filho(filho)
+                filhos.append((yield simbolo))
             else:
-                no.adicionar_filho(NoArvore('ε'))
-        return no
+                filhos.append(criar_no('ε'))
+        return criar_no(lhs, filhos)
 
-    return construir_no('PROGRAM')
+    # Pilha explícita: derivações muito aninhadas não esbarram na recursão
+    return percorrer('PROGRAM', construir_no)
 
 
 def exportar_arvores_json(derivacoes_por_linha, tokens_por_linha, linhas_originais, nome_arquivo='arvore_sintatica.json'):
     """
     Exporta árvores sintáticas para JSON (formato navegável para RA3)
 
+    Cada linha é gerada e gravada antes da próxima (escrita incremental de
+    salvar_artefato); as estatísticas vão no fim do arquivo. O programa
+    inteiro não fica em memória, só a linha atual e as subárvores
+    compartilhadas.
+
     Args:
         derivacoes_por_linha: Lista de derivações (uma por linha)
         tokens_por_linha: Lista de tokens (uma por linha)
         linhas_originais: Linhas de código originais
-        nome_arquivo: Nome do arquivo JSON (padrão: 'arvore_sintatica.json')
+        nome_arquivo: Nome do arquivo JSON (padrão: 'arvore_sintatica.json'); a extensão
+            segue o formato de artefato configurado (json ou bin)
 
     Returns:
         True se sucesso, False caso contrário
     """
     try:
+        # Subárvores repetidas entre linhas são compartilhadas (hash-consing)
+        tabela_nos = TabelaNos()
+        memo_dicts = {}
+        linhas_validas = 0
+
+        def gerar_linhas():
+            # Cada linha é montada e gravada antes da próxima (escrita incremental)
+            nonlocal linhas_validas
+            for i, derivacao in enumerate(derivacoes_por_linha):
+                numero_linha = i + 1
+
+                if derivacao and len(derivacao) > 0:
+                    # Gera árvore para esta linha
+                    arvore = gerarArvore(derivacao, tabela_nos)
+                    arvore_dict = no_para_dict(arvore, memo_dicts)
+
+                    tokens = tokens_por_linha[i] if i < len(tokens_por_linha) else []
+                    linhas_validas += 1
+                    yield {
+                        "numero_linha": numero_linha,
+                        "expressao_original": linhas_originais[i] if i < len(linhas_originais) else "",
+                        "tokens": tokens,
+                        "arvore": arvore_dict,
+                        # Operandos e operador da linha, prontos para o RA3
+                        "ast": construirAST(arvore, tokens),
+                        "derivacao_passos": len(derivacao),
+                        "sucesso": True
+                    }
+                else:
+                    # Linha com erro sintático
+                    yield {
+                        "numero_linha": numero_linha,
+                        "expressao_original": linhas_originais[i] if i < len(linhas_originais) else "",
+                        "tokens": tokens_por_linha[i] if i < len(tokens_por_linha) else [],
+                        "arvore": None,
+                        "erro": "Erro sintático - parsing falhou",
+                        "sucesso": False
+                    }
+
         estrutura_json = {
             "tipo": "PROGRAM",
-            "linhas": []
-        }
-
-        for i, derivacao in enumerate(derivacoes_por_linha):
-            numero_linha = i + 1
-
-            if derivacao and len(derivacao) > 0:
-                # Gera árvore para esta linha
-                arvore = gerarArvore(derivacao)
-                arvore_dict = no_para_dict(arvore)
-
-                linha_json = {
-                    "numero_linha": numero_linha,
-                    "expressao_original": linhas_originais[i] if i < len(linhas_originais) else "",
-                    "tokens": tokens_por_linha[i] if i < len(tokens_por_linha) else [],
-                    "arvore": arvore_dict,
-                    "derivacao_passos": len(derivacao),
-                    "sucesso": True
-                }
-            else:
-                # Linha com erro sintático
-                linha_json = {
-                    "numero_linha": numero_linha,
-                    "expressao_original": linhas_originais[i] if i < len(linhas_originais) else "",
-                    "tokens": tokens_por_linha[i] if i < len(tokens_por_linha) else [],
-                    "arvore": None,
-                    "erro": "Erro sintático - parsing falhou",
-                    "sucesso": False
-                }
-
-            estrutura_json["linhas"].append(linha_json)
-
-        # Adiciona estatísticas
-        linhas_validas = sum(1 for linha in estrutura_json["linhas"] if linha["sucesso"])
-        estrutura_json["estatisticas"] = {
-            "total_linhas": len(derivacoes_por_linha),
-            "linhas_validas": linhas_validas,
-            "linhas_com_erro": len(derivacoes_por_linha) - linhas_validas
+            "linhas": gerar_linhas(),
+            # Estatísticas: calculadas quando todas as linhas já foram gravadas
+            "estatisticas": lambda: {
+                "total_linhas": len(derivacoes_por_linha),
+                "linhas_validas": linhas_validas,
+                "linhas_com_erro": len(derivacoes_por_linha) - linhas_validas
+            }
         }
 
         # Salvar JSON em outputs/RA2/
@@ -128,11 +233,10 @@ def exportar_arvores_json(derivacoes_por_linha, tokens_por_linha, linhas_origina
         os.makedirs(output_dir, exist_ok=True)
         output_path = os.path.join(output_dir, nome_arquivo)
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(estrutura_json, f, indent=2, ensure_ascii=False)
+        destino = salvar_artefato(estrutura_json, output_path)
 
         print(f"\n--- EXPORTAÇÃO JSON ---")
-        print(f"  Árvore JSON salva: outputs/RA2/{nome_arquivo}")
+        print(f"  Árvore JSON salva: outputs/RA2/{destino.name}")
         print(f"  - Linhas válidas: {linhas_validas}")
         print(f"  - Linhas com erro: {len(derivacoes_por_linha) - linhas_validas}")
 
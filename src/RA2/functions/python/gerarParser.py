@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+
+# Integrantes do grupo (ordem alfabética):
+# Nome Completo 1 - Breno Rossi Duarte
+# Nome Completo 2 - Francisco Bley Ruthes
+# Nome Completo 3 - Rafael Olivare Piveta
+# Nome Completo 4 - Stefan Benjamim Seixas Lourenço Rodrigues
+#
+# Nome do grupo no Canvas: RA2_1
+
+"""
+Gerador de parser especializado
+
+Lê GRAMATICA_RPN e emite um módulo Python independente (gerado/parserRPN.py)
+com a tabela LL(1) embutida: cada entrada (não-terminal, terminal) já traz a
+string de derivação pronta e a tupla de símbolos a empilhar na ordem certa.
+O parser gerado não consulta a tabela dinâmica nem faz o mapeamento reverso
+de MAPEAMENTO_TOKENS a cada passo e produz as mesmas derivações de parsear().
+
+O módulo gerado fica versionado como cache de build e carrega o hash da
+gramática; carregarParserGerado() o regenera automaticamente se a gramática
+(ou os mapeamentos de tokens) mudarem.
+
+Uso manual:
+    python -m src.RA2.functions.python.gerarParser
+"""
+
+import hashlib
+import importlib
+import json
+import sys
+import types
+from pathlib import Path
+
+from .configuracaoGramatica import GRAMATICA_RPN, SIMBOLO_INICIAL, MAPEAMENTO_TOKENS
+from .analisadorGramatica import analisarGramatica
+from .construirTabelaLL1 import ConflictError
+from .parsear import TIPO_PARA_SIMBOLO
+
+DIRETORIO_GERADO = Path(__file__).resolve().parent / 'gerado'
+CAMINHO_PARSER_GERADO = DIRETORIO_GERADO / 'parserRPN.py'
+MODULO_PARSER_GERADO = f'{__package__}.gerado.parserRPN'
+
+CABECALHO_GERADO = '''#!/usr/bin/env python3
+
+# ARQUIVO GERADO AUTOMATICAMENTE por src/RA2/functions/python/gerarParser.py
+# Não edite manualmente: altere configuracaoGramatica.GRAMATICA_RPN e regenere com
+#     python -m src.RA2.functions.python.gerarParser
+'''
+
+
+def hash_gramatica(gramatica=None, simbolo_inicial=None):
+    """Hash estável da gramática e dos mapeamentos de tokens usados pelo parser."""
+    gramatica = GRAMATICA_RPN if gramatica is None else gramatica
+    simbolo_inicial = SIMBOLO_INICIAL if simbolo_inicial is None else simbolo_inicial
+    conteudo = json.dumps(
+        [gramatica, simbolo_inicial, TIPO_PARA_SIMBOLO, MAPEAMENTO_TOKENS],
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+
+def _simbolo_teorico(simbolo):
+    # Mesmo mapeamento reverso aplicado por parsear() ao montar a derivação
+    for teorico, real in MAPEAMENTO_TOKENS.items():
+        if real == simbolo:
+            return teorico
+    return simbolo
+
+
+def gerar_codigo_parser(gramatica=None, simbolo_inicial=None):
+    """
+    Gera o código-fonte do parser especializado.
+
+    Raises:
+        ConflictError: Se a gramática não for LL(1).
+    """
+    gramatica = GRAMATICA_RPN if gramatica is None else gramatica
+    simbolo_inicial = SIMBOLO_INICIAL if simbolo_inicial is None else simbolo_inicial
+
+    analise = analisarGramatica(gramatica, simbolo_inicial)
+    if analise['conflitos']:
+        raise ConflictError(analise['conflitos'][0]['mensagem'])
+
+    entradas = []
+    for nt in sorted(analise['tabela']):
+        for terminal in sorted(analise['tabela'][nt]):
+            producao = analise['tabela'][nt][terminal]
+            if producao is None:
+                continue
+            if producao == ['epsilon']:
+                derivacao = f"{nt} → epsilon"
+            else:
+                derivacao = f"{nt} → {' '.join(_simbolo_teorico(s) for s in producao)}"
+            empilhar = tuple(s for s in reversed(producao) if s != 'epsilon')
+            entradas.append(f"    ({nt!r}, {terminal!r}): ({derivacao!r}, {empilhar!r}),")
+
+    simbolos = [f"    {tipo!r}: {simbolo!r}," for tipo, simbolo in sorted(TIPO_PARA_SIMBOLO.items())]
+
+    return '\n'.join([
+        CABECALHO_GERADO,
+        f"HASH_GRAMATICA = {hash_gramatica(gramatica, simbolo_inicial)!r}",
+        f"SIMBOLO_INICIAL = {simbolo_inicial!r}",
+        '',
+        '# Tipo_de_Token -> símbolo da gramática',
+        '_SIMBOLOS = {',
+        *simbolos,
+        '}',
+        '',
+        '# (não-terminal, lookahead) -> (derivação, símbolos a empilhar)',
+        '_ACOES = {',
+        *entradas,
+        '}',
+        '',
+        '',
+        'def parsear(tokens_linha):',
+        '    if not tokens_linha:',
+        '        return []',
+        '',
+        '    try:',
+        '        entrada = [_SIMBOLOS.get(token.tipo) or str(token.valor).lower() for token in tokens_linha]',
+        "        entrada.append('$')",
+        '        fim = len(entrada)',
+        '',
+        "        pilha = ['$', SIMBOLO_INICIAL]",
+        '        indice = 0',
+        '        derivacao = []',
+        '        acoes = _ACOES',
+        '',
+        '        while len(pilha) > 1:',
+        '            topo = pilha.pop()',
+        "            simbolo_entrada = entrada[indice] if indice < fim else '$'",
+        '',
+        '            if topo == simbolo_entrada:',
+        '                indice += 1',
+        '                continue',
+        '',
+        '            acao = acoes.get((topo, simbolo_entrada))',
+        '            if acao is None:',
+        '                return []',
+        '',
+        '            derivacao.append(acao[0])',
+        '            pilha.extend(acao[1])',
+        '',
+        '        return derivacao if indice == fim - 1 else []',
+        '',
+        '    except Exception:',
+        '        return []',
+        '',
+    ])
+
+
+def _escrever_modulo(codigo, destino):
+    destino = Path(destino)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    pacote = destino.parent / '__init__.py'
+    if not pacote.exists():
+        pacote.write_text('# Cache de build: módulos gerados por gerarParser.py\n', encoding='utf-8')
+    destino.write_text(codigo, encoding='utf-8')
+    return destino
+
+
+def gerarParser(destino=CAMINHO_PARSER_GERADO):
+    """Gera o módulo do parser especializado em 'destino' e retorna o caminho."""
+    return _escrever_modulo(gerar_codigo_parser(), destino)
+
+
+def carregarParserGerado():
+    """
+    Retorna a função parsear(tokens_linha) do módulo gerado.
+
+    Se o módulo não existir ou tiver sido gerado para outra versão da
+    gramática, ele é regenerado. Se o diretório não puder ser escrito, o
+    código é compilado apenas em memória.
+    """
+    hash_atual = hash_gramatica()
+
+    try:
+        modulo = importlib.import_module(MODULO_PARSER_GERADO)
+        if getattr(modulo, 'HASH_GRAMATICA', None) == hash_atual:
+            return modulo.parsear
+    except ImportError:
+        pass
+
+    # Cache ausente ou desatualizado: regenera e compila a partir do código
+    # recém-gerado (não depende do .pyc antigo do módulo)
+    codigo = gerar_codigo_parser()
+    try:
+        _escrever_modulo(codigo, CAMINHO_PARSER_GERADO)
+    except OSError:
+        pass
+
+    modulo = types.ModuleType(MODULO_PARSER_GERADO)
+    modulo.__file__ = str(CAMINHO_PARSER_GERADO)
+    exec(compile(codigo, str(CAMINHO_PARSER_GERADO), 'exec'), modulo.__dict__)
+    sys.modules[MODULO_PARSER_GERADO] = modulo
+    pacote = sys.modules.get(MODULO_PARSER_GERADO.rpartition('.')[0])
+    if pacote is not None:
+        setattr(pacote, 'parserRPN', modulo)
+    return modulo.parsear
+
+
+if __name__ == '__main__':
+    caminho = gerarParser()
+    print(f"Parser gerado em: {caminho}")
@@ -8,7 +8,7 @@
 #
 # Nome do grupo no Canvas: RA2_1
 
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from src.RA1.functions.python.tokens import Token, Tipo_de_Token
 from .configuracaoGramatica import SIMBOLO_INICIAL, MAPEAMENTO_TOKENS
 
@@ -127,14 +127,20 @@ def parsear(tabela_ll1: Dict, tokens_linha: List[Token]) -> List[str]:
     except Exception:
         return []
 
-def parsear_todas_linhas(tabela_ll1: Dict, tokens_por_linha: List[List[Token]]) -> List[List[str]]:
+def parsear_todas_linhas(tabela_ll1: Dict, tokens_por_linha: List[List[Token]],
+                         funcao_parser: Optional[Callable[[List[Token]], List[str]]] = None) -> List[List[str]]:
+    # funcao_parser: parser especializado (ver gerarParser.carregarParserGerado);
+    # sem ele, a tabela LL(1) é interpretada por parsear()
 
     derivacoes = []
 
     for i, tokens_linha in enumerate(tokens_por_linha):
         print(f"Processando linha {i+1}: {[t.valor for t in tokens_linha]}")
         
-        derivacao = parsear(tabela_ll1, tokens_linha)
+        if funcao_parser is not None:
+            derivacao = funcao_parser(tokens_linha)
+        else:
+            derivacao = parsear(tabela_ll1, tokens_linha)
     
         if derivacao:
             print(f"    Derivação gerada com {len(derivacao)} passos")
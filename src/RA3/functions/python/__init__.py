@@ -8,4 +8,4 @@
 #
 # Nome do grupo no Canvas: RA3_1
 
-__all__ = ['tipos', 'tabela_simbolos', 'gramatica_atributos', 'analisador_tipos', 'analisador_semantico', 'analisador_memoria_controle']
+__all__ = ['tipos', 'tabela_simbolos', 'gramatica_atributos', 'analisador_tipos', 'analisador_semantico', 'analisador_memoria_controle', 'subexpressoes', 'indice_programa', 'nos_ast']
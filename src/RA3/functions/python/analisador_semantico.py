@@ -8,13 +8,28 @@
 #
 # Nome do grupo no Canvas: RA3_1
 
+import os
 from typing import Dict, Any, Optional, List, Tuple
-from src.RA3.functions.python.analisador_tipos import analisarSemantica, ErroSemantico
-from src.RA3.functions.python.analisador_memoria_controle import analisarSemanticaMemoria, analisarSemanticaControle
-from src.RA3.functions.python.tabela_simbolos import TabelaSimbolos
+from src.RA3.functions.python.analisador_tipos import (
+    analisarSemanticaParalela, ErroSemantico, _analisar_linha_tipos, _erro_interno
+)
+from src.RA3.functions.python.analisador_memoria_controle import (
+    analisarSemanticaMemoria, analisarSemanticaControle, _analisar_linha_memoria, _analisar_linha_controle,
+    _analisar_linha_protegida
+)
+from src.RA3.functions.python.tabela_simbolos import TabelaSimbolos, inicializarTabelaSimbolos
+from src.RA3.functions.python.subexpressoes import TabelaSubexpressoes, SUBTIPOS_LITERAIS
+from src.RA3.functions.python.indice_programa import IndicePrograma
+from src.RA3.functions.python.propagacao_constantes import propagar_constantes
+from src.RA2.functions.python.construirAST import construirAST, anotar_literal
 
+# A partir deste número de linhas a análise de tipos roda em vários processos
+# (abaixo disso o custo de criar os processos supera o ganho)
+LIMIAR_ANALISE_PARALELA = 20000
 
-def _converter_arvore_json_para_analisador(arvore_json: Dict[str, Any]) -> Dict[str, Any]:
+
+def _converter_arvore_json_para_analisador(arvore_json: Dict[str, Any], subexpressoes: Optional[TabelaSubexpressoes] = None,
+                                           usar_ast: bool = True, erros: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Converte a árvore sintática JSON exportada pelo parser RA2
     para o formato esperado pelo analisador semântico.
@@ -25,10 +40,15 @@ def _converter_arvore_json_para_analisador(arvore_json: Dict[str, Any]) -> Dict[
         {
           "numero_linha": 1,
           "arvore": {...},
-          "tokens": [...]
+          "tokens": [...],
+          "ast": {"elementos": [...], "operador": "..."}
         }
       ]
     }
+
+    A AST exportada pelo RA2 é usada diretamente (seus elementos passam a
+    ser os do analisador, sem cópia). Sem 'ast' (JSON de versões antigas) ou
+    com usar_ast=False, a AST é montada de novo a partir da árvore e dos tokens.
     
     Formato esperado pelo analisador:
     {
@@ -44,6 +64,12 @@ def _converter_arvore_json_para_analisador(arvore_json: Dict[str, Any]) -> Dict[
         }
       ]
     }
+
+    Se 'subexpressoes' for informada, subexpressões fechadas (sem variáveis)
+    estruturalmente iguais passam a ser o mesmo elemento em todas as linhas.
+
+    Se 'erros' for informada, uma linha que não pode ser convertida fica
+    fora da árvore e a falha é registrada nela como erro dessa linha.
     """
     linhas_convertidas = []
     
@@ -61,8 +87,18 @@ def _converter_arvore_json_para_analisador(arvore_json: Dict[str, Any]) -> Dict[
         if arvore is None:
             continue  # Pular linhas com erro sintático
             
-        # Extrair elementos e operador da árvore sintática usando tokens
-        elementos, operador = _extrair_elementos_e_operador(arvore, tokens)
+        try:
+            ast = linha_json.get('ast') if usar_ast else None
+            if not isinstance(ast, dict):
+                ast = construirAST(arvore, tokens) or {'elementos': [], 'operador': ''}
+            elementos, operador = _vincular_ast(ast.get('elementos', [])), ast.get('operador', '')
+            if subexpressoes is not None:
+                elementos = [subexpressoes.internar(elemento) for elemento in elementos]
+        except Exception as e:
+            if erros is None:
+                raise
+            erros.append(_erro_interno(numero_linha, e))
+            continue
         
         linha_convertida = {
             'numero_linha': numero_linha,
@@ -76,436 +112,260 @@ def _converter_arvore_json_para_analisador(arvore_json: Dict[str, Any]) -> Dict[
     return {'linhas': linhas_convertidas}
 
 
-def _extrair_elementos_e_operador_sub(arvore: Dict[str, Any], tokens: List[str] = None, start_idx: int = 0) -> Tuple[List[Dict[str, Any]], str]:
+def _vincular_ast(elementos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
-    Versão para subexpressões que usa tokens com índice controlado.
-    
-    Args:
-        arvore: Árvore sintática JSON da subexpressão
-        tokens: Lista de tokens (opcional, para compatibilidade)
-        start_idx: Índice inicial nos tokens
-        
-    Returns:
-        Tupla (elementos, operador)
+    Prepara, no lugar, os elementos da AST do RA2 para o analisador: cada
+    subexpressão LINHA ganha a chave 'ast' com seus próprios elementos e
+    operador (a AST exportada não repete esses dados para não duplicar o JSON).
+    Literais de JSON anterior à conversão no construirAST recebem 'numero' e
+    'tipo' aqui.
     """
-    elementos = []
-    operador = ""
-    idx = start_idx
-    
-    def _processar_sequencia_sub(seq_node):
-        nonlocal elementos, operador, idx
-        
-        if not isinstance(seq_node, dict):
-            return
-            
-        filhos = seq_node.get('filhos', [])
-        i = 0
-        while i < len(filhos):
-            filho = filhos[i]
-            if isinstance(filho, dict):
-                label = filho.get('label', '')
-                
-                if label == 'OPERANDO':
-                    # Processar operando
-                    elemento = None
-                    has_res = False
-                    
-                    for sub_filho in filho.get('filhos', []):
-                        if isinstance(sub_filho, dict):
-                            sub_label = sub_filho.get('label', '')
-                            
-                            if sub_label == 'LINHA':
-                                # Sub-subexpressão - avançar parênteses
-                                if tokens and idx < len(tokens) and tokens[idx] == '(':
-                                    idx += 1  # Pular '('
-                                sub_sub_elementos, sub_sub_operador = _extrair_elementos_e_operador_sub({'label': 'PROGRAM', 'filhos': [sub_filho]}, tokens, idx)
-                                elemento = {
-                                    'subtipo': 'LINHA',
-                                    'elementos': sub_sub_elementos,
-                                    'operador': sub_sub_operador,
-                                    'ast': {'elementos': sub_sub_elementos, 'operador': sub_sub_operador}
-                                }
-                                # Avançar até o ')' da subexpressão
-                                while tokens and idx < len(tokens) and tokens[idx] != ')':
-                                    idx += 1
-                                if tokens and idx < len(tokens):
-                                    idx += 1  # Pular ')'
-                            elif sub_label in ['numero_inteiro', 'numero_real', 'identifier']:
-                                # Folha terminal - pegar valor do token
-                                if tokens and idx < len(tokens):
-                                    # Para subexpressões simples, pular '(' se necessário
-                                    if tokens[idx] == '(':
-                                        idx += 1
-                                    if tokens and idx < len(tokens):
-                                        valor = tokens[idx]
-                                        subtipo = 'numero_inteiro' if sub_label == 'numero_inteiro' else ('numero_real' if sub_label == 'numero_real' else 'variavel')
-                                        elemento = {
-                                            'subtipo': subtipo,
-                                            'valor': valor
-                                        }
-                                        idx += 1
-                                        # Pular ')' se existir
-                                        if tokens and idx < len(tokens) and tokens[idx] == ')':
-                                            idx += 1
-                            elif sub_label == 'OPERANDO_OPCIONAL':
-                                # Verificar RES
-                                for neto in sub_filho.get('filhos', []):
-                                    if isinstance(neto, dict) and neto.get('label') == 'res':
-                                        has_res = True
-                    
-                    if elemento and has_res:
-                        elemento['subtipo'] = elemento['subtipo'] + '_res'
-                    
-                    if elemento:
-                        elementos.append(elemento)
-                        
-                elif label == 'SEQUENCIA_PRIME':
-                    # Continuar processando
-                    _processar_sequencia_sub(filho)
-                    
-                elif label == 'OPERADOR_FINAL':
-                    # Extrair operador
-                    operador = _extrair_operador_final(filho)
-                    
-            i += 1
-    
-    def _extrair_operador_final(op_final_node):
-        """Extrai operador de OPERADOR_FINAL"""
-        if not isinstance(op_final_node, dict):
-            return ""
-            
-        for filho in op_final_node.get('filhos', []):
-            if isinstance(filho, dict):
-                label = filho.get('label', '')
-                mapeamento_operadores = {
-                    'ARITH_OP': {'+': '+', '-': '-', '*': '*', '/': '/', '%': '%', '^': '^', '|': '|'},
-                    'COMP_OP': {'>': '>', '<': '<', '>=': '>=', '<=': '<=', '==': '==', '!=': '!='},
-                    'LOGIC_OP': {'&&': '&&', '||': '||', '!': '!'},
-                    'CONTROL_OP': {'ifelse': 'IFELSE', 'while': 'WHILE', 'for': 'FOR'}
-                }
-                
-                for tipo_op, operadores in mapeamento_operadores.items():
-                    if label == tipo_op:
-                        for neto in filho.get('filhos', []):
-                            if isinstance(neto, dict):
-                                op_label = neto.get('label', '')
-                                if op_label in operadores:
-                                    return operadores[op_label]
-                    elif label in operadores:
-                        return operadores[label]
-        
-        return ""
-    
-    # Encontrar SEQUENCIA na árvore
-    sequencia_node = None
-    
-    def _encontrar_sequencia(node):
-        if isinstance(node, dict):
-            if node.get('label') == 'SEQUENCIA':
-                return node
-            for filho in node.get('filhos', []):
-                result = _encontrar_sequencia(filho)
-                if result:
-                    return result
-        return None
-    
-    sequencia_node = _encontrar_sequencia(arvore)
-    if sequencia_node:
-        _processar_sequencia_sub(sequencia_node)
-    
-    return elementos, operador
+    pendentes = [elementos]
+    while pendentes:
+        for elemento in pendentes.pop():
+            if not isinstance(elemento, dict):
+                continue
+            if elemento.get('subtipo') == 'LINHA' and 'ast' not in elemento:
+                filhos = elemento.setdefault('elementos', [])
+                elemento['ast'] = {'elementos': filhos, 'operador': elemento.get('operador', '')}
+                pendentes.append(filhos)
+            elif elemento.get('subtipo') in SUBTIPOS_LITERAIS and 'numero' not in elemento:
+                anotar_literal(elemento)
+    return elementos
 
 
-def _extrair_elementos_e_operador(arvore: Dict[str, Any], tokens: List[str]) -> Tuple[List[Dict[str, Any]], str]:
+class _VisaoTabelaMemoria:
     """
-    Extrai elementos (operandos) e operador de uma linha da árvore sintática.
-    
-    Args:
-        arvore: Árvore sintática JSON da linha (estrutura PROGRAM/LINHA)
-        tokens: Lista de tokens da linha (usado apenas para compatibilidade)
-        
-    Returns:
-        Tupla (elementos, operador) onde:
-        - elementos: lista de dicionários com 'subtipo' e 'valor' ou subexpressões
-        - operador: string representando o operador ou '' se não houver
+    Visão da tabela de símbolos usada pela fase de memória na análise fundida.
+
+    A fase de memória deve enxergar a tabela final da análise de tipos, mas
+    na análise fundida a linha N é verificada logo após seus tipos. Então
+    esta visão:
+        - grava os armazenamentos da fase de memória em uma tabela própria
+          (a tabela de tipos continua igual à da análise de tipos sozinha);
+        - registra o estado de cada símbolo lido da tabela de tipos e a
+          posição da linha que o leu primeiro. Uma leitura que não confere
+          com a tabela final é uma referência adiante, corrigida no final
+          da análise fundida.
     """
-    # A árvore vem no formato PROGRAM -> LINHA -> SEQUENCIA
-    # Precisamos extrair da parte LINHA
-    linha_node = None
-    
-    # Encontrar o nó LINHA na árvore
-    def _encontrar_linha(node):
-        if isinstance(node, dict):
-            if node.get('label') == 'LINHA':
-                return node
-            for filho in node.get('filhos', []):
-                if isinstance(filho, dict):
-                    result = _encontrar_linha(filho)
-                    if result:
-                        return result
-        return None
-    
-    linha_node = _encontrar_linha(arvore)
-    if not linha_node:
-        return [], ""
-    
-    # Processar a SEQUENCIA dentro da LINHA
-    sequencia_node = None
-    for filho in linha_node.get('filhos', []):
-        if isinstance(filho, dict) and filho.get('label') == 'SEQUENCIA':
-            sequencia_node = filho
-            break
-    
-    if not sequencia_node:
-        return [], ""
-    
-    # Extrair elementos e operador da sequência
-    elementos = []
-    operador = ""
-    indice_token = 1  # Pular o '(' inicial
-    
-    def _processar_operando(operando_node):
-        """Processa um nó OPERANDO e retorna o elemento correspondente"""
-        nonlocal indice_token
-        if not isinstance(operando_node, dict):
-            return None
-            
-        # Verificar se é uma subexpressão (LINHA)
-        linha_interna = None
-        for filho in operando_node.get('filhos', []):
-            if isinstance(filho, dict) and filho.get('label') == 'LINHA':
-                linha_interna = filho
-                break
-        
-        if linha_interna:
-            # É uma subexpressão - processar recursivamente
-            # Para subexpressões, usar tokens com índice controlado
-            sub_elementos, sub_operador = _extrair_elementos_e_operador_sub({'label': 'PROGRAM', 'filhos': [linha_interna]}, tokens, indice_token)
-            sub_elemento = {
-                'subtipo': 'LINHA',
-                'elementos': sub_elementos,
-                'operador': sub_operador,
-                'ast': {'elementos': sub_elementos, 'operador': sub_operador}  # Definir chave 'ast'
-            }
-            # Avançar tokens consumidos pela subexpressão
-            # Contar parênteses para saber quantos tokens pular
-            parenteses = 0
-            while indice_token < len(tokens):
-                if tokens[indice_token] == '(':
-                    parenteses += 1
-                elif tokens[indice_token] == ')':
-                    parenteses -= 1
-                    if parenteses == 0:
-                        indice_token += 1  # Consumir o ')'
-                        break
-                indice_token += 1
-            return sub_elemento
-        
-        # Verificar se é um número ou identificador
-        elemento = None
-        has_res = False
-        
-        for filho in operando_node.get('filhos', []):
-            if isinstance(filho, dict):
-                label = filho.get('label', '')
-                if label == 'numero_inteiro':
-                    elemento = {
-                        'subtipo': 'numero_inteiro',
-                        'valor': tokens[indice_token] if indice_token < len(tokens) else 'unknown'
-                    }
-                    indice_token += 1
-                elif label == 'numero_real':
-                    elemento = {
-                        'subtipo': 'numero_real',
-                        'valor': tokens[indice_token] if indice_token < len(tokens) else 'unknown'
-                    }
-                    indice_token += 1
-                elif label == 'identifier':
-                    elemento = {
-                        'subtipo': 'variavel',
-                        'valor': tokens[indice_token] if indice_token < len(tokens) else 'unknown'
-                    }
-                    indice_token += 1
-                elif label == 'OPERANDO_OPCIONAL':
-                    # Verificar se tem RES
-                    for neto in filho.get('filhos', []):
-                        if isinstance(neto, dict) and neto.get('label') == 'res':
-                            has_res = True
-        
-        # Se tem RES, modificar o subtipo
-        if elemento and has_res:
-            elemento['subtipo'] = elemento['subtipo'] + '_res'
-        
-        return elemento
-    
-    def _processar_operador_final(op_final_node):
-        """Processa um nó OPERADOR_FINAL e retorna o operador"""
-        nonlocal indice_token
-        if not isinstance(op_final_node, dict):
-            return ""
-            
-        for filho in op_final_node.get('filhos', []):
-            if isinstance(filho, dict):
-                label = filho.get('label', '')
-                # Mapear labels para operadores
-                mapeamento_operadores = {
-                    'ARITH_OP': {'+': '+', '-': '-', '*': '*', '/': '/', '%': '%', '^': '^', '|': '|'},
-                    'COMP_OP': {'>': '>', '<': '<', '>=': '>=', '<=': '<=', '==': '==', '!=': '!='},
-                    'LOGIC_OP': {'&&': '&&', '||': '||', '!': '!'},
-                    'CONTROL_OP': {'ifelse': 'IFELSE', 'while': 'WHILE', 'for': 'FOR'}
-                }
-                
-                for tipo_op, operadores in mapeamento_operadores.items():
-                    if label == tipo_op:
-                        # Encontrar o operador específico
-                        for neto in filho.get('filhos', []):
-                            if isinstance(neto, dict):
-                                op_label = neto.get('label', '')
-                                if op_label in operadores:
-                                    return operadores[op_label]
-                    elif label in operadores:
-                        return operadores[label]
-        
-        return ""
-    
-    # Processar a sequência recursivamente
-    def _processar_sequencia(seq_node):
-        nonlocal elementos, operador
-        
-        if not isinstance(seq_node, dict):
-            return
-            
-        filhos = seq_node.get('filhos', [])
-        i = 0
-        while i < len(filhos):
-            filho = filhos[i]
-            if isinstance(filho, dict):
-                label = filho.get('label', '')
-                
-                if label == 'OPERANDO':
-                    elemento = _processar_operando(filho)
-                    if elemento:
-                        elementos.append(elemento)
-                        
-                elif label == 'SEQUENCIA_PRIME':
-                    # Processar recursivamente
-                    _processar_sequencia(filho)
-                    
-                elif label == 'OPERADOR_FINAL':
-                    operador = _processar_operador_final(filho)
-                    
-            i += 1
-    
-    _processar_sequencia(sequencia_node)
-    
-    return elementos, operador
 
+    def __init__(self, base: TabelaSimbolos):
+        self._base = base
+        self._escritas = TabelaSimbolos()
+        self._armazenamentos: List[Tuple[int, str, str, bool, Optional[int]]] = []
+        self._leituras: Dict[Tuple[str, str], Tuple[Any, int]] = {}
+        self._primeira_invalida: Optional[int] = None
+        # Posição (na ordem da fase de memória) da linha em análise
+        self.posicao = 0
 
+    @property
+    def versao(self) -> Tuple[int, int]:
+        return (self._base.versao, self._escritas.versao)
 
+    def _ler_base(self, nome: str, campo: str) -> Any:
+        valor = getattr(self._base, campo)(nome)
+        anterior, posicao = self._leituras.setdefault((nome.upper(), campo), (valor, self.posicao))
+        if anterior != valor and (self._primeira_invalida is None or posicao < self._primeira_invalida):
+            self._primeira_invalida = posicao
+        return valor
 
+    def existe(self, nome: str) -> bool:
+        if self._escritas.existe(nome):
+            return True
+        return self._ler_base(nome, 'existe')
 
+    def obter_tipo(self, nome: str) -> Optional[str]:
+        if self._escritas.existe(nome):
+            return self._escritas.obter_tipo(nome)
+        return self._ler_base(nome, 'obter_tipo')
 
+    def verificar_inicializacao(self, nome: str) -> bool:
+        if self._escritas.existe(nome):
+            return self._escritas.verificar_inicializacao(nome)
+        return self._ler_base(nome, 'verificar_inicializacao')
 
+    def adicionarSimbolo(self, nome: str, tipo: str, inicializada: bool = False, linha: Optional[int] = None):
+        # A fase de memória sempre grava símbolos inicializados; da base só
+        # importa se o símbolo existe (atualização ou criação, que valida o nome)
+        if not self._escritas.existe(nome):
+            self._ler_base(nome, 'existe')
+        simbolo = self._escritas.adicionarSimbolo(nome, tipo, inicializada, linha)
+        self._armazenamentos.append((self.posicao, nome, tipo, inicializada, linha))
+        return simbolo
 
-def _criar_seqs_map(arvore_convertida: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
+    def primeira_leitura_invalida(self) -> Optional[int]:
+        """
+        Posição da primeira linha que leu da base um valor diferente do da
+        base final, ou None se todas as leituras conferem.
+        """
+        posicoes = [
+            posicao for (nome, campo), (valor, posicao) in self._leituras.items()
+            if getattr(self._base, campo)(nome) != valor
+        ]
+        if self._primeira_invalida is not None:
+            posicoes.append(self._primeira_invalida)
+        return min(posicoes, default=None)
+
+    def aplicar_armazenamentos(self, ate: Optional[int] = None) -> None:
+        """
+        Repete na tabela de tipos os armazenamentos da fase de memória, na
+        ordem; com 'ate', só os das linhas em posições anteriores a ela.
+        """
+        for posicao, nome, tipo, inicializada, linha in self._armazenamentos:
+            if ate is not None and posicao >= ate:
+                break
+            self._base.adicionarSimbolo(nome, tipo, inicializada=inicializada, linha=linha)
+
+
+def analisarSemanticaFundida(arvore_convertida: Dict[str, Any], subexpressoes: Optional[TabelaSubexpressoes] = None) -> Dict[str, Any]:
     """
-    Cria o seqs_map necessário para as funções de análise de memória e controle.
-    
-    Args:
-        arvore_convertida: Árvore no formato convertido pelo analisador
-        
+    Análise semântica (tipos, memória e controle) em um único percurso das linhas.
+
+    Cada linha passa pela análise de tipos e, em seguida, pela de memória
+    (inicialização, armazenamentos e RES). A fase de controle depende da tabela
+    de símbolos final, então é aplicada no final, apenas às linhas IFELSE,
+    WHILE e FOR, localizadas pelo índice do programa.
+
+    Referências adiante (a memória da linha N lê um símbolo que a análise de
+    tipos de uma linha posterior altera) são corrigidas no final: a partir
+    da primeira linha afetada, a fase de memória é refeita com a tabela de
+    tipos completa, como se rodasse depois da análise de tipos de todas as
+    linhas. As linhas anteriores não são reanalisadas.
+
+    Uma linha com erro de tipos entra na árvore anotada sem 'tipo' e não
+    passa pelas fases de memória e controle; as demais linhas continuam
+    sendo analisadas, então todos os erros saem da mesma execução. Uma
+    falha inesperada em qualquer fase também vira erro da linha.
+
     Returns:
-        Dicionário mapeando número da linha para {'operador': str, 'elementos': List[Dict]}
+        dict com 'arvore_anotada' (parcial se houver erros), 'tabela_simbolos'
+        e 'erros' (erros de tipos, de memória e de controle, nessa ordem;
+        vazia em caso de sucesso).
     """
-    seqs_map = {}
-    
-    for linha in arvore_convertida.get('linhas', []):
-        if not isinstance(linha, dict):
+    tabela = inicializarTabelaSimbolos()
+    visao = _VisaoTabelaMemoria(tabela)
+    indice = IndicePrograma(arvore_convertida.get('linhas', []))
+
+    arvore_anotada = {'linhas': []}
+    historico_tipos: Dict[int, Optional[str]] = {}
+    erros_tipos: List[str] = []
+    # Linhas na ordem da fase de memória: (linha, seq, tipo dado pela análise de tipos)
+    linhas_memoria: List[Tuple[Dict[str, Any], Dict[str, Any], Optional[str]]] = []
+    erros_memoria: List[List[Dict[str, Any]]] = []
+
+    for linha_ast in arvore_convertida.get('linhas', []):
+        num = linha_ast.get('numero_linha', None)
+        try:
+            linha = _analisar_linha_tipos(linha_ast, tabela, historico_tipos, subexpressoes)
+        except ErroSemantico as e:
+            erros_tipos.append(str(e))
+            arvore_anotada['linhas'].append(dict(linha_ast))
             continue
-            
-        num_linha = linha.get('numero_linha')
-        filhos = linha.get('filhos', [])
-        
-        if filhos and isinstance(filhos[0], dict):
-            seq = filhos[0]  # Primeiro filho contém elementos e operador
-            elementos = seq.get('elementos', [])
-            # Filtrar elementos None e garantir que tenham estrutura válida
-            elementos_validos = []
-            for elem in elementos:
-                if elem is not None and isinstance(elem, dict):
-                    elementos_validos.append(elem)
-            
-            seqs_map[num_linha] = {
-                'operador': seq.get('operador'),
-                'elementos': elementos_validos
-            }
-        else:
-            seqs_map[num_linha] = {
-                'operador': None,
-                'elementos': []
-            }
-    
-    return seqs_map
+        except Exception as e:
+            erros_tipos.append(_erro_interno(num, e))
+            arvore_anotada['linhas'].append(dict(linha_ast))
+            continue
+        if linha is None:
+            continue
+        arvore_anotada['linhas'].append(linha)
+
+        indice.registrar_anotada(linha)
+        seq = indice.seq(linha['numero_linha'])
+        if not seq:
+            continue
+        visao.posicao = len(linhas_memoria)
+        linhas_memoria.append((linha, seq, linha.get('tipo')))
+        erros_memoria.append(_analisar_linha_protegida(_analisar_linha_memoria, linha, seq, visao, indice, subexpressoes))
 
+    refazer = visao.primeira_leitura_invalida()
+    visao.aplicar_armazenamentos(ate=refazer)
+    if refazer is not None:
+        # Correção das referências adiante: a memória volta ao estado anterior
+        # à primeira linha afetada e continua na tabela de tipos completa
+        del erros_memoria[refazer:]
+        for linha, _, tipo in linhas_memoria[refazer:]:
+            linha['tipo'] = tipo
+        for linha, seq, _ in linhas_memoria[refazer:]:
+            erros_memoria.append(_analisar_linha_protegida(_analisar_linha_memoria, linha, seq, tabela, indice, subexpressoes))
 
-# Função principal delega para a implementação em analisador_tipos.py
-# analisarSemantica está implementada em analisador_tipos.py
+    erros_controle: List[Dict[str, Any]] = []
+    for num in indice.linhas_com_operador('IFELSE', 'WHILE', 'FOR'):
+        linha = indice.anotada(num)
+        if linha is not None:
+            erros_controle.extend(_analisar_linha_protegida(_analisar_linha_controle, linha, indice.seq(num), tabela, subexpressoes))
 
+    erros_formatados = (erros_tipos + [erro['erro'] for erros in erros_memoria for erro in erros]
+                        + [erro['erro'] for erro in erros_controle])
+    return {'arvore_anotada': arvore_anotada, 'tabela_simbolos': tabela, 'erros': erros_formatados}
 
-def analisarSemanticaDaJsonRA2(json_data: Dict[str, Any]) -> Optional[List[str]]:
+
+def _analisarSemanticaEmFases(arvore_convertida: Dict[str, Any], subexpressoes: Optional[TabelaSubexpressoes] = None,
+                              processos: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Análise semântica de programas grandes: a análise de tipos de todas as
+    linhas roda antes, com os grupos de linhas independentes em vários
+    processos (analisarSemanticaParalela), e só então memória e controle.
+
+    Memória e controle recebem só as linhas sem erro de tipos, como na
+    análise fundida. O retorno tem o mesmo formato de analisarSemanticaFundida.
+    """
+    resultado_tipos = analisarSemanticaParalela(arvore_convertida, processos=processos, subexpressoes=subexpressoes)
+
+    arvore_anotada = resultado_tipos['arvore_anotada']
+    tabela = resultado_tipos['tabela_simbolos']
+    erros_formatados = [erro['erro'] for erro in resultado_tipos['erros']]
+
+    # Linhas com erro de tipos ficam na árvore anotada, mas fora das próximas fases
+    linhas_com_erro = {erro['linha'] for erro in resultado_tipos['erros']}
+    arvore_tipada = {'linhas': [linha for linha in arvore_anotada['linhas']
+                                if linha.get('numero_linha') not in linhas_com_erro]}
+
+    indice = IndicePrograma(arvore_convertida.get('linhas', []))
+
+    # Executar análise de memória
+    erros_memoria = analisarSemanticaMemoria(arvore_tipada, indice, tabela, subexpressoes)
+    erros_formatados.extend([erro['erro'] for erro in erros_memoria])
+
+    # Executar análise de controle
+    erros_controle = analisarSemanticaControle(arvore_tipada, indice, tabela, subexpressoes)
+    erros_formatados.extend([erro['erro'] for erro in erros_controle])
+
+    return {'arvore_anotada': arvore_anotada, 'tabela_simbolos': tabela, 'erros': erros_formatados}
+
+
+def analisarSemanticaDaJsonRA2(json_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Função principal que coordena a análise semântica completa:
-    1. Análise de tipos (analisarSemantica)
-    2. Análise de memória (analisarSemanticaMemoria)
-    3. Análise de controle (analisarSemanticaControle)
-    
+    1. Análise de tipos
+    2. Análise de memória
+    3. Análise de controle
+
+    As três fases rodam fundidas em um único percurso das linhas
+    (analisarSemanticaFundida), que também corrige as referências adiante.
+    Programas com LIMIAR_ANALISE_PARALELA linhas ou mais, em máquinas com
+    mais de um núcleo, rodam a análise de tipos antes, em paralelo, e depois
+    memória e controle. Antes das fases, propagar_constantes anota as linhas
+    com os valores conhecidos em tempo de compilação e resolve (X RES) com X
+    constante.
+
+    Linhas com erro não interrompem a análise: o resultado traz a árvore
+    anotada parcial junto com todos os erros encontrados. Falhas inesperadas
+    também são registradas na linha em que ocorreram (ERRO INTERNO [Linha N]),
+    antes dos erros semânticos quando ocorrem na conversão.
+
     Retorna:
-        None se não há erros, ou uma lista de strings de erro no formato esperado.
+        dict com 'arvore_anotada', 'tabela_simbolos' e 'erros' (lista de
+        strings de erro no formato esperado; vazia se não há erros).
     """
-    try:
-        # Converter árvore JSON para formato esperado pelo analisador
-        arvore_convertida = _converter_arvore_json_para_analisador(json_data)
-        
-        # Executar análise de tipos
-        resultado_tipos = analisarSemantica(arvore_convertida)
-        erros_formatados = []
-        
-        if isinstance(resultado_tipos, dict):
-            if not resultado_tipos.get('sucesso', False):
-                # Retornar lista de erros já formatados
-                if resultado_tipos.get('erros'):
-                    for erro in resultado_tipos['erros']:
-                        if isinstance(erro, dict):
-                            # O erro já vem formatado da função analisarSemantica
-                            erros_formatados.append(erro.get('erro', str(erro)))
-                        else:
-                            erros_formatados.append(str(erro))
-                return erros_formatados if erros_formatados else None
-            # Usar a árvore anotada para as próximas análises
-            arvore_anotada = resultado_tipos.get('arvore_anotada', arvore_convertida)
-            tabela = resultado_tipos.get('tabela_simbolos')
-        else:
-            # Se retornou string, é um erro
-            if resultado_tipos:
-                return [resultado_tipos]
-            arvore_anotada = arvore_convertida
-            tabela = TabelaSimbolos()
-        
-        # Executar análise de memória
-        erros_memoria = analisarSemanticaMemoria(arvore_anotada, _criar_seqs_map(arvore_convertida), tabela)
-        if erros_memoria:
-            erros_formatados.extend([erro['erro'] for erro in erros_memoria])
-        
-        # Executar análise de controle
-        erros_controle = analisarSemanticaControle(arvore_anotada, _criar_seqs_map(arvore_convertida), tabela)
-        if erros_controle:
-            erros_formatados.extend([erro['erro'] for erro in erros_controle])
-        
-        # Se há erros de memória ou controle, retornar todos os erros
-        if erros_formatados:
-            return erros_formatados
-        
-        return {'arvore_anotada': arvore_anotada, 'tabela_simbolos': tabela}  # Sucesso
-        
-    except Exception as e:
-        return [f"ERRO INTERNO: {str(e)}"]
\ No newline at end of file
+    # Subexpressões fechadas repetidas são compartilhadas e têm o tipo memorizado
+    subexpressoes = TabelaSubexpressoes()
+    erros_conversao: List[str] = []
+    arvore_convertida = _converter_arvore_json_para_analisador(json_data, subexpressoes, erros=erros_conversao)
+    propagar_constantes(arvore_convertida)
+
+    if len(arvore_convertida['linhas']) >= LIMIAR_ANALISE_PARALELA and (os.cpu_count() or 1) > 1:
+        resultado = _analisarSemanticaEmFases(arvore_convertida, subexpressoes)
+    else:
+        resultado = analisarSemanticaFundida(arvore_convertida, subexpressoes)
+    resultado['erros'] = erros_conversao + resultado['erros']
+    return resultado
@@ -8,10 +8,21 @@
 #
 # Nome do grupo no Canvas: RA3_1
 
+import heapq
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Dict, Any, List, Optional, Tuple
+from src.RA1.functions.python.percurso import percorrer
+from src.RA1.functions.python.relatorios import aguardar_relatorios
 from src.RA3.functions.python import tipos
+from src.RA3.functions.python.dependencias_linhas import particionar_linhas
 from src.RA3.functions.python.tabela_simbolos import TabelaSimbolos, inicializarTabelaSimbolos
 from src.RA3.functions.python.gramatica_atributos import obter_regra, definirGramaticaAtributos
+from src.RA3.functions.python.subexpressoes import TabelaSubexpressoes, AUSENTE, SUBTIPOS_LITERAIS
+from src.RA3.functions.python.cache_formas import forma_expressao
+from src.RA2.functions.python.construirAST import valor_literal
 
 
 class ErroSemantico(Exception):
@@ -22,6 +33,11 @@ class ErroSemantico(Exception):
         super().__init__(f"ERRO SEMÂNTICO [Linha {linha}]: {mensagem}\nContexto: {contexto}")
 
 
+def _erro_interno(linha: Any, erro: Exception) -> str:
+    """Mensagem de uma falha inesperada ao analisar uma linha (as demais seguem sendo analisadas)."""
+    return f"ERRO INTERNO [Linha {linha}]: {type(erro).__name__}: {erro}"
+
+
 def _construir_contexto_expressao(linha_ou_seq: Dict[str, Any]) -> str:
     """
     Constrói um contexto mais informativo para mensagens de erro,
@@ -82,32 +98,41 @@ def _construir_contexto_expressao(linha_ou_seq: Dict[str, Any]) -> str:
         return "(estrutura não reconhecida)"
 
 
-def _parse_valor_literal(token: Dict[str, Any]) -> Any:
-    if token.get('subtipo') not in ['numero_real', 'numero_inteiro', 'numero_real_res', 'numero_inteiro_res']:
-        return None
-    raw = token.get('valor')
-    if raw is None:
-        return None
-    try:
-        # Para numero_inteiro e numero_inteiro_res, sempre retorna int
-        if token.get('subtipo') in ['numero_inteiro', 'numero_inteiro_res']:
-            return int(raw)
-        # Para numero_real e numero_real_res, sempre retorna float
-        elif token.get('subtipo') in ['numero_real', 'numero_real_res']:
-            return float(raw)
-        # Fallback: tentar float
-        return float(raw)
-    except Exception:
+def _avaliar_operando(operando: Dict[str, Any], tabela: TabelaSimbolos, historico_tipos: Dict[int, str], linha_atual: int, subexpressoes: Optional[TabelaSubexpressoes] = None) -> Dict[str, Any]:
+    def avaliar():
+        return percorrer(operando, lambda op: _passos_avaliar_operando(op, tabela, historico_tipos, linha_atual, subexpressoes))
+
+    # Subexpressões abertas passam pelo cache de formas (as fechadas já têm
+    # o tipo memorizado na tabela de subexpressões)
+    if (subexpressoes is None or not isinstance(operando, dict) or operando.get('subtipo') != 'LINHA'
+            or subexpressoes.eh_fechada(operando)):
+        return avaliar()
+    forma = forma_expressao(operando, tabela, via_ast=False)
+    if forma is None:
+        return avaliar()
+    chave = ('operando', forma[0])
+
+    # Resultado: (tipo, None) ou (None, (mensagem, contexto)). Erros dos
+    # operandos internos são absorvidos pela LINHA, então o erro que escapa
+    # só menciona tipos e vale para qualquer expressão com a mesma chave.
+    resultado = subexpressoes.formas.obter(chave)
+    if resultado is None:
         try:
-            return float(raw)
-        except Exception:
-            return None
+            resultado = (avaliar()['tipo'], None)
+        except ErroSemantico as e:
+            resultado = (None, (e.mensagem, e.contexto))
+        subexpressoes.formas.memorizar(chave, resultado)
 
+    tipo, erro = resultado
+    if erro is not None:
+        raise ErroSemantico(linha_atual, erro[0], erro[1])
+    return {'tipo': tipo, 'valor': None}
 
-def _avaliar_operando(operando: Dict[str, Any], tabela: TabelaSimbolos, historico_tipos: Dict[int, str], linha_atual: int) -> Dict[str, Any]:
+
+def _passos_avaliar_operando(operando: Dict[str, Any], tabela: TabelaSimbolos, historico_tipos: Dict[int, str], linha_atual: int, subexpressoes: Optional[TabelaSubexpressoes] = None):
+    """Gerador de _avaliar_operando para percorrer: pede a avaliação de cada subexpressão."""
     if operando.get('subtipo') in ['numero_real', 'numero_inteiro', 'numero_real_res', 'numero_inteiro_res']:
-        valor = _parse_valor_literal(operando)
-        tipo = tipos.TYPE_INT if isinstance(valor, int) else tipos.TYPE_REAL
+        tipo, valor = valor_literal(operando)
         return {'tipo': tipo, 'valor': valor}
 
     if operando.get('subtipo') == 'variavel':
@@ -122,7 +147,13 @@ def _avaliar_operando(operando: Dict[str, Any], tabela: TabelaSimbolos, historic
         return {'tipo': tipo, 'valor': None, 'variavel': nome}
 
     if operando.get('subtipo') == 'LINHA':
-        # Avaliar subexpressão LINHA recursivamente
+        # Subexpressão fechada já avaliada em outra ocorrência
+        if subexpressoes is not None:
+            tipo_memorizado = subexpressoes.obter_tipo(operando, 'operando')
+            if tipo_memorizado is not AUSENTE:
+                return {'tipo': tipo_memorizado, 'valor': None}
+
+        # Avaliar subexpressão LINHA (os operandos são pedidos ao percorrer)
         elementos_sub = operando.get('elementos', [])
         operador_sub = operando.get('operador')
         
@@ -130,7 +161,7 @@ def _avaliar_operando(operando: Dict[str, Any], tabela: TabelaSimbolos, historic
         operandos_sub_av = []
         for op_sub in elementos_sub:
             try:
-                aval_sub = _avaliar_operando(op_sub, tabela, historico_tipos, linha_atual)
+                aval_sub = yield op_sub
                 operandos_sub_av.append(aval_sub)
             except ErroSemantico:
                 operandos_sub_av.append({'tipo': None, 'valor': None})
@@ -194,7 +225,9 @@ def _avaliar_operando(operando: Dict[str, Any], tabela: TabelaSimbolos, historic
         else:
             # Sem operador - apenas um operando
             tipo_sub = operandos_sub_av[0]['tipo'] if operandos_sub_av else None
-        
+
+        if subexpressoes is not None:
+            subexpressoes.memorizar_tipo(operando, 'operando', tipo_sub)
         return {'tipo': tipo_sub, 'valor': None}
 
     if operando.get('tipo'):
@@ -203,7 +236,74 @@ def _avaliar_operando(operando: Dict[str, Any], tabela: TabelaSimbolos, historic
     raise ErroSemantico(linha_atual, f"Operando desconhecido ou inválido: {operando}")
 
 
-def avaliar_seq_tipo(seq: Dict[str, Any], linha_atual: int, tabela: TabelaSimbolos) -> Tuple[Optional[str], List[Optional[str]], List[Any]]:
+def avaliar_seq_tipo(seq: Dict[str, Any], linha_atual: int, tabela: TabelaSimbolos, subexpressoes: Optional[TabelaSubexpressoes] = None) -> Tuple[Optional[str], List[Optional[str]], List[Any]]:
+    forma = forma_expressao(seq, tabela, via_ast=True) if subexpressoes is not None else None
+    if forma is None:
+        return percorrer(seq, lambda s: _passos_seq_tipo(s, linha_atual, tabela, subexpressoes))
+    chave, nos = forma
+    chave = ('seq', chave)
+
+    # Resultado: (tipo, tipos_ops, anotações, erro). Anotações e origem do
+    # erro são posições em 'nos' (pré-ordem), válidas para qualquer seq com a
+    # mesma chave; o contexto do erro é refeito com os valores desta seq.
+    resultado = subexpressoes.formas.obter(chave)
+    if resultado is None:
+        resultado = _avaliar_seq_registrando(seq, nos, linha_atual, tabela, subexpressoes)
+        subexpressoes.formas.memorizar(chave, resultado)
+
+    tipo, tipos_ops, anotacoes, erro = resultado
+    for posicao, tipo_anotado in anotacoes:
+        nos[posicao]['tipo'] = tipo_anotado
+    if erro is not None:
+        posicao, mensagem = erro
+        raise ErroSemantico(linha_atual, mensagem, _construir_contexto_expressao(nos[posicao]))
+    vals = [valor_literal(op)[1] if op.get('subtipo') in SUBTIPOS_LITERAIS else None
+            for op in seq.get('elementos', []) if op.get('subtipo') != 'operador_token']
+    return (tipo, list(tipos_ops), vals)
+
+
+def _avaliar_seq_registrando(seq: Dict[str, Any], nos: List[Dict[str, Any]], linha_atual: int, tabela: TabelaSimbolos, subexpressoes: TabelaSubexpressoes) -> Tuple:
+    """
+    Avalia 'seq' registrando os nós anotados e o nó que lançou o erro.
+
+    Returns:
+        Resultado no formato do cache de avaliar_seq_tipo
+
+    Raises:
+        ErroSemantico: Erro cujo contexto não é refeito a partir do nó de
+            origem (ex: estrutura não reconhecida); não é memorizado
+    """
+    posicoes: Dict[int, int] = {}
+    for posicao, no in enumerate(nos):
+        posicoes.setdefault(id(no), posicao)
+    anotados: List[Dict[str, Any]] = []
+    origem: List[Dict[str, Any]] = []
+
+    def passos(s):
+        try:
+            return (yield from _passos_seq_tipo(s, linha_atual, tabela, subexpressoes, anotados))
+        except ErroSemantico:
+            if not origem:
+                origem.append(s)
+            raise
+
+    try:
+        tipo, tipos_ops, _ = percorrer(seq, passos)
+        erro = None
+    except ErroSemantico as e:
+        if e.contexto != _construir_contexto_expressao(origem[0]):
+            raise
+        tipo, tipos_ops, erro = None, (), (posicoes[id(origem[0])], e.mensagem)
+    anotacoes = tuple((posicoes[id(no)], no['tipo']) for no in anotados)
+    return (tipo, tuple(tipos_ops), anotacoes, erro)
+
+
+def _passos_seq_tipo(seq: Dict[str, Any], linha_atual: int, tabela: TabelaSimbolos, subexpressoes: Optional[TabelaSubexpressoes] = None, anotados: Optional[List[Dict[str, Any]]] = None):
+    """
+    Gerador de avaliar_seq_tipo para percorrer: pede o tipo de cada subexpressão.
+
+    Os nós que recebem 'tipo' são acrescentados a 'anotados', se informado.
+    """
     operador = seq.get('operador')
     elementos = seq.get('elementos', [])
 
@@ -213,18 +313,25 @@ def avaliar_seq_tipo(seq: Dict[str, Any], linha_atual: int, tabela: TabelaSimbol
 
     def eval_oper(op):
         if op.get('subtipo') in ['numero_real', 'numero_inteiro', 'numero_real_res', 'numero_inteiro_res']:
-            v = _parse_valor_literal(op)
-            return (tipos.TYPE_INT if isinstance(v, int) else tipos.TYPE_REAL, v)
+            return valor_literal(op)
         if op.get('subtipo') == 'variavel':
             nome = op.get('valor')
             if tabela.existe(nome):
                 return (tabela.obter_tipo(nome), None)
             return (None, None)
         if op.get('subtipo') == 'LINHA':
-            # Avaliar subexpressão LINHA recursivamente
+            # Avaliar subexpressão LINHA (pedida ao percorrer)
             ast_sub = op.get('ast')
             if ast_sub:
-                t, _, _ = avaliar_seq_tipo(ast_sub, linha_atual, tabela)
+                if subexpressoes is not None:
+                    t = subexpressoes.obter_tipo_versionado(op, 'seq', tabela)
+                    if t is not AUSENTE:
+                        if anotados is not None:
+                            _registrar_anotacoes(ast_sub, anotados)
+                        return (t, None)
+                t, _, _ = yield ast_sub
+                if subexpressoes is not None:
+                    subexpressoes.memorizar_tipo_versionado(op, 'seq', tabela, t)
                 return (t, None)
             return (None, None)
         raise ErroSemantico(linha_atual, f"Operando desconhecido: {op}")
@@ -234,7 +341,7 @@ def avaliar_seq_tipo(seq: Dict[str, Any], linha_atual: int, tabela: TabelaSimbol
     for op in elementos:
         if isinstance(op, dict) and op.get('subtipo') == 'operador_token':
             continue
-        t, v = eval_oper(op)
+        t, v = yield from eval_oper(op)
         tipos_ops.append(t)
         vals.append(v)
 
@@ -257,7 +364,7 @@ def avaliar_seq_tipo(seq: Dict[str, Any], linha_atual: int, tabela: TabelaSimbol
                 return (None, tipos_ops, vals)
             try:
                 tipo_resultado = tipos.tipo_resultado_aritmetica(left, right, operador)
-                seq['tipo'] = tipo_resultado
+                _anotar_tipo(seq, tipo_resultado, anotados)
                 return (tipo_resultado, tipos_ops, vals)
             except ValueError as ve:
                 raise ErroSemantico(linha_atual, str(ve), _construir_contexto_expressao(seq))
@@ -268,7 +375,7 @@ def avaliar_seq_tipo(seq: Dict[str, Any], linha_atual: int, tabela: TabelaSimbol
                 return (None, tipos_ops, vals)
             try:
                 tipo_resultado = tipos.tipo_resultado_comparacao(left, right)
-                seq['tipo'] = tipo_resultado
+                _anotar_tipo(seq, tipo_resultado, anotados)
                 return (tipo_resultado, tipos_ops, vals)
             except ValueError as ve:
                 raise ErroSemantico(linha_atual, str(ve), _construir_contexto_expressao(seq))
@@ -280,7 +387,7 @@ def avaliar_seq_tipo(seq: Dict[str, Any], linha_atual: int, tabela: TabelaSimbol
                     return (None, tipos_ops, vals)
                 try:
                     tipo_resultado = tipos.tipo_resultado_logico(a, b)
-                    seq['tipo'] = tipo_resultado
+                    _anotar_tipo(seq, tipo_resultado, anotados)
                     return (tipo_resultado, tipos_ops, vals)
                 except ValueError as ve:
                     raise ErroSemantico(linha_atual, str(ve), _construir_contexto_expressao(seq))
@@ -290,7 +397,7 @@ def avaliar_seq_tipo(seq: Dict[str, Any], linha_atual: int, tabela: TabelaSimbol
                     return (None, tipos_ops, vals)
                 try:
                     tipo_resultado = tipos.tipo_resultado_logico_unario(a)
-                    seq['tipo'] = tipo_resultado
+                    _anotar_tipo(seq, tipo_resultado, anotados)
                     return (tipo_resultado, tipos_ops, vals)
                 except ValueError as ve:
                     raise ErroSemantico(linha_atual, str(ve), _construir_contexto_expressao(seq))
@@ -301,6 +408,26 @@ def avaliar_seq_tipo(seq: Dict[str, Any], linha_atual: int, tabela: TabelaSimbol
     raise ErroSemantico(linha_atual, 'Estrutura da linha não reconhecida ou suporte incompleto', str(seq))
 
 
+def _anotar_tipo(seq: Dict[str, Any], tipo: Optional[str], anotados: Optional[List[Dict[str, Any]]]) -> None:
+    seq['tipo'] = tipo
+    if anotados is not None:
+        anotados.append(seq)
+
+
+def _registrar_anotacoes(raiz: Dict[str, Any], anotados: List[Dict[str, Any]]) -> None:
+    """
+    Acrescenta a 'anotados' os nós já tipados de uma subexpressão cujo tipo
+    veio do cache (sem avaliação, _anotar_tipo não os registraria).
+    """
+    pilha = [raiz]
+    while pilha:
+        no = pilha.pop()
+        if no.get('tipo') is not None:
+            anotados.append(no)
+        pilha.extend(elemento['ast'] for elemento in no.get('elementos', [])
+                     if isinstance(elemento, dict) and elemento.get('subtipo') == 'LINHA' and elemento.get('ast'))
+
+
 def _is_implicit_block(seq: Dict[str, Any]) -> bool:
     """Verifica se uma sequência representa um bloco implícito (múltiplas expressões sem operador)."""
     elementos = seq.get('elementos', [])
@@ -312,7 +439,7 @@ def _is_implicit_block(seq: Dict[str, Any]) -> bool:
     return False
 
 
-def _process_implicit_block(seq: Dict[str, Any], linha_atual: int, tabela: TabelaSimbolos, historico_tipos: Dict[int, str]) -> Optional[str]:
+def _process_implicit_block(seq: Dict[str, Any], linha_atual: int, tabela: TabelaSimbolos, historico_tipos: Dict[int, str], subexpressoes: Optional[TabelaSubexpressoes] = None) -> Optional[str]:
     """Processa um bloco implícito (sequência de expressões)."""
     elementos = seq.get('elementos', [])
     tipo_final = None
@@ -323,7 +450,7 @@ def _process_implicit_block(seq: Dict[str, Any], linha_atual: int, tabela: Tabel
             sub_seq = elemento.get('ast', {})
             if sub_seq:
                 try:
-                    tipo_sub, _, _ = avaliar_seq_tipo(sub_seq, linha_atual, tabela)
+                    tipo_sub, _, _ = avaliar_seq_tipo(sub_seq, linha_atual, tabela, subexpressoes)
                     tipo_final = tipo_sub  # O tipo do bloco é o da última expressão
                 except ErroSemantico:
                     # Se uma subexpressão falhar, continuar processando
@@ -332,7 +459,196 @@ def _process_implicit_block(seq: Dict[str, Any], linha_atual: int, tabela: Tabel
     return tipo_final
 
 
-def analisarSemantica(arvoreSintatica: Dict[str, Any], gramatica: Optional[Dict] = None, tabela: Optional[TabelaSimbolos] = None) -> Dict[str, Any]:
+def _analisar_linha_tipos(linha_ast: Dict[str, Any], tabela: TabelaSimbolos, historico_tipos: Dict[int, Optional[str]], subexpressoes: Optional[TabelaSubexpressoes] = None) -> Optional[Dict[str, Any]]:
+    """
+    Análise de tipos de uma única linha (passo de analisarSemantica).
+
+    Um armazenamento cuja fonte não pode ser avaliada fica com tipo None,
+    nunca com o tipo de uma linha anterior.
+
+    Returns:
+        Cópia da linha anotada com 'tipo', ou None se a linha não tem filhos
+
+    Raises:
+        ErroSemantico: Se a linha tiver erro de tipos
+    """
+    num = linha_ast.get('numero_linha', None)
+    # Usar a estrutura convertida: cada linha tem 'filhos' com 'elementos' e 'operador'
+    filhos = linha_ast.get('filhos', [])
+    if not filhos:
+        return None
+
+    seq = filhos[0]  # Primeiro filho contém elementos e operador
+    elementos = seq.get('elementos', [])
+    operador = seq.get('operador', None)
+
+    # Verificar se é um bloco implícito (múltiplas expressões no corpo de controle)
+    if _is_implicit_block(seq):
+        tipo_res = _process_implicit_block(seq, num, tabela, historico_tipos, subexpressoes)
+        historico_tipos[num] = tipo_res
+        nova_linha = dict(linha_ast)
+        nova_linha['tipo'] = tipo_res
+        return nova_linha
+
+    # Verificar operações de controle ANTES de avaliar operandos
+    if operador in ['RES', 'IFELSE', 'WHILE', 'FOR']:
+        historico_tipos[num] = None  # Tipo será determinado pelo analisador_memoria_controle
+        nova_linha = dict(linha_ast)
+        nova_linha['tipo'] = None
+        return nova_linha
+
+    # Verificar se é armazenamento (valor variável) ANTES de avaliar operandos
+    if (operador is None or operador == "") and len(elementos) == 2:
+        if elementos[1].get('subtipo') == 'variavel':
+            nome_var = elementos[1].get('valor')
+            tipo_res = None
+            # Avaliar apenas o primeiro operando (o valor)
+            try:
+                fonte = _avaliar_operando(elementos[0], tabela, historico_tipos, num, subexpressoes)
+                tipo_res = fonte['tipo']
+                if tipo_res is not None:
+                    if not tipos.tipo_compativel_armazenamento(tipo_res):
+                        raise ErroSemantico(num, f"Tipo '{tipo_res}' não pode ser armazenado em memória. Apenas tipos numéricos são permitidos", _construir_contexto_expressao(linha_ast))
+                    tabela.adicionarSimbolo(nome_var, tipo_res, inicializada=True, linha=num)
+            except ErroSemantico:
+                # Se o valor não puder ser avaliado ou armazenado, não declarar a variável
+                pass
+            historico_tipos[num] = tipo_res
+            nova_linha = dict(linha_ast)
+            nova_linha['tipo'] = tipo_res
+            return nova_linha
+
+    # (X RES): offset resolvido pela propagação de constantes e validado
+    # pelo analisador de memória
+    if (operador is None or operador == "") and len(elementos) == 1 and elementos[0].get('subtipo') == 'variavel_res':
+        historico_tipos[num] = None
+        nova_linha = dict(linha_ast)
+        nova_linha['tipo'] = None
+        return nova_linha
+
+    # Para outras operações, avaliar todos os operandos
+    operandos_av = []
+    for op in elementos:
+        aval = _avaliar_operando(op, tabela, historico_tipos, num, subexpressoes)
+        operandos_av.append(aval)
+
+    if operador is not None and operador != "":
+        regra = obter_regra(operador)
+        if regra is None:
+            raise ErroSemantico(num, f"Operador desconhecido: {operador}", _construir_contexto_expressao(linha_ast))
+        cat = regra.get('categoria')
+
+        if cat == 'aritmetico':
+            if len(operandos_av) == 1 and operador == '-':
+                a = operandos_av[0]
+                tipo_res = a['tipo']
+                # Propagate type to operation node
+                seq['tipo'] = tipo_res
+                historico_tipos[num] = tipo_res
+                nova_linha = dict(linha_ast)
+                nova_linha['tipo'] = tipo_res
+                return nova_linha
+            if len(operandos_av) < 2:
+                raise ErroSemantico(num, 'Operador aritmético com aridade inválida', _construir_contexto_expressao(linha_ast))
+            left, right = operandos_av[0], operandos_av[1]
+            if left['tipo'] is None or right['tipo'] is None:
+                tipo_res = None
+            else:
+                try:
+                    tipo_res = tipos.tipo_resultado_aritmetica(left['tipo'], right['tipo'], operador)
+                except ValueError as ve:
+                    raise ErroSemantico(num, str(ve), _construir_contexto_expressao(linha_ast))
+
+            # Propagate type to operation node
+            seq['tipo'] = tipo_res
+            historico_tipos[num] = tipo_res
+            nova_linha = dict(linha_ast)
+            nova_linha['tipo'] = tipo_res
+            return nova_linha
+
+        if cat == 'comparacao':
+            left, right = operandos_av[0], operandos_av[1]
+            if left['tipo'] is None or right['tipo'] is None:
+                tipo_res = None
+            else:
+                try:
+                    tipo_res = tipos.tipo_resultado_comparacao(left['tipo'], right['tipo'])
+                except ValueError as ve:
+                    raise ErroSemantico(num, str(ve), _construir_contexto_expressao(linha_ast))
+            # Propagate type to operation node
+            seq['tipo'] = tipo_res
+            historico_tipos[num] = tipo_res
+            nova_linha = dict(linha_ast)
+            nova_linha['tipo'] = tipo_res
+            return nova_linha
+
+        if cat == 'logico':
+            if operador in ['&&', '||']:
+                if len(operandos_av) < 2:
+                    raise ErroSemantico(num, f'Operador lógico binário "{operador}" requer 2 operandos', _construir_contexto_expressao(linha_ast))
+                a, b = operandos_av[0], operandos_av[1]
+                if a['tipo'] is None or b['tipo'] is None:
+                    tipo_res = None
+                else:
+                    try:
+                        tipo_res = tipos.tipo_resultado_logico(a['tipo'], b['tipo'])
+                    except ValueError as ve:
+                        raise ErroSemantico(num, str(ve), _construir_contexto_expressao(linha_ast))
+                # Propagate type to operation node
+                seq['tipo'] = tipo_res
+                historico_tipos[num] = tipo_res
+                nova_linha = dict(linha_ast)
+                nova_linha['tipo'] = tipo_res
+                return nova_linha
+            if operador == '!':
+                if len(operandos_av) < 1:
+                    raise ErroSemantico(num, 'Operador lógico unário "!" requer 1 operando', _construir_contexto_expressao(linha_ast))
+                a = operandos_av[0]
+                if a['tipo'] is None:
+                    tipo_res = None
+                else:
+                    try:
+                        tipo_res = tipos.tipo_resultado_logico_unario(a['tipo'])
+                    except ValueError as ve:
+                        raise ErroSemantico(num, str(ve), _construir_contexto_expressao(linha_ast))
+                # Propagate type to operation node
+                seq['tipo'] = tipo_res
+                historico_tipos[num] = tipo_res
+                nova_linha = dict(linha_ast)
+                nova_linha['tipo'] = tipo_res
+                return nova_linha
+
+        # Operações não reconhecidas pelo analisador de tipos
+        historico_tipos[num] = None
+        nova_linha = dict(linha_ast)
+        nova_linha['tipo'] = None
+        return nova_linha
+
+    if (operador is None or operador == "") and len(elementos) == 1:
+        op = elementos[0]
+        try:
+            aval = _avaliar_operando(op, tabela, historico_tipos, num, subexpressoes)
+            tipo_v = aval.get('tipo')
+            # Verificar se é RES (resultado)
+            if op.get('subtipo', '').endswith('_res'):
+                # Operação RES - não produz tipo, apenas indica armazenamento de resultado
+                tipo_v = None
+            # Verificar se é variável não inicializada
+            elif aval.get('variavel') and tipo_v is None:
+                raise ErroSemantico(num, f"Variável '{aval['variavel']}' utilizada sem inicialização", f"({aval['variavel']})")
+        except ErroSemantico:
+            tipo_v = None
+            raise  # Re-lançar o erro
+        historico_tipos[num] = tipo_v
+        nova_linha = dict(linha_ast)
+        nova_linha['tipo'] = tipo_v
+        return nova_linha
+
+    raise ErroSemantico(num, 'Estrutura da linha não reconhecida ou suporte incompleto', _construir_contexto_expressao(linha_ast))
+
+
+
+def analisarSemantica(arvoreSintatica: Dict[str, Any], gramatica: Optional[Dict] = None, tabela: Optional[TabelaSimbolos] = None, subexpressoes: Optional[TabelaSubexpressoes] = None) -> Dict[str, Any]:
     if gramatica is None:
         gramatica = definirGramaticaAtributos()
     if tabela is None:
@@ -346,183 +662,201 @@ def analisarSemantica(arvoreSintatica: Dict[str, Any], gramatica: Optional[Dict]
     for linha_ast in linhas:
         num = linha_ast.get('numero_linha', None)
         try:
-            # Usar a estrutura convertida: cada linha tem 'filhos' com 'elementos' e 'operador'
-            filhos = linha_ast.get('filhos', [])
-            if not filhos:
-                continue
-                
-            seq = filhos[0]  # Primeiro filho contém elementos e operador
-            elementos = seq.get('elementos', [])
-            operador = seq.get('operador', None)
-
-            # Verificar se é um bloco implícito (múltiplas expressões no corpo de controle)
-            if _is_implicit_block(seq):
-                tipo_res = _process_implicit_block(seq, num, tabela, historico_tipos)
-                historico_tipos[num] = tipo_res
-                nova_linha = dict(linha_ast)
-                nova_linha['tipo'] = tipo_res
+            nova_linha = _analisar_linha_tipos(linha_ast, tabela, historico_tipos, subexpressoes)
+            if nova_linha is not None:
                 arvore_anotada['linhas'].append(nova_linha)
-                continue
+        except ErroSemantico as e:
+            erros.append({'linha': num, 'erro': str(e), 'contexto': f"Linha {num}"})
+            arvore_anotada['linhas'].append(dict(linha_ast))
+        except Exception as e:
+            erros.append({'linha': num, 'erro': _erro_interno(num, e), 'contexto': f"Linha {num}"})
+            arvore_anotada['linhas'].append(dict(linha_ast))
 
-            # Verificar operações de controle ANTES de avaliar operandos
-            if operador in ['RES', 'IFELSE', 'WHILE', 'FOR']:
-                historico_tipos[num] = None  # Tipo será determinado pelo analisador_memoria_controle
-                nova_linha = dict(linha_ast)
-                nova_linha['tipo'] = None
-                arvore_anotada['linhas'].append(nova_linha)
-                continue
+    sucesso = len(erros) == 0
+    return {'sucesso': sucesso, 'erros': erros, 'arvore_anotada': arvore_anotada, 'tabela_simbolos': tabela}
 
-            # Verificar se é armazenamento (valor variável) ANTES de avaliar operandos
-            if (operador is None or operador == "") and len(elementos) == 2:
-                if elementos[1].get('subtipo') == 'variavel':
-                    nome_var = elementos[1].get('valor')
-                    # Avaliar apenas o primeiro operando (o valor)
-                    try:
-                        fonte = _avaliar_operando(elementos[0], tabela, historico_tipos, num)
-                        tipo_res = fonte['tipo']
-                        if tipo_res is not None:
-                            if not tipos.tipo_compativel_armazenamento(tipo_res):
-                                raise ErroSemantico(num, f"Tipo '{tipo_res}' não pode ser armazenado em memória. Apenas tipos numéricos são permitidos", _construir_contexto_expressao(linha_ast))
-                            tabela.adicionarSimbolo(nome_var, tipo_res, inicializada=True, linha=num)
-                    except ErroSemantico:
-                        # Se o valor não puder ser avaliado ou armazenado, não declarar a variável
-                        pass
-                    historico_tipos[num] = tipo_res
-                    nova_linha = dict(linha_ast)
-                    nova_linha['tipo'] = tipo_res
-                    arvore_anotada['linhas'].append(nova_linha)
-                    continue
-
-            # Para outras operações, avaliar todos os operandos
-            operandos_av = []
-            for op in elementos:
-                aval = _avaliar_operando(op, tabela, historico_tipos, num)
-                operandos_av.append(aval)
-
-            if operador is not None and operador != "":
-                regra = obter_regra(operador)
-                if regra is None:
-                    raise ErroSemantico(num, f"Operador desconhecido: {operador}", _construir_contexto_expressao(linha_ast))
-                cat = regra.get('categoria')
-
-                if cat == 'aritmetico':
-                    if len(operandos_av) == 1 and operador == '-':
-                        a = operandos_av[0]
-                        tipo_res = a['tipo']
-                        # Propagate type to operation node
-                        seq['tipo'] = tipo_res
-                        historico_tipos[num] = tipo_res
-                        nova_linha = dict(linha_ast)
-                        nova_linha['tipo'] = tipo_res
-                        arvore_anotada['linhas'].append(nova_linha)
-                        continue
-                    if len(operandos_av) < 2:
-                        raise ErroSemantico(num, 'Operador aritmético com aridade inválida', _construir_contexto_expressao(linha_ast))
-                    left, right = operandos_av[0], operandos_av[1]
-                    if left['tipo'] is None or right['tipo'] is None:
-                        tipo_res = None
-                    else:
-                        try:
-                            tipo_res = tipos.tipo_resultado_aritmetica(left['tipo'], right['tipo'], operador)
-                        except ValueError as ve:
-                            raise ErroSemantico(num, str(ve), _construir_contexto_expressao(linha_ast))
-
-                    # Propagate type to operation node
-                    seq['tipo'] = tipo_res
-                    historico_tipos[num] = tipo_res
-                    nova_linha = dict(linha_ast)
-                    nova_linha['tipo'] = tipo_res
-                    arvore_anotada['linhas'].append(nova_linha)
-                    continue
-
-                if cat == 'comparacao':
-                    left, right = operandos_av[0], operandos_av[1]
-                    if left['tipo'] is None or right['tipo'] is None:
-                        tipo_res = None
-                    else:
-                        try:
-                            tipo_res = tipos.tipo_resultado_comparacao(left['tipo'], right['tipo'])
-                        except ValueError as ve:
-                            raise ErroSemantico(num, str(ve), _construir_contexto_expressao(linha_ast))
-                    # Propagate type to operation node
-                    seq['tipo'] = tipo_res
-                    historico_tipos[num] = tipo_res
-                    nova_linha = dict(linha_ast)
-                    nova_linha['tipo'] = tipo_res
-                    arvore_anotada['linhas'].append(nova_linha)
-                    continue
-
-                if cat == 'logico':
-                    if operador in ['&&', '||']:
-                        if len(operandos_av) < 2:
-                            raise ErroSemantico(num, f'Operador lógico binário "{operador}" requer 2 operandos', _construir_contexto_expressao(linha_ast))
-                        a, b = operandos_av[0], operandos_av[1]
-                        if a['tipo'] is None or b['tipo'] is None:
-                            tipo_res = None
-                        else:
-                            try:
-                                tipo_res = tipos.tipo_resultado_logico(a['tipo'], b['tipo'])
-                            except ValueError as ve:
-                                raise ErroSemantico(num, str(ve), _construir_contexto_expressao(linha_ast))
-                        # Propagate type to operation node
-                        seq['tipo'] = tipo_res
-                        historico_tipos[num] = tipo_res
-                        nova_linha = dict(linha_ast)
-                        nova_linha['tipo'] = tipo_res
-                        arvore_anotada['linhas'].append(nova_linha)
-                        continue
-                    if operador == '!':
-                        if len(operandos_av) < 1:
-                            raise ErroSemantico(num, 'Operador lógico unário "!" requer 1 operando', _construir_contexto_expressao(linha_ast))
-                        a = operandos_av[0]
-                        if a['tipo'] is None:
-                            tipo_res = None
-                        else:
-                            try:
-                                tipo_res = tipos.tipo_resultado_logico_unario(a['tipo'])
-                            except ValueError as ve:
-                                raise ErroSemantico(num, str(ve), _construir_contexto_expressao(linha_ast))
-                        # Propagate type to operation node
-                        seq['tipo'] = tipo_res
-                        historico_tipos[num] = tipo_res
-                        nova_linha = dict(linha_ast)
-                        nova_linha['tipo'] = tipo_res
-                        arvore_anotada['linhas'].append(nova_linha)
-                        continue
-
-                # Operações não reconhecidas pelo analisador de tipos
-                historico_tipos[num] = None
-                nova_linha = dict(linha_ast)
-                nova_linha['tipo'] = None
-                arvore_anotada['linhas'].append(nova_linha)
-                continue
 
-            if (operador is None or operador == "") and len(elementos) == 1:
-                op = elementos[0]
-                try:
-                    aval = _avaliar_operando(op, tabela, historico_tipos, num)
-                    tipo_v = aval.get('tipo')
-                    # Verificar se é RES (resultado)
-                    if op.get('subtipo', '').endswith('_res'):
-                        # Operação RES - não produz tipo, apenas indica armazenamento de resultado
-                        tipo_v = None
-                    # Verificar se é variável não inicializada
-                    elif aval.get('variavel') and tipo_v is None:
-                        raise ErroSemantico(num, f"Variável '{aval['variavel']}' utilizada sem inicialização", f"({aval['variavel']})")
-                except ErroSemantico:
-                    tipo_v = None
-                    raise  # Re-lançar o erro
-                historico_tipos[num] = tipo_v
-                nova_linha = dict(linha_ast)
-                nova_linha['tipo'] = tipo_v
-                arvore_anotada['linhas'].append(nova_linha)
-                continue
+# ============================================================================
+# ANÁLISE DE TIPOS PARALELA (grupos de linhas independentes)
+# ============================================================================
 
-            raise ErroSemantico(num, 'Estrutura da linha não reconhecida ou suporte incompleto', _construir_contexto_expressao(linha_ast))
+def _anotacoes_linha(seq: Dict[str, Any]) -> List[Tuple[Tuple[int, ...], Optional[str]]]:
+    """
+    'tipo' gravado na sequência da linha e nas ASTs das subexpressões, com o
+    caminho de cada nó (índices dos elementos LINHA a partir da sequência).
+    """
+    anotacoes = []
+    pendentes: List[Tuple[Tuple[int, ...], Dict[str, Any]]] = [((), seq)]
+    while pendentes:
+        caminho, no = pendentes.pop()
+        if 'tipo' in no:
+            anotacoes.append((caminho, no['tipo']))
+        for i, elemento in enumerate(no.get('elementos') or []):
+            if isinstance(elemento, dict) and elemento.get('subtipo') == 'LINHA' and elemento.get('ast'):
+                pendentes.append((caminho + (i,), elemento['ast']))
+    return anotacoes
+
+
+def _aplicar_anotacoes(seq: Dict[str, Any], anotacoes: List[Tuple[Tuple[int, ...], Optional[str]]]) -> None:
+    """Repete em 'seq' as anotações de _anotacoes_linha (vindas de outro processo)."""
+    for caminho, tipo in anotacoes:
+        no = seq
+        for i in caminho:
+            no = no['elementos'][i]['ast']
+        no['tipo'] = tipo
+
+
+def _analisar_grupo_tipos(grupo: List[int], linhas: List[Dict[str, Any]],
+                          subexpressoes: Optional[TabelaSubexpressoes] = None) -> Dict[str, Any]:
+    """
+    Análise de tipos das linhas de um grupo, na ordem do programa, com
+    tabela de símbolos própria.
+
+    Returns:
+        {'linhas': [(posição, resultado, ...)], 'simbolos': [...]} onde o
+        resultado é 'ok' (tipo e anotações da linha, ver _anotacoes_linha),
+        'erro' (mensagem, também para falhas inesperadas) ou 'vazia'.
+        As anotações voltam com o resultado porque as gravadas nos nós por
+        outro processo não chegam à árvore do processo principal.
+    """
+    tabela = inicializarTabelaSimbolos()
+    historico_tipos: Dict[int, Optional[str]] = {}
+    resultados = []
+    criacao: List[int] = []
 
+    for posicao in grupo:
+        linha_ast = linhas[posicao]
+        try:
+            nova_linha = _analisar_linha_tipos(linha_ast, tabela, historico_tipos, subexpressoes)
         except ErroSemantico as e:
-            erros.append({'linha': num, 'erro': str(e), 'contexto': f"Linha {num}"})
+            resultados.append((posicao, 'erro', str(e)))
+        except Exception as e:
+            resultados.append((posicao, 'erro', _erro_interno(linha_ast.get('numero_linha'), e)))
+        else:
+            if nova_linha is None:
+                resultados.append((posicao, 'vazia'))
+            else:
+                resultados.append((posicao, 'ok', nova_linha['tipo'], _anotacoes_linha(linha_ast['filhos'][0])))
+        criacao.extend([posicao] * (len(tabela) - len(criacao)))
+
+    # A análise de tipos não registra usos; basta o estado final de cada símbolo
+    simbolos = [
+        (criacao[simbolo.id], simbolo.id, simbolo.nome, simbolo.tipo, simbolo.inicializada, simbolo.linha_declaracao)
+        for simbolo in (tabela.simbolo_por_id(i) for i in range(len(tabela)))
+    ]
+    return {'linhas': resultados, 'simbolos': simbolos}
+
+
+# Linhas e subexpressões do programa em análise, dentro de um processo de
+# analisarSemanticaParalela (definidas por _herdar_programa; nunca no
+# processo principal)
+_HERANCA_PROCESSOS: Tuple[List[Dict[str, Any]], Optional[TabelaSubexpressoes]] = ([], None)
+
+
+def _herdar_programa(linhas: List[Dict[str, Any]], subexpressoes: Optional[TabelaSubexpressoes]) -> None:
+    """Inicializador dos processos: guarda o programa para as tarefas."""
+    global _HERANCA_PROCESSOS
+    _HERANCA_PROCESSOS = (linhas, subexpressoes)
+
+
+def _analisar_lote_tipos(lote: List[List[int]], linhas: Optional[List[Dict[str, Any]]] = None,
+                         subexpressoes: Optional[TabelaSubexpressoes] = None) -> List[Dict[str, Any]]:
+    """Tarefa de um processo: vários grupos (posições), cada um isolado dos demais."""
+    if linhas is None:
+        linhas, subexpressoes = _HERANCA_PROCESSOS
+    return [_analisar_grupo_tipos(grupo, linhas, subexpressoes) for grupo in lote]
+
+
+def _distribuir_grupos(grupos: List[List[int]], n_lotes: int) -> List[List[List[int]]]:
+    """Distribui os grupos em lotes de tamanho parecido (maiores primeiro)."""
+    lotes: List[List[List[int]]] = [[] for _ in range(n_lotes)]
+    cargas = [(0, i) for i in range(n_lotes)]
+    for grupo in sorted(grupos, key=lambda g: (-len(g), g[0])):
+        carga, i = heapq.heappop(cargas)
+        lotes[i].append(grupo)
+        heapq.heappush(cargas, (carga + len(grupo), i))
+    return [lote for lote in lotes if lote]
+
+
+def analisarSemanticaParalela(arvoreSintatica: Dict[str, Any], processos: Optional[int] = None,
+                              subexpressoes: Optional[TabelaSubexpressoes] = None) -> Dict[str, Any]:
+    """
+    Mesmo resultado de analisarSemantica, com os grupos de linhas
+    independentes (dependencias_linhas.particionar_linhas) analisados em
+    processos separados.
+
+    A junção percorre as linhas na ordem do programa: erros e linhas
+    anotadas saem na mesma ordem da análise sequencial, o 'tipo' gravado
+    pelos processos nos nós de cada linha é repetido na árvore e os símbolos
+    entram na tabela na ordem em que seriam criados.
+
+    Args:
+        arvoreSintatica: Árvore convertida ({'linhas': [...]})
+        processos: Número de processos (padrão: os.cpu_count()); com 1 os
+            grupos são analisados no próprio processo
+        subexpressoes: Tabela de subexpressões da conversão (só chega aos
+            processos criados com fork)
+    """
+    linhas = arvoreSintatica.get('linhas', [])
+    if processos is None:
+        processos = os.cpu_count() or 1
+    grupos = particionar_linhas(linhas, subexpressoes)
+    lotes = _distribuir_grupos(grupos, max(1, processos) * 4)
+
+    resultados_lotes = None
+    if processos > 1 and len(lotes) > 1:
+        # Os processos recebem o programa pelo inicializador e as tarefas
+        # levam só posições. Com fork os argumentos do inicializador são
+        # herdados sem serialização, e só assim as subexpressões (que
+        # dependem da identidade dos elementos) chegam aos processos
+        fork = 'fork' in multiprocessing.get_all_start_methods()
+        contexto = multiprocessing.get_context('fork') if fork else None
+        heranca = (linhas, subexpressoes if fork else None)
+        if fork:
+            # Um fork com a thread de relatórios no meio de um relatório pode
+            # deixar travas do processo filho presas
+            aguardar_relatorios(coletar=False)
+        try:
+            with ProcessPoolExecutor(max_workers=processos, mp_context=contexto,
+                                     initializer=_herdar_programa, initargs=heranca) as executor:
+                resultados_lotes = list(executor.map(_analisar_lote_tipos, lotes))
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            # Ambiente sem suporte a processos: analisar aqui mesmo
+            resultados_lotes = None
+    if resultados_lotes is None:
+        resultados_lotes = [_analisar_lote_tipos(lote, linhas, subexpressoes) for lote in lotes]
+
+    por_posicao: Dict[int, Tuple] = {}
+    simbolos = []
+    for resultado_lote in resultados_lotes:
+        for resultado_grupo in resultado_lote:
+            for resultado in resultado_grupo['linhas']:
+                por_posicao[resultado[0]] = resultado
+            simbolos.extend(resultado_grupo['simbolos'])
+
+    tabela = inicializarTabelaSimbolos()
+    erros: List[Dict[str, Any]] = []
+    arvore_anotada = {'linhas': []}
+
+    for posicao, linha_ast in enumerate(linhas):
+        num = linha_ast.get('numero_linha', None)
+        resultado = por_posicao[posicao]
+        situacao = resultado[1]
+        if situacao == 'erro':
+            erros.append({'linha': num, 'erro': resultado[2], 'contexto': f"Linha {num}"})
             arvore_anotada['linhas'].append(dict(linha_ast))
+            continue
+        if situacao == 'vazia':
+            continue
+
+        _, _, tipo, anotacoes = resultado
+        _aplicar_anotacoes(linha_ast['filhos'][0], anotacoes)
+        nova_linha = dict(linha_ast)
+        nova_linha['tipo'] = tipo
+        arvore_anotada['linhas'].append(nova_linha)
+
+    for _, _, nome, tipo, inicializada, linha_declaracao in sorted(simbolos, key=lambda s: (s[0], s[1])):
+        tabela.adicionarSimbolo(nome, tipo, inicializada=inicializada, linha=linha_declaracao)
 
     sucesso = len(erros) == 0
     return {'sucesso': sucesso, 'erros': erros, 'arvore_anotada': arvore_anotada, 'tabela_simbolos': tabela}
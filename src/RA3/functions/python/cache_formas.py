@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+# Integrantes do grupo (ordem alfabética):
+# Breno Rossi Duarte - breno-rossi
+# Francisco Bley Ruthes - fbleyruthes
+# Rafael Olivare Piveta - RafaPiveta
+# Stefan Benjamim Seixas Lourenco Rodrigues - waifuisalie
+#
+# Nome do grupo no Canvas: RA3_1
+
+"""
+Memo de avaliação de tipos por forma de expressão (cache LRU)
+
+Programas gerados repetem muitas expressões com a mesma estrutura sobre
+variáveis dos mesmos tipos (ex: acumuladores (X 1 +), (Y 1 +), ...). O
+resultado da avaliação de tipos dessas expressões depende apenas de:
+
+    - a forma normalizada: operadores, aninhamento e o tipo de cada literal,
+      sem nomes de variáveis nem valores;
+    - o tipo que cada variável referenciada tem na tabela de símbolos.
+
+A chave do cache junta as duas coisas (o tipo de cada variável entra no
+lugar dela na forma). Para cada chave o analisador de tipos guarda o tipo
+inferido, as anotações feitas nos nós e o erro, se houve, e as avaliações
+seguintes com a mesma chave não repetem avaliar_seq_tipo nem as regras da
+gramática de atributos.
+
+Ao contrário da TabelaSubexpressoes, o cache vale para expressões abertas e
+não depende da versão da tabela. Ele tem capacidade limitada e descarta a
+entrada usada há mais tempo.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from src.RA1.functions.python.percurso import percorrer
+from src.RA2.functions.python.construirAST import valor_literal
+
+CAPACIDADE_PADRAO = 4096
+
+
+class _SemForma(Exception):
+    """Elemento cuja avaliação não depende só da forma (não é memorizado)."""
+
+
+def _tipo_variavel(tabela: Any, nome: str, exige_inicializacao: bool) -> Optional[str]:
+    """Tipo da variável visto pelo avaliador, com as mesmas consultas à tabela."""
+    if not tabela.existe(nome):
+        return None
+    if exige_inicializacao and not tabela.verificar_inicializacao(nome):
+        return None
+    return tabela.obter_tipo(nome)
+
+
+def forma_expressao(raiz: Any, tabela: Any, via_ast: bool) -> Optional[Tuple[Hashable, List[Dict[str, Any]]]]:
+    """
+    Chave de cache de uma expressão e os nós avaliados, em pré-ordem.
+
+    Args:
+        raiz: Seq ({'elementos', 'operador'}) ou elemento LINHA
+        tabela: Tabela de símbolos (ou visão) consultada pelo avaliador
+        via_ast: True para avaliar_seq_tipo (subexpressões pelo 'ast' e
+            variáveis pelo tipo declarado); False para _avaliar_operando
+            (subexpressões pelos próprios elementos e variáveis não
+            inicializadas sem tipo)
+
+    Returns:
+        (chave, nos), ou None se a expressão tem elementos que o cache não
+        representa (o avaliador roda normalmente).
+    """
+    # Import local: subexpressoes importa CacheFormas deste módulo
+    from src.RA3.functions.python.subexpressoes import SUBTIPOS_LITERAIS
+
+    if not isinstance(raiz, dict):
+        return None
+    nos: List[Dict[str, Any]] = []
+    tipos_variaveis: Dict[str, Optional[str]] = {}
+
+    def tipo_variavel(nome: str) -> Optional[str]:
+        if nome not in tipos_variaveis:
+            tipos_variaveis[nome] = _tipo_variavel(tabela, nome, not via_ast)
+        return tipos_variaveis[nome]
+
+    def passos(no: Dict[str, Any]):
+        """Gerador de forma_expressao para percorrer: pede a forma de cada subexpressão."""
+        nos.append(no)
+        filhos = []
+        for elemento in no.get('elementos', []):
+            if not isinstance(elemento, dict):
+                raise _SemForma()
+            subtipo = elemento.get('subtipo')
+            if subtipo in SUBTIPOS_LITERAIS:
+                filhos.append(('n', valor_literal(elemento)[0]))
+            elif subtipo == 'variavel':
+                filhos.append(('v', tipo_variavel(elemento.get('valor'))))
+            elif subtipo == 'LINHA':
+                sub = elemento.get('ast') if via_ast else elemento
+                filhos.append((yield sub) if sub else ('L',))
+            elif via_ast and subtipo != 'operador_token':
+                # Erro "Operando desconhecido" mostra o elemento inteiro
+                raise _SemForma()
+            else:
+                filhos.append(('?', subtipo, elemento.get('tipo') or None))
+        return ('S', no.get('operador') or None, tuple(filhos))
+
+    try:
+        chave = percorrer(raiz, passos)
+    except _SemForma:
+        return None
+    return chave, nos
+
+
+class CacheFormas:
+    """
+    Cache LRU de resultados de avaliação de tipos indexado por forma.
+
+    Os valores são tuplas definidas pelo analisador de tipos; o cache só
+    controla a ordem de uso e a capacidade.
+    """
+
+    def __init__(self, capacidade: int = CAPACIDADE_PADRAO):
+        self.capacidade = capacidade
+        self._entradas: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, chave: Hashable) -> Any:
+        """Resultado memorizado para 'chave' (marcado como o mais recente), ou None."""
+        resultado = self._entradas.get(chave)
+        if resultado is None:
+            self.falhas += 1
+            return None
+        self._entradas.move_to_end(chave)
+        self.acertos += 1
+        return resultado
+
+    def memorizar(self, chave: Hashable, resultado: Any) -> None:
+        self._entradas[chave] = resultado
+        self._entradas.move_to_end(chave)
+        while len(self._entradas) > self.capacidade:
+            self._entradas.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entradas)
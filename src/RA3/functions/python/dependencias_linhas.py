@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+# Integrantes do grupo (ordem alfabética):
+# Breno Rossi Duarte - breno-rossi
+# Francisco Bley Ruthes - fbleyruthes
+# Rafael Olivare Piveta - RafaPiveta
+# Stefan Benjamim Seixas Lourenco Rodrigues - waifuisalie
+#
+# Nome do grupo no Canvas: RA3_1
+
+"""
+Particionamento das linhas de um programa em grupos independentes
+
+Duas linhas dependem uma da outra quando:
+    - mencionam a mesma variável (definição ou uso, inclusive dentro de
+      subexpressões), pois a tabela de símbolos é lida e escrita na ordem
+      do programa;
+    - uma delas é uma referência (N RES) à outra (linha atual - N).
+
+As linhas são unidas por union-find; cada grupo resultante pode ser
+analisado isoladamente, na ordem do programa, sem enxergar os demais.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from src.RA2.functions.python.construirAST import valor_literal
+from src.RA3.functions.python.subexpressoes import SUBTIPOS_LITERAIS, TabelaSubexpressoes
+
+
+class _UniaoBusca:
+    """Union-find com compressão de caminho e união por tamanho."""
+
+    def __init__(self, n: int):
+        self._pai = list(range(n))
+        self._tamanho = [1] * n
+
+    def raiz(self, x: int) -> int:
+        pai = self._pai
+        raiz = x
+        while pai[raiz] != raiz:
+            raiz = pai[raiz]
+        while pai[x] != raiz:
+            pai[x], x = raiz, pai[x]
+        return raiz
+
+    def unir(self, a: int, b: int) -> None:
+        a, b = self.raiz(a), self.raiz(b)
+        if a == b:
+            return
+        if self._tamanho[a] < self._tamanho[b]:
+            a, b = b, a
+        self._pai[b] = a
+        self._tamanho[a] += self._tamanho[b]
+
+
+def _variaveis(elementos: List[Any], cache: Dict[int, Tuple[str, ...]],
+               subexpressoes: Optional[TabelaSubexpressoes]) -> List[str]:
+    """Nomes (uppercase) das variáveis dos elementos, inclusive em subexpressões."""
+    nomes: List[str] = []
+    for elemento in elementos:
+        if not isinstance(elemento, dict):
+            continue
+        subtipo = elemento.get('subtipo')
+        if subtipo == 'variavel':
+            nomes.append(str(elemento.get('valor', '')).upper())
+        elif subtipo == 'LINHA':
+            # Subexpressões fechadas não têm variáveis
+            if subexpressoes is not None and subexpressoes.eh_fechada(elemento):
+                continue
+            chave = id(elemento)
+            internos = cache.get(chave)
+            if internos is None:
+                internos = cache[chave] = tuple(_variaveis(elemento.get('elementos', []), cache, subexpressoes))
+            nomes.extend(internos)
+    return nomes
+
+
+def _offset_res(seq: Dict[str, Any]) -> Optional[int]:
+    """Offset literal N de uma linha (N RES), ou None."""
+    elementos = [e for e in seq.get('elementos', []) if isinstance(e, dict)]
+    if not elementos:
+        return None
+    if seq.get('operador') != 'RES' and not any(e.get('subtipo', '').endswith('_res') for e in elementos):
+        return None
+    if elementos[0].get('subtipo') not in SUBTIPOS_LITERAIS:
+        return None
+    _, numero = valor_literal(elementos[0])
+    return numero if isinstance(numero, int) and numero >= 0 else None
+
+
+def particionar_linhas(linhas: List[Dict[str, Any]], subexpressoes: Optional[TabelaSubexpressoes] = None) -> List[List[int]]:
+    """
+    Agrupa as linhas em componentes independentes.
+
+    Args:
+        linhas: Linhas convertidas ({'numero_linha', 'filhos': [seq]})
+        subexpressoes: Tabela de subexpressões da conversão; as fechadas são
+            puladas sem percorrê-las
+
+    Returns:
+        Grupos de posições em 'linhas', cada um em ordem crescente; os grupos
+        são ordenados pela primeira posição.
+
+    Examples:
+        >>> def linha(num, *elementos):
+        ...     return {'numero_linha': num, 'filhos': [{'elementos': list(elementos), 'operador': ''}]}
+        >>> X, Y = {'subtipo': 'variavel', 'valor': 'X'}, {'subtipo': 'variavel', 'valor': 'Y'}
+        >>> um = {'subtipo': 'numero_inteiro', 'valor': '1'}
+        >>> res = {'subtipo': 'numero_inteiro_res', 'valor': '2'}
+        >>> particionar_linhas([linha(1, um, X), linha(2, um, Y), linha(3, X), linha(4, res)])
+        [[0, 2], [1, 3]]
+    """
+    uniao = _UniaoBusca(len(linhas))
+    ultima_por_nome: Dict[str, int] = {}
+    posicao_por_numero: Dict[Any, int] = {}
+    cache: Dict[int, Tuple[str, ...]] = {}
+
+    for posicao, linha in enumerate(linhas):
+        num = linha.get('numero_linha')
+        posicao_por_numero.setdefault(num, posicao)
+        filhos = linha.get('filhos')
+        seq = filhos[0] if filhos and isinstance(filhos[0], dict) else {}
+
+        for nome in _variaveis(seq.get('elementos', []), cache, subexpressoes):
+            anterior = ultima_por_nome.get(nome)
+            if anterior is not None and anterior != posicao:
+                uniao.unir(anterior, posicao)
+            ultima_por_nome[nome] = posicao
+
+        offset = _offset_res(seq)
+        if offset is not None and isinstance(num, int):
+            referenciada = posicao_por_numero.get(num - offset)
+            if referenciada is not None:
+                uniao.unir(referenciada, posicao)
+
+    grupos: Dict[int, List[int]] = {}
+    for posicao in range(len(linhas)):
+        grupos.setdefault(uniao.raiz(posicao), []).append(posicao)
+    return list(grupos.values())
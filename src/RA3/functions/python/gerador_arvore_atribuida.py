@@ -9,11 +9,20 @@
 # Nome do grupo no Canvas: RA3_1
 
 
+import io
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, TextIO, Tuple, Union
 from datetime import datetime
+from src.RA1.functions.python.artefatos import (
+    EXTENSOES_ARTEFATO, caminho_artefato, escrever_artefato, modo_escrita_artefato, obter_formato_artefato,
+    obter_copias_secundarias, replicar_arquivo
+)
+from src.RA1.functions.python.percurso import percorrer
+from src.RA1.functions.python.relatorios import agendar_relatorio, relatorios_ativos
 from src.RA3.functions.python.gramatica_atributos import obter_regra
+from src.RA3.functions.python.indice_programa import IndicePrograma
+from src.RA3.functions.python.nos_ast import No, arvore_de_dict, no_de_dict
 from src.RA3.functions.python import tipos
 
 # Caminhos de saída (relativos à raiz do projeto)
@@ -23,6 +32,10 @@ OUT_ARVORE_ATRIBUIDA_JSON = OUTPUTS_DIR / "RA3" / "arvore_atribuida.json"
 ROOT_ARVORE_ATRIBUIDA_JSON = OUTPUTS_DIR /"RA3" / "arvore_atribuida.json"
 OUT_RELATORIOS_DIR = OUTPUTS_DIR / "RA3" / "relatorios"
 ROOT_RELATORIOS_DIR = PROJECT_ROOT / "relatorios"
+NOMES_RELATORIOS = ("arvore_atribuida.md", "julgamento_tipos.md", "erros_sematicos.md", "tabela_simbolos.md")
+# Níveis da árvore desenhados por linha em arvore_atribuida.md; cada nível
+# indenta mais a linha, então árvores muito profundas são resumidas
+PROFUNDIDADE_MAXIMA_RELATORIO = 200
 
 def gerarArvoreAtribuida(arvoreAnotada: Dict[str, Any], tabela_simbolos=None) -> Dict[str, Any]:
     """
@@ -53,7 +66,8 @@ def gerarArvoreAtribuida(arvoreAnotada: Dict[str, Any], tabela_simbolos=None) ->
 
 def _construir_no_atribuido(no: Dict[str, Any], numero_linha: int, tabela_simbolos=None) -> Dict[str, Any]:
     """
-    Constrói recursivamente um nó da árvore atribuída.
+    Constrói um nó da árvore atribuída e toda a sua subárvore (pilha
+    explícita: aninhamentos profundos não esbarram no limite de recursão).
 
     Args:
         no: Nó da árvore anotada
@@ -63,6 +77,11 @@ def _construir_no_atribuido(no: Dict[str, Any], numero_linha: int, tabela_simbol
     Returns:
         Nó da árvore atribuída com tipo, filhos, etc.
     """
+    return percorrer(no, lambda origem: _gerar_no_atribuido(origem, numero_linha, tabela_simbolos))
+
+
+def _gerar_no_atribuido(no: Dict[str, Any], numero_linha: int, tabela_simbolos=None):
+    """Gerador usado por _construir_no_atribuido: pede os filhos com yield."""
     # Determinar tipo do vértice baseado na estrutura
     tipo_vertice = "LINHA"  # Padrão para nó raiz da linha
 
@@ -91,7 +110,7 @@ def _construir_no_atribuido(no: Dict[str, Any], numero_linha: int, tabela_simbol
     # Se tem filhos diretos (estrutura de árvore)
     if 'filhos' in no and no['filhos']:
         for filho in no['filhos']:
-            filhos.append(_construir_no_atribuido(filho, numero_linha, tabela_simbolos))
+            filhos.append((yield filho))
     # Se tem elementos (estrutura convertida)
     elif 'elementos' in no:
         for elemento in no['elementos']:
@@ -104,19 +123,20 @@ def _construir_no_atribuido(no: Dict[str, Any], numero_linha: int, tabela_simbol
                         'elementos': elemento.get('elementos', []),
                         'operador': elemento.get('operador')
                     }
-                    filhos.append(_construir_no_atribuido(no_subexpressao, numero_linha, tabela_simbolos))
+                    filhos.append((yield no_subexpressao))
                 else:
                     # Operando simples
                     no_elemento = {
                         'numero_linha': numero_linha,
                         'tipo': elemento.get('tipo'),
                         'subtipo': elemento.get('subtipo'),
-                        'valor': elemento.get('valor')
+                        'valor': elemento.get('valor'),
+                        'numero': elemento.get('numero')
                     }
-                    filhos.append(_construir_no_atribuido(no_elemento, numero_linha, tabela_simbolos))
+                    filhos.append((yield no_elemento))
             else:
                 # Elemento não-dicionário (fallback)
-                filhos.append(_construir_no_atribuido({'valor': str(elemento)}, numero_linha, tabela_simbolos))
+                filhos.append((yield {'valor': str(elemento)}))
 
     # Valor se for terminal
     valor = no.get('valor')
@@ -169,24 +189,47 @@ def _construir_no_atribuido(no: Dict[str, Any], numero_linha: int, tabela_simbol
     if subtipo:
         no_atribuido['subtipo'] = subtipo
 
+    # Valor nativo dos literais numéricos (o RA4 não converte o texto de novo)
+    if no.get('numero') is not None:
+        no_atribuido['numero'] = no['numero']
+
+    # Raiz de linha com valor conhecido (propagação de constantes): a
+    # expressão fica na árvore e o RA4 gera só a atribuição do valor
+    if no.get('valor_constante') is not None:
+        no_atribuido['valor_constante'] = no['valor_constante']
+
+    # Raiz de (X RES) com X constante: deslocamento da linha referenciada
+    if no.get('offset_res') is not None:
+        no_atribuido['offset_res'] = no['offset_res']
+
     return no_atribuido
 
 
 def salvarArvoreAtribuida(arvoreAtribuida: Dict[str, Any]) -> None:
     """
-    Salva a árvore atribuída em formato JSON.
+    Salva a árvore atribuída no formato de artefato configurado (JSON por padrão).
+
+    A árvore é serializada uma única vez, linha a linha (escrever_artefato grava
+    cada elemento de 'arvore_atribuida' antes de serializar o próximo); a cópia
+    em ROOT_ARVORE_ATRIBUIDA_JSON é feita a partir do arquivo escrito
+    (replicar_arquivo).
 
     Args:
         arvoreAtribuida: Árvore sintática abstrata atribuída
     """
+    formato = obter_formato_artefato()
+    extensao = EXTENSOES_ARTEFATO[formato]
+    modo = modo_escrita_artefato(formato)
+    codificacao = 'utf-8' if modo == 'w' else None
+
     OUT_ARVORE_ATRIBUIDA_JSON.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(OUT_ARVORE_ATRIBUIDA_JSON, 'w', encoding='utf-8') as f:
-        json.dump(arvoreAtribuida, f, indent=2, ensure_ascii=False)
+    destino = OUT_ARVORE_ATRIBUIDA_JSON.with_suffix(extensao)
+    with open(destino, modo, encoding=codificacao) as f:
+        escrever_artefato(arvoreAtribuida, f, formato)
 
-    # Também salvar uma cópia no diretório raiz
-    with open(ROOT_ARVORE_ATRIBUIDA_JSON, 'w', encoding='utf-8') as f:
-        json.dump(arvoreAtribuida, f, indent=2, ensure_ascii=False)
+    # Também disponibilizar no diretório raiz
+    replicar_arquivo(destino, ROOT_ARVORE_ATRIBUIDA_JSON.with_suffix(extensao))
 
 
 def gerarRelatoriosMarkdown(arvoreAtribuida: Dict[str, Any], errosSemanticos: Optional[List[str]],
@@ -194,31 +237,47 @@ def gerarRelatoriosMarkdown(arvoreAtribuida: Dict[str, Any], errosSemanticos: Op
     """
     Gera os relatórios em markdown: árvore atribuída, julgamento de tipos e erros semânticos.
 
+    Os relatórios são gerados uma vez em caminhoSaida e replicados para
+    ROOT_RELATORIOS_DIR (replicar_arquivo). A geração é entregue a
+    agendar_relatorio: pode rodar em segundo plano ou ser desligada.
+
     Args:
         arvoreAtribuida: Árvore sintática abstrata atribuída
         errosSemanticos: Lista de erros semânticos (ou None se não há erros)
         tabelaSimbolos: Tabela de símbolos da análise semântica
         caminhoSaida: Diretório onde salvar os relatórios
     """
+    agendar_relatorio(_gerar_relatorios_markdown, arvoreAtribuida, errosSemanticos, tabelaSimbolos, caminhoSaida)
+
+
+def _gerar_relatorios_markdown(arvoreAtribuida: Dict[str, Any], errosSemanticos: Optional[List[str]],
+                               tabelaSimbolos, caminhoSaida: Path) -> None:
+    """Gera os relatórios em caminhoSaida e os replica para ROOT_RELATORIOS_DIR."""
+    # Índice das linhas montado uma vez e compartilhado pelos relatórios
+    indice = IndicePrograma(arvoreAtribuida.get('arvore_atribuida', []))
+
     # Gerar relatórios no diretório especificado
-    _gerar_relatorios_em_diretorio(arvoreAtribuida, errosSemanticos, tabelaSimbolos, caminhoSaida)
+    _gerar_relatorios_em_diretorio(arvoreAtribuida, errosSemanticos, tabelaSimbolos, caminhoSaida, indice)
 
-    # Também gerar na pasta raiz do projeto
-    _gerar_relatorios_em_diretorio(arvoreAtribuida, errosSemanticos, tabelaSimbolos, ROOT_RELATORIOS_DIR)
+    # Também disponibilizar na pasta raiz do projeto
+    for nome in NOMES_RELATORIOS:
+        replicar_arquivo(caminhoSaida / nome, ROOT_RELATORIOS_DIR / nome)
 
 
 def _gerar_relatorios_em_diretorio(arvoreAtribuida: Dict[str, Any], errosSemanticos: Optional[List[str]],
-                                 tabelaSimbolos, caminhoSaida: Path) -> None:
+                                 tabelaSimbolos, caminhoSaida: Path, indice: Optional[IndicePrograma] = None) -> None:
     """
     Gera os relatórios em um diretório específico.
     """
     caminhoSaida.mkdir(parents=True, exist_ok=True)
+    if indice is None:
+        indice = IndicePrograma(arvoreAtribuida.get('arvore_atribuida', []))
 
     # 1. Relatório da Árvore Atribuída
-    _gerar_relatorio_arvore_atribuida(arvoreAtribuida, caminhoSaida / "arvore_atribuida.md")
+    _gerar_relatorio_arvore_atribuida(arvoreAtribuida, caminhoSaida / "arvore_atribuida.md", indice)
 
     # 2. Relatório de Julgamento de Tipos
-    _gerar_relatorio_julgamento_tipos(arvoreAtribuida, caminhoSaida / "julgamento_tipos.md", tabelaSimbolos)
+    _gerar_relatorio_julgamento_tipos(arvoreAtribuida, caminhoSaida / "julgamento_tipos.md", tabelaSimbolos, indice)
 
     # 3. Relatório de Erros Semânticos
     _gerar_relatorio_erros_sematicos(errosSemanticos, caminhoSaida / "erros_sematicos.md")
@@ -227,618 +286,297 @@ def _gerar_relatorios_em_diretorio(arvoreAtribuida: Dict[str, Any], errosSemanti
     _gerar_relatorio_tabela_simbolos(tabelaSimbolos, caminhoSaida / "tabela_simbolos.md")
 
 
-def _gerar_relatorio_arvore_atribuida(arvoreAtribuida: Dict[str, Any], caminhoArquivo: Path) -> None:
+def _gerar_relatorio_arvore_atribuida(arvoreAtribuida: Dict[str, Any], caminhoArquivo: Path,
+                                      indice: Optional[IndicePrograma] = None) -> None:
     """Gera relatório da árvore atribuída em markdown."""
     with open(caminhoArquivo, 'w', encoding='utf-8') as f:
         f.write("# Árvore Sintática Abstrata Atribuída\n\n")
         f.write(f"**Gerado em:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
 
         arvore = arvoreAtribuida.get('arvore_atribuida', [])
+        if indice is None:
+            indice = IndicePrograma(arvore)
+        com_tipo = indice.contar_linhas_tipadas('tipo_inferido')
 
         f.write("## Resumo\n\n")
         f.write(f"- **Total de linhas:** {len(arvore)}\n")
-        f.write(f"- **Linhas com tipo definido:** {sum(1 for entrada in arvore if entrada.get('tipo_inferido') is not None)}\n")
-        f.write(f"- **Linhas sem tipo definido:** {sum(1 for entrada in arvore if entrada.get('tipo_inferido') is None)}\n\n")
+        f.write(f"- **Linhas com tipo definido:** {com_tipo}\n")
+        f.write(f"- **Linhas sem tipo definido:** {len(arvore) - com_tipo}\n\n")
 
         # Detalhes da árvore por linha
         f.write("## Detalhes da Árvore Atribuída por Linha\n\n")
 
-        for i, raiz_linha in enumerate(arvore, 1):
-            f.write(f"### Linha {raiz_linha.get('numero_linha', i)}\n\n")
-            f.write(f"**Tipo Resultado:** `{raiz_linha.get('tipo_inferido', 'N/A')}`\n\n")
+        for raiz_linha in arvore_de_dict(arvoreAtribuida):
+            f.write(f"### Linha {raiz_linha.numero_linha}\n\n")
+            f.write(f"**Tipo Resultado:** `{raiz_linha.tipo_inferido}`\n\n")
             f.write("**Estrutura da Árvore:**\n\n")
             f.write("```\n")
-            f.write(_formatar_arvore(raiz_linha, 0))
+            _formatar_arvore(raiz_linha, 0, f, max_profundidade=PROFUNDIDADE_MAXIMA_RELATORIO)
             f.write("```\n\n")
 
         f.write("\n---\n*Relatório gerado automaticamente pelo Compilador RA3_1*")
 
 
-def _formatar_arvore(no: Dict[str, Any], nivel: int) -> str:
-    """Formata um nó da árvore para exibição textual."""
-    indent = "  " * nivel
-    tipo_vertice = no.get('tipo_vertice', 'UNKNOWN')
-    tipo_inferido = no.get('tipo_inferido')
-    operador = no.get('operador', '')
-    valor = no.get('valor', '')
-    subtipo = no.get('subtipo', '')
-
-    linha = f"{indent}{tipo_vertice}"
-    if operador:
-        linha += f" ({operador})"
-    if tipo_inferido:
-        linha += f" : {tipo_inferido}"
-    if valor:
-        linha += f" [{valor}]"
-    if subtipo:
-        linha += f" {{{subtipo}}}"
+def _formatar_arvore(no: Union[No, Dict[str, Any]], nivel: int, saida: Optional[TextIO] = None,
+                     max_profundidade: Optional[int] = None, max_filhos: Optional[int] = None) -> Optional[str]:
+    """
+    Formata um nó da árvore (tipado ou dict) para exibição textual.
 
-    linha += "\n"
+    Escreve em 'saida' quando informada; senão retorna o texto. Com
+    max_profundidade (contada a partir de 'no') e max_filhos, os nós além
+    dos limites são resumidos em uma linha '... (N omitido(s))'.
+    """
+    if isinstance(no, dict):
+        no = no_de_dict(no)
+    buffer = io.StringIO() if saida is None else None
+    escrever = (buffer or saida).write
+
+    def formatar(tarefa):
+        no, nivel, profundidade = tarefa
+        linha = f"{'  ' * nivel}{no.tipo_vertice or 'UNKNOWN'}"
+        if no.operador:
+            linha += f" ({no.operador})"
+        if no.tipo_inferido:
+            linha += f" : {no.tipo_inferido}"
+        if no.valor:
+            linha += f" [{no.valor}]"
+        if no.subtipo:
+            linha += f" {{{no.subtipo}}}"
+        escrever(linha + "\n")
+
+        filhos = no.filhos
+        if max_profundidade is not None and profundidade >= max_profundidade:
+            filhos = []
+        elif max_filhos is not None:
+            filhos = filhos[:max_filhos]
+        for filho in filhos:
+            yield (filho, nivel + 1, profundidade + 1)
 
-    for filho in no.get('filhos', []):
-        linha += _formatar_arvore(filho, nivel + 1)
+        omitidos = len(no.filhos) - len(filhos)
+        if omitidos:
+            escrever(f"{'  ' * (nivel + 1)}... ({omitidos} omitido(s))\n")
 
-    return linha
+    percorrer((no, nivel, 0), formatar)
+    return buffer.getvalue() if buffer is not None else None
 
 
 # ============================================================================
 # FUNÇÕES AUXILIARES PARA JULGAMENTO DE TIPOS
 # ============================================================================
 
-def _reconstruir_expressao(no: Dict[str, Any]) -> str:
-    """
-    Reconstrói a expressão original em notação RPN a partir do nó da árvore.
+VERTICES_OPERADOR = ('ARITH_OP', 'COMP_OP', 'LOGIC_OP', 'CONTROL_OP')
 
-    Args:
-        no: Nó da árvore atribuída
 
-    Returns:
-        String com a expressão reconstruída (ex: "(5 3 +)")
+class _DecoracaoJulgamento:
     """
-    try:
+    Texto reconstruído (notação RPN) e tipo de cada nó da árvore atribuída.
+
+    decorar percorre a linha uma única vez em pós-ordem: o texto e o tipo de
+    um nó são montados a partir dos já calculados para os filhos, então o
+    relatório consulta os atributos sem percorrer subárvores de novo.
+    """
+
+    def __init__(self, tabelaSimbolos=None):
+        self._tabela = tabelaSimbolos
+        self._texto: Dict[int, str] = {}
+        self._tipo: Dict[int, Optional[str]] = {}
+        self._tipo_busca: Dict[int, Optional[str]] = {}
+
+    def decorar(self, raiz: Dict[str, Any]) -> '_DecoracaoJulgamento':
+        """Calcula texto e tipo de todos os nós da subárvore (pós-ordem, sem recursão)."""
+        pilha = [(raiz, False)]
+        while pilha:
+            no, filhos_prontos = pilha.pop()
+            if id(no) in self._texto:
+                continue
+            if not filhos_prontos:
+                pilha.append((no, True))
+                pilha.extend((filho, False) for filho in no.get('filhos', []))
+                continue
+            chave = id(no)
+            self._texto[chave] = self._calcular_texto(no)
+            tipo = self._tipo[chave] = self._calcular_tipo(no)
+            if not tipo:
+                tipo = next((self._tipo_busca[id(f)] for f in no.get('filhos', []) if self._tipo_busca[id(f)]), None)
+            self._tipo_busca[chave] = tipo
+        return self
+
+    def texto(self, no: Dict[str, Any]) -> str:
+        """Expressão reconstruída do nó (ex: "(5 3 +)")."""
+        return self._texto[id(no)]
+
+    def tipo(self, no: Dict[str, Any]) -> Optional[str]:
+        """Tipo inferido do nó, ou deduzido do subtipo/operador quando ausente."""
+        return self._tipo[id(no)]
+
+    def tipo_busca(self, no: Dict[str, Any]) -> Optional[str]:
+        """Tipo do nó ou, se indefinido, o do primeiro descendente tipado."""
+        return self._tipo_busca[id(no)]
+
+    def _calcular_texto(self, no: Dict[str, Any]) -> str:
+        texto = self._texto
+        try:
+            tipo_vertice = no.get('tipo_vertice', '')
+            filhos = no.get('filhos', [])
+            valor = no.get('valor')
+            operador = no.get('operador')
+
+            # Se é nó LINHA raiz, o texto vem do primeiro filho
+            if tipo_vertice == 'LINHA' and not valor and filhos:
+                primeiro_filho = filhos[0]
+                filho_tipo = primeiro_filho.get('tipo_vertice', '')
+
+                if filho_tipo in VERTICES_OPERADOR:
+                    partes = [texto[id(operando)] for operando in primeiro_filho.get('filhos', [])]
+                    partes.append(primeiro_filho.get('operador'))
+                    return f"({' '.join(partes)})"
+
+                # LINHA filha: armazenamento ou epsilon
+                if filho_tipo == 'LINHA':
+                    filho_valor = primeiro_filho.get('valor')
+                    if filho_valor is not None:
+                        return f"({filho_valor})"
+                    filho_filhos = primeiro_filho.get('filhos', [])
+                    partes = [texto[id(sub)] for sub in filho_filhos if texto[id(sub)]]
+                    if partes:
+                        return f"({' '.join(partes)})"
+                    for sub in filho_filhos:
+                        if sub.get('valor') is not None:
+                            return f"({sub.get('valor')})"
+                    return "()"
+
+            # Nó operador
+            if operador and tipo_vertice in VERTICES_OPERADOR:
+                partes = [texto[id(filho)] for filho in filhos]
+                partes.append(operador)
+                return f"({' '.join(partes)})"
+
+            # Nó terminal com valor
+            if valor is not None:
+                return str(valor)
+
+            # Nó LINHA com filhos mas sem operador
+            partes = [texto[id(filho)] for filho in filhos if texto[id(filho)]]
+            return ' '.join(partes)
+        except Exception:
+            return "(?)"
+
+    def _tipo_literal(self, no: Dict[str, Any]) -> Optional[str]:
+        """Tipo de um literal ou variável pelo subtipo (variáveis via tabela de símbolos)."""
+        subtipo = no.get('subtipo', '')
+        if subtipo in ('numero_inteiro', 'numero_inteiro_res'):
+            return tipos.TYPE_INT
+        if subtipo in ('numero_real', 'numero_real_res'):
+            return tipos.TYPE_REAL
+        if subtipo == 'variavel' and self._tabela:
+            try:
+                if self._tabela.existe(no.get('valor')):
+                    return self._tabela.obter_tipo(no.get('valor'))
+            except Exception:
+                pass
+        return None
+
+    def _calcular_tipo(self, no: Dict[str, Any]) -> Optional[str]:
+        tipo = no.get('tipo_inferido') or self._tipo_literal(no)
+        if tipo:
+            return tipo
+
         tipo_vertice = no.get('tipo_vertice', '')
-        filhos = no.get('filhos', [])
-        valor = no.get('valor')
-        operador = no.get('operador')
+        if tipo_vertice in ('COMP_OP', 'LOGIC_OP'):
+            return tipos.TYPE_BOOLEAN
+        if tipo_vertice == 'ARITH_OP':
+            filhos = no.get('filhos', [])
+            if len(filhos) >= 2:
+                tipo_1, tipo_2 = self._tipo[id(filhos[0])], self._tipo[id(filhos[1])]
+                if tipo_1 and tipo_2:
+                    try:
+                        return tipos.tipo_resultado_aritmetica(tipo_1, tipo_2, no.get('operador'))
+                    except Exception:
+                        pass
+        return None
 
-        # Se é nó LINHA raiz, processar o primeiro filho
-        if tipo_vertice == 'LINHA' and not valor and filhos:
-            primeiro_filho = filhos[0]
-            filho_tipo = primeiro_filho.get('tipo_vertice', '')
 
-            # Se o primeiro filho é um operador, reconstruir com operador
-            if filho_tipo in ['ARITH_OP', 'COMP_OP', 'LOGIC_OP', 'CONTROL_OP']:
-                filho_operador = primeiro_filho.get('operador')
-                filho_filhos = primeiro_filho.get('filhos', [])
+def _primeiro_operador(filhos: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Primeiro nó operador entre os filhos, ou None."""
+    return next((filho for filho in filhos if filho.get('tipo_vertice', '') in VERTICES_OPERADOR), None)
 
-                partes = []
-                for operando in filho_filhos:
-                    partes.append(_reconstruir_expressao(operando))
 
-                partes.append(filho_operador)
-                return f"({' '.join(partes)})"
+def _extrair_operando(no: Dict[str, Any], decoracao: _DecoracaoJulgamento, de_operador: bool) -> Dict[str, Any]:
+    """
+    Descreve um operando da linha a partir dos atributos decorados.
+
+    Args:
+        no: Nó do operando
+        decoracao: Atributos calculados para a linha
+        de_operador: True se o operando é filho do operador da linha (False
+            para filhos de uma LINHA de armazenamento/epsilon)
+    """
+    tipo_vertice = no.get('tipo_vertice', '')
 
-            # Se o primeiro filho é LINHA, pode ser armazenamento ou epsilon
-            elif filho_tipo == 'LINHA':
-                filho_filhos = primeiro_filho.get('filhos', [])
+    # LINHA com tipo conhecido (nela ou em algum descendente)
+    if de_operador and tipo_vertice == 'LINHA' and decoracao.tipo_busca(no):
+        return {'valor': decoracao.texto(no), 'tipo': decoracao.tipo_busca(no), 'eh_subexpressao': True, 'filhos': [no]}
 
-                # Se a LINHA tem valor direto, usar esse valor
-                filho_valor = primeiro_filho.get('valor')
-                if filho_valor is not None:
-                    return f"({filho_valor})"
+    # O operando é diretamente um nó operador (subexpressão)
+    if tipo_vertice in VERTICES_OPERADOR:
+        return {'valor': decoracao.texto(no), 'tipo': decoracao.tipo(no), 'eh_subexpressao': True, 'filhos': [no]}
 
-                # Caso contrário, reconstruir dos filhos
-                partes = []
-                for sub in filho_filhos:
-                    sub_expr = _reconstruir_expressao(sub)
-                    if sub_expr:
-                        partes.append(sub_expr)
+    valor = no.get('valor')
+    filhos = no.get('filhos', [])
+    tipo = decoracao.tipo(no)
 
-                # Se conseguiu alguma parte, retornar
-                if partes:
-                    return f"({' '.join(partes)})"
+    # Subexpressão: tem filho operador, de onde vem o tipo se faltar
+    # (dentro de armazenamento/epsilon, só o tipo_inferido do operador)
+    no_operador = _primeiro_operador(filhos)
+    if no_operador is not None and tipo is None:
+        tipo = decoracao.tipo(no_operador) if de_operador else no_operador.get('tipo_inferido')
 
-                # Se não tem partes mas tem filhos, buscar valor nos filhos
-                if filho_filhos:
-                    for sub in filho_filhos:
-                        sub_valor = sub.get('valor')
-                        if sub_valor is not None:
-                            return f"({sub_valor})"
-
-                return "()"
-
-        # Nó com operador direto (operador como nó)
-        if operador and tipo_vertice in ['ARITH_OP', 'COMP_OP', 'LOGIC_OP', 'CONTROL_OP']:
-            partes = []
-            for filho in filhos:
-                partes.append(_reconstruir_expressao(filho))
-            partes.append(operador)
-            return f"({' '.join(partes)})"
-
-        # Nó terminal com valor
-        if valor is not None:
-            return str(valor)
-
-        # Nó LINHA com filhos mas sem operador - processar filhos
-        if filhos:
-            partes = []
-            for filho in filhos:
-                sub = _reconstruir_expressao(filho)
-                if sub:
-                    partes.append(sub)
-            if partes:
-                if len(partes) == 1:
-                    return partes[0]
-                return ' '.join(partes)
-
-        return ""
-    except Exception:
-        return "(?)"
-
-
-def _extrair_operandos_e_tipos(no: Dict[str, Any], tabelaSimbolos=None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    if valor is not None and no_operador is None:
+        # Operando simples (literal ou variável)
+        return {'valor': valor, 'tipo': tipo, 'eh_subexpressao': False, 'subtipo': no.get('subtipo', '')}
+
+    expr_texto = decoracao.texto(no)
+    if de_operador and expr_texto in ('()', ''):
+        # Expressão epsilon vazia: usar o valor real de dentro dela
+        for filho in filhos:
+            if filho.get('valor') is not None:
+                expr_texto = f"({filho.get('valor')})"
+                if tipo is None:
+                    tipo = decoracao.tipo(filho)
+                break
+
+    return {'valor': expr_texto, 'tipo': tipo, 'eh_subexpressao': True, 'filhos': filhos}
+
+
+def _extrair_operandos_e_tipos(no: Dict[str, Any], decoracao: _DecoracaoJulgamento) -> Tuple[List[Dict[str, Any]], Optional[str]]:
     """
     Extrai os operandos com seus tipos e o operador de um nó.
 
     Args:
-        no: Nó da árvore atribuída (raiz LINHA)
+        no: Nó da árvore atribuída (raiz LINHA), já decorado
+        decoracao: Atributos calculados para a linha
 
     Returns:
         Tupla (lista de operandos, operador)
         Cada operando é um dict com 'valor', 'tipo', 'eh_subexpressao'
     """
-    operandos = []
-    operador = None
-
-    tipo_vertice = no.get('tipo_vertice', '')
     filhos = no.get('filhos', [])
+    if no.get('tipo_vertice', '') != 'LINHA' or not filhos:
+        return [], None
 
-    # Se é nó LINHA raiz, processar o primeiro filho
-    if tipo_vertice == 'LINHA' and filhos:
-        primeiro_filho = filhos[0]
-        filho_tipo = primeiro_filho.get('tipo_vertice', '')
-
-        # Se o primeiro filho é um operador
-        if filho_tipo in ['ARITH_OP', 'COMP_OP', 'LOGIC_OP', 'CONTROL_OP']:
-            operador = primeiro_filho.get('operador')
-            filho_filhos = primeiro_filho.get('filhos', [])
-
-            # Extrair cada operando
-            for operando_node in filho_filhos:
-                tipo_vertice_operando = operando_node.get('tipo_vertice', '')
-                valor = operando_node.get('valor')
-                tipo = operando_node.get('tipo_inferido')
-                subtipo = operando_node.get('subtipo', '')
-                operando_filhos = operando_node.get('filhos', [])
-
-                # Verificar se o operando É UMA LINHA (pode ter tipo inferido diretamente)
-                if tipo_vertice_operando == 'LINHA':
-                    # Para LINHA, primeiro tentar pegar o tipo inferido do nó
-                    tipo_linha = operando_node.get('tipo_inferido')
-                    if not tipo_linha:
-                        # Se não tem tipo_inferido, buscar recursivamente nos filhos
-                        def _buscar_tipo_recursivo(node):
-                            """Busca recursivamente o tipo em uma estrutura LINHA aninhada"""
-                            ti = node.get('tipo_inferido')
-                            if ti:
-                                return ti
-
-                            # Verificar se o próprio nó tem valor e subtipo
-                            nv = node.get('valor')
-                            nst = node.get('subtipo', '')
-                            if nv is not None and nst:
-                                if nst in ['numero_inteiro', 'numero_inteiro_res']:
-                                    return tipos.TYPE_INT
-                                elif nst in ['numero_real', 'numero_real_res']:
-                                    return tipos.TYPE_REAL
-                                elif nst == 'variavel' and tabelaSimbolos:
-                                    try:
-                                        if tabelaSimbolos.existe(nv):
-                                            return tabelaSimbolos.obter_tipo(nv)
-                                    except:
-                                        pass
-
-                            tv = node.get('tipo_vertice', '')
-                            if tv in ['COMP_OP', 'LOGIC_OP']:
-                                return tipos.TYPE_BOOLEAN
-                            elif tv == 'ARITH_OP':
-                                # Inferir tipo aritmético
-                                filhos_n = node.get('filhos', [])
-                                if len(filhos_n) >= 2:
-                                    tipos_n = []
-                                    for fn in filhos_n:
-                                        tn = _buscar_tipo_recursivo(fn)
-                                        if tn is None:
-                                            # Tentar inferir de subtipo
-                                            stn = fn.get('subtipo', '')
-                                            if stn in ['numero_inteiro', 'numero_inteiro_res']:
-                                                tn = tipos.TYPE_INT
-                                            elif stn in ['numero_real', 'numero_real_res']:
-                                                tn = tipos.TYPE_REAL
-                                            elif stn == 'variavel' and tabelaSimbolos:
-                                                vn = fn.get('valor')
-                                                if vn and tabelaSimbolos.existe(vn):
-                                                    try:
-                                                        tn = tabelaSimbolos.obter_tipo(vn)
-                                                    except:
-                                                        pass
-                                        tipos_n.append(tn)
-                                    if len(tipos_n) >= 2 and tipos_n[0] and tipos_n[1]:
-                                        try:
-                                            return tipos.tipo_resultado_aritmetica(tipos_n[0], tipos_n[1], node.get('operador'))
-                                        except:
-                                            pass
-                            # Buscar nos filhos
-                            for child in node.get('filhos', []):
-                                tr = _buscar_tipo_recursivo(child)
-                                if tr:
-                                    return tr
-                            return None
-
-                        tipo_linha = _buscar_tipo_recursivo(operando_node)
-
-                    if tipo_linha:
-                        tipo = tipo_linha
-                        eh_subexpr = True
-                        expr_texto = _reconstruir_expressao(operando_node)
-                        operandos.append({
-                            'valor': expr_texto,
-                            'tipo': tipo,
-                            'eh_subexpressao': True,
-                            'filhos': [operando_node]
-                        })
-                        continue
-
-                # Verificar se o operando É UM OPERADOR (comum em operadores lógicos)
-                if tipo_vertice_operando in ['ARITH_OP', 'COMP_OP', 'LOGIC_OP', 'CONTROL_OP']:
-                    # O operando é diretamente um nó operador (subexpressão)
-                    eh_subexpr = True
-                    expr_texto = _reconstruir_expressao(operando_node)
-                    # O tipo é o tipo_inferido do próprio nó operador
-                    tipo = operando_node.get('tipo_inferido')
-
-                    # Se não tem tipo_inferido, inferir pela categoria do operador
-                    if tipo is None:
-                        if tipo_vertice_operando in ['COMP_OP', 'LOGIC_OP']:
-                            tipo = tipos.TYPE_BOOLEAN
-                        elif tipo_vertice_operando == 'ARITH_OP':
-                            # Para aritmético, inferir pelos operandos
-                            op_operador = operando_node.get('operador')
-                            op_filhos = operando_node.get('filhos', [])
-
-                            if op_filhos and len(op_filhos) >= 2:
-                                # Extrair tipos dos operandos
-                                tipos_ops = []
-                                for op_f in op_filhos:
-                                    tipo_op = op_f.get('tipo_inferido')
-                                    subtipo_op = op_f.get('subtipo', '')
-                                    valor_op = op_f.get('valor')
-                                    tipo_vertice_op_f = op_f.get('tipo_vertice', '')
-
-                                    # Se o operando é outro operador (nested), inferir seu tipo recursivamente
-                                    if tipo_op is None and tipo_vertice_op_f in ['ARITH_OP', 'COMP_OP', 'LOGIC_OP']:
-                                        if tipo_vertice_op_f in ['COMP_OP', 'LOGIC_OP']:
-                                            # Comparação e lógica sempre retornam boolean
-                                            tipo_op = tipos.TYPE_BOOLEAN
-                                        elif tipo_vertice_op_f == 'ARITH_OP':
-                                            # Recursivamente inferir tipo aritmético
-                                            nested_op = op_f.get('operador')
-                                            nested_filhos = op_f.get('filhos', [])
-                                            if len(nested_filhos) >= 2:
-                                                nested_tipos = []
-                                                for nf in nested_filhos:
-                                                    nt = nf.get('tipo_inferido')
-                                                    nst = nf.get('subtipo', '')
-                                                    nv = nf.get('valor')
-                                                    if nt is None and nst:
-                                                        if nst in ['numero_inteiro', 'numero_inteiro_res']:
-                                                            nt = tipos.TYPE_INT
-                                                        elif nst in ['numero_real', 'numero_real_res']:
-                                                            nt = tipos.TYPE_REAL
-                                                        elif nst == 'variavel' and tabelaSimbolos and nv:
-                                                            try:
-                                                                if tabelaSimbolos.existe(nv):
-                                                                    nt = tabelaSimbolos.obter_tipo(nv)
-                                                            except:
-                                                                pass
-                                                    nested_tipos.append(nt)
-                                                if len(nested_tipos) >= 2 and nested_tipos[0] and nested_tipos[1]:
-                                                    try:
-                                                        tipo_op = tipos.tipo_resultado_aritmetica(nested_tipos[0], nested_tipos[1], nested_op)
-                                                    except:
-                                                        pass
-
-                                    if tipo_op is None and subtipo_op:
-                                        if subtipo_op in ['numero_inteiro', 'numero_inteiro_res']:
-                                            tipo_op = tipos.TYPE_INT
-                                        elif subtipo_op in ['numero_real', 'numero_real_res']:
-                                            tipo_op = tipos.TYPE_REAL
-                                        elif subtipo_op == 'variavel' and tabelaSimbolos and valor_op:
-                                            try:
-                                                if tabelaSimbolos.existe(valor_op):
-                                                    tipo_op = tabelaSimbolos.obter_tipo(valor_op)
-                                            except:
-                                                pass
-                                    tipos_ops.append(tipo_op)
-
-                                # Aplicar regras de tipo para o operador
-                                if len(tipos_ops) >= 2 and tipos_ops[0] and tipos_ops[1]:
-                                    try:
-                                        tipo = tipos.tipo_resultado_aritmetica(tipos_ops[0], tipos_ops[1], op_operador)
-                                    except:
-                                        pass
-
-                    operandos.append({
-                        'valor': expr_texto,
-                        'tipo': tipo,
-                        'eh_subexpressao': True,
-                        'filhos': [operando_node]  # Envolver o nó operador
-                    })
-                    continue
-
-                # Inferir tipo a partir do subtipo se tipo_inferido não estiver disponível
-                if tipo is None and subtipo:
-                    if subtipo in ['numero_inteiro', 'numero_inteiro_res']:
-                        tipo = tipos.TYPE_INT
-                    elif subtipo in ['numero_real', 'numero_real_res']:
-                        tipo = tipos.TYPE_REAL
-                    elif subtipo == 'variavel' and tabelaSimbolos:
-                        # Consultar tabela de símbolos para variáveis
-                        try:
-                            if tabelaSimbolos.existe(valor):
-                                tipo = tabelaSimbolos.obter_tipo(valor)
-                        except:
-                            pass
-
-                # Verificar se é uma subexpressão (tem filhos com operador)
-                eh_subexpr = False
-                no_operador_filho = None
-                if operando_filhos:
-                    for sub in operando_filhos:
-                        tipo_vertice_sub = sub.get('tipo_vertice', '')
-                        if tipo_vertice_sub in ['ARITH_OP', 'COMP_OP', 'LOGIC_OP', 'CONTROL_OP']:
-                            eh_subexpr = True
-                            no_operador_filho = sub
-                            # Se é subexpressão com operador, pegar o tipo do resultado do operador
-                            if tipo is None:
-                                tipo = sub.get('tipo_inferido')
-                                # Se ainda None, inferir pela categoria do operador
-                                if tipo is None:
-                                    if tipo_vertice_sub in ['COMP_OP', 'LOGIC_OP']:
-                                        tipo = tipos.TYPE_BOOLEAN
-                                    elif tipo_vertice_sub == 'ARITH_OP':
-                                        # Inferir tipo aritmético pelos operandos
-                                        sub_operador = sub.get('operador')
-                                        sub_filhos = sub.get('filhos', [])
-                                        if len(sub_filhos) >= 2:
-                                            sub_tipos = []
-                                            for sf in sub_filhos:
-                                                st = sf.get('tipo_inferido')
-                                                sst = sf.get('subtipo', '')
-                                                sv = sf.get('valor')
-                                                stv = sf.get('tipo_vertice', '')
-
-                                                # Verificar se é um operador aninhado
-                                                if st is None and stv in ['ARITH_OP', 'COMP_OP', 'LOGIC_OP']:
-                                                    if stv in ['COMP_OP', 'LOGIC_OP']:
-                                                        st = tipos.TYPE_BOOLEAN
-                                                    elif stv == 'ARITH_OP':
-                                                        # Inferir recursivamente para operador aninhado
-                                                        nested_op = sf.get('operador')
-                                                        nested_filhos = sf.get('filhos', [])
-                                                        if len(nested_filhos) >= 2:
-                                                            nested_tipos = []
-                                                            for nf in nested_filhos:
-                                                                nt = nf.get('tipo_inferido')
-                                                                nst = nf.get('subtipo', '')
-                                                                nv = nf.get('valor')
-                                                                if nt is None and nst:
-                                                                    if nst in ['numero_inteiro', 'numero_inteiro_res']:
-                                                                        nt = tipos.TYPE_INT
-                                                                    elif nst in ['numero_real', 'numero_real_res']:
-                                                                        nt = tipos.TYPE_REAL
-                                                                    elif nst == 'variavel' and tabelaSimbolos and nv:
-                                                                        try:
-                                                                            if tabelaSimbolos.existe(nv):
-                                                                                nt = tabelaSimbolos.obter_tipo(nv)
-                                                                        except:
-                                                                            pass
-                                                                nested_tipos.append(nt)
-                                                            if len(nested_tipos) >= 2 and nested_tipos[0] and nested_tipos[1]:
-                                                                try:
-                                                                    st = tipos.tipo_resultado_aritmetica(nested_tipos[0], nested_tipos[1], nested_op)
-                                                                except:
-                                                                    pass
-
-                                                if st is None and sst:
-                                                    if sst in ['numero_inteiro', 'numero_inteiro_res']:
-                                                        st = tipos.TYPE_INT
-                                                    elif sst in ['numero_real', 'numero_real_res']:
-                                                        st = tipos.TYPE_REAL
-                                                    elif sst == 'variavel' and tabelaSimbolos and sv:
-                                                        try:
-                                                            if tabelaSimbolos.existe(sv):
-                                                                st = tabelaSimbolos.obter_tipo(sv)
-                                                        except:
-                                                            pass
-                                                sub_tipos.append(st)
-                                            if len(sub_tipos) >= 2 and sub_tipos[0] and sub_tipos[1]:
-                                                try:
-                                                    tipo = tipos.tipo_resultado_aritmetica(sub_tipos[0], sub_tipos[1], sub_operador)
-                                                except:
-                                                    pass
-                                # Se ainda None após tudo, tentar buscar no nó raiz do operando
-                                if tipo is None:
-                                    tipo = operando_node.get('tipo_inferido')
-                            break
-
-                if valor is not None and not eh_subexpr:
-                    # Operando simples (literal ou variável)
-                    operandos.append({
-                        'valor': valor,
-                        'tipo': tipo,
-                        'eh_subexpressao': False,
-                        'subtipo': subtipo
-                    })
-                else:
-                    # Subexpressão
-                    expr_texto = _reconstruir_expressao(operando_node)
-
-                    # Corrigir expressões epsilon vazias
-                    if expr_texto == '()' or expr_texto == '':
-                        # Buscar valor real dentro do epsilon
-                        for filho in operando_filhos:
-                            val = filho.get('valor')
-                            if val is not None:
-                                expr_texto = f"({val})"
-                                if tipo is None and filho.get('subtipo'):
-                                    st = filho.get('subtipo')
-                                    if st in ['numero_inteiro', 'numero_inteiro_res']:
-                                        tipo = tipos.TYPE_INT
-                                    elif st in ['numero_real', 'numero_real_res']:
-                                        tipo = tipos.TYPE_REAL
-                                break
-
-                    operandos.append({
-                        'valor': expr_texto,
-                        'tipo': tipo,
-                        'eh_subexpressao': True,
-                        'filhos': operando_filhos
-                    })
-
-        # Se o primeiro filho é LINHA (armazenamento ou epsilon)
-        elif filho_tipo == 'LINHA':
-            filho_filhos = primeiro_filho.get('filhos', [])
-            for sub_node in filho_filhos:
-                tipo_vertice_sub = sub_node.get('tipo_vertice', '')
-                valor = sub_node.get('valor')
-                tipo = sub_node.get('tipo_inferido')
-                subtipo = sub_node.get('subtipo', '')
-                sub_filhos = sub_node.get('filhos', [])
-
-                # Verificar se É um nó operador diretamente
-                if tipo_vertice_sub in ['ARITH_OP', 'COMP_OP', 'LOGIC_OP', 'CONTROL_OP']:
-                    expr_texto = _reconstruir_expressao(sub_node)
-                    tipo = sub_node.get('tipo_inferido')
-
-                    # Inferir tipo pela categoria se necessário
-                    if tipo is None:
-                        if tipo_vertice_sub in ['COMP_OP', 'LOGIC_OP']:
-                            tipo = tipos.TYPE_BOOLEAN
-                        elif tipo_vertice_sub == 'ARITH_OP':
-                            # Inferir tipo aritmético pelos operandos
-                            op_operador = sub_node.get('operador')
-                            op_filhos = sub_node.get('filhos', [])
-
-                            if op_filhos and len(op_filhos) >= 2:
-                                tipos_ops = []
-                                for op_f in op_filhos:
-                                    tipo_op = op_f.get('tipo_inferido')
-                                    subtipo_op = op_f.get('subtipo', '')
-                                    valor_op = op_f.get('valor')
-                                    tipo_vertice_op_f = op_f.get('tipo_vertice', '')
-
-                                    # Se o operando é outro operador (nested), inferir seu tipo recursivamente
-                                    if tipo_op is None and tipo_vertice_op_f in ['ARITH_OP', 'COMP_OP', 'LOGIC_OP']:
-                                        if tipo_vertice_op_f in ['COMP_OP', 'LOGIC_OP']:
-                                            # Comparação e lógica sempre retornam boolean
-                                            tipo_op = tipos.TYPE_BOOLEAN
-                                        elif tipo_vertice_op_f == 'ARITH_OP':
-                                            # Recursivamente inferir tipo aritmético
-                                            nested_op = op_f.get('operador')
-                                            nested_filhos = op_f.get('filhos', [])
-                                            if len(nested_filhos) >= 2:
-                                                nested_tipos = []
-                                                for nf in nested_filhos:
-                                                    nt = nf.get('tipo_inferido')
-                                                    nst = nf.get('subtipo', '')
-                                                    nv = nf.get('valor')
-                                                    if nt is None and nst:
-                                                        if nst in ['numero_inteiro', 'numero_inteiro_res']:
-                                                            nt = tipos.TYPE_INT
-                                                        elif nst in ['numero_real', 'numero_real_res']:
-                                                            nt = tipos.TYPE_REAL
-                                                        elif nst == 'variavel' and tabelaSimbolos and nv:
-                                                            try:
-                                                                if tabelaSimbolos.existe(nv):
-                                                                    nt = tabelaSimbolos.obter_tipo(nv)
-                                                            except:
-                                                                pass
-                                                    nested_tipos.append(nt)
-                                                if len(nested_tipos) >= 2 and nested_tipos[0] and nested_tipos[1]:
-                                                    try:
-                                                        tipo_op = tipos.tipo_resultado_aritmetica(nested_tipos[0], nested_tipos[1], nested_op)
-                                                    except:
-                                                        pass
-
-                                    if tipo_op is None and subtipo_op:
-                                        if subtipo_op in ['numero_inteiro', 'numero_inteiro_res']:
-                                            tipo_op = tipos.TYPE_INT
-                                        elif subtipo_op in ['numero_real', 'numero_real_res']:
-                                            tipo_op = tipos.TYPE_REAL
-                                        elif subtipo_op == 'variavel' and tabelaSimbolos and valor_op:
-                                            try:
-                                                if tabelaSimbolos.existe(valor_op):
-                                                    tipo_op = tabelaSimbolos.obter_tipo(valor_op)
-                                            except:
-                                                pass
-                                    tipos_ops.append(tipo_op)
-
-                                if len(tipos_ops) >= 2 and tipos_ops[0] and tipos_ops[1]:
-                                    try:
-                                        tipo = tipos.tipo_resultado_aritmetica(tipos_ops[0], tipos_ops[1], op_operador)
-                                    except:
-                                        pass
-
-                    operandos.append({
-                        'valor': expr_texto,
-                        'tipo': tipo,
-                        'eh_subexpressao': True,
-                        'filhos': [sub_node]
-                    })
-                    continue
-
-                # Inferir tipo a partir do subtipo se tipo_inferido não estiver disponível
-                if tipo is None and subtipo:
-                    if subtipo in ['numero_inteiro', 'numero_inteiro_res']:
-                        tipo = tipos.TYPE_INT
-                    elif subtipo in ['numero_real', 'numero_real_res']:
-                        tipo = tipos.TYPE_REAL
-                    elif subtipo == 'variavel' and tabelaSimbolos:
-                        # Consultar tabela de símbolos para variáveis
-                        try:
-                            if tabelaSimbolos.existe(valor):
-                                tipo = tabelaSimbolos.obter_tipo(valor)
-                        except:
-                            pass
-
-                # Verificar se é subexpressão
-                eh_subexpr = False
-                if sub_filhos:
-                    for f in sub_filhos:
-                        if f.get('tipo_vertice') in ['ARITH_OP', 'COMP_OP', 'LOGIC_OP', 'CONTROL_OP']:
-                            eh_subexpr = True
-                            if tipo is None:
-                                tipo = f.get('tipo_inferido')
-                            break
-
-                if valor is not None and not eh_subexpr:
-                    operandos.append({
-                        'valor': valor,
-                        'tipo': tipo,
-                        'eh_subexpressao': False,
-                        'subtipo': subtipo
-                    })
-                else:
-                    expr_texto = _reconstruir_expressao(sub_node)
-                    operandos.append({
-                        'valor': expr_texto,
-                        'tipo': tipo,
-                        'eh_subexpressao': True,
-                        'filhos': sub_filhos
-                    })
+    primeiro_filho = filhos[0]
+    filho_tipo = primeiro_filho.get('tipo_vertice', '')
 
-    return operandos, operador
+    # Primeiro filho é o operador da linha
+    if filho_tipo in VERTICES_OPERADOR:
+        operandos = [_extrair_operando(operando, decoracao, True) for operando in primeiro_filho.get('filhos', [])]
+        return operandos, primeiro_filho.get('operador')
+
+    # Primeiro filho é LINHA (armazenamento ou epsilon)
+    if filho_tipo == 'LINHA':
+        return [_extrair_operando(sub, decoracao, False) for sub in primeiro_filho.get('filhos', [])], None
+
+    return [], None
 
 
 def _detectar_promocao_tipo(operandos: List[Dict[str, Any]], tipo_resultado: str) -> Optional[str]:
@@ -917,108 +655,62 @@ def _formatar_regra_semantica(operador: str, tipos_operandos: List[str], tipo_re
     return "N/A"
 
 
-def _analisar_subexpressao(operando: Dict[str, Any], nivel: int = 0, tabelaSimbolos=None) -> List[str]:
+def _analisar_subexpressao(operando: Dict[str, Any], nivel: int, decoracao: _DecoracaoJulgamento) -> List[str]:
     """
-    Analisa recursivamente uma subexpressão, gerando linhas de análise detalhada.
+    Analisa uma subexpressão, gerando linhas de análise detalhada.
 
     Args:
         operando: Operando que contém uma subexpressão
         nivel: Nível de indentação
-        tabelaSimbolos: Tabela de símbolos para consulta
+        decoracao: Atributos calculados para a linha
 
     Returns:
         Lista de strings com a análise completa (operandos, operador, resultado)
     """
-    linhas = []
-    indent = "  " * nivel
+    linhas: List[str] = []
+    if operando.get('eh_subexpressao'):
+        percorrer((operando.get('filhos', []), nivel),
+                  lambda tarefa: _listar_subexpressao(tarefa[0], tarefa[1], decoracao, linhas))
+    return linhas
 
-    if not operando.get('eh_subexpressao'):
-        return linhas
-
-    filhos = operando.get('filhos', [])
-
-    # Procurar nó operador
-    no_operador = None
-    operador_str = None
-    tipo_resultado = None
-
-    for filho in filhos:
-        tipo_vertice = filho.get('tipo_vertice', '')
-        if tipo_vertice in ['ARITH_OP', 'COMP_OP', 'LOGIC_OP', 'CONTROL_OP']:
-            no_operador = filho
-            operador_str = filho.get('operador')
-            tipo_resultado = filho.get('tipo_inferido')
-            break
-
-    if no_operador:
-        # Extrair operandos do operador
-        operandos_filhos = no_operador.get('filhos', [])
-
-        for i, op_filho in enumerate(operandos_filhos, 1):
-            valor = op_filho.get('valor')
-            tipo = op_filho.get('tipo_inferido')
-            subtipo = op_filho.get('subtipo', '')
-
-            # Inferir tipo se não disponível
-            if tipo is None and subtipo:
-                if subtipo in ['numero_inteiro', 'numero_inteiro_res']:
-                    tipo = tipos.TYPE_INT
-                elif subtipo in ['numero_real', 'numero_real_res']:
-                    tipo = tipos.TYPE_REAL
-                elif subtipo == 'variavel' and tabelaSimbolos and valor:
-                    try:
-                        if tabelaSimbolos.existe(valor):
-                            tipo = tabelaSimbolos.obter_tipo(valor)
-                    except:
-                        pass
 
-            # Verificar se é outra subexpressão aninhada
-            op_filhos = op_filho.get('filhos', [])
-            eh_sub = any(f.get('tipo_vertice') in ['ARITH_OP', 'COMP_OP', 'LOGIC_OP', 'CONTROL_OP'] for f in op_filhos)
-
-            if valor is not None and not eh_sub:
-                linhas.append(f"{indent}- `{valor}` : `{tipo if tipo else 'N/A'}`")
-            elif eh_sub:
-                sub_expr = _reconstruir_expressao(op_filho)
-                # Buscar tipo da subexpressão
-                for f in op_filhos:
-                    if f.get('tipo_vertice') in ['ARITH_OP', 'COMP_OP', 'LOGIC_OP', 'CONTROL_OP']:
-                        tipo = f.get('tipo_inferido')
-                        break
-                linhas.append(f"{indent}- `{sub_expr}` : `{tipo if tipo else 'N/A'}`")
-                # Analisar recursivamente
-                sub_linhas = _analisar_subexpressao(
-                    {'eh_subexpressao': True, 'filhos': op_filhos, 'tipo': tipo},
-                    nivel + 1,
-                    tabelaSimbolos
-                )
-                linhas.extend(sub_linhas)
-
-        # Adicionar operador e resultado
-        if operador_str:
-            linhas.append(f"{indent}- Operador: `{operador_str}`")
-        if tipo_resultado:
-            linhas.append(f"{indent}- Resultado: `{tipo_resultado}`")
-    else:
+def _listar_subexpressao(filhos: List[Dict[str, Any]], nivel: int, decoracao: _DecoracaoJulgamento,
+                         linhas: List[str]):
+    """Acrescenta a 'linhas' a análise dos filhos de uma subexpressão (gerador para percorrer)."""
+    indent = "  " * nivel
+    no_operador = _primeiro_operador(filhos)
+
+    if no_operador is None:
         # Sem operador - pode ser epsilon ou literal simples
         for filho in filhos:
             valor = filho.get('valor')
-            tipo = filho.get('tipo_inferido')
-            subtipo = filho.get('subtipo', '')
+            if valor is not None:
+                linhas.append(f"{indent}- `{valor}` : `{decoracao.tipo(filho) or 'N/A'}`")
+        return
 
-            if tipo is None and subtipo:
-                if subtipo in ['numero_inteiro', 'numero_inteiro_res']:
-                    tipo = tipos.TYPE_INT
-                elif subtipo in ['numero_real', 'numero_real_res']:
-                    tipo = tipos.TYPE_REAL
+    for op_filho in no_operador.get('filhos', []):
+        valor = op_filho.get('valor')
+        op_filhos = op_filho.get('filhos', [])
+        sub_operador = _primeiro_operador(op_filhos)
 
+        if sub_operador is None:
             if valor is not None:
-                linhas.append(f"{indent}- `{valor}` : `{tipo if tipo else 'N/A'}`")
+                linhas.append(f"{indent}- `{valor}` : `{decoracao.tipo(op_filho) or 'N/A'}`")
+        else:
+            # Subexpressão aninhada
+            tipo = sub_operador.get('tipo_inferido')
+            linhas.append(f"{indent}- `{decoracao.texto(op_filho)}` : `{tipo if tipo else 'N/A'}`")
+            yield (op_filhos, nivel + 1)
 
-    return linhas
+    # Adicionar operador e resultado
+    if no_operador.get('operador'):
+        linhas.append(f"{indent}- Operador: `{no_operador.get('operador')}`")
+    if no_operador.get('tipo_inferido'):
+        linhas.append(f"{indent}- Resultado: `{no_operador.get('tipo_inferido')}`")
 
 
-def _gerar_relatorio_julgamento_tipos(arvoreAtribuida: Dict[str, Any], caminhoArquivo: Path, tabelaSimbolos=None) -> None:
+def _gerar_relatorio_julgamento_tipos(arvoreAtribuida: Dict[str, Any], caminhoArquivo: Path, tabelaSimbolos=None,
+                                      indice: Optional[IndicePrograma] = None) -> None:
     """
     Gera relatório detalhado de julgamento de tipos em markdown.
     Conforme especificado no issue #7 da rubrica.
@@ -1027,6 +719,7 @@ def _gerar_relatorio_julgamento_tipos(arvoreAtribuida: Dict[str, Any], caminhoAr
         arvoreAtribuida: Árvore sintática abstrata atribuída
         caminhoArquivo: Caminho do arquivo de saída
         tabelaSimbolos: Tabela de símbolos para consulta de tipos de variáveis
+        indice: Índice das linhas da árvore atribuída (montado se omitido)
     """
     with open(caminhoArquivo, 'w', encoding='utf-8') as f:
         # Cabeçalho com informações
@@ -1034,6 +727,8 @@ def _gerar_relatorio_julgamento_tipos(arvoreAtribuida: Dict[str, Any], caminhoAr
         f.write(f"**Gerado em:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
 
         arvore = arvoreAtribuida.get('arvore_atribuida', [])
+        if indice is None:
+            indice = IndicePrograma(arvore)
         f.write(f"**Total de expressões analisadas:** {len(arvore)}\n\n")
         f.write("---\n\n")
 
@@ -1042,18 +737,20 @@ def _gerar_relatorio_julgamento_tipos(arvoreAtribuida: Dict[str, Any], caminhoAr
         tipos_encontrados = {}  # tipo -> contagem
 
         # Análise detalhada linha por linha
+        decoracao = _DecoracaoJulgamento(tabelaSimbolos)
         for raiz_linha in arvore:
             numero_linha = raiz_linha.get('numero_linha', '')
             tipo_resultado = raiz_linha.get('tipo_inferido')
 
-            # Reconstruir expressão original
-            expressao = _reconstruir_expressao(raiz_linha)
+            # Texto e tipo de cada nó da linha, calculados uma única vez
+            decoracao.decorar(raiz_linha)
+            expressao = decoracao.texto(raiz_linha)
 
             # Título da seção
             f.write(f"## Linha {numero_linha}: `{expressao}`\n\n")
 
             # Extrair operandos e operador
-            operandos, operador = _extrair_operandos_e_tipos(raiz_linha, tabelaSimbolos)
+            operandos, operador = _extrair_operandos_e_tipos(raiz_linha, decoracao)
 
             # Seção: Análise de Tipos
             f.write("### Análise de Tipos:\n")
@@ -1066,8 +763,8 @@ def _gerar_relatorio_julgamento_tipos(arvoreAtribuida: Dict[str, Any], caminhoAr
                     if op.get('eh_subexpressao'):
                         tipo_op = op.get('tipo', 'N/A')
                         f.write(f"- **Operando {i}:** `{valor}` → tipo: `{tipo_op}`\n")
-                        # Analisar subexpressão recursivamente
-                        sub_linhas = _analisar_subexpressao(op, nivel=1, tabelaSimbolos=tabelaSimbolos)
+                        # Analisar subexpressão a partir dos atributos decorados
+                        sub_linhas = _analisar_subexpressao(op, 1, decoracao)
                         for linha in sub_linhas:
                             f.write(f"  {linha}\n")
                     else:
@@ -1132,7 +829,7 @@ def _gerar_relatorio_julgamento_tipos(arvoreAtribuida: Dict[str, Any], caminhoAr
 
         f.write("### Estatísticas\n")
         total = len(arvore)
-        com_tipo = sum(1 for r in arvore if r.get('tipo_inferido') is not None)
+        com_tipo = indice.contar_linhas_tipadas('tipo_inferido')
         sem_tipo = total - com_tipo
         f.write(f"- **Total de expressões:** {total}\n")
         f.write(f"- **Com tipo definido:** {com_tipo}\n")
@@ -1247,21 +944,16 @@ def executar_geracao_arvore_atribuida(resultado_semantico: Dict[str, Any]) -> Di
             OUT_RELATORIOS_DIR
         )
 
+        diretorios = [OUT_RELATORIOS_DIR] if relatorios_ativos() else []
+        if diretorios and obter_copias_secundarias():
+            diretorios.append(ROOT_RELATORIOS_DIR)
+
         return {
             'sucesso': True,
             'arvore_atribuida': arvore_atribuida,
-            'relatorios_gerados': [
-                str(OUT_RELATORIOS_DIR / "arvore_atribuida.md"),
-                str(OUT_RELATORIOS_DIR / "julgamento_tipos.md"),
-                str(OUT_RELATORIOS_DIR / "erros_sematicos.md"),
-                str(OUT_RELATORIOS_DIR / "tabela_simbolos.md"),
-                str(ROOT_RELATORIOS_DIR / "arvore_atribuida.md"),
-                str(ROOT_RELATORIOS_DIR / "julgamento_tipos.md"),
-                str(ROOT_RELATORIOS_DIR / "erros_sematicos.md"),
-                str(ROOT_RELATORIOS_DIR / "tabela_simbolos.md")
-            ],
-            'arquivo_arvore_json': str(OUT_ARVORE_ATRIBUIDA_JSON),
-            'arquivo_arvore_json_raiz': str(ROOT_ARVORE_ATRIBUIDA_JSON)
+            'relatorios_gerados': [str(diretorio / nome) for diretorio in diretorios for nome in NOMES_RELATORIOS],
+            'arquivo_arvore_json': str(caminho_artefato(OUT_ARVORE_ATRIBUIDA_JSON)),
+            'arquivo_arvore_json_raiz': str(caminho_artefato(ROOT_ARVORE_ATRIBUIDA_JSON))
         }
 
     except Exception as e:
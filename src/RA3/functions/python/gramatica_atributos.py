@@ -34,9 +34,17 @@ Estrutura de uma Regra Semântica:
         'acao_semantica': callable, # Função que aplica a regra
         'descricao': str            # Descrição legível
     }
+
+As regras são montadas uma única vez, na importação do módulo, em um registro
+somente-leitura de objetos RegraAtributo (imutáveis, mas acessíveis como
+dicionário: regra['categoria'], regra.get('regra_formal')). obter_regra()
+consulta um índice plano operador → regra em O(1).
 """
 
-from typing import Dict, List, Any, Optional
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from types import MappingProxyType
+from typing import Callable, Dict, List, Any, Optional, Tuple, FrozenSet
 from src.RA3.functions.python import tipos
 from src.RA3.functions.python.tabela_simbolos import TabelaSimbolos
 
@@ -48,6 +56,76 @@ from src.RA3.functions.python.tabela_simbolos import TabelaSimbolos
 RegraSemantica = Dict[str, Any]
 
 
+# ============================================================================
+# REGRA SEMÂNTICA TIPADA (IMUTÁVEL)
+# ============================================================================
+
+@dataclass(frozen=True)
+class RegraAtributo(Mapping):
+    """
+    Regra semântica imutável do registro de atributos.
+
+    Mantém a interface de dicionário das regras originais (regra['nome'],
+    regra.get('categoria'), 'aridade' in regra), mas não pode ser alterada:
+    o mesmo objeto é compartilhado por todas as análises.
+
+    Attributes:
+        categoria: 'aritmetico', 'comparacao', 'logico', 'controle' ou 'comando'
+        operador: Símbolo do operador (ex: '+', 'IFELSE', 'MEM')
+        nome: Nome interno da regra (ex: 'soma', 'mem_store')
+        aridade: Número de operandos
+        tipos_operandos: Tipos aceitos para cada operando (None = qualquer)
+        tipo_resultado: Tipo do resultado ou função que o calcula
+        restricoes: Restrições adicionais (texto)
+        acao_semantica: Função que aplica a regra
+        descricao: Descrição legível
+        regra_formal: Regra formal (notação de dedução)
+    """
+    categoria: str
+    operador: str
+    nome: str
+    aridade: int
+    tipos_operandos: Tuple[Optional[FrozenSet[str]], ...]
+    tipo_resultado: Optional[Callable[..., Any]]
+    restricoes: Tuple[str, ...]
+    acao_semantica: Callable[..., Dict[str, Any]]
+    descricao: str
+    regra_formal: str
+
+    @classmethod
+    def de_dict(cls, regra: RegraSemantica) -> 'RegraAtributo':
+        """Cria a regra imutável a partir do dicionário de definição."""
+        return cls(
+            categoria=regra['categoria'],
+            operador=regra['operador'],
+            nome=regra['nome'],
+            aridade=regra['aridade'],
+            tipos_operandos=tuple(
+                frozenset(aceitos) if aceitos is not None else None
+                for aceitos in regra['tipos_operandos']
+            ),
+            tipo_resultado=regra['tipo_resultado'],
+            restricoes=tuple(regra['restricoes']),
+            acao_semantica=regra['acao_semantica'],
+            descricao=regra['descricao'],
+            regra_formal=regra['regra_formal']
+        )
+
+    def __getitem__(self, chave: str) -> Any:
+        if chave not in _CAMPOS_REGRA:
+            raise KeyError(chave)
+        return getattr(self, chave)
+
+    def __iter__(self):
+        return iter(_CAMPOS_REGRA)
+
+    def __len__(self) -> int:
+        return len(_CAMPOS_REGRA)
+
+
+_CAMPOS_REGRA = tuple(campo.name for campo in fields(RegraAtributo))
+
+
 # ============================================================================
 # GRAMÁTICA DE ATRIBUTOS - OPERADORES ARITMÉTICOS
 # ============================================================================
@@ -539,7 +617,37 @@ def definir_regras_comandos() -> Dict[str, RegraSemantica]:
 # FUNÇÃO PRINCIPAL: DEFINIR GRAMÁTICA COMPLETA
 # ============================================================================
 
-def definirGramaticaAtributos() -> Dict[str, Dict[str, RegraSemantica]]:
+def _construir_registro() -> Tuple[Mapping, Mapping]:
+    """
+    Monta o registro de regras (por categoria) e o índice plano operador → regra.
+
+    Um operador presente em mais de uma categoria resolve para a primeira na
+    ordem abaixo, como na busca linear original.
+    """
+    definicoes = {
+        'aritmetico': definir_regras_aritmeticas(),
+        'comparacao': definir_regras_comparacao(),
+        'logico': definir_regras_logicas(),
+        'controle': definir_regras_controle(),
+        'comando': definir_regras_comandos()
+    }
+
+    registro = {}
+    indice = {}
+    for categoria, regras in definicoes.items():
+        regras_congeladas = {op: RegraAtributo.de_dict(regra) for op, regra in regras.items()}
+        registro[categoria] = MappingProxyType(regras_congeladas)
+        for op, regra in regras_congeladas.items():
+            indice.setdefault(op, regra)
+
+    return MappingProxyType(registro), MappingProxyType(indice)
+
+
+# Registro construído uma única vez, na importação
+_REGISTRO, _INDICE_OPERADORES = _construir_registro()
+
+
+def definirGramaticaAtributos() -> Mapping:
     """
     Define a gramática de atributos completa para a linguagem RPN.
 
@@ -551,7 +659,9 @@ def definirGramaticaAtributos() -> Dict[str, Dict[str, RegraSemantica]]:
         - Comandos especiais
 
     Returns:
-        Dicionário organizado por categoria, contendo todas as regras semânticas
+        Mapeamento somente-leitura organizado por categoria, contendo todas as
+        regras semânticas (o registro é compartilhado, não é recriado a cada
+        chamada)
 
     Example:
         >>> gramatica = definirGramaticaAtributos()
@@ -560,15 +670,7 @@ def definirGramaticaAtributos() -> Dict[str, Dict[str, RegraSemantica]]:
         >>> '+' in gramatica['aritmetico']
         True
     """
-    gramatica = {
-        'aritmetico': definir_regras_aritmeticas(),
-        'comparacao': definir_regras_comparacao(),
-        'logico': definir_regras_logicas(),
-        'controle': definir_regras_controle(),
-        'comando': definir_regras_comandos()
-    }
-
-    return gramatica
+    return _REGISTRO
 
 
 def inicializar_sistema_semantico() -> tuple[Dict, TabelaSimbolos]:
@@ -597,28 +699,21 @@ def inicializar_sistema_semantico() -> tuple[Dict, TabelaSimbolos]:
 # UTILIDADES E HELPERS
 # ============================================================================
 
-def obter_regra(operador: str, categoria: Optional[str] = None) -> Optional[RegraSemantica]:
+def obter_regra(operador: str, categoria: Optional[str] = None) -> Optional[RegraAtributo]:
     """
-    Busca a regra semântica de um operador.
+    Busca a regra semântica de um operador em O(1).
 
     Args:
         operador: Símbolo do operador
-        categoria: Categoria (opcional, acelera busca)
+        categoria: Categoria (opcional, restringe a busca)
 
     Returns:
-        RegraSemantica se encontrada, None caso contrário
+        RegraAtributo se encontrada, None caso contrário
     """
-    gramatica = definirGramaticaAtributos()
-
-    if categoria and categoria in gramatica:
-        return gramatica[categoria].get(operador)
-
-    # Busca em todas as categorias
-    for cat_regras in gramatica.values():
-        if operador in cat_regras:
-            return cat_regras[operador]
+    if categoria and categoria in _REGISTRO:
+        return _REGISTRO[categoria].get(operador)
 
-    return None
+    return _INDICE_OPERADORES.get(operador)
 
 
 if __name__ == '__main__':
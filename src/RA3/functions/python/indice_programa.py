@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+# Integrantes do grupo (ordem alfabética):
+# Breno Rossi Duarte - breno-rossi
+# Francisco Bley Ruthes - fbleyruthes
+# Rafael Olivare Piveta - RafaPiveta
+# Stefan Benjamim Seixas Lourenco Rodrigues - waifuisalie
+#
+# Nome do grupo no Canvas: RA3_1
+
+"""
+Índice por programa compartilhado pelas fases do RA3
+
+Montado uma única vez a partir das linhas (árvore convertida ou árvore
+atribuída), substitui as buscas lineares por 'numero_linha' feitas em cada
+fase:
+    - número da linha -> linha, sequência (operador e elementos) e linha anotada;
+    - operador -> números das linhas com esse operador, na ordem do programa
+      (a fase de controle percorre apenas as linhas IFELSE, WHILE e FOR);
+    - id de nó -> número da linha em que o nó aparece pela primeira vez
+      (subexpressões compartilhadas pertencem a várias linhas). Este índice
+      só é montado na primeira consulta.
+"""
+
+from heapq import merge
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def _seq_da_linha(linha: Dict[str, Any]) -> Dict[str, Any]:
+    """Sequência (operador e elementos) do primeiro filho da linha."""
+    filhos = linha.get('filhos', [])
+    if filhos and isinstance(filhos[0], dict):
+        seq = filhos[0]
+        # Filtrar elementos None e garantir que tenham estrutura válida
+        return {
+            'operador': seq.get('operador'),
+            'elementos': [elem for elem in seq.get('elementos', []) if elem is not None and isinstance(elem, dict)]
+        }
+    return {'operador': None, 'elementos': []}
+
+
+class IndicePrograma:
+    """Índices de linhas e nós de um programa."""
+
+    def __init__(self, linhas: Iterable[Dict[str, Any]] = ()):
+        self._linhas: List[Dict[str, Any]] = []
+        self._por_numero: Dict[Any, Dict[str, Any]] = {}
+        self._seqs: Dict[Any, Dict[str, Any]] = {}
+        self._anotadas: Dict[Any, Dict[str, Any]] = {}
+        self._por_operador: Dict[Any, List[int]] = {}
+        self._nos: Optional[Dict[int, Any]] = None
+
+        for linha in linhas:
+            if isinstance(linha, dict):
+                self.adicionar_linha(linha)
+
+    def adicionar_linha(self, linha: Dict[str, Any]) -> None:
+        num = linha.get('numero_linha')
+        seq = _seq_da_linha(linha)
+
+        self._por_operador.setdefault(seq['operador'], []).append(len(self._linhas))
+        self._linhas.append(linha)
+        self._por_numero[num] = linha
+        self._seqs[num] = seq
+        if self._nos is not None:
+            self._indexar_nos(linha, num)
+
+    def _indexar_nos(self, raiz: Dict[str, Any], num: Any) -> None:
+        pendentes = [raiz]
+        while pendentes:
+            no = pendentes.pop()
+            if id(no) in self._nos:
+                continue
+            self._nos[id(no)] = num
+            for chave in ('filhos', 'elementos'):
+                filhos = no.get(chave)
+                if isinstance(filhos, list):
+                    pendentes.extend(filho for filho in filhos if isinstance(filho, dict))
+            ast = no.get('ast')
+            if isinstance(ast, dict):
+                pendentes.append(ast)
+
+    def __len__(self) -> int:
+        return len(self._linhas)
+
+    def __iter__(self):
+        return iter(self._linhas)
+
+    def linha(self, num: Any) -> Optional[Dict[str, Any]]:
+        return self._por_numero.get(num)
+
+    def seq(self, num: Any) -> Optional[Dict[str, Any]]:
+        return self._seqs.get(num)
+
+    def linhas_com_operador(self, *operadores: Any) -> List[Any]:
+        """Números das linhas cujo operador está em 'operadores', na ordem do programa."""
+        # Cada lista guarda as posições em ordem crescente; basta intercalá-las
+        posicoes = merge(*(self._por_operador.get(operador, []) for operador in set(operadores)))
+        return [self._linhas[posicao].get('numero_linha') for posicao in posicoes]
+
+    def registrar_anotada(self, linha: Dict[str, Any]) -> None:
+        """Registra a versão anotada (com 'tipo') da linha."""
+        self._anotadas[linha['numero_linha']] = linha
+
+    def anotada(self, num: Any) -> Optional[Dict[str, Any]]:
+        return self._anotadas.get(num)
+
+    def linha_do_no(self, no: Dict[str, Any]) -> Optional[Any]:
+        """Número da linha em que o nó aparece, ou None se não pertence ao programa."""
+        if self._nos is None:
+            self._nos = {}
+            for linha in self._linhas:
+                self._indexar_nos(linha, linha.get('numero_linha'))
+        return self._nos.get(id(no))
+
+    def contar_linhas_tipadas(self, chave: str = 'tipo') -> int:
+        return sum(1 for linha in self._linhas if linha.get(chave) is not None)
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+
+# Integrantes do grupo (ordem alfabética):
+# Breno Rossi Duarte - breno-rossi
+# Francisco Bley Ruthes - fbleyruthes
+# Rafael Olivare Piveta - RafaPiveta
+# Stefan Benjamim Seixas Lourenco Rodrigues - waifuisalie
+#
+# Nome do grupo no Canvas: RA3_1
+
+"""
+Nós tipados da árvore sintática abstrata atribuída
+
+A árvore atribuída é serializada (arvore_atribuida.json) como dicionários com
+as chaves 'tipo_vertice', 'tipo_inferido', 'numero_linha', 'filhos' e,
+conforme o vértice, 'operador', 'valor', 'subtipo' e 'numero' (valor nativo
+dos literais numéricos, convertido uma vez ao montar a AST no RA2). A raiz de
+uma linha cujo valor a propagação de constantes do RA3 conhece também tem
+'valor_constante'; a árvore continua com a expressão original e o RA4 gera
+só a atribuição do valor. A raiz de um (X RES) com X constante tem
+'offset_res', o deslocamento da linha referenciada. Em memória, o RA3
+(relatórios) e o RA4 (ASTTraverser) usam as classes abaixo, com __slots__ e
+acesso por atributo:
+
+    Linha      vértice LINHA (linha ou sequência de operandos)
+    Literal    vértice LINHA com valor numérico (ou outro subtipo)
+    Var        vértice LINHA com valor de variável (subtipo 'variavel')
+    ArithOp    vértice ARITH_OP
+    CompOp     vértice COMP_OP
+    LogicOp    vértice LOGIC_OP
+    Control    vértice CONTROL_OP
+    OutroNo    qualquer outro vértice (RES, OPERADOR_FINAL, ...)
+
+no_de_dict() e No.to_dict() convertem entre os dois formatos; to_dict()
+reproduz as chaves e a ordem do dicionário gerado pelo RA3. As duas usam
+percorrer() (pilha explícita), sem limite de profundidade.
+
+As classes não usam @dataclass: com __slots__, campos com valor padrão só
+são suportados pelo dataclass a partir do Python 3.10.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from src.RA1.functions.python.percurso import percorrer
+
+
+class No:
+    """Base dos nós atribuídos."""
+
+    __slots__ = ('tipo_inferido', 'numero_linha', 'filhos')
+
+    TIPO_VERTICE: Optional[str] = None
+
+    # Atributos ausentes no vértice valem None (as subclasses que os têm
+    # declaram o slot correspondente)
+    operador: Optional[str] = None
+    valor: Optional[str] = None
+    subtipo: Optional[str] = None
+    numero: Any = None
+    valor_constante: Optional[int] = None
+    offset_res: Optional[int] = None
+
+    def __init__(self, tipo_inferido: Optional[str] = None, numero_linha: Any = 0,
+                 filhos: Optional[List['No']] = None):
+        self.tipo_inferido = tipo_inferido
+        self.numero_linha = numero_linha
+        self.filhos = filhos if filhos is not None else []
+
+    @property
+    def tipo_vertice(self) -> Optional[str]:
+        return self.TIPO_VERTICE
+
+    def _campos(self):
+        return (self.tipo_vertice, self.tipo_inferido, self.numero_linha, self.filhos,
+                self.operador, self.valor, self.subtipo, self.numero, self.valor_constante,
+                self.offset_res)
+
+    def __eq__(self, outro: Any) -> bool:
+        return type(self) is type(outro) and self._campos() == outro._campos()
+
+    def __repr__(self) -> str:
+        extras = ''.join(f", {nome}={valor!r}" for nome, valor in
+                         (('operador', self.operador), ('valor', self.valor), ('subtipo', self.subtipo))
+                         if valor is not None)
+        return (f"{type(self).__name__}(tipo_inferido={self.tipo_inferido!r}, "
+                f"numero_linha={self.numero_linha!r}{extras}, filhos={self.filhos!r})")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Dicionário no formato de arvore_atribuida.json."""
+        return percorrer(self, _gerar_dict)
+
+
+class Linha(No):
+    __slots__ = ('valor', 'subtipo', 'valor_constante', 'offset_res')
+
+    TIPO_VERTICE = 'LINHA'
+
+    def __init__(self, tipo_inferido: Optional[str] = None, numero_linha: Any = 0,
+                 filhos: Optional[List[No]] = None, valor: Optional[str] = None,
+                 subtipo: Optional[str] = None, valor_constante: Optional[int] = None,
+                 offset_res: Optional[int] = None):
+        super().__init__(tipo_inferido, numero_linha, filhos)
+        self.valor = valor
+        self.subtipo = subtipo
+        self.valor_constante = valor_constante
+        self.offset_res = offset_res
+
+
+class Literal(Linha):
+    __slots__ = ('numero',)
+
+    def __init__(self, tipo_inferido: Optional[str] = None, numero_linha: Any = 0,
+                 filhos: Optional[List[No]] = None, valor: Optional[str] = None,
+                 subtipo: Optional[str] = None, numero: Any = None):
+        super().__init__(tipo_inferido, numero_linha, filhos, valor, subtipo)
+        self.numero = numero
+
+
+class Var(Linha):
+    __slots__ = ()
+
+
+class Operacao(No):
+    __slots__ = ('operador',)
+
+    def __init__(self, operador: Optional[str], tipo_inferido: Optional[str] = None,
+                 numero_linha: Any = 0, filhos: Optional[List[No]] = None):
+        super().__init__(tipo_inferido, numero_linha, filhos)
+        self.operador = operador
+
+
+class ArithOp(Operacao):
+    __slots__ = ()
+    TIPO_VERTICE = 'ARITH_OP'
+
+
+class CompOp(Operacao):
+    __slots__ = ()
+    TIPO_VERTICE = 'COMP_OP'
+
+
+class LogicOp(Operacao):
+    __slots__ = ()
+    TIPO_VERTICE = 'LOGIC_OP'
+
+
+class Control(Operacao):
+    __slots__ = ()
+    TIPO_VERTICE = 'CONTROL_OP'
+
+
+class OutroNo(Operacao):
+    """Vértice sem classe própria; guarda o próprio tipo_vertice."""
+
+    __slots__ = ('_tipo_vertice',)
+
+    def __init__(self, tipo_vertice: Optional[str], operador: Optional[str] = None,
+                 tipo_inferido: Optional[str] = None, numero_linha: Any = 0,
+                 filhos: Optional[List[No]] = None):
+        super().__init__(operador, tipo_inferido, numero_linha, filhos)
+        self._tipo_vertice = tipo_vertice
+
+    @property
+    def tipo_vertice(self) -> Optional[str]:
+        return self._tipo_vertice
+
+
+CLASSES_OPERACAO = {classe.TIPO_VERTICE: classe for classe in (ArithOp, CompOp, LogicOp, Control)}
+
+
+def _gerar_dict(no: No):
+    """Gerador de No.to_dict para percorrer: pede o dicionário de cada filho."""
+    filhos = []
+    for filho in no.filhos:
+        filhos.append((yield filho))
+    resultado = {
+        'tipo_vertice': no.tipo_vertice,
+        'tipo_inferido': no.tipo_inferido,
+        'numero_linha': no.numero_linha,
+        'filhos': filhos
+    }
+    if no.operador:
+        resultado['operador'] = no.operador
+    if no.valor is not None:
+        resultado['valor'] = no.valor
+    if no.subtipo:
+        resultado['subtipo'] = no.subtipo
+    if no.numero is not None:
+        resultado['numero'] = no.numero
+    if no.valor_constante is not None:
+        resultado['valor_constante'] = no.valor_constante
+    if no.offset_res is not None:
+        resultado['offset_res'] = no.offset_res
+    return resultado
+
+
+def no_de_dict(no: Dict[str, Any]) -> No:
+    """Converte um nó (e seus filhos) do formato de arvore_atribuida.json."""
+    return percorrer(no, _gerar_no)
+
+
+def _gerar_no(no: Dict[str, Any]):
+    """Gerador de no_de_dict para percorrer: pede o nó tipado de cada filho."""
+    filhos = []
+    for filho in no.get('filhos') or []:
+        filhos.append((yield filho))
+    tipo_vertice = no.get('tipo_vertice')
+    tipo_inferido = no.get('tipo_inferido')
+    numero_linha = no.get('numero_linha', 0)
+
+    classe = CLASSES_OPERACAO.get(tipo_vertice)
+    if classe is not None:
+        return classe(no.get('operador'), tipo_inferido, numero_linha, filhos)
+
+    if tipo_vertice == 'LINHA':
+        valor, subtipo = no.get('valor'), no.get('subtipo')
+        if 'valor' not in no:
+            return Linha(tipo_inferido, numero_linha, filhos, None, subtipo,
+                         no.get('valor_constante'), no.get('offset_res'))
+        if subtipo == 'variavel':
+            return Var(tipo_inferido, numero_linha, filhos, valor, subtipo)
+        return Literal(tipo_inferido, numero_linha, filhos, valor, subtipo, no.get('numero'))
+
+    return OutroNo(tipo_vertice, no.get('operador'), tipo_inferido, numero_linha, filhos)
+
+
+def arvore_de_dict(arvore_atribuida: Dict[str, Any]) -> List[No]:
+    """Raízes (uma por linha) de {'arvore_atribuida': [...]} como nós tipados."""
+    return [no_de_dict(raiz) for raiz in arvore_atribuida.get('arvore_atribuida', [])]
+
+
+def arvore_para_dict(raizes: List[No]) -> Dict[str, Any]:
+    return {'arvore_atribuida': [raiz.to_dict() for raiz in raizes]}
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+
+# Integrantes do grupo (ordem alfabética):
+# Breno Rossi Duarte - breno-rossi
+# Francisco Bley Ruthes - fbleyruthes
+# Rafael Olivare Piveta - RafaPiveta
+# Stefan Benjamim Seixas Lourenco Rodrigues - waifuisalie
+#
+# Nome do grupo no Canvas: RA3_1
+
+"""
+Propagação de constantes entre as linhas do programa (interpretação abstrata)
+
+Percorre as linhas convertidas na ordem do programa guardando o valor
+conhecido de cada linha e de cada variável. Cada valor é um inteiro
+conhecido em tempo de compilação ou é desconhecido. Com isso:
+
+    - (X RES) com X constante vira uma referência RES comum: a linha recebe
+      'offset_res', usado pela análise de memória no lugar do erro
+      "requer avaliação em tempo de execução" e levado pela árvore atribuída
+      até o RA4, que copia o resultado da linha referenciada;
+    - linhas cujo valor é totalmente conhecido recebem 'valor_constante' e
+      são emitidas como literais na árvore atribuída (o TAC recebe uma
+      atribuição em vez da expressão inteira).
+
+Só inteiros são dobrados, e só quando cada resultado cabe em 16 bits com
+sinal (a aritmética do backend). Divisão, resto e potência exigem operandos
+não negativos. Fora disso o valor fica desconhecido e a linha segue como
+antes. Reais também ficam desconhecidos: o backend os calcula em ponto fixo
+e dobrá-los mudaria o resultado.
+
+Linhas de controle (IFELSE, WHILE, FOR) e blocos tornam desconhecidas todas
+as variáveis armazenadas dentro delas, pois podem executar zero ou várias
+vezes. Um armazenamento aninhado em outra expressão, como ((5 X) 1 +), também
+torna a variável desconhecida (o valor da expressão inteira já não é dobrado).
+"""
+
+from typing import Any, Dict, List, Optional
+
+from src.RA1.functions.python.percurso import percorrer
+from src.RA2.functions.python.construirAST import valor_literal
+
+INT16_MIN = -32768
+INT16_MAX = 32767
+
+OPERADORES_CONTROLE = ('IFELSE', 'WHILE', 'FOR')
+
+
+def _no_intervalo(valor: int) -> Optional[int]:
+    return valor if INT16_MIN <= valor <= INT16_MAX else None
+
+
+def _aplicar_operador(operador: str, a: int, b: int) -> Optional[int]:
+    """Resultado inteiro de 'a operador b', ou None se não puder ser dobrado."""
+    if operador == '+':
+        return _no_intervalo(a + b)
+    if operador == '-':
+        return _no_intervalo(a - b)
+    if operador == '*':
+        return _no_intervalo(a * b)
+    if operador in ('/', '%'):
+        if a < 0 or b <= 0:
+            return None
+        return a // b if operador == '/' else a % b
+    if operador == '^':
+        if b < 0 or (abs(a) > 1 and b > 15):
+            return None
+        return _no_intervalo(a ** b)
+    return None
+
+
+def _literal_inteiro(elemento: Dict[str, Any]) -> Optional[int]:
+    _, numero = valor_literal(elemento)
+    return _no_intervalo(numero) if isinstance(numero, int) else None
+
+
+def _eh_armazenamento(elementos: List[Any], operador: Optional[str]) -> bool:
+    return (not operador and len(elementos) == 2 and isinstance(elementos[1], dict)
+            and elementos[1].get('subtipo') == 'variavel')
+
+
+def _variaveis_armazenadas(seq: Dict[str, Any]) -> List[str]:
+    """Nomes (uppercase) armazenados em qualquer nível de 'seq'."""
+    nomes: List[str] = []
+    pendentes = [seq]
+    while pendentes:
+        atual = pendentes.pop()
+        elementos = atual.get('elementos') or []
+        if _eh_armazenamento(elementos, atual.get('operador')):
+            nomes.append(str(elementos[1].get('valor')).upper())
+        pendentes.extend(e for e in elementos if isinstance(e, dict) and e.get('subtipo') == 'LINHA')
+    return nomes
+
+
+class _EstadoConstantes:
+    """Valores conhecidos das linhas já percorridas e das variáveis."""
+
+    def __init__(self):
+        self.linhas: Dict[int, int] = {}
+        self.variaveis: Dict[str, int] = {}
+
+    def valor_res(self, num: int, offset: Optional[int]) -> Optional[int]:
+        if offset is None or offset < 1:
+            return None
+        return self.linhas.get(num - offset)
+
+    def valor_expressao(self, seq: Dict[str, Any], num: int) -> Optional[int]:
+        return percorrer(seq, lambda atual: self._passos_expressao(atual, num))
+
+    def _passos_expressao(self, seq: Dict[str, Any], num: int):
+        """Gerador de valor_expressao para percorrer: pede o valor das subexpressões."""
+        operador = seq.get('operador') or None
+        valores = []
+        for elemento in seq.get('elementos') or []:
+            if not isinstance(elemento, dict):
+                return None
+            subtipo = elemento.get('subtipo')
+            if subtipo == 'LINHA':
+                valor = yield elemento
+            elif subtipo == 'numero_inteiro':
+                valor = _literal_inteiro(elemento)
+            elif subtipo == 'numero_inteiro_res':
+                valor = self.valor_res(num, _literal_inteiro(elemento))
+            elif subtipo == 'variavel':
+                valor = self.variaveis.get(str(elemento.get('valor')).upper())
+            else:
+                valor = None
+            if valor is None:
+                return None
+            valores.append(valor)
+
+        if operador is None:
+            return valores[0] if len(valores) == 1 else None
+        if len(valores) != 2:
+            return None
+        return _aplicar_operador(operador, valores[0], valores[1])
+
+
+def _valor_linha(linha: Dict[str, Any], estado: _EstadoConstantes) -> Optional[int]:
+    """Atualiza 'estado' com o que a linha armazena e devolve o valor dela, se conhecido."""
+    num = linha.get('numero_linha')
+    filhos = linha.get('filhos') or []
+    if not filhos or num is None:
+        return None
+
+    seq = filhos[0]
+    elementos = seq.get('elementos') or []
+    operador = seq.get('operador') or None
+    valor: Optional[int] = None
+
+    if operador in OPERADORES_CONTROLE or (operador is None and len(elementos) > 1
+                                          and not _eh_armazenamento(elementos, operador)):
+        # Laços, condicionais e blocos: o que armazenam deixa de ser conhecido
+        for nome in _variaveis_armazenadas(seq):
+            estado.variaveis.pop(nome, None)
+    elif _eh_armazenamento(elementos, operador):
+        fonte = elementos[0]
+        if isinstance(fonte, dict) and fonte.get('subtipo') == 'LINHA':
+            for nome in _variaveis_armazenadas(fonte):
+                estado.variaveis.pop(nome, None)
+            valor = estado.valor_expressao(fonte, num)
+        else:
+            valor = estado.valor_expressao({'elementos': [fonte], 'operador': None}, num)
+        nome = str(elementos[1].get('valor')).upper()
+        if valor is None:
+            estado.variaveis.pop(nome, None)
+        else:
+            estado.variaveis[nome] = valor
+    elif operador is None and len(elementos) == 1 and isinstance(elementos[0], dict) \
+            and elementos[0].get('subtipo') == 'variavel_res':
+        offset = estado.variaveis.get(str(elementos[0].get('valor')).upper())
+        if offset is not None:
+            linha['offset_res'] = offset
+        valor = estado.valor_res(num, offset)
+    else:
+        # Armazenamentos aninhados na expressão também alteram as variáveis
+        for nome in _variaveis_armazenadas(seq):
+            estado.variaveis.pop(nome, None)
+        valor = estado.valor_expressao(seq, num)
+    return valor
+
+
+def propagar_constantes(arvore_convertida: Dict[str, Any]) -> int:
+    """
+    Anota as linhas de 'arvore_convertida' (formato de
+    _converter_arvore_json_para_analisador) com 'valor_constante' e
+    'offset_res' quando conhecidos.
+
+    As anotações são gravadas no dicionário da linha (não nos elementos,
+    que podem ser compartilhados entre linhas) e seguem para a árvore anotada.
+    Uma linha malformada não é anotada e torna todas as variáveis
+    desconhecidas; a falha é reportada pela análise semântica.
+
+    Returns:
+        Número de linhas com valor constante.
+    """
+    estado = _EstadoConstantes()
+
+    for linha in arvore_convertida.get('linhas', []):
+        linha.pop('valor_constante', None)
+        linha.pop('offset_res', None)
+        try:
+            valor = _valor_linha(linha, estado)
+        except Exception:
+            linha.pop('offset_res', None)
+            estado.variaveis.clear()
+            continue
+
+        if valor is not None:
+            estado.linhas[linha['numero_linha']] = valor
+            linha['valor_constante'] = valor
+
+    return len(estado.linhas)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+# Integrantes do grupo (ordem alfabética):
+# Breno Rossi Duarte - breno-rossi
+# Francisco Bley Ruthes - fbleyruthes
+# Rafael Olivare Piveta - RafaPiveta
+# Stefan Benjamim Seixas Lourenco Rodrigues - waifuisalie
+#
+# Nome do grupo no Canvas: RA3_1
+
+"""
+Compartilhamento de subexpressões fechadas (hash-consing)
+
+Uma subexpressão é fechada quando não referencia variáveis: só contém
+literais (inclusive os de RES) e outras subexpressões fechadas. O tipo de uma
+subexpressão fechada depende apenas da sua estrutura, então ocorrências
+repetidas no programa (ex: o mesmo (2 3 *) em várias linhas) podem apontar
+para o mesmo elemento e ter o tipo calculado uma única vez.
+
+Subexpressões abertas não são compartilhadas, mas o resultado de cada uma
+também fica memorizado no próprio nó, associado à versão da tabela de
+símbolos em que foi calculado: enquanto a tabela não muda, o nó não é
+reavaliado.
+
+Expressões com a mesma forma e variáveis dos mesmos tipos, mesmo sendo nós
+diferentes, compartilham o resultado pelo cache de formas (ver cache_formas),
+que também pertence à tabela.
+
+A tabela é criada por análise (não é global): as identidades dos elementos
+canônicos só são válidas enquanto a tabela os mantém vivos.
+"""
+
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+from src.RA1.functions.python.percurso import percorrer
+from src.RA3.functions.python.cache_formas import CacheFormas
+
+SUBTIPOS_LITERAIS = ('numero_inteiro', 'numero_real', 'numero_inteiro_res', 'numero_real_res')
+
+# Marca de "tipo ainda não calculado" (None é um tipo válido na análise)
+AUSENTE = object()
+
+
+class TabelaSubexpressoes:
+    """
+    Interna elementos fechados e guarda o tipo calculado para cada um.
+
+    Os elementos canônicos são compartilhados entre linhas; o único atributo
+    escrito neles durante a análise é o 'tipo' do 'ast', que é o mesmo em
+    todas as ocorrências.
+    """
+
+    def __init__(self):
+        self._canonicos: Dict[Tuple, Dict[str, Any]] = {}
+        self._chaves: Dict[int, Tuple] = {}
+        self._tipos: Dict[Tuple[int, str], Optional[str]] = {}
+        self._tipos_versionados: Dict[Tuple[int, str], Tuple[Any, Any, Optional[str]]] = {}
+        self.formas = CacheFormas()
+
+    def internar(self, elemento: Any) -> Any:
+        """
+        Retorna o elemento canônico equivalente a 'elemento'.
+
+        Subexpressões abertas (com variáveis) não são compartilhadas, mas as
+        partes fechadas dentro delas são internadas no lugar.
+        """
+        return percorrer(elemento, self._internar_elemento)
+
+    def _internar_elemento(self, elemento: Any):
+        """Gerador de internar para percorrer: pede o canônico de cada filho."""
+        if not isinstance(elemento, dict):
+            return elemento
+
+        subtipo = elemento.get('subtipo')
+        if subtipo in SUBTIPOS_LITERAIS:
+            chave = (subtipo, elemento.get('valor'))
+        elif subtipo == 'LINHA':
+            filhos = elemento.get('elementos', [])
+            for i, filho in enumerate(filhos):
+                filhos[i] = yield filho
+            chaves_filhos = tuple(self._chaves.get(id(filho)) for filho in filhos)
+            if None in chaves_filhos or set(elemento) != {'subtipo', 'elementos', 'operador', 'ast'}:
+                return elemento
+            chave = ('LINHA', elemento.get('operador'), chaves_filhos)
+        else:
+            return elemento
+
+        canonico = self._canonicos.get(chave)
+        if canonico is None:
+            canonico = elemento
+            self._canonicos[chave] = canonico
+            self._chaves[id(canonico)] = chave
+        return canonico
+
+    def eh_fechada(self, elemento: Any) -> bool:
+        return id(elemento) in self._chaves
+
+    def obter_tipo(self, elemento: Dict[str, Any], contexto: str) -> Any:
+        """Tipo memorizado de um elemento fechado, ou AUSENTE."""
+        return self._tipos.get((id(elemento), contexto), AUSENTE)
+
+    def memorizar_tipo(self, elemento: Dict[str, Any], contexto: str, tipo: Optional[str]) -> None:
+        if id(elemento) in self._chaves:
+            self._tipos[(id(elemento), contexto)] = tipo
+
+    def obter_tipo_versionado(self, elemento: Dict[str, Any], contexto: str, tabela: Any) -> Any:
+        """
+        Tipo de um nó (aberto ou fechado) calculado com a tabela no estado
+        atual, ou AUSENTE se a tabela mudou desde o cálculo.
+        """
+        tipo = self.obter_tipo(elemento, contexto)
+        if tipo is not AUSENTE:
+            return tipo
+        registro = self._tipos_versionados.get((id(elemento), contexto))
+        # Referência fraca: o id de uma tabela já descartada pode ser reusado
+        if registro is not None and registro[0]() is tabela and registro[1] == tabela.versao:
+            return registro[2]
+        return AUSENTE
+
+    def memorizar_tipo_versionado(self, elemento: Dict[str, Any], contexto: str, tabela: Any, tipo: Optional[str]) -> None:
+        if id(elemento) in self._chaves:
+            self._tipos[(id(elemento), contexto)] = tipo
+        else:
+            self._tipos_versionados[(id(elemento), contexto)] = (weakref.ref(tabela), tabela.versao, tipo)
+
+    def __len__(self) -> int:
+        return len(self._canonicos)
@@ -19,11 +19,14 @@ Funcionalidades:
     - Buscar símbolos existentes
     - Atualizar estado de inicialização
     - Verificar se variável foi inicializada antes do uso
-    - Gerenciamento de escopos (cada arquivo = escopo independente)
+    - Gerenciamento de escopos (cada arquivo = escopo independente; escopos
+      aninhados com entrar_escopo/sair_escopo)
 """
 
-from typing import Optional, Dict, Any
-from dataclasses import dataclass
+import sys
+from collections.abc import Mapping
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 from src.RA3.functions.python import tipos
 
 
@@ -31,11 +34,28 @@ from src.RA3.functions.python import tipos
 # ESTRUTURA DE DADOS PARA SÍMBOLOS
 # ============================================================================
 
-@dataclass
+def _validar_simbolo(nome: str, tipo: str) -> None:
+    # Validar tipo
+    if tipo not in tipos.TIPOS_NUMERICOS:
+        raise ValueError(
+            f"Tipo inválido para armazenamento: '{tipo}'. "
+            f"Apenas {tipos.TIPOS_NUMERICOS} podem ser armazenados em memória."
+        )
+
+    # Nome deve ser uppercase (convenção da linguagem)
+    if not nome.isupper():
+        raise ValueError(
+            f"Nome de variável deve ser uppercase: '{nome}'"
+        )
+
+
 class SimboloInfo:
     """
     Informações sobre um símbolo (variável/memória) na tabela.
 
+    Registro compacto (__slots__); a tabela cria os registros já validados
+    por SimboloInfo._novo, sem repetir a validação do construtor.
+
     Attributes:
         nome: Nome da variável (ex: 'VAR', 'CONTADOR', 'PI')
         tipo: Tipo do valor armazenado ('int' ou 'real')
@@ -43,6 +63,7 @@ class SimboloInfo:
         escopo: Nível de escopo (0 = global/arquivo)
         linha_declaracao: Linha onde a variável foi declarada/inicializada
         linha_ultimo_uso: Última linha onde a variável foi usada
+        id: Identificador inteiro atribuído pela tabela (None fora dela)
 
     Examples:
         >>> simbolo = SimboloInfo(
@@ -55,27 +76,49 @@ class SimboloInfo:
         >>> simbolo.nome
         'CONTADOR'
     """
-    nome: str
-    tipo: str
-    inicializada: bool = False
-    escopo: int = 0
-    linha_declaracao: Optional[int] = None
-    linha_ultimo_uso: Optional[int] = None
-
-    def __post_init__(self):
-        """Validação após inicialização."""
-        # Validar tipo
-        if self.tipo not in tipos.TIPOS_NUMERICOS:
-            raise ValueError(
-                f"Tipo inválido para armazenamento: '{self.tipo}'. "
-                f"Apenas {tipos.TIPOS_NUMERICOS} podem ser armazenados em memória."
-            )
 
-        # Nome deve ser uppercase (convenção da linguagem)
-        if not self.nome.isupper():
-            raise ValueError(
-                f"Nome de variável deve ser uppercase: '{self.nome}'"
-            )
+    __slots__ = ('nome', 'tipo', 'inicializada', 'escopo', 'linha_declaracao', 'linha_ultimo_uso', 'id')
+
+    def __init__(self, nome: str, tipo: str, inicializada: bool = False, escopo: int = 0,
+                 linha_declaracao: Optional[int] = None, linha_ultimo_uso: Optional[int] = None):
+        _validar_simbolo(nome, tipo)
+        self.nome = nome
+        self.tipo = tipo
+        self.inicializada = inicializada
+        self.escopo = escopo
+        self.linha_declaracao = linha_declaracao
+        self.linha_ultimo_uso = linha_ultimo_uso
+        self.id: Optional[int] = None
+
+    @classmethod
+    def _novo(cls, id_simbolo: int, nome: str, tipo: str, inicializada: bool,
+              escopo: int, linha_declaracao: Optional[int]) -> 'SimboloInfo':
+        """Cria o registro sem validar (nome e tipo já validados pela tabela)."""
+        simbolo = cls.__new__(cls)
+        simbolo.nome = nome
+        simbolo.tipo = tipo
+        simbolo.inicializada = inicializada
+        simbolo.escopo = escopo
+        simbolo.linha_declaracao = linha_declaracao
+        simbolo.linha_ultimo_uso = None
+        simbolo.id = id_simbolo
+        return simbolo
+
+    def _campos(self):
+        return (self.nome, self.tipo, self.inicializada, self.escopo,
+                self.linha_declaracao, self.linha_ultimo_uso)
+
+    def __eq__(self, outro: Any) -> bool:
+        if not isinstance(outro, SimboloInfo):
+            return NotImplemented
+        return self._campos() == outro._campos()
+
+    def __repr__(self) -> str:
+        return (
+            f"SimboloInfo(nome={self.nome!r}, tipo={self.tipo!r}, inicializada={self.inicializada!r}, "
+            f"escopo={self.escopo!r}, linha_declaracao={self.linha_declaracao!r}, "
+            f"linha_ultimo_uso={self.linha_ultimo_uso!r})"
+        )
 
     def __str__(self) -> str:
         """Representação legível do símbolo."""
@@ -86,6 +129,28 @@ class SimboloInfo:
         )
 
 
+class _VisaoSimbolos(Mapping):
+    """Visão somente leitura nome -> SimboloInfo, sem cópia (reflete a tabela)."""
+
+    __slots__ = ('_ids', '_registros')
+
+    def __init__(self, ids: Dict[str, int], registros: List[SimboloInfo]):
+        self._ids = ids
+        self._registros = registros
+
+    def __getitem__(self, nome: str) -> SimboloInfo:
+        return self._registros[self._ids[nome]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, nome: object) -> bool:
+        return nome in self._ids
+
+
 # ============================================================================
 # TABELA DE SÍMBOLOS
 # ============================================================================
@@ -100,6 +165,14 @@ class TabelaSimbolos:
         - Estado de inicialização
         - Escopo (cada arquivo = escopo independente)
 
+    Escopos aninhados:
+        O dicionário nome -> id guarda sempre o símbolo visível (o do escopo
+        mais interno), então a busca é O(1) em qualquer profundidade. Cada
+        escopo aberto registra o que alterou nesse dicionário; sair_escopo
+        desfaz apenas essas alterações, com custo proporcional aos símbolos
+        declarados no escopo. Os registros de escopos fechados continuam
+        acessíveis por simbolo_por_id.
+
     Regras Importantes:
         - Variáveis devem ser inicializadas antes do uso (V MEM)
         - Usar variável não inicializada (MEM) = erro semântico
@@ -123,31 +196,136 @@ class TabelaSimbolos:
         Args:
             escopo_inicial: Nível de escopo inicial (padrão: 0 = global)
         """
-        self._simbolos: Dict[str, SimboloInfo] = {}
+        # Nomes normalizados e internados uma única vez: nome recebido -> nome
+        self._nomes: Dict[str, str] = {}
+        # Símbolos indexados por id: nome -> id, id -> registro e id -> usos
+        self._ids: Dict[str, int] = {}
+        self._registros: List[SimboloInfo] = []
+        self._usos: List[int] = []  # Para estatísticas
+        self._visao = _VisaoSimbolos(self._ids, self._registros)
+        self._escopo_inicial: int = escopo_inicial
         self._escopo_atual: int = escopo_inicial
-        self._contador_acessos: Dict[str, int] = {}  # Para estatísticas
+        # Um registro por escopo aberto: (nome, id visível antes da declaração)
+        self._desfazer: List[List[Tuple[str, Optional[int]]]] = []
+        self._versao: int = 0  # Incrementada a cada alteração de símbolo
 
     @property
     def escopo_atual(self) -> int:
         """Retorna o nível de escopo atual."""
         return self._escopo_atual
 
+    def entrar_escopo(self) -> int:
+        """
+        Abre um escopo aninhado e retorna o novo nível.
+
+        Examples:
+            >>> tabela = TabelaSimbolos()
+            >>> _ = tabela.adicionarSimbolo('X', 'int', True)
+            >>> tabela.entrar_escopo()
+            1
+            >>> _ = tabela.adicionarSimbolo('X', 'real', True, local=True)
+            >>> tabela.obter_tipo('X')
+            'real'
+            >>> tabela.sair_escopo()
+            0
+            >>> tabela.obter_tipo('X')
+            'int'
+        """
+        self._desfazer.append([])
+        self._escopo_atual += 1
+        return self._escopo_atual
+
+    def sair_escopo(self) -> int:
+        """
+        Fecha o escopo atual, descartando os símbolos declarados nele, e
+        retorna o nível do escopo que volta a ser o atual.
+
+        Raises:
+            ValueError: Se não há escopo aninhado aberto
+        """
+        if not self._desfazer:
+            raise ValueError("Não há escopo aninhado para fechar")
+
+        alteracoes = self._desfazer.pop()
+        for nome, id_anterior in reversed(alteracoes):
+            if id_anterior is None:
+                del self._ids[nome]
+            else:
+                self._ids[nome] = id_anterior
+        self._escopo_atual -= 1
+        if alteracoes:
+            self._versao += 1
+        return self._escopo_atual
+
+    @contextmanager
+    def escopo(self):
+        """Abre um escopo aninhado durante o bloco with."""
+        self.entrar_escopo()
+        try:
+            yield self
+        finally:
+            self.sair_escopo()
+
     @property
-    def simbolos(self) -> Dict[str, SimboloInfo]:
-        """Retorna cópia do dicionário de símbolos (read-only)."""
-        return self._simbolos.copy()
+    def versao(self) -> int:
+        """
+        Contador de alterações da tabela.
+
+        Muda sempre que um símbolo é adicionado, atualizado ou removido;
+        resultados que dependem da tabela podem ser memorizados por versão.
+        """
+        return self._versao
+
+    @property
+    def simbolos(self) -> Mapping:
+        """Retorna visão somente leitura (sem cópia) nome -> SimboloInfo."""
+        return self._visao
+
+    def _normalizar(self, nome: str) -> str:
+        """Nome em uppercase, calculado e internado uma vez por grafia recebida."""
+        normalizado = self._nomes.get(nome)
+        if normalizado is None:
+            normalizado = self._nomes[nome] = sys.intern(nome.upper())
+        return normalizado
+
+    def _id(self, nome: str) -> Optional[int]:
+        normalizado = self._nomes.get(nome)
+        if normalizado is None:
+            normalizado = self._normalizar(nome)
+        return self._ids.get(normalizado)
+
+    def id_simbolo(self, nome: str) -> Optional[int]:
+        """
+        Identificador inteiro do símbolo (estável até limpar()), ou None.
+
+        Examples:
+            >>> tabela = TabelaSimbolos()
+            >>> _ = tabela.adicionarSimbolo('A', 'int')
+            >>> _ = tabela.adicionarSimbolo('B', 'real')
+            >>> tabela.id_simbolo('b'), tabela.id_simbolo('C')
+            (1, None)
+        """
+        return self._id(nome)
+
+    def simbolo_por_id(self, id_simbolo: int) -> SimboloInfo:
+        """Registro do símbolo com o id dado (inclusive de escopos já fechados)."""
+        return self._registros[id_simbolo]
+
+    def _visiveis(self) -> List[SimboloInfo]:
+        return [self._registros[id_simbolo] for id_simbolo in self._ids.values()]
 
     def adicionarSimbolo(
         self,
         nome: str,
         tipo: str,
         inicializada: bool = False,
-        linha: Optional[int] = None
+        linha: Optional[int] = None,
+        local: bool = False
     ) -> SimboloInfo:
         """
         Adiciona um novo símbolo à tabela ou atualiza existente.
 
-        Se o símbolo já existe:
+        Se o símbolo já existe (visível no escopo atual ou em um externo):
             - Atualiza o tipo (permite redeclaração)
             - Atualiza estado de inicialização
             - Mantém escopo original
@@ -157,6 +335,8 @@ class TabelaSimbolos:
             tipo: Tipo do valor ('int' ou 'real')
             inicializada: True se está sendo inicializada agora
             linha: Número da linha onde ocorreu a declaração
+            local: Se True, um símbolo visível de escopo externo é ocultado
+                por um novo símbolo no escopo atual em vez de atualizado
 
         Returns:
             SimboloInfo do símbolo adicionado/atualizado
@@ -174,7 +354,7 @@ class TabelaSimbolos:
             >>> simbolo_novo.tipo
             'real'
         """
-        nome = nome.upper()  # Garantir uppercase
+        nome = self._normalizar(nome)  # Garantir uppercase
 
         # Validar tipo de armazenamento
         if not tipos.tipo_compativel_armazenamento(tipo):
@@ -184,8 +364,10 @@ class TabelaSimbolos:
             )
 
         # Se já existe, atualizar
-        if nome in self._simbolos:
-            simbolo_existente = self._simbolos[nome]
+        id_simbolo = self._ids.get(nome)
+        if id_simbolo is not None and not (local and self._registros[id_simbolo].escopo != self._escopo_atual):
+            self._versao += 1
+            simbolo_existente = self._registros[id_simbolo]
             simbolo_existente.tipo = tipo
             if inicializada:
                 simbolo_existente.inicializada = True
@@ -193,17 +375,17 @@ class TabelaSimbolos:
                     simbolo_existente.linha_declaracao = linha
             return simbolo_existente
 
-        # Criar novo símbolo
-        simbolo = SimboloInfo(
-            nome=nome,
-            tipo=tipo,
-            inicializada=inicializada,
-            escopo=self._escopo_atual,
-            linha_declaracao=linha
-        )
-        
-        self._simbolos[nome] = simbolo
-        self._contador_acessos[nome] = 0
+        # Criar novo símbolo (o tipo já foi validado; falta apenas o nome)
+        _validar_simbolo(nome, tipo)
+        id_simbolo = len(self._registros)
+        simbolo = SimboloInfo._novo(id_simbolo, nome, tipo, inicializada, self._escopo_atual, linha)
+
+        if self._desfazer:
+            self._desfazer[-1].append((nome, self._ids.get(nome)))
+        self._ids[nome] = id_simbolo
+        self._registros.append(simbolo)
+        self._usos.append(0)
+        self._versao += 1
 
         return simbolo
 
@@ -226,8 +408,8 @@ class TabelaSimbolos:
             >>> tabela.buscarSimbolo('INEXISTENTE') is None
             True
         """
-        nome = nome.upper()
-        return self._simbolos.get(nome)
+        id_simbolo = self._id(nome)
+        return None if id_simbolo is None else self._registros[id_simbolo]
 
     def existe(self, nome: str) -> bool:
         """
@@ -247,7 +429,7 @@ class TabelaSimbolos:
             >>> tabela.existe('INEXISTENTE')
             False
         """
-        return nome.upper() in self._simbolos
+        return self._id(nome) is not None
 
     def marcar_inicializada(self, nome: str, linha: Optional[int] = None) -> bool:
         """
@@ -275,6 +457,7 @@ class TabelaSimbolos:
         simbolo.inicializada = True
         if linha is not None:
             simbolo.linha_declaracao = linha
+        self._versao += 1
 
         return True
 
@@ -344,12 +527,12 @@ class TabelaSimbolos:
             >>> tabela.registrar_uso('VAR', 20)
             True
         """
-        simbolo = self.buscarSimbolo(nome)
-        if simbolo is None:
+        id_simbolo = self._id(nome)
+        if id_simbolo is None:
             return False
 
-        self._contador_acessos[nome.upper()] = \
-            self._contador_acessos.get(nome.upper(), 0) + 1
+        simbolo = self._registros[id_simbolo]
+        self._usos[id_simbolo] += 1
 
         if linha is not None:
             simbolo.linha_ultimo_uso = linha
@@ -376,7 +559,8 @@ class TabelaSimbolos:
             >>> tabela.obter_numero_usos('VAR')
             2
         """
-        return self._contador_acessos.get(nome.upper(), 0)
+        id_simbolo = self._id(nome)
+        return 0 if id_simbolo is None else self._usos[id_simbolo]
 
     def limpar(self):
         """
@@ -393,8 +577,12 @@ class TabelaSimbolos:
             >>> len(tabela.simbolos)
             0
         """
-        self._simbolos.clear()
-        self._contador_acessos.clear()
+        self._ids.clear()
+        self._registros.clear()
+        self._usos.clear()
+        self._desfazer.clear()
+        self._escopo_atual = self._escopo_inicial
+        self._versao += 1
 
     def listar_simbolos(self, apenas_inicializadas: bool = False) -> list[SimboloInfo]:
         """
@@ -415,7 +603,7 @@ class TabelaSimbolos:
             >>> len(tabela.listar_simbolos(apenas_inicializadas=True))
             1
         """
-        simbolos = list(self._simbolos.values())
+        simbolos = self._visiveis()
 
         if apenas_inicializadas:
             simbolos = [s for s in simbolos if s.inicializada]
@@ -443,10 +631,11 @@ class TabelaSimbolos:
         linhas.append("TABELA DE SÍMBOLOS")
         linhas.append("=" * 70)
         linhas.append(f"Escopo atual: {self._escopo_atual}")
-        linhas.append(f"Total de símbolos: {len(self._simbolos)}")
+        visiveis = self._visiveis()
+        linhas.append(f"Total de símbolos: {len(visiveis)}")
         linhas.append("-" * 70)
 
-        if not self._simbolos:
+        if not visiveis:
             linhas.append("(vazia)")
         else:
             # Cabeçalho
@@ -457,11 +646,11 @@ class TabelaSimbolos:
             linhas.append("-" * 70)
 
             # Símbolos
-            for simbolo in sorted(self._simbolos.values(), key=lambda s: s.nome):
+            for simbolo in sorted(visiveis, key=lambda s: s.nome):
                 status = "SIM" if simbolo.inicializada else "NÃO"
                 linha_decl = str(simbolo.linha_declaracao) \
                     if simbolo.linha_declaracao else "-"
-                usos = self._contador_acessos.get(simbolo.nome, 0)
+                usos = self._usos[simbolo.id]
 
                 linhas.append(
                     f"{simbolo.nome:<15} {simbolo.tipo:<10} {status:<15} "
@@ -477,7 +666,7 @@ class TabelaSimbolos:
 
     def __len__(self) -> int:
         """Número de símbolos na tabela."""
-        return len(self._simbolos)
+        return len(self._ids)
 
     def __contains__(self, nome: str) -> bool:
         """Permite usar 'in' operator."""
@@ -23,6 +23,13 @@ Tipos Suportados:
 Hierarquia de Tipos:
     int < real (int pode ser promovido a real)
     boolean - separado (sem promoção automática)
+
+Julgamentos de tipo:
+    Como o universo de tipos é pequeno, as regras de compatibilidade e de
+    tipo resultante são avaliadas uma única vez na importação e guardadas em
+    matrizes indexadas pelo id inteiro de cada tipo (ID_TIPO). As funções
+    públicas apenas consultam essas matrizes; os ValueError continuam com as
+    mesmas mensagens.
 """
 
 # ============================================================================
@@ -47,6 +54,50 @@ TIPOS_NUMERICOS = {TYPE_INT, TYPE_REAL}
 # Tipos que podem ser convertidos para booleano (truthiness)
 TIPOS_TRUTHY = {TYPE_INT, TYPE_REAL, TYPE_BOOLEAN}
 
+# Id inteiro de cada tipo (índice nas matrizes de julgamento)
+TIPOS_POR_ID = (TYPE_INT, TYPE_REAL, TYPE_BOOLEAN)
+ID_TIPO = {tipo: id_tipo for id_tipo, tipo in enumerate(TIPOS_POR_ID)}
+
+
+# ============================================================================
+# MATRIZES DE JULGAMENTO (montadas uma vez na importação)
+# ============================================================================
+
+def _matriz(regra):
+    """Matriz [id1][id2] com o valor da regra para cada par de tipos."""
+    return tuple(tuple(regra(tipo1, tipo2) for tipo2 in TIPOS_POR_ID) for tipo1 in TIPOS_POR_ID)
+
+
+def _consultar(matriz, tipo1, tipo2):
+    """Entrada da matriz para o par de tipos, ou None se algum tipo é desconhecido."""
+    id1 = ID_TIPO.get(tipo1)
+    id2 = ID_TIPO.get(tipo2)
+    if id1 is None or id2 is None:
+        return None
+    return matriz[id1][id2]
+
+
+# Compatibilidade (bool)
+_COMPATIVEL_ARITMETICA = _matriz(lambda t1, t2: t1 in TIPOS_NUMERICOS and t2 in TIPOS_NUMERICOS)
+_COMPATIVEL_DIVISAO_INTEIRA = _matriz(lambda t1, t2: t1 == TYPE_INT and t2 == TYPE_INT)
+_COMPATIVEL_POTENCIA = _matriz(lambda base, expoente: base in TIPOS_NUMERICOS and expoente == TYPE_INT)
+_COMPATIVEL_COMPARACAO = _COMPATIVEL_ARITMETICA
+_COMPATIVEL_LOGICO = _matriz(lambda t1, t2: t1 in TIPOS_TRUTHY and t2 in TIPOS_TRUTHY)
+
+# Promoção int < real (None quando algum tipo não é numérico)
+_PROMOCAO = _matriz(lambda t1, t2: (TYPE_REAL if TYPE_REAL in (t1, t2) else TYPE_INT)
+                    if t1 in TIPOS_NUMERICOS and t2 in TIPOS_NUMERICOS else None)
+
+# Tipo resultante por operador aritmético (None quando a aplicação é inválida)
+_RESULTADO_ARITMETICA = {
+    '|': _matriz(lambda t1, t2: TYPE_REAL if t1 in TIPOS_NUMERICOS and t2 in TIPOS_NUMERICOS else None),
+    '/': _matriz(lambda t1, t2: TYPE_INT if t1 == TYPE_INT and t2 == TYPE_INT else None),
+    '^': _matriz(lambda base, expoente: base if base in TIPOS_NUMERICOS and expoente == TYPE_INT else None),
+    '+': _PROMOCAO,
+}
+_RESULTADO_ARITMETICA['%'] = _RESULTADO_ARITMETICA['/']
+_RESULTADO_ARITMETICA['-'] = _RESULTADO_ARITMETICA['*'] = _PROMOCAO
+
 
 # ============================================================================
 # FUNÇÕES DE PROMOÇÃO E CONVERSÃO DE TIPOS
@@ -80,19 +131,13 @@ def promover_tipo(tipo1: str, tipo2: str) -> str:
         >>> promover_tipo('real', 'int')
         'real'
     """
-    # Validação de entrada
-    if tipo1 not in TIPOS_NUMERICOS or tipo2 not in TIPOS_NUMERICOS:
+    promovido = _consultar(_PROMOCAO, tipo1, tipo2)
+    if promovido is None:
         raise ValueError(
             f"Promoção de tipo requer tipos numéricos. "
             f"Recebido: {tipo1}, {tipo2}"
         )
-
-    # Promoção: se qualquer um é real, resultado é real
-    if tipo1 == TYPE_REAL or tipo2 == TYPE_REAL:
-        return TYPE_REAL
-
-    # Ambos são int
-    return TYPE_INT
+    return promovido
 
 
 def para_booleano(valor, tipo: str) -> bool:
@@ -171,7 +216,7 @@ def tipos_compativeis_aritmetica(tipo1: str, tipo2: str) -> bool:
         >>> tipos_compativeis_aritmetica('boolean', 'int')
         False
     """
-    return tipo1 in TIPOS_NUMERICOS and tipo2 in TIPOS_NUMERICOS
+    return bool(_consultar(_COMPATIVEL_ARITMETICA, tipo1, tipo2))
 
 
 def tipos_compativeis_divisao_inteira(tipo1: str, tipo2: str) -> bool:
@@ -197,7 +242,7 @@ def tipos_compativeis_divisao_inteira(tipo1: str, tipo2: str) -> bool:
         >>> tipos_compativeis_divisao_inteira('real', 'real')
         False
     """
-    return tipo1 == TYPE_INT and tipo2 == TYPE_INT
+    return bool(_consultar(_COMPATIVEL_DIVISAO_INTEIRA, tipo1, tipo2))
 
 
 def tipos_compativeis_potencia(tipo_base: str, tipo_expoente: str) -> bool:
@@ -224,7 +269,7 @@ def tipos_compativeis_potencia(tipo_base: str, tipo_expoente: str) -> bool:
         >>> tipos_compativeis_potencia('int', 'real')
         False
     """
-    return tipo_base in TIPOS_NUMERICOS and tipo_expoente == TYPE_INT
+    return bool(_consultar(_COMPATIVEL_POTENCIA, tipo_base, tipo_expoente))
 
 
 def tipos_compativeis_comparacao(tipo1: str, tipo2: str) -> bool:
@@ -250,7 +295,7 @@ def tipos_compativeis_comparacao(tipo1: str, tipo2: str) -> bool:
         >>> tipos_compativeis_comparacao('boolean', 'int')
         False
     """
-    return tipo1 in TIPOS_NUMERICOS and tipo2 in TIPOS_NUMERICOS
+    return bool(_consultar(_COMPATIVEL_COMPARACAO, tipo1, tipo2))
 
 
 def tipos_compativeis_logico(tipo1: str, tipo2: str) -> bool:
@@ -278,7 +323,7 @@ def tipos_compativeis_logico(tipo1: str, tipo2: str) -> bool:
         >>> tipos_compativeis_logico('int', 'int')
         True
     """
-    return tipo1 in TIPOS_TRUTHY and tipo2 in TIPOS_TRUTHY
+    return bool(_consultar(_COMPATIVEL_LOGICO, tipo1, tipo2))
 
 
 def tipo_compativel_logico_unario(tipo: str) -> bool:
@@ -386,41 +431,32 @@ def tipo_resultado_aritmetica(tipo1: str, tipo2: str, operador: str) -> str:
         >>> tipo_resultado_aritmetica('real', 'int', '^')
         'real'
     """
-    # Divisão real: sempre retorna real
-    if operador == '|':
-        if not tipos_compativeis_aritmetica(tipo1, tipo2):
+    matriz = _RESULTADO_ARITMETICA.get(operador)
+    if matriz is not None:
+        resultado = _consultar(matriz, tipo1, tipo2)
+        if resultado is not None:
+            return resultado
+
+        # Aplicação inválida: mesma mensagem de erro de cada regra
+        if operador == '|':
             raise ValueError(
                 f"Operador '|' requer operandos numéricos. "
                 f"Recebido: {tipo1}, {tipo2}"
             )
-        return TYPE_REAL
-
-    # Divisão inteira e módulo: requer int, retorna int
-    if operador in ['/', '%']:
-        if not tipos_compativeis_divisao_inteira(tipo1, tipo2):
+        if operador in ['/', '%']:
             raise ValueError(
                 f"Operador '{operador}' requer operandos inteiros. "
                 f"Recebido: {tipo1}, {tipo2}"
             )
-        return TYPE_INT
-
-    # Potência: retorna tipo da base
-    if operador == '^':
-        if not tipos_compativeis_potencia(tipo1, tipo2):
+        if operador == '^':
             raise ValueError(
                 f"Operador '^' requer base numérica e expoente inteiro. "
                 f"Recebido: base={tipo1}, expoente={tipo2}"
             )
-        return tipo1  # Retorna o tipo da base
-
-    # Operadores com promoção: +, -, *
-    if operador in ['+', '-', '*']:
-        if not tipos_compativeis_aritmetica(tipo1, tipo2):
-            raise ValueError(
-                f"Operador '{operador}' requer operandos numéricos. "
-                f"Recebido: {tipo1}, {tipo2}"
-            )
-        return promover_tipo(tipo1, tipo2)
+        raise ValueError(
+            f"Operador '{operador}' requer operandos numéricos. "
+            f"Recebido: {tipo1}, {tipo2}"
+        )
 
     # Operador desconhecido
     raise ValueError(f"Operador aritmético desconhecido: '{operador}'")
@@ -449,7 +485,7 @@ def tipo_resultado_comparacao(tipo1: str, tipo2: str) -> str:
         >>> tipo_resultado_comparacao('int', 'real')
         'boolean'
     """
-    if not tipos_compativeis_comparacao(tipo1, tipo2):
+    if not _consultar(_COMPATIVEL_COMPARACAO, tipo1, tipo2):
         raise ValueError(
             f"Operadores de comparação requerem operandos numéricos. "
             f"Recebido: {tipo1}, {tipo2}"
@@ -481,7 +517,7 @@ def tipo_resultado_logico(tipo1: str, tipo2: str) -> str:
         >>> tipo_resultado_logico('int', 'int')
         'boolean'
     """
-    if not tipos_compativeis_logico(tipo1, tipo2):
+    if not _consultar(_COMPATIVEL_LOGICO, tipo1, tipo2):
         raise ValueError(
             f"Operadores lógicos requerem operandos convertíveis para boolean. "
             f"Recebido: {tipo1}, {tipo2}"
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+
+# Integrantes do grupo (ordem alfabética):
+# Breno Rossi Duarte - breno-rossi
+# Francisco Bley Ruthes - fbleyruthes
+# Rafael Olivare Piveta - RafaPiveta
+# Stefan Benjamim Seixas Lourenco Rodrigues - waifuisalie
+#
+# Nome do grupo no Canvas: RA4_1
+
+"""
+Análise de intervalos sobre o TAC otimizado
+
+Calcula, antes de cada instrução, o intervalo [mínimo, máximo] que cada
+variável e temporário pode conter. O modelo é o do backend AVR: todo valor
+ocupa um par de registradores e é tratado como inteiro de 16 bits sem
+sinal, então os intervalos ficam dentro de [0, 0xFFFF] e qualquer operação
+que possa dar a volta (overflow, subtração negativa) resulta no intervalo
+total. Variáveis ausentes do estado também valem o intervalo total.
+
+A análise é sensível ao fluxo:
+    - o TAC é percorrido como grafo (label, goto, if_goto, if_false_goto);
+    - nos desvios condicionais gerados por uma comparação logo antes
+      (t = a <= b; ifFalse t goto L) cada saída restringe a e b conforme a
+      comparação vale ou não;
+    - em labels visitados mais de LIMITE_VISITAS vezes o intervalo é
+      alargado até o limite de 16 bits, para os laços convergirem;
+    - depois do ponto fixo, PASSOS_ESTREITAMENTO passadas recalculam os
+      estados sem alargamento, recuperando os limites dos contadores.
+
+O GeradorAssembly usa o resultado para emitir aritmética de 8 bits quando
+os operandos cabem em um byte.
+
+Exemplo:
+    >>> tac = [{'type': 'assignment', 'dest': 'C', 'source': '1'},
+    ...        {'type': 'binary_op', 'result': 't0', 'operand1': 'C',
+    ...         'operator': '+', 'operand2': '1'}]
+    >>> analisar_intervalos(tac)[1]
+    {'C': (1, 1)}
+"""
+
+import heapq
+from typing import Any, Dict, List, Optional, Tuple
+
+Intervalo = Tuple[int, int]
+Estado = Dict[str, Intervalo]
+
+VALOR_MAXIMO = 0xFFFF
+INTERVALO_TOTAL: Intervalo = (0, VALOR_MAXIMO)
+BYTE_MAXIMO = 0xFF
+
+LIMITE_VISITAS = 10
+PASSOS_ESTREITAMENTO = 2
+
+OPERADORES_COMPARACAO = ('==', '!=', '<', '<=', '>', '>=')
+_NEGACAO = {'==': '!=', '!=': '==', '<': '>=', '<=': '>', '>': '<=', '>=': '<'}
+_INVERSO = {'==': '==', '!=': '!=', '<': '>', '<=': '>=', '>': '<', '>=': '<='}
+
+
+#########################
+# OPERAÇÕES SOBRE INTERVALOS
+#########################
+
+def _normalizar(minimo: int, maximo: int) -> Intervalo:
+    if minimo < 0 or maximo > VALOR_MAXIMO:
+        return INTERVALO_TOTAL
+    return (minimo, maximo)
+
+
+def eh_constante(operando: Any) -> bool:
+    """Verifica se o operando TAC é uma constante numérica (str ou número)."""
+    try:
+        float(operando)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def intervalo_operando(operando: Any, estado: Optional[Estado]) -> Intervalo:
+    """Intervalo de um operando TAC: constante (como o backend a carrega) ou variável."""
+    if eh_constante(operando):
+        valor = int(float(operando)) & VALOR_MAXIMO
+        return (valor, valor)
+    if not estado:
+        return INTERVALO_TOTAL
+    return estado.get(str(operando), INTERVALO_TOTAL)
+
+
+def cabe_em_byte(intervalo: Intervalo) -> bool:
+    """True se todo valor do intervalo cabe no byte baixo (byte alto sempre zero)."""
+    return intervalo[1] <= BYTE_MAXIMO
+
+
+def intervalo_binario(operador: str, a: Intervalo, b: Intervalo,
+                      data_type: Optional[str] = None) -> Intervalo:
+    """
+    Intervalo do resultado de 'a operador b' como o backend o calcula.
+
+    Divisão por zero no backend devolve 0xFFFF (quociente) e o dividendo
+    (resto); operadores sem implementação no backend ficam com o intervalo total.
+    """
+    if operador in OPERADORES_COMPARACAO:
+        return (0, 1)
+    if operador == '+':
+        return _normalizar(a[0] + b[0], a[1] + b[1])
+    if operador == '-':
+        return _normalizar(a[0] - b[1], a[1] - b[0])
+    if operador == '*':
+        minimo, maximo = a[0] * b[0], a[1] * b[1]
+        if maximo > VALOR_MAXIMO:
+            return INTERVALO_TOTAL
+        if data_type == 'real':
+            return (minimo // 100, maximo // 100)
+        return (minimo, maximo)
+    if operador == '/':
+        if b[0] == 0:
+            return INTERVALO_TOTAL
+        return (a[0] // b[1], a[1] // b[0])
+    if operador == '%':
+        if b[0] == 0:
+            return (0, a[1])
+        return (0, min(a[1], b[1] - 1))
+    return INTERVALO_TOTAL
+
+
+def _unir(a: Estado, b: Estado) -> Estado:
+    unido = {}
+    for nome, (minimo, maximo) in a.items():
+        outro = b.get(nome)
+        if outro is not None:
+            unido[nome] = (min(minimo, outro[0]), max(maximo, outro[1]))
+    return unido
+
+
+def _alargar(anterior: Estado, novo: Estado) -> Estado:
+    """Leva ao limite de 16 bits cada extremo que cresceu desde o estado anterior."""
+    alargado = {}
+    for nome, (minimo, maximo) in novo.items():
+        antes = anterior.get(nome)
+        if antes is None:
+            continue
+        intervalo = (minimo if minimo >= antes[0] else 0,
+                     maximo if maximo <= antes[1] else VALOR_MAXIMO)
+        if intervalo != INTERVALO_TOTAL:
+            alargado[nome] = intervalo
+    return alargado
+
+
+def _definir(estado: Estado, nome: Any, intervalo: Intervalo) -> None:
+    if intervalo == INTERVALO_TOTAL:
+        estado.pop(str(nome), None)
+    else:
+        estado[str(nome)] = intervalo
+
+
+#########################
+# REFINAMENTO NOS DESVIOS
+#########################
+
+def _restringir(operador: str, a: Intervalo, b: Intervalo) -> Optional[Tuple[Intervalo, Intervalo]]:
+    """Intervalos de a e b quando 'a operador b' é verdadeiro (None se impossível)."""
+    if operador == '<':
+        a, b = (a[0], min(a[1], b[1] - 1)), (max(b[0], a[0] + 1), b[1])
+    elif operador == '<=':
+        a, b = (a[0], min(a[1], b[1])), (max(b[0], a[0]), b[1])
+    elif operador in ('>', '>='):
+        restrito = _restringir(_INVERSO[operador], b, a)
+        return None if restrito is None else (restrito[1], restrito[0])
+    elif operador == '==':
+        comum = (max(a[0], b[0]), min(a[1], b[1]))
+        a = b = comum
+    if a[0] > a[1] or b[0] > b[1]:
+        return None
+    return a, b
+
+
+def _refinar(estado: Estado, comparacao: Optional[Dict[str, Any]], condicao: Any,
+             verdadeira: bool) -> Optional[Estado]:
+    """Estado na saída do desvio em que 'condicao' é verdadeira/falsa (None se inalcançável)."""
+    refinado = dict(estado)
+    cond = intervalo_operando(condicao, estado)
+    cond = (max(cond[0], 1), cond[1]) if verdadeira else (cond[0], min(cond[1], 0))
+    if cond[0] > cond[1]:
+        return None
+    if not eh_constante(condicao):
+        _definir(refinado, condicao, cond)
+
+    if comparacao is None:
+        return refinado
+    operador = comparacao['operator'] if verdadeira else _NEGACAO[comparacao['operator']]
+    op1, op2 = comparacao['operand1'], comparacao['operand2']
+    restrito = _restringir(operador, intervalo_operando(op1, estado), intervalo_operando(op2, estado))
+    if restrito is None:
+        return None
+    for operando, intervalo in zip((op1, op2), restrito):
+        if not eh_constante(operando):
+            _definir(refinado, operando, intervalo)
+    return refinado
+
+
+def _comparacao_da_condicao(instrucoes: List[Dict[str, Any]], indice: int) -> Optional[Dict[str, Any]]:
+    """Comparação que calculou a condição do desvio 'indice', se for a instrução anterior."""
+    if indice == 0:
+        return None
+    anterior = instrucoes[indice - 1]
+    condicao = instrucoes[indice].get('condition')
+    if (anterior.get('type') == 'binary_op' and anterior.get('operator') in OPERADORES_COMPARACAO
+            and anterior.get('result') == condicao
+            and condicao not in (anterior.get('operand1'), anterior.get('operand2'))):
+        return anterior
+    return None
+
+
+#########################
+# FUNÇÃO DE TRANSFERÊNCIA
+#########################
+
+def _executar(instr: Dict[str, Any], estado: Estado) -> Estado:
+    """Estado depois de uma instrução que não desvia."""
+    tipo = instr.get('type')
+    if tipo in ('assignment', 'copy'):
+        novo = dict(estado)
+        _definir(novo, instr['dest'], intervalo_operando(instr['source'], estado))
+        return novo
+    if tipo == 'binary_op':
+        novo = dict(estado)
+        resultado = intervalo_binario(instr['operator'],
+                                      intervalo_operando(instr['operand1'], estado),
+                                      intervalo_operando(instr['operand2'], estado),
+                                      instr.get('data_type'))
+        _definir(novo, instr['result'], resultado)
+        return novo
+    destino = instr.get('dest', instr.get('result'))
+    if destino is not None:
+        novo = dict(estado)
+        _definir(novo, destino, INTERVALO_TOTAL)
+        return novo
+    return estado
+
+
+class _GrafoTAC:
+    """Sucessores de cada instrução do TAC, com o estado de cada saída."""
+
+    def __init__(self, instrucoes: List[Dict[str, Any]]):
+        self.instrucoes = instrucoes
+        self.labels = {instr.get('name'): i for i, instr in enumerate(instrucoes)
+                       if instr.get('type') == 'label'}
+        self.comparacoes = {i: _comparacao_da_condicao(instrucoes, i) for i, instr in enumerate(instrucoes)
+                            if instr.get('type') in ('if_goto', 'if_false_goto')}
+
+    def sucessores(self, indice: int, estado: Estado) -> List[Tuple[int, Estado]]:
+        instr = self.instrucoes[indice]
+        tipo = instr.get('type')
+        proxima = indice + 1
+        if tipo == 'goto':
+            destino = self.labels.get(instr.get('target'))
+            return [] if destino is None else [(destino, estado)]
+        if tipo in ('if_goto', 'if_false_goto'):
+            comparacao = self.comparacoes[indice]
+            salta_se = tipo == 'if_goto'
+            saidas = [(self.labels.get(instr.get('target')), _refinar(estado, comparacao, instr['condition'], salta_se)),
+                      (proxima, _refinar(estado, comparacao, instr['condition'], not salta_se))]
+            return [(destino, saida) for destino, saida in saidas
+                    if destino is not None and saida is not None and destino < len(self.instrucoes)]
+        if proxima >= len(self.instrucoes):
+            return []
+        return [(proxima, _executar(instr, estado))]
+
+
+#########################
+# ANÁLISE
+#########################
+
+def _acumular(entradas: List[Optional[Estado]], destino: int, saida: Estado) -> None:
+    atual = entradas[destino]
+    entradas[destino] = saida if atual is None else _unir(atual, saida)
+
+
+def analisar_intervalos(instrucoes: List[Dict[str, Any]]) -> List[Optional[Estado]]:
+    """
+    Calcula o estado de intervalos antes de cada instrução.
+
+    Args:
+        instrucoes: Instruções TAC em formato de dicionário (tac_otimizado['instructions'])
+
+    Returns:
+        Lista paralela a 'instrucoes': para cada uma, dicionário
+        variável -> (mínimo, máximo) válido antes dela, ou None se a
+        instrução é inalcançável. Variáveis ausentes valem INTERVALO_TOTAL.
+    """
+    if not instrucoes:
+        return []
+
+    grafo = _GrafoTAC(instrucoes)
+    entradas: List[Optional[Estado]] = [None] * len(instrucoes)
+    entradas[0] = {}
+    visitas = [0] * len(instrucoes)
+    pendentes = [0]
+    agendados = {0}
+
+    while pendentes:
+        indice = heapq.heappop(pendentes)
+        agendados.discard(indice)
+        for destino, saida in grafo.sucessores(indice, entradas[indice]):
+            atual = entradas[destino]
+            if atual is None:
+                novo = saida
+            else:
+                novo = _unir(atual, saida)
+                if instrucoes[destino].get('type') == 'label':
+                    visitas[destino] += 1
+                    if visitas[destino] > LIMITE_VISITAS:
+                        novo = _alargar(atual, novo)
+            if novo != atual:
+                entradas[destino] = novo
+                if destino not in agendados:
+                    agendados.add(destino)
+                    heapq.heappush(pendentes, destino)
+
+    # Estreitamento na ordem do programa: arestas para trás usam os estados
+    # da passada anterior, as demais os estados já recalculados nesta
+    for _ in range(PASSOS_ESTREITAMENTO):
+        estreitadas: List[Optional[Estado]] = [None] * len(instrucoes)
+        estreitadas[0] = {}
+        for indice, estado in enumerate(entradas):
+            if estado is not None:
+                for destino, saida in grafo.sucessores(indice, estado):
+                    if destino <= indice:
+                        _acumular(estreitadas, destino, saida)
+        for indice in range(len(instrucoes)):
+            if estreitadas[indice] is None:
+                continue
+            for destino, saida in grafo.sucessores(indice, estreitadas[indice]):
+                if destino > indice:
+                    _acumular(estreitadas, destino, saida)
+        entradas = estreitadas
+
+    return entradas
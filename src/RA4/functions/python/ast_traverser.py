@@ -15,9 +15,23 @@ Implementa o motor de travessia da AST atribuída da Fase 3,
 gerando instruções TAC (Three Address Code).
 
 A travessia é feita em PÓS-ORDEM (bottom-up), visitando filhos antes dos pais.
+Os nós são convertidos uma vez para as classes tipadas de nos_ast (acesso por
+atributo em vez de consultas por chave); os handlers também aceitam dicts.
+
+Os handlers de nós com filhos são geradores que pedem o temporário de cada
+filho com 'temp = yield filho'; _process_node os executa com percorrer()
+(pilha explícita), então expressões com milhares de níveis de aninhamento
+não esbarram no limite de recursão.
+
+Linhas com 'valor_constante' (propagação de constantes do RA3) geram só a
+atribuição do valor: a árvore atribuída mantém a expressão original e a troca
+pelo literal é feita aqui (_dobrar_linha_constante). Linhas (X RES) com X
+constante trazem 'offset_res' e copiam o resultado da linha referenciada.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Generator, Optional, Union
+from src.RA1.functions.python.percurso import percorrer
+from src.RA3.functions.python.nos_ast import No, Linha, Literal, Var, ArithOp, CompOp, LogicOp, Control, no_de_dict
 from .tac_manager import TACManager
 from .tac_instructions import (
     TACInstruction,
@@ -35,6 +49,37 @@ from .tac_instructions import (
 # 100x provides 0.01 precision and prevents 16-bit overflow for Taylor series
 FLOAT_SCALE_FACTOR = 100
 
+# Handlers geradores: produzem nós filhos e recebem o temporário de cada um
+_Passos = Generator[Any, Optional[str], Optional[str]]
+
+
+def _tipado(node: Union[No, Dict[str, Any]]) -> No:
+    """Converte nós no formato de arvore_atribuida.json para as classes de nos_ast."""
+    return no_de_dict(node) if isinstance(node, dict) else node
+
+
+def _dobrar_linha_constante(linha: No) -> No:
+    """
+    Substitui a expressão de uma linha com 'valor_constante' pelo literal
+    correspondente. Em armazenamentos (valor VAR) só a fonte é substituída.
+    A linha recebida não é alterada.
+    """
+    valor = linha.valor_constante
+    if valor is None or len(linha.filhos) != 1:
+        return linha
+
+    seq = linha.filhos[0]
+    # Operandos da sequência sem operador; operações são trocadas inteiras
+    filhos = seq.filhos if type(seq) is Linha else []
+    armazenamento = len(filhos) == 2 and isinstance(filhos[1], Var)
+    if (armazenamento or len(filhos) == 1) and (
+            isinstance(filhos[0], Var) or (isinstance(filhos[0], Literal) and filhos[0].subtipo == 'numero_inteiro')):
+        return linha  # Literal ou variável: o TAC já não calcula nada
+
+    literal = Literal('int', seq.numero_linha, [], str(valor), 'numero_inteiro', valor)
+    dobrada = Linha(seq.tipo_inferido, seq.numero_linha, [literal, filhos[1]] if armazenamento else [literal])
+    return Linha(linha.tipo_inferido, linha.numero_linha, [dobrada], linha.valor, linha.subtipo)
+
 
 #########################
 # CLASSE PRINCIPAL: ASTTraverser
@@ -48,6 +93,7 @@ class ASTTraverser:
         self.manager = manager
         self.instructions: List[TACInstruction] = []
         self._result_history: List[str] = []  # Para comando RES
+        self._result_by_line: Dict[int, str] = {}  # Para (X RES) com 'offset_res'
 
     #########################
     # MÉTODO PRINCIPAL
@@ -57,14 +103,20 @@ class ASTTraverser:
         """Gera TAC a partir da AST atribuída completa."""
         self.instructions = []
         self._result_history = []
+        self._result_by_line = {}
 
         # Processa cada nó LINHA de nível superior
         arvore = ast_dict.get("arvore_atribuida", [])
         for linha_node in arvore:
-            result_temp = self._process_node(linha_node)
+            linha = _dobrar_linha_constante(_tipado(linha_node))
+            if linha.offset_res is not None:
+                result_temp = self._handle_res_offset(linha)
+            else:
+                result_temp = self._process_node(linha)
             # Rastreia resultado para comando RES
             if result_temp:
                 self._result_history.append(result_temp)
+                self._result_by_line[linha.numero_linha] = result_temp
 
         return self.instructions
 
@@ -72,60 +124,69 @@ class ASTTraverser:
     # TRAVESSIA PÓS-ORDEM
     #########################
 
-    def _process_node(self, node: Dict[str, Any]) -> Optional[str]:
-        """Processa recursivamente um nó da AST em pós-ordem."""
+    def _process_node(self, node: Union[No, Dict[str, Any], None]) -> Optional[str]:
+        """Processa um nó da AST (e sua subárvore) em pós-ordem."""
+        return percorrer(node, self._visit_node)
+
+    def _visit_node(self, node: Union[No, Dict[str, Any], None]):
+        """Despacha um nó: retorna o temporário das folhas ou o gerador do handler."""
         if not node:
             return None
-
-        tipo_vertice = node.get("tipo_vertice")
-        numero_linha = node.get("numero_linha", 0)
+        node = _tipado(node)
 
         # Caso base: valor literal
-        if "valor" in node and not node.get("filhos"):
+        if isinstance(node, (Literal, Var)) and not node.filhos:
             return self._handle_literal(node)
 
         # Caso recursivo: operações
-        if tipo_vertice == "ARITH_OP":
+        if isinstance(node, ArithOp):
             return self._handle_arithmetic_op(node)
-        elif tipo_vertice == "COMP_OP":
+        elif isinstance(node, CompOp):
             return self._handle_comparison_op(node)
-        elif tipo_vertice == "LOGIC_OP":
+        elif isinstance(node, LogicOp):
             return self._handle_logical_op(node)
-        elif tipo_vertice == "CONTROL_OP":
-            return self._handle_control_flow(node)
-        elif tipo_vertice == "LINHA":
-            filhos = node.get("filhos", [])
-
-            if not filhos:
-                return None
-            if len(filhos) == 1:
-                return self._process_node(filhos[0])
-            elif len(filhos) == 2:
-                return self._handle_variable_assignment(node)
-            else:
-                result = None
-                for child in filhos:
-                    result = self._process_node(child)
-                return result
+        elif isinstance(node, Control):
+            return self._control_flow_handler(node)
+        elif isinstance(node, Linha):
+            return self._handle_linha(node)
+        else:
+            raise ValueError(f"Tipo de nó desconhecido: {node.tipo_vertice} na linha {node.numero_linha}")
+
+    def _handle_linha(self, node: Linha) -> _Passos:
+        """Processa um nó LINHA conforme o número de filhos."""
+        filhos = node.filhos
+
+        if not filhos:
+            return None
+        if len(filhos) == 1:
+            return (yield filhos[0])
+        elif len(filhos) == 2:
+            return (yield from self._handle_variable_assignment(node))
         else:
-            raise ValueError(f"Tipo de nó desconhecido: {tipo_vertice} na linha {numero_linha}")
+            result = None
+            for child in filhos:
+                result = yield child
+            return result
 
     #########################
     # HANDLERS DE LITERAIS E OPERAÇÕES
     #########################
 
-    def _handle_literal(self, node: Dict[str, Any]) -> str:
+    def _handle_literal(self, node: Union[No, Dict[str, Any]]) -> str:
         """Processa valores literais (números, constantes). Gera: temp = valor"""
-        valor = node["valor"]
-        numero_linha = node.get("numero_linha", 0)
-        subtipo = node.get("subtipo", "")
+        node = _tipado(node)
+        valor = node.valor
+        numero_linha = node.numero_linha
+        subtipo = node.subtipo or ""
 
         # Determina tipo de dado
         if "real" in subtipo:
             data_type = "real"
             # Convert float literal to scaled integer (100x for 16-bit arithmetic)
             # Example: 0.5 → 50, 1.0 → 100, 2.5 → 250
-            valor = int(float(valor) * FLOAT_SCALE_FACTOR)
+            # The RA2 already parsed the literal into node.numero when present
+            numero = node.numero if node.numero is not None else float(valor)
+            valor = int(numero * FLOAT_SCALE_FACTOR)
         elif "inteiro" in subtipo:
             data_type = "int"
             # Integers stay as-is (no scaling needed)
@@ -142,28 +203,28 @@ class ASTTraverser:
 
         return temp
 
-    def _handle_arithmetic_op(self, node: Dict[str, Any]) -> str:
+    def _handle_arithmetic_op(self, node: ArithOp) -> _Passos:
         """Processa operações aritméticas binárias: +, -, *, /, |, %, ^"""
-        operador = node["operador"]
-        filhos = node["filhos"]
-        numero_linha = node.get("numero_linha", 0)
-        tipo_inferido = node.get("tipo_inferido")
+        operador = node.operador
+        filhos = node.filhos
+        numero_linha = node.numero_linha
+        tipo_inferido = node.tipo_inferido
 
         # Verificar se temos exatamente 2 filhos (caso normal)
         if len(filhos) == 2:
-            left_temp = self._process_node(filhos[0])
-            right_temp = self._process_node(filhos[1])
+            left_temp = yield filhos[0]
+            right_temp = yield filhos[1]
         # Caso especial: ARITH_OP com 1 filho que é outro ARITH_OP
-        elif len(filhos) == 1 and filhos[0].get("tipo_vertice") == "ARITH_OP":
+        elif len(filhos) == 1 and isinstance(filhos[0], ArithOp):
             # Processar o ARITH_OP aninhado
-            left_temp = self._process_node(filhos[0])
+            left_temp = yield filhos[0]
             right_temp = "TEMP4"
         # Caso especial: ARITH_OP com mais de 2 filhos (associatividade à esquerda)
         elif len(filhos) > 2:
             # Tratar como associatividade à esquerda: a * b * c = (a * b) * c
-            result_temp = self._process_node(filhos[0])
+            result_temp = yield filhos[0]
             for i in range(1, len(filhos)):
-                next_temp = self._process_node(filhos[i])
+                next_temp = yield filhos[i]
                 new_result = self.manager.new_temp()
                 self.instructions.append(
                     TACBinaryOp(new_result, result_temp, operador, next_temp, numero_linha, tipo_inferido)
@@ -190,14 +251,14 @@ class ASTTraverser:
     # HANDLERS DE COMPARAÇÃO E LÓGICA
     #########################
 
-    def _handle_comparison_op(self, node: Dict[str, Any]) -> str:
+    def _handle_comparison_op(self, node: CompOp) -> _Passos:
         """Processa operações de comparação: >, <, >=, <=, ==, !="""
-        filhos = node["filhos"]
-        numero_linha = node.get("numero_linha", 0)
-        operador = node.get("operador", "")
+        filhos = node.filhos
+        numero_linha = node.numero_linha
+        operador = node.operador or ""
 
-        left_temp = self._process_node(filhos[0])
-        right_temp = self._process_node(filhos[1])
+        left_temp = yield filhos[0]
+        right_temp = yield filhos[1]
 
         result_temp = self.manager.new_temp()
         self.instructions.append(
@@ -206,18 +267,18 @@ class ASTTraverser:
 
         return result_temp
 
-    def _handle_logical_op(self, node: Dict[str, Any]) -> str:
+    def _handle_logical_op(self, node: LogicOp) -> _Passos:
         """Processa operações lógicas: && (AND), || (OR), ! (NOT)."""
-        filhos = node["filhos"]
-        numero_linha = node.get("numero_linha", 0)
-        operador = node.get("operador", "")
+        filhos = node.filhos
+        numero_linha = node.numero_linha
+        operador = node.operador or ""
 
         # Operador unário NOT (!)
         if operador == "!":
             if len(filhos) != 1:
                 raise ValueError(f"Operador '!' requer 1 operando, recebeu {len(filhos)} na linha {numero_linha}")
 
-            operand_temp = self._process_node(filhos[0])
+            operand_temp = yield filhos[0]
             result_temp = self.manager.new_temp()
             self.instructions.append(
                 TACUnaryOp(result_temp, operador, operand_temp, numero_linha, "boolean")
@@ -228,8 +289,8 @@ class ASTTraverser:
         if len(filhos) != 2:
             raise ValueError(f"Operador '{operador}' requer 2 operandos, recebeu {len(filhos)} na linha {numero_linha}")
 
-        left_temp = self._process_node(filhos[0])
-        right_temp = self._process_node(filhos[1])
+        left_temp = yield filhos[0]
+        right_temp = yield filhos[1]
 
         result_temp = self.manager.new_temp()
         self.instructions.append(
@@ -242,10 +303,14 @@ class ASTTraverser:
     # HANDLERS DE CONTROLE DE FLUXO
     #########################
 
-    def _handle_control_flow(self, node: Dict[str, Any]) -> Optional[str]:
-        """Despacha para handlers específicos de controle de fluxo."""
-        operador = node.get("operador", "")
-        numero_linha = node.get("numero_linha", 0)
+    def _handle_control_flow(self, node: Union[Control, Dict[str, Any]]) -> Optional[str]:
+        """Processa um nó de controle de fluxo (IFELSE, WHILE, FOR) e seus filhos."""
+        return self._process_node(_tipado(node))
+
+    def _control_flow_handler(self, node: Control):
+        """Escolhe o handler específico de controle de fluxo."""
+        operador = node.operador or ""
+        numero_linha = node.numero_linha
 
         if operador == "IFELSE":
             return self._handle_ifelse(node)
@@ -256,10 +321,10 @@ class ASTTraverser:
         else:
             raise ValueError(f"Operador de controle desconhecido '{operador}' na linha {numero_linha}")
 
-    def _handle_ifelse(self, node: Dict[str, Any]) -> Optional[str]:
+    def _handle_ifelse(self, node: Control) -> _Passos:
         """Processa IFELSE: (condição then else IFELSE)."""
-        filhos = node["filhos"]
-        numero_linha = node.get("numero_linha", 0)
+        filhos = node.filhos
+        numero_linha = node.numero_linha
 
         if len(filhos) != 3:
             raise ValueError(f"IFELSE requer 3 operandos, recebeu {len(filhos)} na linha {numero_linha}")
@@ -271,24 +336,24 @@ class ASTTraverser:
         label_end = self.manager.new_label()
 
         # Processa condição
-        cond_temp = self._process_node(condition_node)
+        cond_temp = yield condition_node
         self.instructions.append(TACIfFalseGoto(cond_temp, label_else, numero_linha))
 
         # Processa branch then
-        then_temp = self._process_node(then_node)
+        then_temp = yield then_node
         self.instructions.append(TACGoto(label_end, numero_linha))
 
         # Processa branch else
         self.instructions.append(TACLabel(label_else, numero_linha))
-        else_temp = self._process_node(else_node)
+        else_temp = yield else_node
         self.instructions.append(TACLabel(label_end, numero_linha))
 
         return else_temp
 
-    def _handle_while(self, node: Dict[str, Any]) -> Optional[str]:
+    def _handle_while(self, node: Control) -> _Passos:
         """Processa WHILE: (condição bloco WHILE) - bloco pode ter múltiplas expressões."""
-        filhos = node["filhos"]
-        numero_linha = node.get("numero_linha", 0)
+        filhos = node.filhos
+        numero_linha = node.numero_linha
 
         if len(filhos) < 2:
             raise ValueError(f"WHILE requer pelo menos 2 operandos, recebeu {len(filhos)} na linha {numero_linha}")
@@ -304,12 +369,12 @@ class ASTTraverser:
         self.instructions.append(TACLabel(label_start, numero_linha))
 
         # Processa condição
-        cond_temp = self._process_node(condition_node)
+        cond_temp = yield condition_node
         self.instructions.append(TACIfFalseGoto(cond_temp, label_end, numero_linha))
 
         # Processa bloco (sequência de expressões)
         for block_node in block_nodes:
-            self._process_node(block_node)
+            yield block_node
 
         self.instructions.append(TACGoto(label_start, numero_linha))
 
@@ -318,10 +383,10 @@ class ASTTraverser:
 
         return None
 
-    def _handle_for(self, node: Dict[str, Any]) -> Optional[str]:
+    def _handle_for(self, node: Control) -> _Passos:
         """Processa FOR: (init fim passo bloco FOR) - bloco pode ter múltiplas expressões."""
-        filhos = node["filhos"]
-        numero_linha = node.get("numero_linha", 0)
+        filhos = node.filhos
+        numero_linha = node.numero_linha
 
         if len(filhos) != 4:
             raise ValueError(f"FOR requer 4 operandos, recebeu {len(filhos)} na linha {numero_linha}")
@@ -333,9 +398,9 @@ class ASTTraverser:
         label_end = self.manager.new_label()
 
         # Processa valores iniciais
-        current_temp = self._process_node(init_node)
-        end_temp = self._process_node(end_node)
-        step_temp = self._process_node(step_node)
+        current_temp = yield init_node
+        end_temp = yield end_node
+        step_temp = yield step_node
 
         # Cria temp para contador do loop
         loop_counter = self.manager.new_temp()
@@ -350,7 +415,7 @@ class ASTTraverser:
         self.instructions.append(TACIfFalseGoto(cond_temp, label_end, numero_linha))
 
         # Processa bloco (sequência de expressões)
-        self._process_block(block_node)
+        yield from self._process_block(block_node)
 
         # Incrementa contador
         new_counter = self.manager.new_temp()
@@ -363,81 +428,47 @@ class ASTTraverser:
 
         return None
 
-    def _process_block(self, block_node: Dict[str, Any]) -> None:
-        """Processa um bloco de código (sequência de expressões ou bloco implícito)."""
+    def _process_block(self, block_node: Optional[No]) -> _Passos:
+        """Processa um bloco de código (sequência de expressões)."""
         if not block_node:
             return
 
-        # Verificar se é um bloco implícito (linha com múltiplas expressões)
-        if self._is_implicit_block(block_node):
-            self._process_implicit_block(block_node)
-        elif 'filhos' in block_node:
-            # Um bloco é uma sequência de linhas/expressões
-            for expression_node in block_node['filhos']:
-                self._process_node(expression_node)
-        else:
-            # Corpo simples
-            self._process_node(block_node)
-
-    def _is_implicit_block(self, node: Dict[str, Any]) -> bool:
-        """Verifica se um nó representa um bloco implícito (linha com múltiplas expressões)."""
-        if not node or node.get('tipo') != 'LINHA':
-            return False
-
-        # Uma linha é um bloco implícito se tem filhos que são expressões sem operador final
-        filhos = node.get('filhos', [])
-        if len(filhos) > 1:
-            # Verificar se todos os filhos são linhas/expressões
-            return all(filho.get('tipo') == 'LINHA' for filho in filhos)
-        return False
-
-    def _process_implicit_block(self, block_node: Dict[str, Any]) -> None:
-        """Processa um bloco implícito (linha contendo múltiplas subexpressões)."""
-        filhos = block_node.get('filhos', [])
-        for expression_node in filhos:
-            if expression_node.get('tipo') == 'LINHA':
-                # Verificar se esta expressão contém múltiplas subexpressões que deveriam ser atribuições
-                sub_filhos = expression_node.get('filhos', [])
-                if len(sub_filhos) == 2 and all(f.get('tipo') == 'LINHA' for f in sub_filhos):
-                    # Possível padrão: ((expr1) (expr2)) - tratar como duas atribuições separadas
-                    for sub_expr in sub_filhos:
-                        self._process_node(sub_expr)
-                else:
-                    # Expressão normal
-                    self._process_node(expression_node)
-
-    def _handle_variable_assignment(self, node: Dict[str, Any]) -> str:
+        # Um bloco é uma sequência de linhas/expressões
+        for expression_node in block_node.filhos:
+            yield expression_node
+
+    def _handle_variable_assignment(self, node: Linha) -> _Passos:
         """Processa atribuições de variáveis: (valor variável). Ex: (10 X) → X = 10"""
-        filhos = node["filhos"]
-        numero_linha = node.get("numero_linha", 0)
+        filhos = node.filhos
+        numero_linha = node.numero_linha
 
         if len(filhos) < 2:
             result = None
             for child in filhos:
-                result = self._process_node(child)
+                result = yield child
             return result
 
         value_node = filhos[0]
         var_node = filhos[1]
 
         # Verifica comando RES
-        if var_node.get("valor") == "RES":
+        if var_node.valor == "RES":
             return self._handle_res_command(node)
 
         # Verifica se é uma variável válida (não é símbolo especial)
-        var_name = var_node.get("valor", "")
-        if not var_name or var_name in ['(', ')', '[', ']', '{', '}', ';', ':', '.', ','] or var_node.get("subtipo") != "variavel":
+        var_name = var_node.valor or ""
+        if not var_name or var_name in ['(', ')', '[', ']', '{', '}', ';', ':', '.', ','] or not isinstance(var_node, Var):
             # Não é uma atribuição válida - apenas processe os filhos sem gerar TAC
             result = None
             for child in filhos:
-                temp_result = self._process_node(child)
+                temp_result = yield child
                 if temp_result is not None:
                     result = temp_result
             return result
 
         # Processa expressão de valor
-        value_temp = self._process_node(value_node)
-        data_type = value_node.get("tipo_inferido")
+        value_temp = yield value_node
+        data_type = value_node.tipo_inferido
 
         # Se não há tipo no nó, tentar inferir a partir do operando (constante, temp ou variável)
         if data_type is None:
@@ -447,23 +478,37 @@ class ASTTraverser:
 
         return value_temp
 
-    def _handle_res_command(self, node: Dict[str, Any]) -> str:
+    def _handle_res_command(self, node: Linha) -> str:
         """Processa comando RES: (índice RES) - recupera resultado histórico."""
-        filhos = node["filhos"]
-        numero_linha = node.get("numero_linha", 0)
+        filhos = node.filhos
+        numero_linha = node.numero_linha
 
         index_node = filhos[0]
-        index_value = index_node.get("valor", "0")
+        index_value = index_node.valor if index_node.valor is not None else "0"
 
-        try:
-            index = int(index_value)
-        except ValueError:
-            raise ValueError(f"Índice RES deve ser inteiro, recebeu '{index_value}' na linha {numero_linha}")
+        if isinstance(index_node.numero, int):
+            index = index_node.numero
+        else:
+            try:
+                index = int(index_value)
+            except ValueError:
+                raise ValueError(f"Índice RES deve ser inteiro, recebeu '{index_value}' na linha {numero_linha}")
 
         if index < 0 or index >= len(self._result_history):
             raise ValueError(f"Índice RES {index} fora dos limites (histórico: {len(self._result_history)}) na linha {numero_linha}")
 
-        historical_temp = self._result_history[index]
+        return self._copy_history_result(self._result_history[index], numero_linha)
+
+    def _handle_res_offset(self, linha: Linha) -> str:
+        """Processa (X RES) com X constante: 'offset_res' indica a linha referenciada."""
+        numero_linha = linha.numero_linha
+        alvo = numero_linha - linha.offset_res
+        if alvo not in self._result_by_line:
+            raise ValueError(f"Linha {alvo} referenciada por RES sem resultado na linha {numero_linha}")
+        return self._copy_history_result(self._result_by_line[alvo], numero_linha)
+
+    def _copy_history_result(self, historical_temp: str, numero_linha: Any) -> str:
+        """Copia um resultado do histórico para um novo temporário."""
         result_temp = self.manager.new_temp()
 
         # Inferir tipo do histórico, se possível (procura última definição ou constante)
@@ -11,21 +11,41 @@
 """
 Gerador de código Assembly AVR pro Arduino Uno.
 Recebe o TAC otimizado e gera o código Assembly completo.
+
+Com usar_intervalos (ligado pelo compilador), roda antes a análise de
+intervalos (analise_intervalos) sobre o TAC. Quando os operandos de uma
+instrução cabem em um byte, ela é emitida em 8 bits (sem o trabalho no byte
+alto); caso contrário, em 16 bits.
 """
 
 from typing import Dict, List, Tuple, Optional, Any
 import json
 
+from src.RA1.functions.python.artefatos import carregar_artefato
+from src.RA4.functions.python.analise_intervalos import (
+    analisar_intervalos,
+    cabe_em_byte,
+    intervalo_binario,
+    intervalo_operando,
+)
+
 
 class GeradorAssembly:
     """
     Gerador de Assembly AVR pra ATmega328P.
     """
 
-    def __init__(self):
+    def __init__(self, usar_intervalos: bool = False):
         """
         Inicializa o gerador de assembly.
+
+        Args:
+            usar_intervalos: Se True, a análise de intervalos do TAC escolhe
+                aritmética de 8 bits para os operandos que cabem em um byte
+                (sem ela tudo é 16-bit)
         """
+        self._usar_intervalos = usar_intervalos
+
         # Alocação fixa de registradores pras variáveis
         # IMPORTANTE: R18-R21 são usados pela rotina de multiplicação
         self._fixed_allocations: Dict[str, Tuple[int, int]] = {
@@ -49,6 +69,12 @@ class GeradorAssembly:
         # Rotinas auxiliares que vão ser geradas no final
         self._routines_needed: set = set()
 
+        # Intervalos das variáveis antes da instrução sendo processada
+        self._intervalos_atuais: Dict[str, Tuple[int, int]] = {}
+
+        # Variáveis que não couberam em registradores (nome -> endereço na SRAM)
+        self._spilled_vars: Dict[str, int] = {}
+
     def gerarAssembly(self, tac_otimizado: Dict[str, Any]) -> str:
         """
         Gera o código Assembly a partir do TAC.
@@ -61,9 +87,11 @@ class GeradorAssembly:
         # 1. Gerar prólogo (inicialização do programa)
         asm_lines.extend(self._gerar_prologo())
 
-        # 2. Processar cada instrução TAC
+        # 2. Processar cada instrução TAC (com os intervalos válidos antes dela)
         instructions = tac_otimizado["instructions"]
-        for instr in instructions:
+        intervalos = analisar_intervalos(instructions) if self._usar_intervalos else [None] * len(instructions)
+        for instr, estado in zip(instructions, intervalos):
+            self._intervalos_atuais = estado or {}
             asm_lines.extend(self._processar_instrucao(instr))
 
         # 3. Gerar epílogo (finalização do programa)
@@ -118,6 +146,37 @@ class GeradorAssembly:
         except ValueError:
             return False
 
+    def _cabem_em_byte(self, *operands: Any) -> bool:
+        """
+        Verifica se todos os operandos cabem em um byte na instrução atual.
+        """
+        if not self._usar_intervalos:
+            return False
+        return all(cabe_em_byte(intervalo_operando(op, self._intervalos_atuais)) for op in operands)
+
+    def _resultado_cabe_em_byte(self, instr: Dict[str, Any]) -> bool:
+        """
+        Verifica se operandos e resultado de uma binary_op cabem em um byte.
+        """
+        op1, op2 = instr["operand1"], instr["operand2"]
+        resultado = intervalo_binario(instr["operator"],
+                                      intervalo_operando(op1, self._intervalos_atuais),
+                                      intervalo_operando(op2, self._intervalos_atuais),
+                                      instr.get("data_type"))
+        return self._cabem_em_byte(op1, op2) and cabe_em_byte(resultado)
+
+    def _registrador_byte(self, operand: Any, reg_temp: int) -> Tuple[List[str], int]:
+        """
+        Retorna o registrador com o byte baixo de um operando que cabe em um byte.
+
+        Constantes são carregadas com LDI em reg_temp (R18 ou R20, livres entre
+        instruções); variáveis usam o byte baixo do próprio par.
+        """
+        if self._is_constant(operand):
+            valor = intervalo_operando(operand, None)[0]
+            return [f"    ldi r{reg_temp}, {valor}          ; Constante {operand}"], reg_temp
+        return [], self._get_reg_pair(operand)[0]
+
     def _load_constant_16bit(self, value: float, reg_low: int, reg_high: int) -> List[str]:
         """
         Carrega uma constante em um par de registradores.
@@ -223,15 +282,24 @@ class GeradorAssembly:
         operator = instr["operator"]
 
         # Despachar para função específica de cada operador
+        # (versão 8-bit quando a análise de intervalos garante que cabe em um byte)
         if operator == "+":
+            if self._resultado_cabe_em_byte(instr):
+                return self._processar_adicao_8bit(instr)
             return self._processar_adicao_16bit(instr)
         elif operator == "-":
+            if self._resultado_cabe_em_byte(instr):
+                return self._processar_subtracao_8bit(instr)
             return self._processar_subtracao_16bit(instr)
         elif operator == "*":
             return self._processar_multiplicacao_16bit(instr)
         elif operator == "/":
+            if self._cabem_em_byte(instr["operand1"], instr["operand2"]):
+                return self._processar_divisao_8bit(instr)
             return self._processar_divisao_16bit(instr)
         elif operator == "%":
+            if self._cabem_em_byte(instr["operand1"], instr["operand2"]):
+                return self._processar_divisao_8bit(instr)
             return self._processar_modulo_16bit(instr)
         elif operator == "^":
             return self._processar_exponenciacao_16bit(instr)
@@ -305,6 +373,62 @@ class GeradorAssembly:
 
         return asm
 
+    def _processar_adicao_8bit(self, instr: Dict[str, Any]) -> List[str]:
+        """
+        Processa adição 8-bit: result = op1 + op2
+
+        Usada quando operandos e resultado cabem em um byte: soma só o byte
+        baixo e zera o byte alto do resultado.
+        """
+        return self._processar_operacao_8bit(instr, "add", "inc", "Soma")
+
+    def _processar_subtracao_8bit(self, instr: Dict[str, Any]) -> List[str]:
+        """
+        Processa subtração 8-bit: result = op1 - op2
+
+        Usada quando operandos e resultado cabem em um byte (op1 >= op2 sempre).
+        """
+        return self._processar_operacao_8bit(instr, "sub", "dec", "Subtração")
+
+    def _processar_operacao_8bit(self, instr: Dict[str, Any], mnemonico: str,
+                                 mnemonico_unitario: str, descricao: str) -> List[str]:
+        """
+        Gera soma/subtração no byte baixo: mov + (add|sub|inc|dec) + clr do byte alto.
+        """
+        result = instr["result"]
+        op1 = instr["operand1"]
+        op2 = instr["operand2"]
+        operator = instr["operator"]
+        line = instr.get("line", "?")
+
+        asm = [f"    ; TAC linha {line}: {result} = {op1} {operator} {op2}",
+               f"    ; {descricao} 8-bit: operandos e resultado cabem em um byte"]
+
+        res_low, res_high = self._get_reg_pair(result)
+        carga1, reg1 = self._registrador_byte(op1, 18)
+        asm.extend(carga1)
+
+        if self._is_constant(op2) and intervalo_operando(op2, None)[0] == 1:
+            operacao = [f"    {mnemonico_unitario} r{res_low}              ; {descricao} de 1 (byte baixo)"]
+        else:
+            carga2, reg2 = self._registrador_byte(op2, 20)
+            asm.extend(carga2)
+            # op2 no registrador do resultado seria sobrescrito pelo mov de op1
+            if reg2 == res_low and reg1 != res_low:
+                asm.append(f"    mov r20, r{reg2}          ; Preserva op2")
+                reg2 = 20
+            operacao = [f"    {mnemonico} r{res_low}, r{reg2}   ; {descricao} op2 (byte baixo)"]
+
+        if reg1 != res_low:
+            asm.append(f"    mov r{res_low}, r{reg1}   ; Copia op1 pro resultado")
+        asm.extend(operacao)
+        asm.extend([
+            f"    clr r{res_high}              ; Byte alto do resultado é zero",
+            ""
+        ])
+
+        return asm
+
     def _processar_subtracao_16bit(self, instr: Dict[str, Any]) -> List[str]:
         """
         Processa subtração 16-bit: result = op1 - op2
@@ -355,6 +479,9 @@ class GeradorAssembly:
     def _processar_multiplicacao_16bit(self, instr: Dict[str, Any]) -> List[str]:
         """
         Processa multiplicação 16-bit.
+
+        Se os dois operandos cabem em um byte, usa uma única MUL (8x8 = 16 bits)
+        no lugar da rotina mul16.
         """
         result = instr["result"]
         op1 = instr["operand1"]
@@ -362,14 +489,27 @@ class GeradorAssembly:
         line = instr.get("line", "?")
         data_type = instr.get("data_type", "int")  # Default to int if not specified
 
-        # Registrar que precisamos da rotina mul16
-        self._routines_needed.add("mul16")
-
         asm = [f"    ; TAC linha {line}: {result} = {op1} * {op2} (type: {data_type})"]
 
         # Pega registradores do resultado
         res_low, res_high = self._get_reg_pair(result)
 
+        if self._cabem_em_byte(op1, op2):
+            # Operandos de um byte: produto de 16 bits com uma única MUL
+            carga1, reg1 = self._registrador_byte(op1, 18)
+            carga2, reg2 = self._registrador_byte(op2, 20)
+            asm.extend(carga1 + carga2)
+            asm.extend([
+                f"    ; Multiplicação 8-bit: operandos cabem em um byte",
+                f"    mul r{reg1}, r{reg2}          ; R1:R0 = op1 * op2",
+                f"    movw r24, r0             ; R24:R25 = produto",
+                f"    clr r1                   ; R1 volta a ser zero",
+            ])
+            return asm + self._finalizar_multiplicacao(data_type, res_low, res_high)
+
+        # Registrar que precisamos da rotina mul16
+        self._routines_needed.add("mul16")
+
         # Prepara operandos pra mul16 (R18:R19 = op1, R20:R21 = op2)
         if self._is_constant(op1):
             int_value = int(float(op1))
@@ -415,6 +555,14 @@ class GeradorAssembly:
 
         asm.append(f"    rcall mul16              ; R24:R25 = op1 * op2")
 
+        return asm + self._finalizar_multiplicacao(data_type, res_low, res_high)
+
+    def _finalizar_multiplicacao(self, data_type: str, res_low: int, res_high: int) -> List[str]:
+        """
+        Renormaliza o produto em R24:R25 (reais) e copia pro destino.
+        """
+        asm = []
+
         # Só aplica renormalização pra números reais
         if data_type == "real":
             # Need div16 for scale renormalization
@@ -483,6 +631,50 @@ class GeradorAssembly:
 
         return asm
 
+    def _processar_divisao_8bit(self, instr: Dict[str, Any]) -> List[str]:
+        """
+        Processa divisão ou módulo 8-bit: result = op1 / op2 ou op1 % op2
+
+        Usada quando dividendo e divisor cabem em um byte. A rotina div8 faz
+        8 iterações em vez das 16 de div16 e devolve os mesmos valores
+        (quociente em R24:R25, resto em R22:R23, byte alto zerado).
+
+        Args:
+            instr: Instrução TAC de divisão ou módulo
+
+        Returns:
+            Linhas Assembly geradas
+        """
+        result = instr["result"]
+        op1 = instr["operand1"]
+        op2 = instr["operand2"]
+        operator = instr["operator"]
+        line = instr.get("line", "?")
+
+        self._routines_needed.add("div8")
+
+        asm = [f"    ; TAC linha {line}: {result} = {op1} {operator} {op2}",
+               f"    ; Divisão 8-bit: dividendo e divisor cabem em um byte"]
+
+        res_low, res_high = self._get_reg_pair(result)
+        carga1, reg1 = self._registrador_byte(op1, 18)
+        carga2, reg2 = self._registrador_byte(op2, 20)
+        asm.extend(carga1 + carga2)
+        if reg1 != 18:
+            asm.append(f"    mov r18, r{reg1}   ; Dividendo")
+        if reg2 != 20:
+            asm.append(f"    mov r20, r{reg2}   ; Divisor")
+
+        saida_low, saida_high = (24, 25) if operator == "/" else (22, 23)
+        asm.extend([
+            f"    rcall div8            ; Quociente em R24:R25, resto em R22:R23",
+            f"    mov r{res_low}, r{saida_low}   ; Copiar {'quociente' if operator == '/' else 'RESTO'}",
+            f"    mov r{res_high}, r{saida_high}",
+            ""
+        ])
+
+        return asm
+
     def _processar_modulo_16bit(self, instr: Dict[str, Any]) -> List[str]:
         """
         Processa módulo 16-bit: result = op1 % op2
@@ -606,6 +798,27 @@ class GeradorAssembly:
     # Operadores de Comparação (16-bit unsigned)
     # ====================================================================
 
+    def _comparar(self, op_a: Any, op_b: Any) -> List[str]:
+        """
+        Gera a comparação de op_a com op_b (flags de op_a - op_b).
+
+        Se os dois cabem em um byte os bytes altos são zero e basta CP nos
+        bytes baixos; caso contrário, CP + CPC nos dois bytes.
+        """
+        if self._cabem_em_byte(op_a, op_b):
+            carga_a, reg_a = self._registrador_byte(op_a, 18)
+            carga_b, reg_b = self._registrador_byte(op_b, 20)
+            return carga_a + carga_b + [
+                f"    cp r{reg_a}, r{reg_b}      ; Compare low bytes (operandos cabem em um byte)",
+            ]
+
+        a_low, a_high = self._get_reg_pair(op_a)
+        b_low, b_high = self._get_reg_pair(op_b)
+        return [
+            f"    cp r{a_low}, r{b_low}      ; Compare low bytes",
+            f"    cpc r{a_high}, r{b_high}   ; Compare high bytes with carry",
+        ]
+
     def _processar_comparacao_eq(self, instr: Dict[str, Any]) -> List[str]:
         """
         Processa comparação de igualdade: result = op1 == op2
@@ -628,15 +841,13 @@ class GeradorAssembly:
         skip_label = f"skip_eq_{line}"
 
         # Obter registradores dos operandos
-        op1_low, op1_high = self._get_reg_pair(op1)
-        op2_low, op2_high = self._get_reg_pair(op2)
+        comparacao = self._comparar(op1, op2)
         res_low, res_high = self._get_reg_pair(result)
 
         return [
             f"    ; TAC linha {line}: {result} = {op1} == {op2}",
             f"    ; Comparação 16-bit de igualdade (unsigned)",
-            f"    cp r{op1_low}, r{op2_low}      ; Compare low bytes",
-            f"    cpc r{op1_high}, r{op2_high}   ; Compare high bytes with carry",
+            *comparacao,
             f"    ldi r{res_low}, 0               ; Assume false",
             f"    ldi r{res_high}, 0",
             f"    brne {skip_label}               ; If not equal, skip",
@@ -663,15 +874,13 @@ class GeradorAssembly:
 
         skip_label = f"skip_ne_{line}"
 
-        op1_low, op1_high = self._get_reg_pair(op1)
-        op2_low, op2_high = self._get_reg_pair(op2)
+        comparacao = self._comparar(op1, op2)
         res_low, res_high = self._get_reg_pair(result)
 
         return [
             f"    ; TAC linha {line}: {result} = {op1} != {op2}",
             f"    ; Comparação 16-bit de desigualdade (unsigned)",
-            f"    cp r{op1_low}, r{op2_low}      ; Compare low bytes",
-            f"    cpc r{op1_high}, r{op2_high}   ; Compare high bytes with carry",
+            *comparacao,
             f"    ldi r{res_low}, 0               ; Assume false",
             f"    ldi r{res_high}, 0",
             f"    breq {skip_label}               ; If equal, skip",
@@ -701,15 +910,13 @@ class GeradorAssembly:
 
         skip_label = f"skip_lt_{line}"
 
-        op1_low, op1_high = self._get_reg_pair(op1)
-        op2_low, op2_high = self._get_reg_pair(op2)
+        comparacao = self._comparar(op1, op2)
         res_low, res_high = self._get_reg_pair(result)
 
         return [
             f"    ; TAC linha {line}: {result} = {op1} < {op2}",
             f"    ; Comparação 16-bit menor que (unsigned)",
-            f"    cp r{op1_low}, r{op2_low}      ; Compare low bytes",
-            f"    cpc r{op1_high}, r{op2_high}   ; Compare high bytes with carry",
+            *comparacao,
             f"    ldi r{res_low}, 0               ; Assume false",
             f"    ldi r{res_high}, 0",
             f"    brsh {skip_label}               ; If A >= B, skip",
@@ -736,15 +943,13 @@ class GeradorAssembly:
 
         skip_label = f"skip_ge_{line}"
 
-        op1_low, op1_high = self._get_reg_pair(op1)
-        op2_low, op2_high = self._get_reg_pair(op2)
+        comparacao = self._comparar(op1, op2)
         res_low, res_high = self._get_reg_pair(result)
 
         return [
             f"    ; TAC linha {line}: {result} = {op1} >= {op2}",
             f"    ; Comparação 16-bit maior ou igual (unsigned)",
-            f"    cp r{op1_low}, r{op2_low}      ; Compare low bytes",
-            f"    cpc r{op1_high}, r{op2_high}   ; Compare high bytes with carry",
+            *comparacao,
             f"    ldi r{res_low}, 0               ; Assume false",
             f"    ldi r{res_high}, 0",
             f"    brlo {skip_label}               ; If A < B, skip",
@@ -773,16 +978,14 @@ class GeradorAssembly:
 
         skip_label = f"skip_gt_{line}"
 
-        op1_low, op1_high = self._get_reg_pair(op1)
-        op2_low, op2_high = self._get_reg_pair(op2)
+        comparacao = self._comparar(op2, op1)
         res_low, res_high = self._get_reg_pair(result)
 
         return [
             f"    ; TAC linha {line}: {result} = {op1} > {op2}",
             f"    ; Comparação 16-bit maior que (unsigned)",
             f"    ; Implementado como: B < A (operandos trocados)",
-            f"    cp r{op2_low}, r{op1_low}      ; Compare B with A (reversed)",
-            f"    cpc r{op2_high}, r{op1_high}",
+            *comparacao,
             f"    ldi r{res_low}, 0               ; Assume false",
             f"    ldi r{res_high}, 0",
             f"    brsh {skip_label}               ; If B >= A, skip",
@@ -811,16 +1014,14 @@ class GeradorAssembly:
 
         skip_label = f"skip_le_{line}"
 
-        op1_low, op1_high = self._get_reg_pair(op1)
-        op2_low, op2_high = self._get_reg_pair(op2)
+        comparacao = self._comparar(op2, op1)
         res_low, res_high = self._get_reg_pair(result)
 
         return [
             f"    ; TAC linha {line}: {result} = {op1} <= {op2}",
             f"    ; Comparação 16-bit menor ou igual (unsigned)",
             f"    ; Implementado como: B >= A (operandos trocados)",
-            f"    cp r{op2_low}, r{op1_low}      ; Compare B with A (reversed)",
-            f"    cpc r{op2_high}, r{op1_high}",
+            *comparacao,
             f"    ldi r{res_low}, 0               ; Assume false",
             f"    ldi r{res_high}, 0",
             f"    brlo {skip_label}               ; If B < A, skip",
@@ -882,6 +1083,15 @@ class GeradorAssembly:
         # Get register pair for condition variable
         cond_low, cond_high = self._get_reg_pair(condition)
 
+        # Condição de um byte (resultado de comparação): TST no byte baixo
+        if self._cabem_em_byte(condition):
+            return [
+                f"    ; TAC linha {line}: if {condition} goto {target}",
+                f"    tst r{cond_low}                ; {condition} cabe em um byte",
+                f"    brne {target}               ; Branch if NOT equal (condition is true)",
+                ""
+            ]
+
         return [
             f"    ; TAC linha {line}: if {condition} goto {target}",
             f"    ; Check if {condition} != 0 (true)",
@@ -912,6 +1122,15 @@ class GeradorAssembly:
         # Get register pair for condition variable
         cond_low, cond_high = self._get_reg_pair(condition)
 
+        # Condição de um byte (resultado de comparação): TST no byte baixo
+        if self._cabem_em_byte(condition):
+            return [
+                f"    ; TAC linha {line}: ifFalse {condition} goto {target}",
+                f"    tst r{cond_low}                ; {condition} cabe em um byte",
+                f"    breq {target}               ; Branch if equal (condition is false)",
+                ""
+            ]
+
         return [
             f"    ; TAC linha {line}: ifFalse {condition} goto {target}",
             f"    ; Check if {condition} == 0 (false)",
@@ -1048,6 +1267,9 @@ class GeradorAssembly:
         if "div16" in self._routines_needed:
             epilogo.extend(self._gerar_rotina_divisao_16bit())
 
+        if "div8" in self._routines_needed:
+            epilogo.extend(self._gerar_rotina_divisao_8bit())
+
         if "exp16" in self._routines_needed:
             epilogo.extend(self._gerar_rotina_exponenciacao())
 
@@ -1220,6 +1442,71 @@ class GeradorAssembly:
             ""
         ]
 
+    def _gerar_rotina_divisao_8bit(self) -> List[str]:
+        """
+        Gera rotina auxiliar para divisão 8-bit ÷ 8-bit = quociente e resto (unsigned).
+
+        Mesmo algoritmo de div16 com 8 iterações. As saídas têm o formato de
+        div16 (byte alto zerado), então o chamador copia os dois bytes.
+
+        Convenção de chamada:
+        - Entrada: R18 (dividendo), R20 (divisor)
+        - Saída: R24:R25 (quociente), R22:R23 (resto)
+        - Usa: R16 (contador de loop)
+
+        Tratamento de divisão por zero: igual a div16 (quociente 0xFFFF,
+        resto = dividendo).
+
+        Returns:
+            Linhas Assembly da rotina
+        """
+        return [
+            "; ====================================================================",
+            "; div8: Divisão 8-bit ÷ 8-bit = quociente e resto (unsigned)",
+            "; Entrada: R18 (dividendo), R20 (divisor)",
+            "; Saída: R24:R25 (quociente), R22:R23 (resto), bytes altos zerados",
+            "; Usa: R16 (contador de loop)",
+            "; ====================================================================",
+            "div8:",
+            "    push r16              ; Salvar registrador usado",
+            "",
+            "    ; Verificar divisão por zero",
+            "    cp      r20, r1",
+            "    breq    div8_by_zero",
+            "",
+            "    clr     r22           ; Resto = 0",
+            "    ldi     r16, 8        ; 8 iterações",
+            "",
+            "div8_loop:",
+            "    lsl     r18           ; Desloca dividendo/quociente",
+            "    rol     r22           ; MSB do dividendo entra no resto",
+            "    brcs    div8_sub      ; Resto passou de 8 bits: com certeza >= divisor",
+            "    cp      r22, r20",
+            "    brcs    div8_skip     ; Resto < divisor: não subtrai",
+            "div8_sub:",
+            "    sub     r22, r20      ; Resto -= divisor",
+            "    inc     r18           ; Bit do quociente = 1",
+            "",
+            "div8_skip:",
+            "    dec     r16",
+            "    brne    div8_loop",
+            "",
+            "    mov     r24, r18      ; Quociente",
+            "    clr     r25",
+            "    clr     r23           ; Resto já está em R22",
+            "    pop r16",
+            "    ret",
+            "",
+            "div8_by_zero:",
+            "    ldi     r24, 0xFF     ; Quociente = 0xFFFF (indicador de erro)",
+            "    ldi     r25, 0xFF",
+            "    mov     r22, r18      ; Resto = dividendo original",
+            "    clr     r23",
+            "    pop r16",
+            "    ret",
+            ""
+        ]
+
     def _gerar_rotina_exponenciacao(self) -> List[str]:
         """
         Gera rotina auxiliar para exponenciação 16-bit ^ 16-bit.
@@ -1406,19 +1693,19 @@ def gerarAssembly(tac_otimizado_path: str, output_path: str) -> None:
     Função de conveniência para gerar Assembly a partir de arquivo JSON TAC.
 
     Args:
-        tac_otimizado_path: Caminho para arquivo JSON com TAC otimizado
+        tac_otimizado_path: Caminho para artefato (JSON ou binário) com TAC otimizado
         output_path: Caminho para salvar arquivo .s de saída
 
     Raises:
         FileNotFoundError: Se arquivo TAC não existe
         json.JSONDecodeError: Se JSON é inválido
+        ErroArtefato: Se o artefato binário é inválido
     """
     # Ler TAC otimizado
-    with open(tac_otimizado_path, 'r', encoding='utf-8') as f:
-        tac_otimizado = json.load(f)
+    tac_otimizado = carregar_artefato(tac_otimizado_path)
 
     # Gerar Assembly
-    gerador = GeradorAssembly()
+    gerador = GeradorAssembly(usar_intervalos=True)
     assembly_code = gerador.gerarAssembly(tac_otimizado)
 
     # Salvar arquivo .s
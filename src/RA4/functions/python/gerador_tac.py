@@ -15,10 +15,13 @@ Módulo principal para geração de código TAC a partir da AST (Fase 3).
 Orquestra o pipeline de geração e salvamento.
 """
 
-import json
 from pathlib import Path
 from typing import Dict, Any, Union, List, Optional
 
+from collections.abc import Mapping
+
+from src.RA1.functions.python.artefatos import abrir_artefato
+
 from .tac_manager import TACManager
 from .ast_traverser import ASTTraverser
 from .tac_instructions import TACInstruction
@@ -39,7 +42,7 @@ def gerarTAC(
     Gera código TAC a partir de uma AST atribuída.
     
     Args:
-        ast_input: Caminho do arquivo JSON ou dicionário da AST.
+        ast_input: Caminho do artefato (JSON ou binário) ou dicionário da AST.
         output_dir: Diretório para salvar saídas.
         save_output: Se deve salvar arquivos JSON/MD.
         source_file: Nome do arquivo fonte (para metadados).
@@ -55,23 +58,22 @@ def gerarTAC(
         "error": None
     }
 
+    artefato = None
+
     try:
-        # Carrega AST se for um caminho de arquivo
+        # Abre AST se for um caminho de arquivo (artefatos binários são lidos
+        # sob demanda: cada LINHA só é decodificada quando o traverser chega nela)
         if isinstance(ast_input, (str, Path)):
-            ast_path = Path(ast_input)
-            if not ast_path.exists():
-                raise FileNotFoundError(f"Arquivo AST não encontrado: {ast_path}")
-
-            with open(ast_path, 'r', encoding='utf-8') as f:
-                ast_dict = json.load(f)
+            artefato = abrir_artefato(ast_input)
+            ast_dict = artefato
 
             if source_file is None:
-                source_file = ast_path.name
+                source_file = artefato.caminho.name
         else:
             ast_dict = ast_input
 
         # Validação básica da estrutura
-        if not isinstance(ast_dict, dict):
+        if not isinstance(ast_dict, Mapping):
             raise ValueError("AST deve ser um dicionário")
 
         if "arvore_atribuida" not in ast_dict:
@@ -102,6 +104,9 @@ def gerarTAC(
 
     except Exception as e:
         result["error"] = f"Erro inesperado: {type(e).__name__}: {e}"
+    finally:
+        if artefato is not None:
+            artefato.fechar()
 
     return result
 
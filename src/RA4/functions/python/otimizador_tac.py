@@ -12,6 +12,9 @@ import json
 import os
 from typing import List, Dict, Any, Optional, Union
 
+from src.RA1.functions.python.artefatos import ArtefatoIndexado, ErroArtefato, abrir_artefato, salvar_artefato
+from src.RA1.functions.python.relatorios import agendar_relatorio
+
 from .tac_instructions import TACInstruction, instruction_from_dict, TACBinaryOp, TACAssignment, TACUnaryOp, TACIfGoto, TACIfFalseGoto, TACGoto
 from .erros_compilador import TACError, FileError, JSONError, ValidationError
 
@@ -31,22 +34,23 @@ JSON_EXT = '.json'
 # FUNÇÕES AUXILIARES
 #########################
 
-def _carregar_json_validado(caminho_arquivo: str, chaves_obrigatorias: List[str] = None) -> Dict[str, Any]:
-    """Carrega JSON e valida chaves obrigatórias."""
-    if not os.path.exists(caminho_arquivo):
-        raise FileError(f"arquivo não encontrado: {caminho_arquivo}")
-    
+def _abrir_artefato_validado(caminho_arquivo: str, chaves_obrigatorias: List[str] = None) -> ArtefatoIndexado:
+    """Abre artefato (JSON ou binário, sob demanda) e valida chaves obrigatórias."""
     try:
-        with open(caminho_arquivo, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = abrir_artefato(caminho_arquivo)
+    except FileNotFoundError:
+        raise FileError(f"arquivo não encontrado: {caminho_arquivo}")
     except json.JSONDecodeError as e:
         raise JSONError(f"JSON inválido: {e}")
+    except ErroArtefato as e:
+        raise JSONError(f"artefato binário inválido: {e}")
     except Exception as e:
         raise FileError(f"erro ao ler arquivo: {e}")
 
     if chaves_obrigatorias:
         for chave in chaves_obrigatorias:
             if chave not in data:
+                data.fechar()
                 raise ValidationError(f"chave obrigatória ausente: {chave}")
 
     return data
@@ -163,10 +167,10 @@ class TACOptimizer:
         final_instructions = len(self.instructions)
         final_temporaries = self._contar_temporarios()
 
-        # Gerar relatórios
-        self._gerar_tac_otimizado_md(file_name)
+        # Gerar artefato e relatórios (os .md podem rodar em segundo plano)
+        agendar_relatorio(self._gerar_tac_otimizado_md, file_name)
         self._gerar_tac_otimizado_json(file_name)
-        self._gerar_relatorio_otimizacoes_md(file_name, {
+        agendar_relatorio(self._gerar_relatorio_otimizacoes_md, file_name, {
             'initial_instructions': initial_instructions,
             'final_instructions': final_instructions,
             'initial_temporaries': initial_temporaries,
@@ -191,17 +195,26 @@ class TACOptimizer:
     # CARREGAMENTO E PARSING DE TAC
     #########################
 
-    def carregar_tac(self, arquivo_json: str) -> None:
-        """Carrega TAC.json e converte para objetos TACInstruction."""
-        data = _carregar_json_validado(arquivo_json, ['instructions'])
+    def carregar_tac(self, arquivo_json: str, inicio: Optional[int] = None, fim: Optional[int] = None) -> None:
+        """
+        Carrega TAC.json e converte para objetos TACInstruction.
 
-        instructions = []
-        for i, item in enumerate(data['instructions']):
-            try:
-                instruction = instruction_from_dict(item)
-                instructions.append(instruction)
-            except Exception as e:
-                raise TACError(f"erro na instrução {i}: {e}", i, {"data": item})
+        Args:
+            arquivo_json: Caminho do artefato TAC (JSON ou binário)
+            inicio, fim: Intervalo de instruções a carregar (semântica de fatia);
+                em artefatos binários só esse trecho é decodificado
+        """
+        with _abrir_artefato_validado(arquivo_json, ['instructions']) as data:
+            itens = data['instructions']
+            indices = range(len(itens))[inicio:fim]
+
+            instructions = []
+            for i, item in zip(indices, itens[inicio:fim]):
+                try:
+                    instruction = instruction_from_dict(item)
+                    instructions.append(instruction)
+                except Exception as e:
+                    raise TACError(f"erro na instrução {i}: {e}", i, {"data": item})
 
         self.instructions = instructions
 
@@ -383,22 +396,13 @@ class TACOptimizer:
             changed = False
             iterations += 1
             
-            # Processar do fim para o início (backward)
+            # Processar do fim para o início (backward). O live_out de cada
+            # instrução é calculado antes do live_in, a partir dos sucessores já
+            # atualizados nesta passada: em código linear o ponto fixo sai em
+            # duas passadas em vez de uma passada por instrução
             for i in range(n - 1, -1, -1):
                 instr = self.instructions[i]
                 
-                # Calcular live_in baseado no live_out atual
-                use_vars = self._get_used_variables(instr)
-                def_var = self._get_defined_variable(instr)
-                new_live_in = use_vars.union(live_out[i])
-                if def_var:
-                    new_live_in.discard(def_var)
-                
-                # Atualizar live_in se mudou
-                if new_live_in != live_in[i]:
-                    live_in[i] = new_live_in
-                    changed = True
-                
                 # Calcular live_out baseado nos live_in dos sucessores
                 new_live_out = set()
                 successors = self._get_successors(i, label_to_index)
@@ -415,6 +419,18 @@ class TACOptimizer:
                 if new_live_out != live_out[i]:
                     live_out[i] = new_live_out
                     changed = True
+                
+                # Calcular live_in baseado no live_out atual
+                use_vars = self._get_used_variables(instr)
+                def_var = self._get_defined_variable(instr)
+                new_live_in = use_vars.union(live_out[i])
+                if def_var:
+                    new_live_in.discard(def_var)
+                
+                # Atualizar live_in se mudou
+                if new_live_in != live_in[i]:
+                    live_in[i] = new_live_in
+                    changed = True
         
         # Retornar resultado
         result = {}
@@ -726,8 +742,7 @@ class TACOptimizer:
         # Converter instruções para formato JSON
         instructions_json = [instr.to_dict() for instr in self.instructions]
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump({'instructions': instructions_json}, f, indent=2, ensure_ascii=False)
+        salvar_artefato({'instructions': instructions_json}, output_file)
 
     def _gerar_relatorio_otimizacoes_md(self, file_name: str, stats: Dict[str, Any]) -> None:
         """Gera otimizacao_tac.md conforme especificação."""
@@ -21,6 +21,9 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
+from src.RA1.functions.python.artefatos import salvar_artefato
+from src.RA1.functions.python.relatorios import agendar_relatorio, relatorios_ativos
+
 from .tac_instructions import TACInstruction
 
 
@@ -138,9 +141,11 @@ def save_tac_output(
 ) -> Dict[str, Path]:
     """
     Função de conveniência: Salva TAC em ambos formatos (JSON e Markdown).
+    O Markdown é um relatório: é entregue a agendar_relatorio.
     
     Returns:
-        Dicionário com os caminhos dos arquivos gerados.
+        Dicionário com os caminhos dos arquivos gerados ('markdown' é None
+        com os relatórios desligados).
     """
     metadata = {
         "generated_at": datetime.now().isoformat(),
@@ -157,10 +162,10 @@ def save_tac_output(
     if source_file:
         title = f"TAC Output - {source_file}"
 
-    save_json(instructions, json_path, statistics, metadata)
-    save_markdown(instructions, md_path, statistics, title)
+    json_path = salvar_artefato(to_json(instructions, statistics, metadata), json_path)
+    agendar_relatorio(save_markdown, instructions, md_path, statistics, title)
 
     return {
         "json": json_path,
-        "markdown": md_path
+        "markdown": md_path if relatorios_ativos() else None
     }
\ No newline at end of file
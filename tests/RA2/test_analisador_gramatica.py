@@ -0,0 +1,62 @@
+from src.RA2.functions.python.analisadorGramatica import analisarGramatica
+from src.RA2.functions.python.construirTabelaLL1 import construirTabelaLL1
+
+
+# Gramática clássica de expressões (Dragon Book, 4.28) com conjuntos conhecidos
+GRAMATICA_EXPRESSOES = {
+    'E': [['T', 'E_PRIME']],
+    'E_PRIME': [['+', 'T', 'E_PRIME'], ['epsilon']],
+    'T': [['F', 'T_PRIME']],
+    'T_PRIME': [['*', 'F', 'T_PRIME'], ['epsilon']],
+    'F': [['(', 'E', ')'], ['id']],
+}
+
+
+def test_first_follow_expression_grammar():
+    analise = analisarGramatica(GRAMATICA_EXPRESSOES, 'E')
+    first, follow = analise['first'], analise['follow']
+
+    assert first['E'] == first['T'] == first['F'] == {'(', 'id'}
+    assert first['E_PRIME'] == {'+', 'epsilon'}
+    assert first['T_PRIME'] == {'*', 'epsilon'}
+
+    assert follow['E'] == follow['E_PRIME'] == {')', '$'}
+    assert follow['T'] == follow['T_PRIME'] == {'+', ')', '$'}
+    assert follow['F'] == {'+', '*', ')', '$'}
+    assert analise['conflitos'] == []
+
+
+def test_rpn_grammar_has_no_conflicts():
+    analise = analisarGramatica()
+    assert analise['conflitos'] == []
+    assert analise['tabela'] == construirTabelaLL1()
+    assert analise['first']['PROGRAM'] == {'abre_parenteses'}
+    assert analise['follow']['LINHA'] >= {'abre_parenteses', 'fecha_parenteses', '$'}
+
+
+def test_reports_all_conflicts_instead_of_first():
+    gramatica = {
+        'S': [['a', 'X'], ['a', 'Y'], ['B']],
+        'B': [['b'], ['b', 'c'], ['epsilon']],
+        'X': [['x']],
+        'Y': [['y']],
+    }
+    analise = analisarGramatica(gramatica, 'S')
+    conflitos = analise['conflitos']
+
+    chaves = {(c['tipo'], c['nao_terminal'], c['terminal']) for c in conflitos}
+    assert ('FIRST/FIRST', 'S', 'a') in chaves
+    assert ('FIRST/FIRST', 'B', 'b') in chaves
+    assert len(conflitos) == 2
+    # A tabela mantém a primeira produção registrada
+    assert analise['tabela']['S']['a'] == ['a', 'X']
+    assert all('Conflito' in c['mensagem'] for c in conflitos)
+
+
+def test_first_follow_conflict_detected():
+    gramatica = {
+        'S': [['A', 'a']],
+        'A': [['a'], ['epsilon']],
+    }
+    conflitos = analisarGramatica(gramatica, 'S')['conflitos']
+    assert [(c['tipo'], c['nao_terminal'], c['terminal']) for c in conflitos] == [('FIRST/FOLLOW', 'A', 'a')]
@@ -0,0 +1,71 @@
+from src.RA2.functions.python.construirAST import construirAST, valor_literal
+from src.RA2.functions.python.construirTabelaLL1 import construirTabelaLL1
+from src.RA2.functions.python.gerarArvore import gerarArvore, no_para_dict
+from src.RA2.functions.python.lerTokens import reconhecerToken
+from src.RA2.functions.python.parsear import parsear
+
+
+def _arvore(texto):
+    tokens = [t for t in (reconhecerToken(elemento, 1) for elemento in texto.split()) if t]
+    derivacao = parsear(construirTabelaLL1(), tokens)
+    assert derivacao
+    return gerarArvore(derivacao), [str(t.valor) for t in tokens]
+
+
+def test_simple_line():
+    arvore, tokens = _arvore('( 3 2.5 + )')
+    assert construirAST(arvore, tokens) == {
+        'elementos': [{'subtipo': 'numero_inteiro', 'valor': '3', 'tipo': 'int', 'numero': 3},
+                      {'subtipo': 'numero_real', 'valor': '2.5', 'tipo': 'real', 'numero': 2.5}],
+        'operador': '+'
+    }
+
+    arvore, tokens = _arvore('( 10 CONTADOR )')
+    assert construirAST(arvore, tokens) == {
+        'elementos': [{'subtipo': 'numero_inteiro', 'valor': '10', 'tipo': 'int', 'numero': 10},
+                      {'subtipo': 'variavel', 'valor': 'CONTADOR'}],
+        'operador': ''
+    }
+
+
+def test_res_and_nested_operands_keep_their_tokens():
+    arvore, tokens = _arvore('( 2 RES 3 + )')
+    assert construirAST(arvore, tokens)['elementos'] == [
+        {'subtipo': 'numero_inteiro_res', 'valor': '2', 'tipo': 'int', 'numero': 2},
+        {'subtipo': 'numero_inteiro', 'valor': '3', 'tipo': 'int', 'numero': 3},
+    ]
+
+    arvore, tokens = _arvore('( ( ( ( B A > ) ) A > ) ( X 1 - ) IFELSE )')
+    ast = construirAST(arvore, tokens)
+    assert ast['operador'] == 'IFELSE'
+    condicao, ramo = ast['elementos']
+    assert condicao == {
+        'subtipo': 'LINHA',
+        'elementos': [
+            {'subtipo': 'LINHA', 'elementos': [
+                {'subtipo': 'LINHA', 'elementos': [
+                    {'subtipo': 'variavel', 'valor': 'B'}, {'subtipo': 'variavel', 'valor': 'A'}
+                ], 'operador': '>'}
+            ], 'operador': ''},
+            {'subtipo': 'variavel', 'valor': 'A'},
+        ],
+        'operador': '>'
+    }
+    assert ramo == {'subtipo': 'LINHA', 'elementos': [
+        {'subtipo': 'variavel', 'valor': 'X'}, {'subtipo': 'numero_inteiro', 'valor': '1', 'tipo': 'int', 'numero': 1}
+    ], 'operador': '-'}
+
+
+def test_json_tree_gives_same_ast():
+    arvore, tokens = _arvore('( ( 1 RES 2 * ) ( 4 2 / ) ( X 0 > ) WHILE )')
+    assert construirAST(no_para_dict(arvore), tokens) == construirAST(arvore, tokens)
+
+
+def test_literals_are_parsed_once():
+    assert valor_literal({'subtipo': 'numero_real', 'valor': '5'}) == ('real', 5.0)
+    assert valor_literal({'subtipo': 'numero_inteiro', 'valor': '1e3'}) == ('real', 1000.0)
+    assert valor_literal({'subtipo': 'numero_inteiro', 'valor': 'x'}) == ('real', None)
+
+    # O texto não é convertido de novo: vale o que foi gravado no nó
+    operando = {'subtipo': 'numero_inteiro_res', 'valor': '2', 'tipo': 'int', 'numero': 7}
+    assert valor_literal(operando) == ('int', 7)
@@ -0,0 +1,68 @@
+import io
+import sys
+
+from src.RA2.functions.python.construirTabelaLL1 import construirTabelaLL1
+from src.RA2.functions.python.gerarArvore import TabelaNos, gerarArvore, no_para_dict
+from src.RA2.functions.python.lerTokens import reconhecerToken
+from src.RA2.functions.python.parsear import parsear
+
+
+def _derivacao(texto):
+    tokens = [reconhecerToken(elemento, 1) for elemento in texto.split()]
+    return parsear(construirTabelaLL1(), [t for t in tokens if t])
+
+
+def _nos(no, vistos):
+    if id(no) not in vistos:
+        vistos.add(id(no))
+        for filho in no.filhos:
+            _nos(filho, vistos)
+    return vistos
+
+
+def test_interned_tree_matches_plain_tree():
+    for texto in ['( ( 2 3 * ) ( 2 3 * ) + )', '( ( X X * ) 2.5 / )', '( 5 RES )']:
+        derivacao = _derivacao(texto)
+        assert derivacao
+        simples = gerarArvore(derivacao)
+        internada = gerarArvore(derivacao, TabelaNos())
+        assert internada.desenhar_ascii() == simples.desenhar_ascii()
+        assert no_para_dict(internada, {}) == no_para_dict(simples)
+
+
+def test_repeated_subtrees_are_shared_across_lines():
+    tabela = TabelaNos()
+    linha1 = gerarArvore(_derivacao('( ( X X * ) ( X X * ) + )'), tabela)
+    linha2 = gerarArvore(_derivacao('( ( X X * ) ( X X * ) + )'), tabela)
+    assert linha1 is linha2
+
+    simples = gerarArvore(_derivacao('( ( X X * ) ( X X * ) + )'))
+    assert len(_nos(linha1, set())) < len(_nos(simples, set()))
+
+    memo = {}
+    assert no_para_dict(linha1, memo) is no_para_dict(linha2, memo)
+
+
+def test_deep_nesting_does_not_hit_recursion_limit():
+    profundidade = sys.getrecursionlimit() + 200
+    texto = '1'
+    for _ in range(profundidade):
+        texto = f'( {texto} 1 + )'
+    arvore = gerarArvore(_derivacao(texto))
+    assert arvore.desenhar_ascii().count('+') == profundidade
+    assert no_para_dict(arvore)['label'] == 'PROGRAM'
+
+
+def test_ascii_drawing_limits_and_writer():
+    arvore = gerarArvore(_derivacao('( ( 2 3 * ) ( 2 3 * ) + )'))
+    completo = arvore.desenhar_ascii()
+
+    saida = io.StringIO()
+    assert arvore.desenhar_ascii(saida=saida) is None
+    assert saida.getvalue() == completo
+
+    raso = arvore.desenhar_ascii(max_profundidade=1).splitlines()
+    assert raso[0] == '└── PROGRAM'
+    assert raso[-1].endswith('└── ... (1 omitido(s))')
+    assert len(raso) < len(completo.splitlines())
+    assert 'omitido' in arvore.desenhar_ascii(max_filhos=1)
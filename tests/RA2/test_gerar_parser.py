@@ -0,0 +1,61 @@
+import glob
+import os
+import random
+
+from src.RA2.functions.python.construirTabelaLL1 import construirTabelaLL1
+from src.RA2.functions.python.gerarParser import carregarParserGerado, gerar_codigo_parser, hash_gramatica
+from src.RA2.functions.python.gerado import parserRPN
+from src.RA2.functions.python.lerTokens import reconhecerToken
+from src.RA2.functions.python.parsear import parsear
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+def _linhas_de_tokens():
+    linhas = []
+    for caminho in sorted(glob.glob(os.path.join(RAIZ, 'inputs', 'RA*', '*.txt'))):
+        with open(caminho, encoding='utf-8') as f:
+            for texto in f:
+                texto = texto.strip()
+                if not texto or texto.startswith('#'):
+                    continue
+                tokens = [reconhecerToken(elemento, 1) for elemento in texto.split()]
+                linhas.append([t for t in tokens if t])
+    return linhas
+
+
+def test_cached_parser_matches_grammar():
+    # O módulo versionado precisa estar em dia com GRAMATICA_RPN
+    assert parserRPN.HASH_GRAMATICA == hash_gramatica()
+
+
+def test_generated_parser_matches_interpreted_parser():
+    tabela = construirTabelaLL1()
+    parser_gerado = carregarParserGerado()
+    linhas = _linhas_de_tokens()
+    assert linhas
+
+    for tokens in linhas:
+        assert parser_gerado(tokens) == parsear(tabela, tokens)
+
+
+def test_generated_parser_rejects_like_interpreted_parser():
+    tabela = construirTabelaLL1()
+    parser_gerado = carregarParserGerado()
+    aleatorio = random.Random(42)
+
+    for tokens in _linhas_de_tokens():
+        for _ in range(5):
+            mutado = list(tokens)
+            posicao = aleatorio.randrange(len(mutado))
+            if aleatorio.random() < 0.5:
+                del mutado[posicao]
+            else:
+                mutado.insert(posicao, aleatorio.choice(tokens))
+            assert parser_gerado(mutado) == parsear(tabela, mutado)
+
+    assert parser_gerado([]) == []
+
+
+def test_generated_code_is_deterministic():
+    assert gerar_codigo_parser() == gerar_codigo_parser()
@@ -52,3 +52,293 @@ def test_uninitialized_variable_error():
     res = analisarSemantica(ast, gramatica, tabela)
     assert not res['sucesso']
     assert any('sem inicialização' in e['erro'].lower() for e in res['erros'])
+
+
+def test_closed_subexpressions_are_shared_and_typed_once():
+    from src.RA3.functions.python.subexpressoes import TabelaSubexpressoes
+
+    def sub():
+        elementos = [{'subtipo': 'numero_inteiro', 'valor': '2'}, {'subtipo': 'numero_real', 'valor': '3.0'}]
+        return {'subtipo': 'LINHA', 'elementos': elementos, 'operador': '*', 'ast': {'elementos': elementos, 'operador': '*'}}
+
+    subexpressoes = TabelaSubexpressoes()
+    primeira, segunda = subexpressoes.internar(sub()), subexpressoes.internar(sub())
+    assert primeira is segunda
+    aberta = {'subtipo': 'LINHA', 'elementos': [{'subtipo': 'variavel', 'valor': 'A'}, sub()], 'operador': '+'}
+    aberta['ast'] = {'elementos': aberta['elementos'], 'operador': '+'}
+    assert subexpressoes.internar(aberta) is aberta
+    assert aberta['elementos'][1] is primeira
+
+    gramatica, tabela = inicializar_sistema_semantico()
+    ast = {
+        'linhas': [
+            {'numero_linha': n, 'filhos': [{'elementos': [primeira, {'subtipo': 'numero_inteiro', 'valor': '1'}], 'operador': '+'}]}
+            for n in (1, 2)
+        ]
+    }
+    res = analisarSemantica(ast, gramatica, tabela, subexpressoes=subexpressoes)
+    assert res['sucesso']
+    assert [l['tipo'] for l in res['arvore_anotada']['linhas']] == ['real', 'real']
+    assert subexpressoes.obter_tipo(primeira, 'operando') == 'real'
+
+
+def test_shape_cache_reuses_results_of_repeated_expressions():
+    from src.RA3.functions.python.analisador_tipos import avaliar_seq_tipo, ErroSemantico
+    from src.RA3.functions.python.cache_formas import CacheFormas
+    from src.RA3.functions.python.subexpressoes import TabelaSubexpressoes
+
+    inteiro = lambda v: {'subtipo': 'numero_inteiro', 'valor': v}
+    real = lambda v: {'subtipo': 'numero_real', 'valor': v}
+    var = lambda v: {'subtipo': 'variavel', 'valor': v}
+    _, tabela = inicializar_sistema_semantico()
+    for nome, tipo in (('A', 'int'), ('B', 'int'), ('R', 'real')):
+        tabela.adicionarSimbolo(nome, tipo, inicializada=True, linha=0)
+    subexpressoes = TabelaSubexpressoes()
+
+    def acumulador(nome, passo):
+        return {'elementos': [_sub([var(nome), inteiro(passo)], '+'), inteiro('2')], 'operador': '*'}
+
+    # Mesma forma e mesmos tipos: a segunda avaliação vem do cache, com as
+    # anotações reaplicadas nos nós da nova expressão
+    segunda = acumulador('B', '7')
+    assert avaliar_seq_tipo(acumulador('A', '1'), 1, tabela, subexpressoes) == ('int', ['int', 'int'], [None, 2])
+    assert avaliar_seq_tipo(segunda, 2, tabela, subexpressoes) == ('int', ['int', 'int'], [None, 2])
+    assert subexpressoes.formas.acertos == 1
+    assert segunda['elementos'][0]['ast']['tipo'] == 'int'
+    assert avaliar_seq_tipo(acumulador('R', '1'), 3, tabela, subexpressoes)[0] == 'real'
+    assert len(subexpressoes.formas) == 2
+
+    # Erros também são memorizados; linha e contexto são os da nova expressão
+    erros = []
+    for linha, seq in ((4, {'elementos': [var('A'), real('2.0')], 'operador': '%'}),
+                       (5, {'elementos': [var('B'), real('3.5')], 'operador': '%'})):
+        try:
+            avaliar_seq_tipo(seq, linha, tabela, subexpressoes)
+        except ErroSemantico as e:
+            erros.append((e.linha, e.contexto))
+    assert erros == [(4, '(A % 2.0)'), (5, '(B % 3.5)')]
+    assert subexpressoes.formas.acertos == 2
+
+    cache = CacheFormas(capacidade=2)
+    cache.memorizar('a', 1)
+    cache.memorizar('b', 2)
+    assert cache.obter('a') == 1
+    cache.memorizar('c', 3)
+    assert cache.obter('b') is None and len(cache) == 2
+
+
+def test_shape_cache_replays_annotations_of_cached_subexpressions():
+    from src.RA3.functions.python.analisador_tipos import avaliar_seq_tipo
+    from src.RA3.functions.python.subexpressoes import TabelaSubexpressoes
+
+    inteiro = lambda v: {'subtipo': 'numero_inteiro', 'valor': v}
+    var = lambda v: {'subtipo': 'variavel', 'valor': v}
+    _, tabela = inicializar_sistema_semantico()
+    for nome in ('A', 'B'):
+        tabela.adicionarSimbolo(nome, 'int', inicializada=True, linha=0)
+    subexpressoes = TabelaSubexpressoes()
+
+    def seq(a, b, variavel, operador):
+        soma = subexpressoes.internar(_sub([inteiro(a), inteiro(b)], '+'))
+        return {'elementos': [soma, var(variavel)], 'operador': operador}
+
+    # Na linha 2, (2 3 +) vem do cache de tipos ao ser registrada a forma de
+    # '*'; a linha 3 reaproveita a forma e precisa anotar (5 6 +) também
+    avaliar_seq_tipo(seq('2', '3', 'A', '-'), 1, tabela, subexpressoes)
+    avaliar_seq_tipo(seq('2', '3', 'A', '*'), 2, tabela, subexpressoes)
+    terceira = seq('5', '6', 'B', '*')
+    assert avaliar_seq_tipo(terceira, 3, tabela, subexpressoes)[0] == 'int'
+    assert subexpressoes.formas.acertos == 1
+    assert terceira['elementos'][0]['ast']['tipo'] == 'int'
+
+
+def _programa(*seqs):
+    return {'linhas': [
+        {'numero_linha': i + 1, 'filhos': [{'elementos': elementos, 'operador': operador}]}
+        for i, (elementos, operador) in enumerate(seqs)
+    ]}
+
+
+def _sub(elementos, operador):
+    return {'subtipo': 'LINHA', 'elementos': elementos, 'operador': operador, 'ast': {'elementos': elementos, 'operador': operador}}
+
+
+def _resumo(resultado):
+    simbolos = [(s.nome, s.tipo, s.inicializada, s.linha_declaracao) for s in resultado['tabela_simbolos'].listar_simbolos()]
+    return resultado['arvore_anotada'], simbolos, resultado['erros']
+
+
+def test_fused_analysis_matches_separate_phases():
+    import copy
+    from src.RA3.functions.python.analisador_semantico import analisarSemanticaFundida, _analisarSemanticaEmFases
+
+    inteiro = lambda v: {'subtipo': 'numero_inteiro', 'valor': v}
+    real = lambda v: {'subtipo': 'numero_real', 'valor': v}
+    var = lambda v: {'subtipo': 'variavel', 'valor': v}
+    programas = [
+        # armazenamento, leitura, RES, IFELSE e redefinição posterior de tipo
+        _programa(([inteiro('0'), var('X')], None), ([var('X')], None), ([inteiro('1'), inteiro('2')], '+'),
+                  ([{'subtipo': 'numero_inteiro_res', 'valor': '1'}], None),
+                  ([_sub([var('X'), inteiro('3')], '<'), _sub([var('X')], None), _sub([real('1.5')], None)], 'IFELSE'),
+                  ([real('2.5'), var('X')], None)),
+        # erros de memória e controle na mesma execução
+        _programa(([inteiro('1'), inteiro('1')], '+'), ([{'subtipo': 'numero_inteiro_res', 'valor': '5'}], None),
+                  ([real('1.5'), inteiro('2'), inteiro('1'), _sub([inteiro('1')], None)], 'FOR')),
+        # erro de tipos: memória e controle continuam nas demais linhas
+        _programa(([real('1.5'), inteiro('2')], '/'), ([var('Z')], None), ([inteiro('4'), var('X')], None),
+                  ([{'subtipo': 'numero_inteiro_res', 'valor': '9'}], None)),
+    ]
+    for programa in programas:
+        fundida = analisarSemanticaFundida(copy.deepcopy(programa))
+        assert _resumo(fundida) == _resumo(_analisarSemanticaEmFases(copy.deepcopy(programa), processos=1))
+
+
+def test_errors_do_not_stop_analysis():
+    from src.RA3.functions.python.analisador_semantico import analisarSemanticaFundida
+
+    inteiro = lambda v: {'subtipo': 'numero_inteiro', 'valor': v}
+    programa = _programa(
+        ([{'subtipo': 'numero_real', 'valor': '1.5'}, inteiro('2')], '/'),
+        ([inteiro('4'), {'subtipo': 'variavel', 'valor': 'X'}], None),
+        ([{'subtipo': 'numero_inteiro_res', 'valor': '9'}], None),
+        ([{'subtipo': 'variavel', 'valor': 'X'}, inteiro('1')], '+'),
+    )
+    resultado = analisarSemanticaFundida(programa)
+    assert [linha.get('tipo') for linha in resultado['arvore_anotada']['linhas']] == [None, 'int', None, 'int']
+    assert resultado['tabela_simbolos'].existe('X')
+    erros = resultado['erros']
+    assert len(erros) == 2
+    assert '[Linha 1]' in erros[0] and 'inteiros' in erros[0]
+    assert '[Linha 3]' in erros[1]
+
+
+def test_internal_failure_is_reported_on_its_line():
+    from src.RA3.functions.python.analisador_semantico import analisarSemanticaDaJsonRA2
+
+    def linha(num, elementos, operador=''):
+        return {'numero_linha': num, 'arvore': {}, 'tokens': [], 'ast': {'elementos': elementos, 'operador': operador}}
+
+    inteiro = lambda v: {'subtipo': 'numero_inteiro', 'valor': v}
+    validas = [
+        linha(2, [inteiro('1'), inteiro('2')], '+'),
+        linha(3, [inteiro('4'), {'subtipo': 'variavel', 'valor': 'X'}]),
+        linha(4, [{'subtipo': 'variavel', 'valor': 'X'}, inteiro('2')], '*'),
+    ]
+    # Linha 1 falha na análise de tipos; linha 1 de 'sem_ast' falha na conversão
+    quebrada = linha(1, [inteiro('1'), {'subtipo': 'variavel', 'valor': None}])
+    sem_ast = linha(1, [{'subtipo': 'LINHA', 'elementos': 'X', 'operador': '+'}])
+    for primeira, tipos in ((quebrada, [None, 'int', 'int', 'int']), (sem_ast, ['int', 'int', 'int'])):
+        resultado = analisarSemanticaDaJsonRA2({'linhas': [primeira] + validas})
+        assert len(resultado['erros']) == 1
+        assert resultado['erros'][0].startswith('ERRO INTERNO [Linha 1]')
+        assert [linha.get('tipo') for linha in resultado['arvore_anotada']['linhas']] == tipos
+        assert resultado['tabela_simbolos'].obter_tipo('X') == 'int'
+
+
+def test_untyped_storage_does_not_inherit_previous_line_type():
+    inteiro = lambda v: {'subtipo': 'numero_inteiro', 'valor': v}
+    real = lambda v: {'subtipo': 'numero_real', 'valor': v}
+    var = lambda v: {'subtipo': 'variavel', 'valor': v}
+    programa = _programa(
+        ([var('Y'), var('X')], None),                                  # Y não declarada: sem tipo
+        ([inteiro('1'), inteiro('2')], '+'),
+        ([_sub([real('1.5'), real('2.0')], '/'), var('W')], None),     # fonte com erro: sem tipo
+        ([_sub([var('W')], None), _sub([_sub([inteiro('1'), inteiro('2')], '+'), var('Z')], None)], 'WHILE'),
+        ([_sub([var('Z'), inteiro('1')], '+'), var('V')], None),       # Z só é armazenada no corpo do WHILE
+    )
+    res = analisarSemantica(programa)
+    assert [l['tipo'] for l in res['arvore_anotada']['linhas']] == [None, 'int', None, None, None]
+    for nome in ('X', 'W', 'Z', 'V'):
+        assert not res['tabela_simbolos'].existe(nome)
+
+
+def test_fused_analysis_fixes_forward_references():
+    import copy
+    from src.RA3.functions.python.analisador_semantico import analisarSemanticaFundida, _analisarSemanticaEmFases
+
+    inteiro = lambda v: {'subtipo': 'numero_inteiro', 'valor': v}
+    var = lambda v: {'subtipo': 'variavel', 'valor': v}
+    # Y só é declarada na linha 4; com a análise de tipos completa a memória
+    # da linha 3 já a enxerga
+    programa = _programa(
+        ([inteiro('7'), var('A')], None),
+        ([inteiro('1'), inteiro('2')], '+'),
+        ([_sub([var('Y'), inteiro('1')], '+'), var('X')], None),
+        ([inteiro('5'), var('Y')], None),
+        ([{'subtipo': 'numero_inteiro_res', 'valor': '2'}], None),
+    )
+    fundida = analisarSemanticaFundida(copy.deepcopy(programa))
+    assert fundida['erros'] == []
+    assert [linha['tipo'] for linha in fundida['arvore_anotada']['linhas']] == ['int'] * 5
+    assert _resumo(fundida) == _resumo(_analisarSemanticaEmFases(copy.deepcopy(programa), processos=1))
+
+
+def test_independent_lines_are_partitioned():
+    from src.RA3.functions.python.dependencias_linhas import particionar_linhas
+
+    inteiro = lambda v: {'subtipo': 'numero_inteiro', 'valor': v}
+    var = lambda v: {'subtipo': 'variavel', 'valor': v}
+    programa = _programa(([inteiro('1'), var('X')], None), ([inteiro('2'), var('Y')], None),
+                         ([_sub([var('X'), inteiro('1')], '+'), inteiro('3')], '*'),
+                         ([{'subtipo': 'numero_inteiro_res', 'valor': '2'}], None),
+                         ([inteiro('4'), inteiro('5')], '+'))
+    assert particionar_linhas(programa['linhas']) == [[0, 2], [1, 3], [4]]
+
+
+def test_parallel_type_analysis_matches_sequential():
+    import copy
+    from src.RA3.functions.python.analisador_tipos import analisarSemanticaParalela
+
+    inteiro = lambda v: {'subtipo': 'numero_inteiro', 'valor': v}
+    real = lambda v: {'subtipo': 'numero_real', 'valor': v}
+    var = lambda v: {'subtipo': 'variavel', 'valor': v}
+    # erros em grupos diferentes, RES para outro grupo e um bloco cujas
+    # subexpressões são anotadas dentro do processo que analisa o grupo
+    programa = _programa(([real('1.5'), var('A')], None), ([real('1.5'), inteiro('2')], '/'),
+                         ([inteiro('2'), var('B')], None), ([var('A'), var('C')], '+'),
+                         ([{'subtipo': 'numero_inteiro_res', 'valor': '4'}], None),
+                         ([var('B'), real('2.0')], '%'), ([var('A'), var('B')], None),
+                         ([_sub([var('D'), real('1.0')], '+'), _sub([inteiro('3'), inteiro('4')], '*')], None))
+    sequencial = analisarSemantica(copy.deepcopy(programa))
+    for processos in (1, 2):
+        paralela = analisarSemanticaParalela(copy.deepcopy(programa), processos=processos)
+        assert paralela['erros'] == sequencial['erros']
+        assert _resumo(paralela) == _resumo(sequencial)
+        bloco = paralela['arvore_anotada']['linhas'][-1]['filhos'][0]
+        assert bloco['elementos'][1]['ast']['tipo'] == 'int'
+
+
+def test_parallel_type_analysis_waits_for_pending_reports():
+    import copy
+    import threading
+    from src.RA1.functions.python import relatorios
+    from src.RA3.functions.python.analisador_tipos import analisarSemanticaParalela
+
+    inteiro = lambda v: {'subtipo': 'numero_inteiro', 'valor': v}
+    var = lambda v: {'subtipo': 'variavel', 'valor': v}
+    programa = _programa(([inteiro('1'), var('A')], None), ([inteiro('2'), var('B')], None),
+                         ([var('A'), inteiro('3')], '+'), ([var('B'), inteiro('4')], '*'))
+    sequencial = analisarSemantica(copy.deepcopy(programa))
+
+    anterior = relatorios.obter_modo_relatorios()
+    relatorios.definir_modo_relatorios(relatorios.MODO_SEGUNDO_PLANO)
+    liberar = threading.Event()
+
+    def relatorio_lento():
+        liberar.wait()
+        raise OSError("disco cheio")
+
+    try:
+        futuro = relatorios.agendar_relatorio(relatorio_lento)
+        threading.Timer(0.2, liberar.set).start()
+        paralela = analisarSemanticaParalela(copy.deepcopy(programa), processos=2)
+        # O fork só acontece com a thread de relatórios parada
+        assert futuro.done()
+        assert _resumo(paralela) == _resumo(sequencial)
+        # A falha do relatório continua para a coleta final
+        erros = relatorios.aguardar_relatorios()
+        assert len(erros) == 1 and isinstance(erros[0], OSError)
+    finally:
+        liberar.set()
+        relatorios.aguardar_relatorios()
+        relatorios.definir_modo_relatorios(anterior)
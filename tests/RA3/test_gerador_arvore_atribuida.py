@@ -8,6 +8,7 @@
 #
 # Nome do grupo no Canvas: RA3_1
 
+import io
 import unittest
 import json
 import tempfile
@@ -263,9 +264,10 @@ class TestConstruirNoAtribuido(unittest.TestCase):
 class TestSalvarArvoreAtribuida(unittest.TestCase):
     """Testes para a função salvarArvoreAtribuida."""
 
+    @patch('src.RA3.functions.python.gerador_arvore_atribuida.replicar_arquivo')
     @patch('src.RA3.functions.python.gerador_arvore_atribuida.OUT_ARVORE_ATRIBUIDA_JSON')
     @patch('builtins.open', new_callable=mock_open)
-    def test_salvar_arvore_simples(self, mock_file, mock_path):
+    def test_salvar_arvore_simples(self, mock_file, mock_path, mock_replicar):
         """Deve salvar árvore atribuída em JSON."""
         # Configure the mock path's parent with a MagicMock
         mock_parent = MagicMock()
@@ -288,8 +290,9 @@ class TestSalvarArvoreAtribuida(unittest.TestCase):
         # Verificar se mkdir foi chamado no parent do path mockado
         mock_parent.mkdir.assert_called_once_with(parents=True, exist_ok=True)
 
-        # Verificar se open foi chamado (deve ser chamado 2 vezes - outputs e raiz)
-        self.assertEqual(mock_file.call_count, 2)
+        # A árvore é serializada uma única vez; a raiz recebe uma réplica do arquivo
+        self.assertEqual(mock_file.call_count, 1)
+        mock_replicar.assert_called_once()
 
         # Verificar se json.dump foi chamado (write é chamado múltiplas vezes pelo json.dump)
         self.assertTrue(mock_file().write.called)
@@ -417,6 +420,69 @@ class TestRelatoriosMarkdown(unittest.TestCase):
         self.assertTrue(linhas[1].startswith('  LINHA'))  # Filho 1
         self.assertTrue(linhas[2].startswith('  LINHA'))  # Filho 2
 
+    def test_formatar_arvore_com_limites(self):
+        """Deve resumir os nós além da profundidade e da largura máximas."""
+        folha = {'tipo_vertice': 'LINHA', 'tipo_inferido': 'int', 'numero_linha': 1,
+                 'valor': '1', 'subtipo': 'numero_inteiro', 'filhos': []}
+        no = {'tipo_vertice': 'ARITH_OP', 'tipo_inferido': 'int', 'numero_linha': 1,
+              'operador': '+', 'filhos': [folha, folha, folha]}
+        raiz = {'tipo_vertice': 'LINHA', 'tipo_inferido': 'int', 'numero_linha': 1, 'filhos': [no]}
+
+        raso = gerador_arvore_atribuida._formatar_arvore(raiz, 0, max_profundidade=1)
+        self.assertEqual(raso.splitlines()[-1], '    ... (3 omitido(s))')
+
+        saida = io.StringIO()
+        self.assertIsNone(gerador_arvore_atribuida._formatar_arvore(raiz, 0, saida, max_filhos=2))
+        linhas = saida.getvalue().splitlines()
+        self.assertEqual(len(linhas), 5)
+        self.assertEqual(linhas[-1], '    ... (1 omitido(s))')
+
+
+class TestDecoracaoJulgamento(unittest.TestCase):
+    """Testes para os atributos usados pelo relatório de julgamento de tipos."""
+
+    def _linha_aninhada(self):
+        arvore_anotada = {
+            'linhas': [
+                {'numero_linha': 1, 'filhos': [{
+                    'operador': '*',
+                    'elementos': [
+                        {'subtipo': 'LINHA', 'operador': '+', 'elementos': [
+                            {'subtipo': 'numero_inteiro', 'valor': '2'},
+                            {'subtipo': 'numero_real', 'valor': '1.5'},
+                        ]},
+                        {'subtipo': 'variavel', 'valor': 'X'},
+                    ],
+                }]}
+            ]
+        }
+        return gerador_arvore_atribuida.gerarArvoreAtribuida(arvore_anotada)['arvore_atribuida'][0]
+
+    def test_texto_e_tipo_de_cada_no(self):
+        """Cada nó recebe texto reconstruído e tipo em uma única passagem."""
+        raiz = self._linha_aninhada()
+        decoracao = gerador_arvore_atribuida._DecoracaoJulgamento().decorar(raiz)
+        operador = raiz['filhos'][0]
+        soma = operador['filhos'][0]
+
+        self.assertEqual(decoracao.texto(raiz), '((2 1.5 +) X *)')
+        self.assertEqual(decoracao.texto(soma), '(2 1.5 +)')
+        self.assertEqual(decoracao.tipo(soma), 'real')
+        self.assertIsNone(decoracao.tipo(operador['filhos'][1]))
+
+    def test_relatorio_usa_atributos_decorados(self):
+        """O relatório lista a subexpressão com texto e tipos dos operandos."""
+        arvore = {'arvore_atribuida': [self._linha_aninhada()]}
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = Path(diretorio) / 'julgamento_tipos.md'
+            gerador_arvore_atribuida._gerar_relatorio_julgamento_tipos(arvore, caminho)
+            conteudo = caminho.read_text(encoding='utf-8')
+
+        self.assertIn('## Linha 1: `((2 1.5 +) X *)`', conteudo)
+        self.assertIn('- **Operando 1:** `(2 1.5 +)` → tipo: `real`', conteudo)
+        self.assertIn('    - `1.5` : `real`', conteudo)
+        self.assertIn('- **Operando 2:** `X` → tipo: `None`', conteudo)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+# Integrantes do grupo (ordem alfabética):
+# Breno Rossi Duarte - breno-rossi
+# Francisco Bley Ruthes - fbleyruthes
+# Rafael Olivare Piveta - RafaPiveta
+# Stefan Benjamim Seixas Lourenco Rodrigues - waifuisalie
+#
+# Nome do grupo no Canvas: RA3_1
+
+import dataclasses
+import unittest
+from src.RA3.functions.python import tipos
+from src.RA3.functions.python.gramatica_atributos import (
+    RegraAtributo,
+    definirGramaticaAtributos,
+    definir_regras_aritmeticas,
+    obter_regra,
+)
+
+
+class TestRegistroRegras(unittest.TestCase):
+    """Testes para o registro de regras semânticas."""
+
+    def test_registro_construido_uma_vez(self):
+        """Chamadas repetidas devem devolver o mesmo registro."""
+        self.assertIs(definirGramaticaAtributos(), definirGramaticaAtributos())
+        self.assertIs(obter_regra('+'), definirGramaticaAtributos()['aritmetico']['+'])
+
+    def test_regra_mantem_interface_de_dicionario(self):
+        """A regra tipada deve responder como o dicionário original."""
+        regra = obter_regra('/')
+        original = definir_regras_aritmeticas()['/']
+        self.assertIsInstance(regra, RegraAtributo)
+        self.assertEqual(regra['categoria'], 'aritmetico')
+        self.assertEqual(regra.get('nome'), original['nome'])
+        self.assertEqual(regra['regra_formal'], original['regra_formal'])
+        self.assertEqual(set(regra), set(original))
+        self.assertIsNone(regra.get('inexistente'))
+        self.assertEqual(regra['tipos_operandos'], (frozenset({tipos.TYPE_INT}), frozenset({tipos.TYPE_INT})))
+
+    def test_registro_somente_leitura(self):
+        """Nem o registro nem as regras podem ser alterados."""
+        with self.assertRaises(TypeError):
+            definirGramaticaAtributos()['aritmetico']['+'] = None
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            obter_regra('+').categoria = 'logico'
+
+    def test_busca_por_categoria(self):
+        """A categoria restringe a busca, como antes."""
+        self.assertEqual(obter_regra('IFELSE', 'controle')['nome'], 'ifelse')
+        self.assertIsNone(obter_regra('+', 'logico'))
+        self.assertEqual(obter_regra('MEM_STORE')['nome'], 'mem_store')
+        self.assertIsNone(obter_regra('???'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+from src.RA3.functions.python import analisador_memoria_controle
+from src.RA3.functions.python.analisador_memoria_controle import analisarSemanticaControle
+from src.RA3.functions.python.indice_programa import IndicePrograma
+from src.RA3.functions.python.tabela_simbolos import TabelaSimbolos
+
+
+def _linha(num, elementos, operador):
+    return {'numero_linha': num, 'filhos': [{'elementos': elementos, 'operador': operador}]}
+
+
+def _inteiro(valor):
+    return {'subtipo': 'numero_inteiro', 'valor': valor}
+
+
+def test_index_lines_sequences_and_nodes():
+    compartilhado = {'subtipo': 'LINHA', 'elementos': [_inteiro('2')], 'operador': None}
+    linhas = [
+        _linha(1, [_inteiro('1'), None], None),
+        _linha(2, [compartilhado, _inteiro('3')], '+'),
+        _linha(3, [compartilhado, _inteiro('4'), _inteiro('5')], 'IFELSE'),
+        _linha(4, [_inteiro('1'), _inteiro('2')], '+'),
+    ]
+    indice = IndicePrograma(linhas)
+
+    assert len(indice) == 4
+    assert indice.linha(3) is linhas[2]
+    assert indice.seq(1) == {'operador': None, 'elementos': [_inteiro('1')]}
+    assert indice.linhas_com_operador('+') == [2, 4]
+    assert indice.linhas_com_operador('IFELSE', '+', 'WHILE') == [2, 3, 4]
+    assert indice.linhas_com_operador('FOR') == []
+
+    # Nó compartilhado pertence à primeira linha em que aparece
+    assert indice.linha_do_no(compartilhado) == 2
+    assert indice.linha_do_no(compartilhado['elementos'][0]) == 2
+    assert indice.linha_do_no(linhas[3]['filhos'][0]['elementos'][1]) == 4
+    assert indice.linha_do_no(_inteiro('9')) is None
+
+    assert indice.anotada(2) is None
+    anotada = dict(linhas[1], tipo='int')
+    indice.registrar_anotada(anotada)
+    assert indice.anotada(2) is anotada
+
+
+def test_control_pass_visits_only_control_lines(monkeypatch):
+    linhas = [_linha(i, [_inteiro(str(i)), _inteiro('1')], '+') for i in range(1, 2001)]
+    real = lambda v: {'subtipo': 'numero_real', 'valor': v}
+    linhas[999] = _linha(1000, [real('1'), real('2'), real('3')], 'IFELSE')
+    arvore = {'linhas': linhas}
+
+    visitadas = []
+    original = analisador_memoria_controle._analisar_linha_controle
+
+    def registrar(linha, seq, tabela, subexpressoes=None):
+        visitadas.append(linha['numero_linha'])
+        return original(linha, seq, tabela, subexpressoes)
+
+    monkeypatch.setattr(analisador_memoria_controle, '_analisar_linha_controle', registrar)
+    erros = analisarSemanticaControle(arvore, IndicePrograma(linhas), TabelaSimbolos())
+
+    assert visitadas == [1000]
+    assert erros == []
+    assert linhas[999]['tipo'] == 'real'
@@ -0,0 +1,67 @@
+from src.RA3.functions.python.nos_ast import (
+    ArithOp, Control, Linha, Literal, OutroNo, Var, arvore_de_dict, arvore_para_dict, no_de_dict
+)
+
+
+def _folha(valor, subtipo, tipo='int'):
+    return {'tipo_vertice': 'LINHA', 'tipo_inferido': tipo, 'numero_linha': 1,
+            'filhos': [], 'valor': valor, 'subtipo': subtipo}
+
+
+def test_round_trip_keeps_keys_and_order():
+    arvore = {'arvore_atribuida': [
+        {'tipo_vertice': 'LINHA', 'tipo_inferido': 'int', 'numero_linha': 1, 'filhos': [
+            {'tipo_vertice': 'ARITH_OP', 'tipo_inferido': 'int', 'numero_linha': 1, 'filhos': [
+                _folha('3', 'numero_inteiro'), _folha('X', 'variavel')
+            ], 'operador': '+'}
+        ]},
+        {'tipo_vertice': 'LINHA', 'tipo_inferido': None, 'numero_linha': 2, 'filhos': [
+            {'tipo_vertice': 'CONTROL_OP', 'tipo_inferido': None, 'numero_linha': 2, 'filhos': [
+                {'tipo_vertice': 'COMP_OP', 'tipo_inferido': 'boolean', 'numero_linha': 2, 'filhos': [
+                    _folha('X', 'variavel'), _folha('0', 'numero_inteiro')
+                ], 'operador': '>'},
+                {'tipo_vertice': 'RES', 'tipo_inferido': None, 'numero_linha': 2, 'filhos': []}
+            ], 'operador': 'WHILE'}
+        ]},
+    ]}
+
+    raizes = arvore_de_dict(arvore)
+    resultado = arvore_para_dict(raizes)
+
+    assert resultado == arvore
+    assert [list(no) for no in resultado['arvore_atribuida']] == [list(no) for no in arvore['arvore_atribuida']]
+
+    soma = raizes[0].filhos[0]
+    assert isinstance(raizes[0], Linha) and isinstance(soma, ArithOp)
+    assert [type(filho) for filho in soma.filhos] == [Literal, Var]
+    assert soma.operador == '+' and soma.filhos[1].valor == 'X'
+
+    controle = raizes[1].filhos[0]
+    assert isinstance(controle, Control)
+    assert isinstance(controle.filhos[1], OutroNo) and controle.filhos[1].tipo_vertice == 'RES'
+
+
+def test_nodes_use_slots():
+    no = no_de_dict(_folha('2.5', 'numero_real', 'real'))
+    assert not hasattr(no, '__dict__')
+    assert no.operador is None
+    assert no == no_de_dict(no.to_dict())
+
+
+def test_literal_number_flows_from_conversion_to_attributed_tree():
+    from src.RA3.functions.python.analisador_semantico import analisarSemanticaDaJsonRA2
+    from src.RA3.functions.python.gerador_arvore_atribuida import gerarArvoreAtribuida
+
+    # AST de um JSON antigo do RA2 (literais sem 'numero'/'tipo')
+    json_ra2 = {'linhas': [{'numero_linha': 1, 'arvore': {}, 'tokens': [], 'ast': {
+        'elementos': [{'subtipo': 'numero_real', 'valor': '2.5'}, {'subtipo': 'variavel', 'valor': 'X'}],
+        'operador': ''}}]}
+    resultado = analisarSemanticaDaJsonRA2(json_ra2)
+    assert resultado['erros'] == []
+    literal = resultado['arvore_anotada']['linhas'][0]['filhos'][0]['elementos'][0]
+    assert (literal['tipo'], literal['numero']) == ('real', 2.5)
+
+    arvore = gerarArvoreAtribuida(resultado['arvore_anotada'], resultado['tabela_simbolos'])
+    no = arvore_de_dict(arvore)[0].filhos[0].filhos[0]
+    assert isinstance(no, Literal) and no.numero == 2.5 and no.tipo_inferido == 'real'
+    assert no.to_dict()['numero'] == 2.5
@@ -0,0 +1,159 @@
+"""
+Test suite for the RA3 analysis of the sample programs in inputs/
+
+This file tests that:
+1. The symbol table report (tabela_simbolos.md) of the programs the original
+   compiler accepted is the same as the original one
+2. The fused analysis and the phased analysis (used for large programs)
+   agree on every sample program, and on the same program with its lines
+   in reverse order (full of forward references): errors, symbol table and
+   annotated tree (the correction of forward references is covered by
+   test_analisar_semantica.py::test_fused_analysis_fixes_forward_references)
+
+The RA2 trees are produced by a copy of compilador.py in a temporary
+directory (compilador.py writes to fixed paths under outputs/).
+
+Run with pytest:
+    pytest tests/RA3/test_programas_exemplo.py -v
+"""
+
+import sys
+import os
+import copy
+import glob
+import shutil
+import subprocess
+import pytest
+
+# Add project root to path to allow imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.insert(0, project_root)
+
+from src.RA1.functions.python.artefatos import carregar_artefato
+from src.RA3.functions.python.analisador_semantico import (
+    _analisarSemanticaEmFases,
+    _converter_arvore_json_para_analisador,
+    analisarSemanticaDaJsonRA2,
+    analisarSemanticaFundida,
+)
+from src.RA3.functions.python.gerador_arvore_atribuida import _gerar_relatorio_tabela_simbolos
+from src.RA3.functions.python.propagacao_constantes import propagar_constantes
+from src.RA3.functions.python.subexpressoes import TabelaSubexpressoes
+
+
+PROGRAMAS = sorted(os.path.relpath(caminho, project_root).replace(os.sep, '/')
+                   for caminho in glob.glob(os.path.join(project_root, 'inputs', '*', '*.txt')))
+
+# Linhas (Nome, Tipo, Inicializado, Linha) de tabela_simbolos.md geradas pelo
+# compilador original para os programas sem erros
+TABELAS_ORIGINAIS = {
+    'inputs/RA2/teste1.txt': [
+        ('A', 'real', 'Sim', '1'), ('B', 'real', 'Sim', '2'), ('C', 'real', 'Sim', '3'),
+        ('D', 'real', 'Sim', '4'), ('E', 'real', 'Sim', '5'), ('H', 'real', 'Sim', '8'),
+        ('V', 'int', 'Sim', '21'), ('W', 'int', 'Sim', '22'), ('X', 'real', 'Sim', '11'),
+        ('Z', 'int', 'Sim', '13'),
+    ],
+    'inputs/RA2/teste2.txt': [
+        ('A', 'int', 'Sim', '1'), ('B', 'int', 'Sim', '2'), ('C', 'int', 'Sim', '3'),
+        ('D', 'int', 'Sim', '4'), ('E', 'int', 'Sim', '5'), ('F', 'int', 'Sim', '6'),
+        ('G', 'int', 'Sim', '7'), ('H', 'int', 'Sim', '8'), ('V', 'int', 'Sim', '20'),
+        ('W', 'int', 'Sim', '21'), ('X', 'int', 'Sim', '11'), ('Z', 'int', 'Sim', '13'),
+    ],
+    'inputs/RA2/teste3.txt': [
+        ('A', 'int', 'Sim', '1'), ('B', 'int', 'Sim', '2'), ('C', 'int', 'Sim', '3'),
+        ('D', 'int', 'Sim', '4'), ('E', 'int', 'Sim', '5'), ('X', 'int', 'Sim', '9'),
+    ],
+    'inputs/RA3/teste2.txt': [
+        ('COUNTER', 'int', 'Sim', '15'), ('FLAG', 'int', 'Sim', '14'), ('PI', 'real', 'Sim', '13'),
+        ('SUM', 'int', 'Sim', '16'), ('X', 'int', 'Sim', '12'), ('Y', 'int', 'Sim', '17'),
+        ('Z', 'int', 'Sim', '18'),
+    ],
+    'inputs/RA3/teste3.txt': [
+        ('A', 'int', 'Sim', '1'), ('B', 'int', 'Sim', '2'), ('COUNTER', 'int', 'Sim', '29'),
+        ('INDEX', 'int', 'Sim', '30'), ('PRODUCT', 'real', 'Sim', '24'), ('RESULT', 'int', 'Sim', '27'),
+        ('SUM', 'int', 'Sim', '23'), ('X', 'real', 'Sim', '3'), ('Y', 'real', 'Sim', '4'),
+    ],
+    'inputs/RA3/teste_simple.txt': [
+        ('PI', 'real', 'Sim', '9'), ('X', 'int', 'Sim', '8'),
+    ],
+    'inputs/RA4/fatorial.txt': [
+        ('COUNTER', 'int', 'Sim', '1'), ('LIMIT', 'int', 'Sim', '3'), ('RESULT', 'int', 'Sim', '2'),
+    ],
+    'inputs/RA4/fibonacci.txt': [
+        ('COUNTER', 'int', 'Sim', '3'), ('FIB_0', 'int', 'Sim', '1'), ('FIB_1', 'int', 'Sim', '2'),
+        ('LIMIT', 'int', 'Sim', '4'),
+    ],
+    'inputs/RA4/taylor.txt': [
+        ('COUNTER', 'int', 'Sim', '3'), ('TERM1', 'real', 'Sim', '2'), ('X_VAL', 'real', 'Sim', '1'),
+    ],
+}
+
+
+@pytest.fixture(scope='module')
+def arvores_ra2(tmp_path_factory):
+    """Árvore sintática (JSON do RA2) de cada programa de inputs/."""
+    raiz = tmp_path_factory.mktemp('compilador')
+    shutil.copytree(os.path.join(project_root, 'src'), raiz / 'src',
+                    ignore=shutil.ignore_patterns('__pycache__'))
+    shutil.copy(os.path.join(project_root, 'compilador.py'), raiz)
+
+    arvores = {}
+    for programa in PROGRAMAS:
+        shutil.rmtree(raiz / 'outputs', ignore_errors=True)
+        shutil.copy(os.path.join(project_root, programa), raiz / 'entrada.txt')
+        subprocess.run([sys.executable, 'compilador.py', 'entrada.txt', '--no-reports', '--no-secondary-copies'],
+                       cwd=raiz, capture_output=True, timeout=300)
+        arvores[programa] = carregar_artefato(raiz / 'outputs' / 'RA2' / 'arvore_sintatica.json')
+    return arvores
+
+
+def _linhas_tabela(caminho):
+    """Linhas da tabela de tabela_simbolos.md, sem o número de usos."""
+    linhas = []
+    with open(caminho, encoding='utf-8') as f:
+        for texto in f:
+            colunas = [coluna.strip().strip('`') for coluna in texto.strip().strip('|').split('|')]
+            if texto.startswith('| `'):
+                linhas.append(tuple(colunas[:4]))
+    return linhas
+
+
+def _convertida(arvore_ra2):
+    """Programa convertido para o analisador, como em analisarSemanticaDaJsonRA2."""
+    subexpressoes = TabelaSubexpressoes()
+    arvore = _converter_arvore_json_para_analisador(copy.deepcopy(arvore_ra2), subexpressoes, erros=[])
+    propagar_constantes(arvore)
+    return arvore, subexpressoes
+
+
+def _invertida(arvore_ra2):
+    """Mesmo programa com as linhas em ordem inversa (renumeradas)."""
+    linhas = [dict(linha) for linha in reversed(arvore_ra2['linhas'])]
+    for numero, linha in enumerate(linhas, 1):
+        linha['numero_linha'] = numero
+    return dict(arvore_ra2, linhas=linhas)
+
+
+def _resumo(resultado):
+    simbolos = [(s.nome, s.tipo, s.inicializada, s.linha_declaracao) for s in resultado['tabela_simbolos'].listar_simbolos()]
+    return resultado['arvore_anotada'], simbolos, resultado['erros']
+
+
+@pytest.mark.parametrize('programa', sorted(TABELAS_ORIGINAIS))
+def test_symbol_table_report_matches_original(arvores_ra2, programa, tmp_path):
+    resultado = analisarSemanticaDaJsonRA2(copy.deepcopy(arvores_ra2[programa]))
+    assert resultado['erros'] == []
+    _gerar_relatorio_tabela_simbolos(resultado['tabela_simbolos'], tmp_path / 'tabela_simbolos.md')
+    assert _linhas_tabela(tmp_path / 'tabela_simbolos.md') == TABELAS_ORIGINAIS[programa]
+
+
+@pytest.mark.parametrize('invertida', [False, True])
+@pytest.mark.parametrize('programa', PROGRAMAS)
+def test_fused_and_phased_analysis_agree(arvores_ra2, programa, invertida):
+    arvore_ra2 = _invertida(arvores_ra2[programa]) if invertida else arvores_ra2[programa]
+    arvore, subexpressoes = _convertida(arvore_ra2)
+    fundida = analisarSemanticaFundida(arvore, subexpressoes)
+    for processos in (1, 2):
+        arvore, subexpressoes = _convertida(arvore_ra2)
+        em_fases = _analisarSemanticaEmFases(arvore, subexpressoes, processos=processos)
+        assert _resumo(em_fases) == _resumo(fundida)
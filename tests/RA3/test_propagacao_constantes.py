@@ -0,0 +1,119 @@
+from src.RA3.functions.python.analisador_semantico import analisarSemanticaFundida
+from src.RA3.functions.python.gerador_arvore_atribuida import gerarArvoreAtribuida
+from src.RA3.functions.python.propagacao_constantes import propagar_constantes
+from src.RA4.functions.python.ast_traverser import ASTTraverser
+from src.RA4.functions.python.tac_instructions import TACAssignment, TACCopy
+from src.RA4.functions.python.tac_manager import TACManager
+
+
+def _programa(*seqs):
+    return {'linhas': [
+        {'numero_linha': i + 1, 'filhos': [{'elementos': elementos, 'operador': operador}]}
+        for i, (elementos, operador) in enumerate(seqs)
+    ]}
+
+
+def _sub(elementos, operador):
+    return {'subtipo': 'LINHA', 'elementos': elementos, 'operador': operador, 'ast': {'elementos': elementos, 'operador': operador}}
+
+
+def _inteiro(valor):
+    return {'subtipo': 'numero_inteiro', 'valor': valor}
+
+
+def _var(nome):
+    return {'subtipo': 'variavel', 'valor': nome}
+
+
+def _valores(programa):
+    return {linha['numero_linha']: linha.get('valor_constante') for linha in programa['linhas']}
+
+
+def test_lines_variables_and_res_are_folded():
+    programa = _programa(
+        ([_inteiro('3'), _inteiro('4')], '+'),                            # 7
+        ([_sub([_inteiro('2'), _inteiro('3')], '*'), _var('X')], None),   # X = 6
+        ([{'subtipo': 'numero_inteiro_res', 'valor': '2'}], None),       # linha 1
+        ([_inteiro('2'), _var('N')], None),                               # N = 2
+        ([{'subtipo': 'variavel_res', 'valor': 'N'}], None),              # linha 3
+        ([_var('X'), {'subtipo': 'numero_real', 'valor': '1.5'}], '+'),   # real: desconhecido
+        ([_inteiro('7'), _inteiro('2')], '/'),
+    )
+    assert propagar_constantes(programa) == 6
+    assert _valores(programa) == {1: 7, 2: 6, 3: 7, 4: 2, 5: 7, 6: None, 7: 3}
+    assert programa['linhas'][4]['offset_res'] == 2
+
+
+def test_loops_and_overflow_are_not_folded():
+    programa = _programa(
+        ([_inteiro('0'), _var('C')], None),
+        ([_sub([_var('C'), _inteiro('3')], '<'), _sub([_sub([_var('C'), _inteiro('1')], '+'), _var('C')], None)], 'WHILE'),
+        ([_var('C'), _inteiro('1')], '+'),
+        ([_inteiro('300'), _inteiro('300')], '*'),
+        ([_inteiro('-7'), _inteiro('2')], '/'),
+        ([{'subtipo': 'variavel_res', 'valor': 'C'}], None),
+    )
+    propagar_constantes(programa)
+    assert _valores(programa) == {1: 0, 2: None, 3: None, 4: None, 5: None, 6: None}
+    assert 'offset_res' not in programa['linhas'][5]
+
+
+def test_nested_stores_invalidate_variables():
+    programa = _programa(
+        ([_inteiro('3'), _var('X')], None),                                       # X = 3
+        ([_sub([_inteiro('5'), _var('X')], None), _inteiro('1')], '+'),          # armazena X dentro da soma
+        ([_var('X'), _inteiro('1')], '+'),
+        ([_inteiro('2'), _var('Y')], None),                                       # Y = 2
+        ([_sub([_sub([_inteiro('9'), _var('Y')], None), _inteiro('1')], '+'), _var('Z')], None),
+        ([_var('Y'), _inteiro('1')], '+'),
+    )
+    propagar_constantes(programa)
+    assert _valores(programa) == {1: 3, 2: None, 3: None, 4: 2, 5: None, 6: None}
+
+
+def test_res_with_constant_variable_offset_is_analyzed_and_folded():
+    programa = _programa(
+        ([_inteiro('10'), _inteiro('20')], '+'),
+        ([_inteiro('1'), _var('N')], None),
+        ([{'subtipo': 'variavel_res', 'valor': 'N'}], None),
+        ([{'subtipo': 'variavel_res', 'valor': 'N'}], None),
+    )
+    propagar_constantes(programa)
+    resultado = analisarSemanticaFundida(programa)
+    assert resultado['erros'] == []
+    assert [linha['tipo'] for linha in resultado['arvore_anotada']['linhas']] == ['int'] * 4
+
+    # A árvore atribuída mantém as expressões; o valor só é usado no TAC
+    arvore = gerarArvoreAtribuida(resultado['arvore_anotada'], resultado['tabela_simbolos'])
+    soma, _, raiz_res, _ = arvore['arvore_atribuida']
+    assert (soma['valor_constante'], soma['filhos'][0]['operador']) == (30, '+')
+    assert raiz_res['valor_constante'] == 1
+    assert raiz_res['filhos'][0]['filhos'][0]['subtipo'] == 'variavel_res'
+
+    instrucoes = ASTTraverser(TACManager()).generate_tac(arvore)
+    por_linha = {}
+    for instrucao in instrucoes:
+        por_linha.setdefault(instrucao.line, []).append(instrucao)
+    assert [(type(i), i.source) for i in por_linha[1]] == [(TACAssignment, '30')]
+    assert [(type(i), i.source) for i in por_linha[3]] == [(TACAssignment, '1')]
+
+
+def test_res_with_constant_offset_copies_the_referenced_line():
+    programa = _programa(
+        ([{'subtipo': 'numero_real', 'valor': '1.5'}, _var('A')], None),
+        ([_inteiro('2'), _var('X')], None),
+        ([{'subtipo': 'variavel_res', 'valor': 'X'}], None),               # linha 1 (real)
+    )
+    propagar_constantes(programa)
+    resultado = analisarSemanticaFundida(programa)
+    assert resultado['erros'] == []
+
+    arvore = gerarArvoreAtribuida(resultado['arvore_anotada'], resultado['tabela_simbolos'])
+    raiz_res = arvore['arvore_atribuida'][2]
+    assert raiz_res['offset_res'] == 2 and 'valor_constante' not in raiz_res
+
+    instrucoes = ASTTraverser(TACManager()).generate_tac(arvore)
+    resultado_linha_1 = next(i for i in instrucoes if i.line == 1).dest
+    linha_3 = [i for i in instrucoes if i.line == 3]
+    assert [(type(i), i.source) for i in linha_3] == [(TACCopy, resultado_linha_1)]
+    assert linha_3[0].data_type == 'real'
@@ -219,6 +219,62 @@ class TestTabelaSimbolos(unittest.TestCase):
         self.assertFalse(self.tabela.existe('VAR1'))
         self.assertFalse(self.tabela.existe('VAR2'))
 
+    def test_ids_e_visao_sem_copia(self):
+        """Símbolos recebem ids sequenciais e a visão reflete a tabela sem cópia."""
+        visao = self.tabela.simbolos
+        a = self.tabela.adicionarSimbolo('a', tipos.TYPE_INT)
+        b = self.tabela.adicionarSimbolo('B', tipos.TYPE_REAL)
+
+        self.assertEqual((a.id, b.id), (0, 1))
+        self.assertEqual(self.tabela.id_simbolo('b'), 1)
+        self.assertIs(self.tabela.simbolo_por_id(0), a)
+        self.assertIs(self.tabela.simbolos, visao)
+        self.assertEqual(list(visao), ['A', 'B'])
+        self.assertIs(visao['A'], a)
+        with self.assertRaises(TypeError):
+            visao['C'] = b
+        self.assertFalse(hasattr(a, '__dict__'))
+
+    def test_escopos_aninhados(self):
+        """Símbolos locais ocultam os externos e somem ao sair do escopo."""
+        self.tabela.adicionarSimbolo('X', tipos.TYPE_INT, True)
+        self.tabela.adicionarSimbolo('Y', tipos.TYPE_INT, True)
+
+        with self.tabela.escopo():
+            self.assertEqual(self.tabela.escopo_atual, 1)
+            self.tabela.adicionarSimbolo('X', tipos.TYPE_REAL, True, local=True)
+            self.tabela.adicionarSimbolo('Z', tipos.TYPE_REAL, True)
+            self.tabela.adicionarSimbolo('Y', tipos.TYPE_REAL, True)  # atualiza o externo
+            self.assertEqual(self.tabela.obter_tipo('X'), tipos.TYPE_REAL)
+            self.assertEqual(self.tabela.buscarSimbolo('Z').escopo, 1)
+            self.assertEqual(len(self.tabela), 3)
+            versao = self.tabela.versao
+
+        self.assertEqual(self.tabela.escopo_atual, 0)
+        self.assertGreater(self.tabela.versao, versao)
+        self.assertEqual(self.tabela.obter_tipo('X'), tipos.TYPE_INT)
+        self.assertEqual(self.tabela.obter_tipo('Y'), tipos.TYPE_REAL)
+        self.assertFalse(self.tabela.existe('Z'))
+        self.assertEqual([s.nome for s in self.tabela.listar_simbolos()], ['X', 'Y'])
+
+        with self.assertRaises(ValueError):
+            self.tabela.sair_escopo()
+
+    def test_escopos_profundos(self):
+        """Busca em escopo profundo vê o símbolo mais interno de cada nome."""
+        self.tabela.adicionarSimbolo('G', tipos.TYPE_INT, True)
+        for nivel in range(1, 3001):
+            self.tabela.entrar_escopo()
+            self.tabela.adicionarSimbolo(f'V{nivel % 10}', tipos.TYPE_INT, True, nivel, local=True)
+
+        self.assertEqual(self.tabela.buscarSimbolo('V3').linha_declaracao, 2993)
+        self.assertEqual(self.tabela.buscarSimbolo('G').escopo, 0)
+
+        for _ in range(3000):
+            self.tabela.sair_escopo()
+        self.assertEqual(len(self.tabela), 1)
+        self.assertFalse(self.tabela.existe('V3'))
+
     def test_listar_simbolos(self):
         """Deve listar todos os símbolos."""
         self.tabela.adicionarSimbolo('A', tipos.TYPE_INT, True)
@@ -195,6 +195,31 @@ class TestTipoResultado(unittest.TestCase):
         with self.assertRaises(ValueError):
             tipos.tipo_resultado_aritmetica('int', 'real', '^')
 
+    def test_mensagens_erro_preservadas(self):
+        """Consultas inválidas às matrizes mantêm as mensagens de cada regra."""
+        casos = [
+            (('int', 'boolean', '|'), "Operador '|' requer operandos numéricos. Recebido: int, boolean"),
+            (('real', 'int', '%'), "Operador '%' requer operandos inteiros. Recebido: real, int"),
+            (('int', 'real', '^'), "Operador '^' requer base numérica e expoente inteiro. Recebido: base=int, expoente=real"),
+            ((None, 'int', '-'), "Operador '-' requer operandos numéricos. Recebido: None, int"),
+            (('int', 'int', '?'), "Operador aritmético desconhecido: '?'"),
+        ]
+        for argumentos, mensagem in casos:
+            with self.assertRaises(ValueError) as contexto:
+                tipos.tipo_resultado_aritmetica(*argumentos)
+            self.assertEqual(str(contexto.exception), mensagem)
+
+        with self.assertRaises(ValueError) as contexto:
+            tipos.tipo_resultado_comparacao('boolean', 'int')
+        self.assertEqual(str(contexto.exception),
+                         "Operadores de comparação requerem operandos numéricos. Recebido: boolean, int")
+
+    def test_tipos_desconhecidos_incompativeis(self):
+        """Tipos fora do universo (ou None) não são compatíveis com nenhum operador."""
+        self.assertFalse(tipos.tipos_compativeis_aritmetica('int', None))
+        self.assertFalse(tipos.tipos_compativeis_logico('texto', 'boolean'))
+        self.assertEqual(tipos.tipo_resultado_aritmetica('real', 'int', '^'), 'real')
+
 
 class TestUtilitarios(unittest.TestCase):
     """Testes para funções utilitárias."""
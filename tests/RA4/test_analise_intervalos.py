@@ -0,0 +1,111 @@
+"""
+Test suite for the TAC interval analysis (analise_intervalos)
+
+This file tests that:
+1. Constants, copies and arithmetic produce exact 16-bit unsigned ranges
+2. Possible wrap-around (overflow, negative subtraction) gives the full range
+3. Loop counters are bounded by the comparison that guards the loop
+4. Unreachable branches get no state
+
+Run with pytest:
+    pytest tests/RA4/test_analise_intervalos.py -v
+"""
+
+import sys
+import os
+
+# Add project root to path to allow imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.insert(0, project_root)
+
+from src.RA4.functions.python.analise_intervalos import (
+    INTERVALO_TOTAL,
+    analisar_intervalos,
+    intervalo_binario,
+)
+
+
+def _atribuir(dest, source):
+    return {"type": "assignment", "dest": dest, "source": source}
+
+
+def _binaria(result, op1, operator, op2):
+    return {"type": "binary_op", "result": result, "operand1": op1, "operator": operator, "operand2": op2}
+
+
+def test_intervalo_binario():
+    assert intervalo_binario('+', (1, 10), (2, 3)) == (3, 13)
+    assert intervalo_binario('-', (5, 10), (0, 5)) == (0, 10)
+    assert intervalo_binario('-', (0, 10), (1, 1)) == INTERVALO_TOTAL
+    assert intervalo_binario('*', (300, 300), (300, 300)) == INTERVALO_TOTAL
+    assert intervalo_binario('*', (50, 50), (50, 50), 'real') == (25, 25)
+    assert intervalo_binario('/', (10, 20), (2, 5)) == (2, 10)
+    assert intervalo_binario('/', (10, 20), (0, 5)) == INTERVALO_TOTAL
+    assert intervalo_binario('%', (0, 200), (0, 7)) == (0, 200)
+    assert intervalo_binario('%', (0, 200), (1, 7)) == (0, 6)
+    assert intervalo_binario('<', INTERVALO_TOTAL, INTERVALO_TOTAL) == (0, 1)
+    assert intervalo_binario('^', (2, 2), (3, 3)) == INTERVALO_TOTAL
+
+
+def test_linha_reta_e_constantes_negativas():
+    tac = [
+        _atribuir("A", "7"),
+        _atribuir("B", "-1"),
+        _binaria("t0", "A", "+", "B"),
+        {"type": "copy", "dest": "C", "source": "t0"},
+        {"type": "label", "name": "FIM"},
+    ]
+    estados = analisar_intervalos(tac)
+    assert estados[2] == {"A": (7, 7), "B": (0xFFFF, 0xFFFF)}
+    assert "t0" not in estados[3]           # 7 + 0xFFFF dá a volta
+    assert "C" not in estados[4]
+
+
+def test_contador_limitado_pela_condicao_do_laco():
+    tac = [
+        _atribuir("COUNTER", "1"),
+        _atribuir("LIMIT", "8"),
+        {"type": "label", "name": "L0"},
+        _binaria("t0", "COUNTER", "<=", "LIMIT"),
+        {"type": "if_false_goto", "condition": "t0", "target": "L1"},
+        _binaria("t1", "COUNTER", "+", "1"),
+        {"type": "copy", "dest": "COUNTER", "source": "t1"},
+        {"type": "goto", "target": "L0"},
+        {"type": "label", "name": "L1"},
+    ]
+    estados = analisar_intervalos(tac)
+    assert estados[2]["COUNTER"] == (1, 9)
+    assert estados[5]["COUNTER"] == (1, 8)
+    assert estados[5]["t0"] == (1, 1)
+    assert estados[7]["COUNTER"] == (2, 9)
+    assert estados[8]["COUNTER"] == (9, 9)
+    assert estados[8]["t0"] == (0, 0)
+
+
+def test_laco_sem_limite_e_alargado():
+    tac = [
+        _atribuir("X", "1"),
+        {"type": "label", "name": "L0"},
+        _binaria("X", "X", "+", "1"),
+        {"type": "goto", "target": "L0"},
+    ]
+    estados = analisar_intervalos(tac)
+    assert "X" not in estados[1]
+    assert "X" not in estados[3]
+
+
+def test_ramo_impossivel_fica_inalcancavel():
+    tac = [
+        _atribuir("A", "3"),
+        _binaria("t0", "A", ">", "10"),
+        {"type": "if_goto", "condition": "t0", "target": "L1"},
+        _atribuir("B", "1"),
+        {"type": "goto", "target": "L1"},
+        _atribuir("B", "2"),
+        {"type": "label", "name": "L1"},
+    ]
+    estados = analisar_intervalos(tac)
+    assert estados[3] == {"A": (3, 3), "t0": (0, 0)}
+    assert estados[5] is None
+    assert estados[6] == {"A": (3, 3), "t0": (0, 0), "B": (1, 1)}
+    assert analisar_intervalos([]) == []
@@ -0,0 +1,252 @@
+"""
+Test suite for inter-phase artifacts (json / bin)
+
+This file tests that:
+1. The binary format round-trips every JSON-compatible value
+2. Repeated strings are interned (stored once)
+3. salvar_artefato / carregar_artefato honor the configured format
+4. Corrupted binaries raise ErroArtefato
+5. abrir_artefato decodes indexed lists on demand (mmap)
+6. replicar_arquivo links/copies a written artifact to a secondary location
+7. Root lists are written element by element (generators and deferred values)
+8. Values nested thousands of levels deep are written and read back
+9. A failed write leaves the previous artifact in place
+
+Run with pytest:
+    pytest tests/RA4/test_artefatos.py -v
+"""
+
+import sys
+import os
+import json
+import pytest
+
+# Add project root to path to allow imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.insert(0, project_root)
+
+from src.RA1.functions.python.artefatos import (
+    ErroArtefato,
+    ListaIndexada,
+    abrir_artefato,
+    carregar_artefato,
+    definir_copias_secundarias,
+    definir_formato_artefato,
+    desserializar_binario,
+    obter_formato_artefato,
+    replicar_arquivo,
+    salvar_artefato,
+    serializar_binario,
+)
+
+
+ARVORE_EXEMPLO = {
+    "arvore_atribuida": [
+        {
+            "tipo_vertice": "LINHA",
+            "tipo_inferido": "int",
+            "numero_linha": i,
+            "filhos": [
+                {"tipo_vertice": "LINHA", "subtipo": "numero_inteiro", "valor": str(i)},
+                {"tipo_vertice": "LINHA", "subtipo": "numero_real", "valor": "-2.5"},
+            ],
+        }
+        for i in range(1, 50)
+    ],
+    "extras": [None, True, False, -1, 0, 2 ** 40, -(2 ** 40), 3.25, "ação"],
+}
+
+
+@pytest.fixture
+def formato_bin():
+    anterior = obter_formato_artefato()
+    definir_formato_artefato("bin")
+    yield
+    definir_formato_artefato(anterior)
+
+
+def test_binary_round_trip():
+    assert desserializar_binario(serializar_binario(ARVORE_EXEMPLO)) == ARVORE_EXEMPLO
+
+
+def test_binary_interns_repeated_labels():
+    dados = serializar_binario(ARVORE_EXEMPLO)
+    assert dados.count(b"tipo_vertice") == 1
+    assert len(dados) < len(json.dumps(ARVORE_EXEMPLO).encode("utf-8")) / 2
+
+
+def test_non_string_keys_follow_json():
+    assert desserializar_binario(serializar_binario({1: "a", True: "b"})) == json.loads(json.dumps({1: "a", True: "b"}))
+
+
+def test_salvar_artefato_json_by_default(tmp_path):
+    destino = salvar_artefato(ARVORE_EXEMPLO, tmp_path / "arvore.json")
+    assert destino.suffix == ".json"
+    with open(destino, encoding="utf-8") as f:
+        assert json.load(f) == ARVORE_EXEMPLO
+
+
+def test_salvar_e_carregar_artefato_bin(tmp_path, formato_bin):
+    destino = salvar_artefato(ARVORE_EXEMPLO, tmp_path / "arvore.json")
+    assert destino.suffix == ".bin"
+    assert not (tmp_path / "arvore.json").exists()
+    # Os chamadores continuam passando o nome .json
+    assert carregar_artefato(tmp_path / "arvore.json") == ARVORE_EXEMPLO
+
+
+def test_carregar_artefato_missing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        carregar_artefato(tmp_path / "inexistente.json")
+
+
+def test_corrupted_binary_raises():
+    dados = serializar_binario(ARVORE_EXEMPLO)
+    with pytest.raises(ErroArtefato):
+        desserializar_binario(dados[:len(dados) // 2])
+    with pytest.raises(ErroArtefato):
+        desserializar_binario(b"XXXX" + dados[4:])
+
+
+def test_unknown_format_rejected():
+    with pytest.raises(ValueError):
+        definir_formato_artefato("xml")
+
+
+def test_abrir_artefato_bin_is_lazy(tmp_path, formato_bin):
+    salvar_artefato(ARVORE_EXEMPLO, tmp_path / "arvore.json")
+    with abrir_artefato(tmp_path / "arvore.json") as artefato:
+        linhas = artefato["arvore_atribuida"]
+        assert isinstance(linhas, ListaIndexada)
+        assert len(linhas) == len(ARVORE_EXEMPLO["arvore_atribuida"])
+        assert linhas[10] == ARVORE_EXEMPLO["arvore_atribuida"][10]
+        assert linhas[-1] == ARVORE_EXEMPLO["arvore_atribuida"][-1]
+        assert linhas[5:8] == ARVORE_EXEMPLO["arvore_atribuida"][5:8]
+        assert list(linhas) == ARVORE_EXEMPLO["arvore_atribuida"]
+        assert artefato["extras"][8] == "ação"
+
+
+def test_abrir_artefato_json_same_interface(tmp_path):
+    salvar_artefato(ARVORE_EXEMPLO, tmp_path / "arvore.json")
+    with abrir_artefato(tmp_path / "arvore.json") as artefato:
+        assert artefato["arvore_atribuida"][3:5] == ARVORE_EXEMPLO["arvore_atribuida"][3:5]
+        assert set(artefato) == set(ARVORE_EXEMPLO)
+
+
+def test_carregar_tac_range(tmp_path, formato_bin):
+    from src.RA4.functions.python.otimizador_tac import TACOptimizer
+
+    instrucoes = [
+        {"type": "assignment", "dest": f"t{i}", "source": str(i), "line": i, "data_type": "int"}
+        for i in range(20)
+    ]
+    salvar_artefato({"statistics": {"total": 20}, "instructions": instrucoes}, tmp_path / "tac.json")
+
+    otimizador = TACOptimizer()
+    otimizador.carregar_tac(str(tmp_path / "tac.json"), 5, 8)
+    assert [instr.dest for instr in otimizador.instructions] == ["t5", "t6", "t7"]
+
+    otimizador.carregar_tac(str(tmp_path / "tac.json"))
+    assert len(otimizador.instructions) == 20
+
+
+def test_replicar_arquivo_links_or_copies_once(tmp_path):
+    origem = salvar_artefato(ARVORE_EXEMPLO, tmp_path / "saida" / "arvore.json")
+    destino = tmp_path / "raiz" / "arvore.json"
+
+    assert replicar_arquivo(origem, destino) == destino
+    assert carregar_artefato(destino) == ARVORE_EXEMPLO
+    # Réplica repetida e réplica sobre o próprio arquivo não falham
+    assert replicar_arquivo(origem, destino) == destino
+    assert replicar_arquivo(origem, origem) is None
+
+
+def test_replicar_arquivo_disabled(tmp_path):
+    origem = salvar_artefato(ARVORE_EXEMPLO, tmp_path / "arvore.json")
+    definir_copias_secundarias(False)
+    try:
+        assert replicar_arquivo(origem, tmp_path / "raiz" / "arvore.json") is None
+        assert not (tmp_path / "raiz").exists()
+    finally:
+        definir_copias_secundarias(True)
+
+
+@pytest.mark.parametrize("formato", ["json", "bin"])
+def test_incremental_write_matches_full_write(tmp_path, formato):
+    produzidas = []
+
+    def gerar_linhas():
+        for linha in ARVORE_EXEMPLO["arvore_atribuida"]:
+            produzidas.append(linha["numero_linha"])
+            yield linha
+
+    dados = {
+        "arvore_atribuida": gerar_linhas(),
+        # Chamada só depois de todas as linhas terem sido gravadas
+        "extras": lambda: ARVORE_EXEMPLO["extras"] + [len(produzidas)],
+    }
+    destino = salvar_artefato(dados, tmp_path / "arvore.json", formato)
+    esperado = dict(ARVORE_EXEMPLO, extras=ARVORE_EXEMPLO["extras"] + [49])
+
+    assert carregar_artefato(destino) == esperado
+    if formato == "json":
+        assert destino.read_text(encoding="utf-8") == json.dumps(esperado, indent=2, ensure_ascii=False)
+    else:
+        assert destino.read_bytes() == serializar_binario(esperado)
+        with abrir_artefato(destino) as artefato:
+            assert artefato["arvore_atribuida"][48] == esperado["arvore_atribuida"][48]
+
+
+def _aninhada(niveis):
+    """Linha da árvore atribuída com 'niveis' subexpressões aninhadas."""
+    no = {"tipo_vertice": "LINHA", "subtipo": "numero_inteiro", "valor": "1", "filhos": []}
+    for _ in range(niveis):
+        no = {"tipo_vertice": "ARITH_OP", "operador": "+", "filhos": [no, {"valor": "2"}]}
+    return {"tipo_vertice": "LINHA", "numero_linha": 1, "filhos": [no]}
+
+
+def _profundidade(no):
+    niveis = 0
+    while no["filhos"]:
+        no, niveis = no["filhos"][0], niveis + 1
+    return niveis
+
+
+@pytest.mark.parametrize("formato", ["json", "bin"])
+def test_deeply_nested_round_trip(tmp_path, formato):
+    niveis = 1500
+    destino = salvar_artefato({"arvore_atribuida": [_aninhada(niveis)], "nivel": {"x": [[[]]]}},
+                              tmp_path / "arvore.json", formato)
+
+    carregado = carregar_artefato(destino)
+    assert _profundidade(carregado["arvore_atribuida"][0]) == niveis + 1
+    assert carregado["nivel"] == {"x": [[[]]]}
+    with abrir_artefato(destino) as artefato:
+        assert _profundidade(artefato["arvore_atribuida"][0]) == niveis + 1
+
+    assert _profundidade(desserializar_binario(serializar_binario(_aninhada(niveis)))) == niveis + 1
+
+    # Valores que o json.dumps consegue serializar: mesmo texto
+    pequeno = {"arvore_atribuida": [_aninhada(50)], "vazio": {}}
+    destino = salvar_artefato(pequeno, tmp_path / "pequeno.json", "json")
+    assert destino.read_text(encoding="utf-8") == json.dumps(pequeno, indent=2, ensure_ascii=False)
+
+
+@pytest.mark.parametrize("formato", ["json", "bin"])
+def test_failed_write_keeps_previous_artifact(tmp_path, formato):
+    destino = salvar_artefato(ARVORE_EXEMPLO, tmp_path / "arvore.json", formato)
+
+    def linhas_com_falha():
+        yield ARVORE_EXEMPLO["arvore_atribuida"][0]
+        raise RuntimeError("falha no meio da escrita")
+
+    with pytest.raises(RuntimeError):
+        salvar_artefato({"arvore_atribuida": linhas_com_falha()}, tmp_path / "arvore.json", formato)
+    assert carregar_artefato(destino) == ARVORE_EXEMPLO
+    assert [caminho.name for caminho in tmp_path.iterdir()] == [destino.name]
+
+
+def test_circular_reference_rejected():
+    circular = []
+    circular.append(circular)
+    with pytest.raises(ValueError):
+        serializar_binario({"linhas": [circular]})
@@ -803,3 +803,17 @@ def test_control_flow_implemented():
 
     # Should have generated instructions (condition check, body, jump back)
     assert stats["total_instructions"] > 0, "WHILE should generate TAC instructions"
+
+
+def test_deeply_nested_expression_does_not_hit_recursion_limit():
+    """Test expression nested beyond Python's recursion limit."""
+    traverser = ASTTraverser(TACManager())
+    node = create_literal_node("1", "numero_inteiro")
+    depth = sys.getrecursionlimit() + 200
+    for _ in range(depth):
+        node = create_arith_op_node("+", node, create_literal_node("1", "numero_inteiro"))
+
+    instructions = traverser.generate_tac({"arvore_atribuida": [create_linha_node([node])]})
+
+    binary_ops = [instr for instr in instructions if isinstance(instr, TACBinaryOp)]
+    assert len(binary_ops) == depth
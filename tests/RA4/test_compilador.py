@@ -0,0 +1,87 @@
+"""
+Test suite for the full compiler pipeline (compilador.py)
+
+This file tests that:
+1. A program nested thousands of levels deep goes through every phase
+   (RA1 to RA4) in both artifact formats
+2. The artifacts written by each phase are read back by carregar_artefato
+
+compilador.py writes to fixed paths under outputs/, so each test runs a copy
+of the compiler in a temporary directory.
+
+Run with pytest:
+    pytest tests/RA4/test_compilador.py -v
+"""
+
+import sys
+import os
+import shutil
+import subprocess
+import pytest
+
+# Add project root to path to allow imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.insert(0, project_root)
+
+from src.RA1.functions.python.artefatos import caminho_artefato, carregar_artefato
+
+
+NIVEIS = 1500
+
+
+def _programa_aninhado(niveis):
+    """Programa com uma linha de 'niveis' somas aninhadas sobre uma variável real."""
+    expressao = '(X 1 +)'
+    for i in range(niveis - 1):
+        expressao = f'({expressao} {i % 7} +)'
+    return f'(1.5 X)\n{expressao}\n(2 RES)\n'
+
+
+def _profundidade(no):
+    """Maior aninhamento de listas e dicionários em 'no', sem recursão."""
+    maior = 0
+    pilha = [(no, 0)]
+    while pilha:
+        atual, nivel = pilha.pop()
+        maior = max(maior, nivel)
+        if isinstance(atual, dict):
+            pilha.extend((filho, nivel + 1) for filho in atual.values())
+        elif isinstance(atual, list):
+            pilha.extend((filho, nivel + 1) for filho in atual)
+    return maior
+
+
+@pytest.fixture
+def compilador(tmp_path):
+    """Cópia do compilador em um diretório temporário, com o programa aninhado."""
+    shutil.copytree(os.path.join(project_root, 'src'), tmp_path / 'src',
+                    ignore=shutil.ignore_patterns('__pycache__'))
+    shutil.copy(os.path.join(project_root, 'compilador.py'), tmp_path)
+    (tmp_path / 'aninhado.txt').write_text(_programa_aninhado(NIVEIS), encoding='utf-8')
+    return tmp_path
+
+
+@pytest.mark.parametrize('formato', ['json', 'bin'])
+def test_deeply_nested_program_compiles(compilador, formato):
+    """O pipeline inteiro aceita milhares de níveis e os artefatos podem ser relidos."""
+    resultado = subprocess.run(
+        [sys.executable, 'compilador.py', 'aninhado.txt', '--artifact-format', formato,
+         '--no-reports', '--no-secondary-copies'],
+        cwd=compilador, capture_output=True, text=True, encoding='utf-8', timeout=600,
+    )
+    saida = resultado.stdout + resultado.stderr
+    assert resultado.returncode == 0, saida
+    assert 'Traceback' not in saida
+    assert '[ERROR]' not in saida
+
+    saidas = compilador / 'outputs'
+    arvore_sintatica = carregar_artefato(caminho_artefato(saidas / 'RA2' / 'arvore_sintatica.json', formato))
+    arvore_atribuida = carregar_artefato(caminho_artefato(saidas / 'RA3' / 'arvore_atribuida.json', formato))
+    assert _profundidade(arvore_sintatica) > NIVEIS
+    assert _profundidade(arvore_atribuida) > NIVEIS
+
+    tac = carregar_artefato(caminho_artefato(saidas / 'RA4' / 'tac_instructions.json', formato))
+    tac_otimizado = carregar_artefato(caminho_artefato(saidas / 'RA4' / 'tac_otimizado.json', formato))
+    assert len(tac['instructions']) > 2 * NIVEIS
+    assert 0 < len(tac_otimizado['instructions']) < len(tac['instructions'])
+    assert (saidas / 'RA4' / 'aninhado.s').exists()
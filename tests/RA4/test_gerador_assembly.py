@@ -230,6 +230,60 @@ def test_modulo():
     print("✓ Teste 8 passou: Módulo implementado usando rotina div16 (retorna resto)!")
 
 
+def test_multiplication_16bit_operands():
+    """Com a análise de intervalos, operandos acima de um byte continuam em mul16"""
+    tac_mul = {
+        "instructions": [
+            {"type": "assignment", "dest": "t0", "source": "300", "line": 1},
+            {"type": "assignment", "dest": "t1", "source": "7", "line": 2},
+            {"type": "binary_op", "result": "t2", "operand1": "t0",
+             "operator": "*", "operand2": "t1", "line": 3}
+        ]
+    }
+
+    assembly = GeradorAssembly(usar_intervalos=True).gerarAssembly(tac_mul)
+
+    assert "rcall mul16" in assembly
+    assert "mul16:" in assembly
+    assert "Multiplicação 8-bit" not in assembly
+
+
+def test_division_16bit_operands():
+    """Com a análise de intervalos, 1000 / 7 continua em div16"""
+    tac_div = {
+        "instructions": [
+            {"type": "assignment", "dest": "t0", "source": "1000", "line": 1},
+            {"type": "assignment", "dest": "t1", "source": "7", "line": 2},
+            {"type": "binary_op", "result": "t2", "operand1": "t0",
+             "operator": "/", "operand2": "t1", "line": 3}
+        ]
+    }
+
+    assembly = GeradorAssembly(usar_intervalos=True).gerarAssembly(tac_div)
+
+    assert "rcall div16" in assembly
+    assert "div16:" in assembly
+    assert "rcall div8" not in assembly
+
+
+def test_modulo_16bit_operands():
+    """Com a análise de intervalos, 1000 % 7 continua em div16 (resto em r22)"""
+    tac_mod = {
+        "instructions": [
+            {"type": "assignment", "dest": "t0", "source": "1000", "line": 1},
+            {"type": "assignment", "dest": "t1", "source": "7", "line": 2},
+            {"type": "binary_op", "result": "t2", "operand1": "t0",
+             "operator": "%", "operand2": "t1", "line": 3}
+        ]
+    }
+
+    assembly = GeradorAssembly(usar_intervalos=True).gerarAssembly(tac_mod)
+
+    assert "rcall div16" in assembly
+    assert "r22" in assembly
+    assert "rcall div8" not in assembly
+
+
 def test_comparison_eq():
     """Testa comparação de igualdade (100 == 100 = 1, 100 == 99 = 0)"""
     print("\n=== Teste 9: Comparação == (Equal) ===")
@@ -513,6 +567,67 @@ def test_real_division_scaled():
     print("✓ Teste 18 passou: Divisão real escalada (|) implementada!")
 
 
+def test_operacoes_8bit_com_intervalos():
+    """Operandos que cabem em um byte usam MUL, div8, INC e CP sem o byte alto"""
+    tac_8bit = {
+        "instructions": [
+            {"type": "assignment", "dest": "t0", "source": "6", "line": 1},
+            {"type": "assignment", "dest": "t1", "source": "7", "line": 2},
+            {"type": "binary_op", "result": "t2", "operand1": "t0",
+             "operator": "*", "operand2": "t1", "line": 3},
+            {"type": "binary_op", "result": "t3", "operand1": "t0",
+             "operator": "/", "operand2": "t1", "line": 4},
+            {"type": "binary_op", "result": "t4", "operand1": "t0",
+             "operator": "+", "operand2": "1", "line": 5},
+            {"type": "binary_op", "result": "t5", "operand1": "t0",
+             "operator": "<", "operand2": "t1", "line": 6},
+            {"type": "if_false_goto", "condition": "t5", "target": "L1", "line": 6},
+            {"type": "label", "name": "L1", "line": 7}
+        ]
+    }
+
+    assembly = GeradorAssembly(usar_intervalos=True).gerarAssembly(tac_8bit)
+
+    assert "Multiplicação 8-bit" in assembly
+    assert "movw r24, r0" in assembly
+    assert "rcall mul16" not in assembly and "mul16:" not in assembly
+    assert "rcall div8" in assembly and "div8:" in assembly
+    assert "rcall div16" not in assembly
+    assert "inc r24" in assembly
+    assert "tst r24" in assembly
+    linhas_lt = assembly.split("; TAC linha 6: t5 = t0 < t1")[1].split("skip_lt_6:")[0]
+    assert "cpc" not in linhas_lt
+
+
+def test_contador_de_laco_limitado_usa_8bit():
+    """COUNTER limitado por LIMIT = 8 cabe em um byte; RESULT (fatorial) não"""
+    tac_fatorial = {
+        "instructions": [
+            {"type": "assignment", "dest": "COUNTER", "source": "1", "line": 1},
+            {"type": "assignment", "dest": "RESULT", "source": "1", "line": 2},
+            {"type": "assignment", "dest": "LIMIT", "source": "8", "line": 3},
+            {"type": "label", "name": "L0", "line": 4},
+            {"type": "binary_op", "result": "t3", "operand1": "COUNTER",
+             "operator": "<=", "operand2": "LIMIT", "line": 4},
+            {"type": "if_false_goto", "condition": "t3", "target": "L1", "line": 4},
+            {"type": "binary_op", "result": "t4", "operand1": "RESULT",
+             "operator": "*", "operand2": "COUNTER", "line": 4},
+            {"type": "copy", "dest": "RESULT", "source": "t4", "line": 4},
+            {"type": "binary_op", "result": "t6", "operand1": "COUNTER",
+             "operator": "+", "operand2": "1", "line": 4},
+            {"type": "copy", "dest": "COUNTER", "source": "t6", "line": 4},
+            {"type": "goto", "target": "L0", "line": 4},
+            {"type": "label", "name": "L1", "line": 4}
+        ]
+    }
+
+    assembly = GeradorAssembly(usar_intervalos=True).gerarAssembly(tac_fatorial)
+
+    assert "Soma 8-bit" in assembly          # COUNTER + 1
+    assert "cp r16, r12" in assembly         # LIMIT >= COUNTER sem CPC
+    assert "rcall mul16" in assembly         # RESULT cresce até 40320
+
+
 if __name__ == "__main__":
     print("=" * 70)
     print("TESTES DO GERADOR DE ASSEMBLY - SUB-ISSUES 3.2, 3.3, 3.4")
@@ -527,6 +642,9 @@ if __name__ == "__main__":
         test_multiplication()
         test_division()
         test_modulo()
+        test_multiplication_16bit_operands()
+        test_division_16bit_operands()
+        test_modulo_16bit_operands()
         test_comparison_eq()
         test_comparison_ne()
         test_comparison_lt()
@@ -537,9 +655,11 @@ if __name__ == "__main__":
         test_if_false_goto()
         test_simple_while_loop()
         test_real_division_scaled()
+        test_operacoes_8bit_com_intervalos()
+        test_contador_de_laco_limitado_usa_8bit()
 
         print("\n" + "=" * 70)
-        print("✅ TODOS OS 18 TESTES PASSARAM!")
+        print("✅ TODOS OS 23 TESTES PASSARAM!")
         print("=" * 70)
 
     except Exception as e:
@@ -0,0 +1,87 @@
+"""
+Test suite for the report scheduler (relatorios)
+
+This file tests that:
+1. Synchronous mode runs reports immediately
+2. Background mode runs reports off the caller thread, in scheduling order
+3. Disabled mode skips reports entirely
+4. Report failures are collected by aguardar_relatorios
+
+Run with pytest:
+    pytest tests/RA4/test_relatorios.py -v
+"""
+
+import sys
+import os
+import threading
+import pytest
+
+# Add project root to path to allow imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.insert(0, project_root)
+
+from src.RA1.functions.python.relatorios import (
+    MODO_DESLIGADO,
+    MODO_SEGUNDO_PLANO,
+    MODO_SINCRONO,
+    agendar_relatorio,
+    aguardar_relatorios,
+    definir_modo_relatorios,
+    obter_modo_relatorios,
+    relatorios_ativos,
+)
+
+
+@pytest.fixture
+def modo_relatorios():
+    anterior = obter_modo_relatorios()
+    yield definir_modo_relatorios
+    aguardar_relatorios()
+    definir_modo_relatorios(anterior)
+
+
+def test_sync_mode_runs_immediately(modo_relatorios):
+    modo_relatorios(MODO_SINCRONO)
+    gerados = []
+    assert agendar_relatorio(gerados.append, 'a') is None
+    assert gerados == ['a']
+
+
+def test_background_mode_keeps_order(modo_relatorios):
+    modo_relatorios(MODO_SEGUNDO_PLANO)
+    liberar = threading.Event()
+    gerados = []
+
+    agendar_relatorio(liberar.wait)
+    for nome in ('a', 'b', 'c'):
+        agendar_relatorio(gerados.append, nome)
+    # O chamador segue adiante enquanto o primeiro relatório está bloqueado
+    assert gerados == []
+
+    liberar.set()
+    assert aguardar_relatorios() == []
+    assert gerados == ['a', 'b', 'c']
+
+
+def test_disabled_mode_skips_reports(modo_relatorios):
+    modo_relatorios(MODO_DESLIGADO)
+    gerados = []
+    assert agendar_relatorio(gerados.append, 'a') is None
+    assert gerados == []
+    assert not relatorios_ativos()
+
+
+def test_background_errors_are_collected(modo_relatorios):
+    modo_relatorios(MODO_SEGUNDO_PLANO)
+
+    def falhar():
+        raise OSError("disco cheio")
+
+    agendar_relatorio(falhar)
+    erros = aguardar_relatorios()
+    assert len(erros) == 1 and isinstance(erros[0], OSError)
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError):
+        definir_modo_relatorios('paralelo')